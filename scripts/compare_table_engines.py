@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Table Engine Comparison
+
+Extracts the same pages with each table detection engine and reports
+pages per second, tables and rows found, and cell agreement against
+the first engine. Cell agreement compares each page's tables cell by
+cell (header row included); pages that disagree are listed so they can
+be checked by eye.
+
+Usage:
+    python scripts/compare_table_engines.py docs/context/init/W20552.pdf --pages 39-42
+    python scripts/compare_table_engines.py report.pdf --engines pymupdf pdfplumber --workers 4 -o engines.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# Project root (script is in scripts/)
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.table_engines import DEFAULT_ENGINE, ENGINES, cell_agreement  # noqa: E402
+from src.table_extractor import TableExtractor  # noqa: E402
+
+
+def parse_pages(spec: str) -> list[int]:
+    """'2,5-7' -> [2, 5, 6, 7]"""
+    pages = []
+    for part in spec.split(","):
+        start, _, end = part.strip().partition("-")
+        pages.extend(range(int(start), int(end or start) + 1))
+    return pages
+
+
+def run_engine(pdf_path: str, engine: str, pages: list[int], workers: int) -> tuple[dict, dict]:
+    """Extract pages with one engine; returns (stats, page -> cell grids)."""
+    extractor = TableExtractor(pdf_path, engine=engine)
+    start = time.perf_counter()
+    result = extractor.extract_tables(pages or None, workers=workers)
+    elapsed = time.perf_counter() - start
+
+    grids = defaultdict(list)
+    for table in result.tables:
+        grids[table.page_number].append([table.headers] + table.rows)
+    stats = {
+        "pages": result.pages_processed,
+        "elapsed_s": round(elapsed, 3),
+        "pages_per_s": round(result.pages_processed / elapsed, 1) if elapsed else None,
+        "pages_with_tables": result.pages_with_tables,
+        "tables": len(result.tables),
+        "rows": sum(t.row_count for t in result.tables),
+        "warnings": len(result.warnings),
+    }
+    return stats, grids
+
+
+def compare(baseline: dict, other: dict) -> dict:
+    """Cell agreement of other's tables with the baseline's, overall and per page."""
+    pages = sorted(set(baseline) | set(other))
+    by_page = {page: round(cell_agreement(baseline.get(page, []), other.get(page, [])), 4) for page in pages}
+    # Overall agreement pairs tables page by page, so one page's extra
+    # table does not shift every later page
+    agree = total = 0
+    for page in pages:
+        cells = max(
+            sum(len(row) for grid in baseline.get(page, []) for row in grid),
+            sum(len(row) for grid in other.get(page, []) for row in grid),
+        )
+        agree += by_page[page] * cells
+        total += cells
+    return {
+        "cell_agreement": round(agree / total, 4) if total else 1.0,
+        "disagreeing_pages": [page for page, score in by_page.items() if score < 1.0],
+    }
+
+
+def print_table(stats: dict[str, dict], agreement: dict[str, dict], baseline: str) -> None:
+    print(f"\n{'Engine':<12} {'pages/s':>8} {'seconds':>8} {'tables':>7} {'rows':>7} {'agree':>7}")
+    print("-" * 54)
+    for engine, s in stats.items():
+        agree = "-" if engine == baseline else f"{agreement[engine]['cell_agreement']:.1%}"
+        print(
+            f"{engine:<12} {s['pages_per_s'] or '-':>8} {s['elapsed_s']:>8} "
+            f"{s['tables']:>7} {s['rows']:>7} {agree:>7}"
+        )
+    for engine, a in agreement.items():
+        if a["disagreeing_pages"]:
+            print(f"\n{engine} differs from {baseline} on pages {a['disagreeing_pages']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare table detection engines")
+    parser.add_argument("pdf", help="PDF to extract")
+    parser.add_argument("--engines", nargs="+", default=[DEFAULT_ENGINE] + [e for e in ENGINES if e != DEFAULT_ENGINE],
+                        choices=list(ENGINES), help="Engines to compare; the first is the baseline")
+    parser.add_argument("--pages", "-p", help="Pages to extract, e.g. '39-42' (default: all)")
+    parser.add_argument("--workers", "-w", type=int, default=1, help="Worker processes per engine")
+    parser.add_argument("--output", "-o", help="Write results as JSON")
+    args = parser.parse_args()
+
+    pages = parse_pages(args.pages) if args.pages else []
+    stats, grids = {}, {}
+    for engine in args.engines:
+        print(f"Extracting with {engine}...")
+        stats[engine], grids[engine] = run_engine(args.pdf, engine, pages, args.workers)
+
+    baseline = args.engines[0]
+    agreement = {
+        engine: compare(grids[baseline], grids[engine])
+        for engine in args.engines[1:]
+    }
+
+    print_table(stats, agreement, baseline)
+    if args.output:
+        results = {"baseline": baseline, "engines": stats, "agreement": agreement}
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"\nResults: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
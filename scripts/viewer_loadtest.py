@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Viewer Load Test
+
+Starts the element viewer in each serve mode and reports requests per
+second and latency percentiles under concurrent load, so the Flask
+development server ("before") can be compared with production mode
+("after"). Pass --url to load-test a server that is already running.
+
+Usage:
+    python scripts/viewer_loadtest.py data/output/extended/W20552_elements.db
+    python scripts/viewer_loadtest.py --url http://127.0.0.1:5000 --requests 5000
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Project root (script is in scripts/)
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DEFAULT_PATHS = ["/", "/pages", "/page/39", "/page/40", "/search?q=Core"]
+STARTUP_TIMEOUT = 30.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(base_url: str, timeout: float = STARTUP_TIMEOUT) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(base_url + "/pages", timeout=1).read()
+            return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f"Viewer at {base_url} did not start within {timeout}s")
+
+
+def fetch(url: str) -> tuple[float, bool]:
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, ConnectionError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run_load(base_url: str, paths: list[str], requests: int, concurrency: int) -> dict:
+    """Issue requests round-robin over paths and summarize throughput."""
+    urls = [base_url + paths[i % len(paths)] for i in range(requests)]
+    # Warm-up pass so first-request costs are not measured
+    for path in paths:
+        fetch(base_url + path)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": sum(1 for _, ok in results if not ok),
+        "elapsed_s": round(elapsed, 2),
+        "requests_per_s": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1),
+    }
+
+
+def run_mode(db_path: str, mode: str, args) -> dict:
+    """Start the viewer in one serve mode, load-test it and stop it."""
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "src.elementizer.main", "view", db_path,
+            "--port", str(port), "--serve", mode,
+            "--threads", str(args.threads), "--no-prewarm",
+        ],
+        cwd=PROJECT_ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_ready(base_url)
+        return run_load(base_url, args.paths, args.requests, args.concurrency)
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def print_table(results: dict[str, dict]) -> None:
+    print(f"\n{'Mode':<14} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+    print("-" * 49)
+    for mode, r in results.items():
+        print(f"{mode:<14} {r['requests_per_s']:>8} {r['p50_ms']:>8} {r['p95_ms']:>8} {r['errors']:>7}")
+    if len(results) == 2:
+        before, after = results.values()
+        print(f"\nSpeedup: {after['requests_per_s'] / before['requests_per_s']:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the element viewer")
+    parser.add_argument("database", nargs="?", help="Element database to serve")
+    parser.add_argument("--url", help="Load-test an already running viewer instead")
+    parser.add_argument("--modes", nargs="+", default=["development", "production"],
+                        choices=["development", "production"], help="Serve modes to compare")
+    parser.add_argument("--paths", nargs="+", default=DEFAULT_PATHS, help="Paths to request")
+    parser.add_argument("--requests", "-n", type=int, default=2000, help="Requests per mode")
+    parser.add_argument("--concurrency", "-c", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--threads", type=int, default=8, help="Server threads in production mode")
+    parser.add_argument("--output", "-o", help="Write results as JSON")
+    args = parser.parse_args()
+
+    if not args.url and not args.database:
+        parser.error("pass a database or --url")
+
+    if args.url:
+        results = {args.url: run_load(args.url.rstrip("/"), args.paths, args.requests, args.concurrency)}
+    else:
+        results = {}
+        for mode in args.modes:
+            print(f"Load-testing {mode} mode ({args.requests} requests, {args.concurrency} clients)...")
+            results[mode] = run_mode(str(Path(args.database).resolve()), mode, args)
+
+    print_table(results)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+        print(f"\nResults: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""Batch Core Analysis extraction over many element databases.
+
+Fans element databases out across a process pool so a nightly run over
+hundreds of wells pays interpreter startup and import costs once, then
+writes per-document outputs plus one consolidated CSV with a source column.
+"""
+
+import csv
+import glob
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .core_analysis import TEMPLATE_INDEX, CoreAnalysisExtractor, iter_csv_rows, validate_output_path
+from .output.columnar import samples_to_columns, write_columns
+from .output.csv_sanitizer import sanitize_csv_value
+from .sample_table import SampleTable
+from .validation import ValidationReport, validate_columns
+
+logger = logging.getLogger(__name__)
+
+# Consolidated output filenames (written at the batch output root)
+CONSOLIDATED_CSV_NAME = "consolidated_extraction.csv"
+CONSOLIDATED_COLUMNAR_NAME = "consolidated_extraction"  # suffix set by format
+BATCH_SUMMARY_NAME = "batch_summary.json"
+VALIDATION_REPORT_NAME = "validation_report.json"
+
+# Column prepended to the consolidated CSV identifying the source database
+SOURCE_COLUMN = "source"
+
+# Characters that mark a database argument as a glob pattern
+GLOB_CHARS = ("*", "?", "[")
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of extracting a single database in a batch run."""
+    source: str
+    db_path: str
+    output_dir: Optional[str] = None
+    table_pages: list[int] = field(default_factory=list)
+    samples: SampleTable = field(default_factory=SampleTable)
+    warnings: list[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchResult:
+    """Result of a batch run across many databases."""
+    items: list[BatchItemResult] = field(default_factory=list)
+    consolidated_csv: Optional[str] = None
+    consolidated_columnar: Optional[str] = None
+    validation: Optional[ValidationReport] = None
+    validation_report: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+    @property
+    def sample_count(self) -> int:
+        return sum(len(item.samples) for item in self.items)
+
+    @property
+    def failed(self) -> list[BatchItemResult]:
+        return [item for item in self.items if not item.ok]
+
+
+def is_batch_target(target: str) -> bool:
+    """Return True if a database argument names a directory or glob."""
+    return Path(target).is_dir() or any(ch in target for ch in GLOB_CHARS)
+
+
+def discover_databases(target: str) -> list[Path]:
+    """Resolve a database file, directory, or glob to a sorted list of paths.
+
+    Directories are searched (non-recursively) for ``*.db`` files.
+    """
+    path = Path(target)
+    if path.is_dir():
+        return sorted(p for p in path.glob("*.db") if p.is_file())
+    if any(ch in target for ch in GLOB_CHARS):
+        return sorted(Path(p) for p in glob.glob(target) if Path(p).is_file())
+    return [path]
+
+
+def _source_name(db_path: Path) -> str:
+    """Derive a document name from an elements database filename."""
+    stem = db_path.stem
+    return stem[: -len("_elements")] if stem.endswith("_elements") else stem
+
+
+def source_names(databases: list[Path]) -> list[str]:
+    """Unique document names for a batch, in the order of ``databases``.
+
+    Names double as output subdirectories and ``source`` values, so
+    databases that would share one (``W1.db`` and ``W1_elements.db``, or
+    same-named files in different directories) are told apart: first by
+    prefixing the parent directory name, then by a numeric suffix.
+    """
+    stems = [_source_name(Path(db)) for db in databases]
+    names = [
+        f"{Path(db).parent.name}_{stem}" if stems.count(stem) > 1 and Path(db).parent.name else stem
+        for db, stem in zip(databases, stems)
+    ]
+
+    taken = set(names)
+    unique: list[str] = []
+    for name in names:
+        candidate, n = name, 1
+        while candidate in unique or (n > 1 and candidate in taken):
+            n += 1
+            candidate = f"{name}-{n}"
+        unique.append(candidate)
+    return unique
+
+
+def process_database(
+    db_path: str,
+    output_root: str,
+    use_original_headers: bool = False,
+    classify_only: bool = False,
+    columnar: Optional[str] = None,
+    template_match: bool = False,
+    source: Optional[str] = None,
+) -> BatchItemResult:
+    """Extract one database and write its per-document outputs.
+
+    Runs inside a worker process, so it must stay a module-level function
+    and never raise: failures are reported on the returned item instead.
+    Outputs go to ``output_root/<source>``; source defaults to the name
+    derived from the filename (see source_names).
+    """
+    start = time.perf_counter()
+    db_path = Path(db_path)
+    item = BatchItemResult(source=source or _source_name(db_path), db_path=str(db_path))
+
+    try:
+        output_dir = Path(output_root) / item.source
+        # Each worker process shares one template index across its documents
+        layout_index = TEMPLATE_INDEX if template_match else None
+        extractor = CoreAnalysisExtractor(str(db_path), layout_index=layout_index)
+        result = extractor.extract()
+
+        item.table_pages = result.table_pages
+        item.samples = result.samples
+        item.warnings = list(result.warnings)
+
+        extractor.save_classification(result, str(output_dir / "page_classification.json"))
+        if not classify_only:
+            extractor.save_csv(
+                result,
+                str(output_dir / "full_table_extraction.csv"),
+                use_original_headers=use_original_headers,
+            )
+            extractor.save_header_verification(
+                str(output_dir / "header_verification.txt"),
+                table_pages=result.table_pages,
+            )
+            if columnar:
+                extractor.save_columnar(
+                    result, str(output_dir / "full_table_extraction"), fmt=columnar
+                )
+        item.output_dir = str(output_dir)
+
+    except Exception as e:
+        item.error = str(e)
+
+    item.elapsed_ms = (time.perf_counter() - start) * 1000
+    return item
+
+
+def write_consolidated_csv(items: list[BatchItemResult], output_path: str) -> str:
+    """Write all samples from a batch to one CSV with a leading source column.
+
+    Uses canonical headers, since original PDF headers can differ between
+    reports.
+    """
+    validate_output_path(str(output_path))
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.writer(f)
+        writer.writerow([SOURCE_COLUMN] + CoreAnalysisExtractor.CANONICAL_HEADERS)
+        for item in items:
+            source = sanitize_csv_value(item.source)
+            for row in iter_csv_rows(item.samples):
+                writer.writerow([source] + row)
+
+    return str(output_path)
+
+
+def write_consolidated_columnar(
+    items: list[BatchItemResult], output_path: str, fmt: str = "auto"
+) -> str:
+    """Write all samples from a batch to one typed columnar file.
+
+    Columns match save_columnar output with a leading ``source`` column.
+    """
+    validate_output_path(str(output_path))
+    return write_columns(consolidated_columns(items), output_path, fmt=fmt)
+
+
+def consolidated_columns(items: list[BatchItemResult]) -> dict:
+    """Typed columns for all samples in a batch, with a ``source`` column."""
+    import numpy as np
+
+    parts = [samples_to_columns(item.samples, source=item.source) for item in items]
+    parts = parts or [samples_to_columns([], source="")]
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def validate_batch(batch: BatchResult, output_path: str) -> str:
+    """Validate all batch samples in one vectorized pass and save the report.
+
+    Depth ordering is checked per source document.
+
+    Raises:
+        ValueError: If output_path is outside allowed directories.
+    """
+    validate_output_path(str(output_path))
+
+    batch.validation = validate_columns(consolidated_columns(batch.items))
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(batch.validation.to_dict(), f, indent=2)
+    return str(output_path)
+
+
+def run_batch(
+    databases: list[Path],
+    output_root: str,
+    workers: Optional[int] = None,
+    use_original_headers: bool = False,
+    classify_only: bool = False,
+    columnar: Optional[str] = None,
+    validate: bool = False,
+    template_match: bool = False,
+) -> BatchResult:
+    """Extract many databases across a process pool.
+
+    Args:
+        databases: Element database paths to process.
+        output_root: Directory receiving one subdirectory per document
+                     plus the consolidated CSV and batch summary.
+        workers: Worker process count. ``1`` runs inline without a pool;
+                 ``None`` uses the CPU count.
+        use_original_headers: Use original PDF headers in per-document CSVs.
+        classify_only: Only write page classifications.
+        columnar: Also write typed columnar output in this format
+                  ('auto', 'parquet' or 'npz').
+        validate: Validate all samples together and write a validation report.
+        template_match: Classify pages by layout template where possible
+                        (see CoreAnalysisExtractor's layout_index).
+
+    Returns:
+        BatchResult with items in the same order as ``databases``.
+
+    Raises:
+        ValueError: If output_root is outside allowed directories.
+    """
+    validate_output_path(str(output_root))
+
+    start = time.perf_counter()
+    batch = BatchResult()
+    args = (str(output_root), use_original_headers, classify_only, columnar, template_match)
+
+    sources = source_names(databases)
+
+    if workers == 1 or len(databases) <= 1:
+        batch.items = [
+            process_database(str(db), *args, source=source) for db, source in zip(databases, sources)
+        ]
+    else:
+        max_workers = min(workers or os.cpu_count() or 1, len(databases))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(process_database, str(db), *args, source=source)
+                for db, source in zip(databases, sources)
+            ]
+            for future in as_completed(futures):
+                item = future.result()
+                logger.info(f"{item.source}: {len(item.samples)} samples in {item.elapsed_ms:.0f}ms")
+        batch.items = [future.result() for future in futures]
+
+    if not classify_only:
+        batch.consolidated_csv = write_consolidated_csv(
+            batch.items, str(Path(output_root) / CONSOLIDATED_CSV_NAME)
+        )
+        if columnar:
+            batch.consolidated_columnar = write_consolidated_columnar(
+                batch.items, str(Path(output_root) / CONSOLIDATED_COLUMNAR_NAME), fmt=columnar
+            )
+    if validate:
+        batch.validation_report = validate_batch(
+            batch, str(Path(output_root) / VALIDATION_REPORT_NAME)
+        )
+
+    batch.elapsed_ms = (time.perf_counter() - start) * 1000
+    return batch
+
+
+def get_batch_summary(batch: BatchResult) -> dict:
+    """Get a JSON-serializable per-file timing and warning summary."""
+    return {
+        "documents": len(batch.items),
+        "failed": len(batch.failed),
+        "sample_count": batch.sample_count,
+        "elapsed_ms": round(batch.elapsed_ms, 1),
+        "consolidated_csv": batch.consolidated_csv,
+        "consolidated_columnar": batch.consolidated_columnar,
+        "validation_passed": batch.validation.passed if batch.validation else None,
+        "files": [
+            {
+                "source": item.source,
+                "db_path": item.db_path,
+                "output_dir": item.output_dir,
+                "table_pages": item.table_pages,
+                "samples": len(item.samples),
+                "elapsed_ms": round(item.elapsed_ms, 1),
+                "warnings": item.warnings,
+                "error": item.error,
+            }
+            for item in batch.items
+        ],
+    }
+
+
+def save_batch_summary(batch: BatchResult, output_path: str) -> str:
+    """Save the batch summary to JSON.
+
+    Raises:
+        ValueError: If output_path is outside allowed directories.
+    """
+    validate_output_path(str(output_path))
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(get_batch_summary(batch), f, indent=2)
+
+    return str(output_path)
+
+
+def print_batch_summary(batch: BatchResult):
+    """Print per-file timing and warning summary."""
+    print("\n" + "=" * 60)
+    print("CORE ANALYSIS BATCH RESULTS")
+    print("=" * 60)
+
+    print(f"\n{'Source':<30}{'Samples':<10}{'Time (ms)':<12}{'Warnings':<10}")
+    print("-" * 62)
+    for item in batch.items:
+        status = "FAILED" if item.error else str(len(item.warnings))
+        print(f"{item.source[:29]:<30}{len(item.samples):<10}{item.elapsed_ms:<12.0f}{status:<10}")
+
+    print(f"\nDocuments: {len(batch.items)} ({len(batch.failed)} failed)")
+    print(f"Samples extracted: {batch.sample_count}")
+    print(f"Total time: {batch.elapsed_ms:.0f}ms")
+    if batch.validation:
+        status = "PASSED" if batch.validation.passed else "FAILED"
+        print(f"Validation: {status} ({batch.validation.violation_count} violations)")
+
+    for item in batch.items:
+        if item.error:
+            print(f"  ! {item.source}: {item.error}")
+        for w in item.warnings[:5]:
+            print(f"  - {item.source}: {w}")
+        if len(item.warnings) > 5:
+            print(f"  ... and {len(item.warnings) - 5} more in {item.source}")
@@ -5,17 +5,34 @@ classifies pages, and consolidates table data into CSV/JSON output.
 """
 
 import csv
+import hashlib
 import json
 import logging
 import os
 import re
-import sqlite3
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
-
+from typing import Iterator, Optional
+
+from .element_sources import (
+    JSONL_SUFFIXES,
+    ElementSource,
+    InMemoryElementSource,
+    LazyPDFElementSource,
+    SQLiteElementSource,
+    open_element_source,
+)
+from .elementizer.layout_index import LayoutIndex
+from .output.columnar import write_columnar
 from .output.csv_sanitizer import sanitize_csv_value
+from .profiling import NULL_PROFILER, StageProfiler
+from .sample_table import FIELDS, SampleTable
+from .validation import ValidationReport, validate_samples
 
 # Configure logging for audit trail
 logger = logging.getLogger(__name__)
@@ -41,6 +58,23 @@ EXPECTED_COLUMN_COUNTS = {
 # Merged cell indicators that should be replicated across column groups
 MERGED_INDICATORS = ['+', '**', '<0.0001', '<']
 
+# Header layout matching tolerances (points). Spatial buckets use the same
+# sizes, so every match lies in a span's own bucket or an adjacent one.
+HEADER_Y_TOLERANCE = 5
+HEADER_X_TOLERANCE = 20
+
+# Page types fully extracted in two-phase (--lazy) PDF mode
+DEFAULT_LAZY_PAGE_TYPES = ("table",)
+
+# Memoized flattened headers shared across pages and documents (LRU bound)
+MAX_HEADER_CACHE_ENTRIES = 256
+_header_cache: "OrderedDict[str, tuple[str, ...]]" = OrderedDict()
+_header_cache_lock = threading.Lock()
+
+# Page layout templates labeled by the classification rules, shared across
+# documents when template matching is on (--template-match)
+TEMPLATE_INDEX = LayoutIndex()
+
 # Allowed output directories for security
 ALLOWED_OUTPUT_ROOTS = [
     '/c/Users/mcwiz/Projects/RCA-PDF-extraction-pipeline',
@@ -51,6 +85,141 @@ ALLOWED_OUTPUT_ROOTS = [
 ]
 
 
+def validate_output_path(output_path: str) -> bool:
+    """Ensure output path is within allowed directories.
+
+    Args:
+        output_path: Path to validate
+
+    Returns:
+        True if valid
+
+    Raises:
+        ValueError: If path is outside allowed directories
+    """
+    abs_path = os.path.abspath(output_path)
+    for allowed_root in ALLOWED_OUTPUT_ROOTS:
+        allowed_abs = os.path.abspath(allowed_root)
+        if abs_path.startswith(allowed_abs):
+            return True
+    raise ValueError(f"Output path '{output_path}' outside allowed directories")
+
+
+def _format_value(val):
+    """Format a cell value for CSV, sanitizing merged indicator strings."""
+    if val is None:
+        return ""
+    # ISSUE #4: Sanitize string values that may contain CSV injection chars
+    # This handles replicated merged indicators like +, **, <0.0001
+    if isinstance(val, str):
+        return sanitize_csv_value(val)
+    return val
+
+
+def format_row_values(values: tuple) -> list:
+    """Format sample values given in CANONICAL_HEADERS order as CSV cells."""
+    (core_number, sample_number, depth, perm_air, perm_klink, porosity_amb,
+     porosity_ncs, grain_density, sat_water, sat_oil, sat_total, page_number) = values
+    return [
+        core_number,
+        sample_number,
+        depth if depth is not None else "",
+        _format_value(perm_air),
+        _format_value(perm_klink),
+        porosity_amb if porosity_amb is not None else "",
+        porosity_ncs if porosity_ncs is not None else "",
+        grain_density if grain_density is not None else "",
+        _format_value(sat_water),
+        _format_value(sat_oil),
+        _format_value(sat_total),
+        page_number,
+    ]
+
+
+def format_sample_row(sample: "CoreSample") -> list:
+    """Get a sample's CSV cell values in CANONICAL_HEADERS order."""
+    return format_row_values(tuple(getattr(sample, name) for name in FIELDS))
+
+
+def as_sample_table(samples) -> SampleTable:
+    """Return samples as a SampleTable, converting a plain list if needed."""
+    return samples if isinstance(samples, SampleTable) else SampleTable(samples)
+
+
+def iter_csv_rows(samples) -> Iterator[list]:
+    """Yield formatted CSV rows, reading SampleTable columns directly."""
+    if isinstance(samples, SampleTable):
+        return (format_row_values(values) for values in samples.iter_tuples())
+    return (format_sample_row(sample) for sample in samples)
+
+
+class _HeaderLayoutIndex:
+    """Spatial index over a header layout's column and spanning definitions.
+
+    Spanning and excluded header anchors are bucketed on a grid of
+    HEADER_Y_TOLERANCE x HEADER_X_TOLERANCE cells, so a span only checks the
+    anchors in its own and adjacent cells instead of every entry. Column
+    assignment uses bisection over the column boundaries.
+    """
+
+    def __init__(
+        self,
+        column_boundaries: list[tuple[float, float]],
+        spanning_headers: dict[tuple[float, float], list[int]],
+        excluded_headers: list[tuple[float, float]],
+    ):
+        self._spanning = self._bucket(
+            (y, x, order, cols)
+            for order, ((y, x), cols) in enumerate(spanning_headers.items())
+        )
+        self._excluded = self._bucket(
+            (y, x, order, None) for order, (y, x) in enumerate(excluded_headers)
+        )
+        ordered = sorted(enumerate(column_boundaries), key=lambda c: c[1][1])
+        self._column_maxes = [col_max for _, (_, col_max) in ordered]
+        self._columns = [(i, col_min) for i, (col_min, _) in ordered]
+        self.signature = repr((column_boundaries, sorted(spanning_headers.items()),
+                               sorted(excluded_headers)))
+
+    @staticmethod
+    def _cell(y: float, x: float) -> tuple[int, int]:
+        return int(y // HEADER_Y_TOLERANCE), int(x // HEADER_X_TOLERANCE)
+
+    @classmethod
+    def _bucket(cls, anchors) -> dict[tuple[int, int], list[tuple]]:
+        buckets: dict[tuple[int, int], list[tuple]] = {}
+        for anchor in anchors:
+            buckets.setdefault(cls._cell(anchor[0], anchor[1]), []).append(anchor)
+        return buckets
+
+    @classmethod
+    def _nearest(cls, buckets: dict, y: float, center: float) -> Optional[tuple]:
+        """Return the first-defined anchor within tolerance of (y, center)."""
+        cy, cx = cls._cell(y, center)
+        best = None
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                for anchor in buckets.get((cy + dy, cx + dx), ()):
+                    if (abs(y - anchor[0]) < HEADER_Y_TOLERANCE
+                            and abs(center - anchor[1]) < HEADER_X_TOLERANCE
+                            and (best is None or anchor[2] < best[2])):
+                        best = anchor
+        return best
+
+    def spanning_columns(self, y: float, center: float) -> Optional[list[int]]:
+        anchor = self._nearest(self._spanning, y, center)
+        return anchor[3] if anchor else None
+
+    def is_excluded(self, y: float, center: float) -> bool:
+        return self._nearest(self._excluded, y, center) is not None
+
+    def column_for(self, center: float) -> Optional[int]:
+        pos = bisect_left(self._column_maxes, center)
+        if pos < len(self._columns) and self._columns[pos][1] <= center:
+            return self._columns[pos][0]
+        return None
+
+
 @dataclass
 class CoreSample:
     """A single core sample measurement."""
@@ -97,13 +266,17 @@ class PageClassification:
 class ExtractionResult:
     """Result of the extraction pipeline."""
     classifications: list[PageClassification] = field(default_factory=list)
-    samples: list[CoreSample] = field(default_factory=list)
+    samples: SampleTable = field(default_factory=SampleTable)
     table_pages: list[int] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
 
 
 class CoreAnalysisExtractor:
-    """Extract Core Analysis data from parsed PDF database."""
+    """Extract Core Analysis data from parsed PDF elements.
+
+    Elements come from an elementizer SQLite database by default, or from
+    any ElementSource (JSONL page dump, in-memory PDF extraction).
+    """
 
     # Canonical headers (for internal use and backwards compatibility)
     CANONICAL_HEADERS = [
@@ -185,13 +358,107 @@ class CoreAnalysisExtractor:
     # Headers to exclude (misaligned or not actual column headers)
     EXCLUDED_HEADERS = []  # None currently - "Sample" at y=193 IS part of Depth header
 
-    def __init__(self, db_path: str):
-        self.db_path = Path(db_path)
-        if not self.db_path.exists():
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        profiler=None,
+        source: Optional[ElementSource] = None,
+        layout_index: Optional[LayoutIndex] = None,
+    ):
+        """
+        Args:
+            db_path: Path to the SQLite database from elementizer.
+            profiler: Optional StageProfiler (src.profiling) recording
+                      per-stage timings. Defaults to a no-op profiler.
+            source: ElementSource to read instead of a database. The
+                    caller owns it and is responsible for closing it.
+            layout_index: Template index for classification. Pages whose
+                          layout matches a labeled template take its
+                          label without running the keyword rules; other
+                          pages are added to it. Usually TEMPLATE_INDEX.
+        """
+        if (db_path is None) == (source is None):
+            raise ValueError("Provide exactly one of db_path or source")
+        self.db_path = Path(db_path) if db_path is not None else None
+        if self.db_path is not None and not self.db_path.exists():
             raise FileNotFoundError(f"Database not found: {db_path}")
+        self.source = source
         self._extracted_headers: list[str] | None = None
+        self.profiler = profiler or NULL_PROFILER
+        self.layout_index = layout_index
+
+    @classmethod
+    def from_pdf(
+        cls,
+        pdf_path: str,
+        lazy: bool = False,
+        page_types: tuple[str, ...] = DEFAULT_LAZY_PAGE_TYPES,
+        profiler=None,
+        layout_index: Optional[LayoutIndex] = None,
+    ) -> "CoreAnalysisExtractor":
+        """Create an extractor reading a PDF in memory, without a database.
+
+        Args:
+            pdf_path: PDF to extract.
+            lazy: Two-phase mode. Classify every page from cheap plain
+                  text, then extract text structure only for pages whose
+                  type is in page_types.
+            page_types: Page types to fully extract in lazy mode.
+            profiler: Optional StageProfiler.
+            layout_index: Template index (not used in lazy mode, where
+                          classification needs only plain text).
+        """
+        if not lazy:
+            source = InMemoryElementSource.from_pdf(pdf_path, layouts=layout_index is not None)
+            return cls(source=source, profiler=profiler, layout_index=layout_index)
+
+        def select_pages(page_texts: dict[int, str]) -> list[int]:
+            return [
+                page_num for page_num, text in page_texts.items()
+                if cls.classify_page_text(page_num, text).page_type in page_types
+            ]
+
+        source = LazyPDFElementSource.from_pdf(pdf_path, select_pages, profiler=profiler)
+        return cls(source=source, profiler=profiler)
+
+    def _open_source(self):
+        """Context manager yielding the element source for one operation.
 
-    def _extract_headers_from_db(self, conn: sqlite3.Connection, page_num: int = 39) -> list[str]:
+        Database sources are opened and closed per operation; a source
+        passed to the constructor is reused and left open.
+        """
+        if self.source is not None:
+            return nullcontext(self.source)
+        return SQLiteElementSource(self.db_path)
+
+    @classmethod
+    def _header_layout(cls) -> _HeaderLayoutIndex:
+        """Get the spatial header index for this class's layout constants."""
+        index = cls.__dict__.get("_header_layout_index")
+        if index is None:
+            index = _HeaderLayoutIndex(
+                cls.COLUMN_BOUNDARIES, cls.SPANNING_HEADERS, cls.EXCLUDED_HEADERS
+            )
+            cls._header_layout_index = index
+        return index
+
+    @staticmethod
+    def _header_fingerprint(
+        spans: list[tuple[float, float, float, str]], layout: _HeaderLayoutIndex
+    ) -> str:
+        """Compute a layout fingerprint of a header band.
+
+        Hashes span texts with their exact positions, plus the column
+        layout. Bands share a fingerprint only when they are identical,
+        so a cached result is always what flattening would produce;
+        rounding positions could move a span across a column boundary.
+        """
+        digest = hashlib.blake2b(layout.signature.encode(), digest_size=16)
+        for span in spans:
+            digest.update(repr(span).encode())
+        return digest.hexdigest()
+
+    def _extract_headers(self, source: ElementSource, page_num: int = 39) -> list[str]:
         """
         Extract and flatten multi-row table headers from the database.
 
@@ -201,68 +468,59 @@ class CoreAnalysisExtractor:
         2. Handles spanning headers that apply to multiple columns
         3. Excludes misaligned headers
 
+        Flattened headers are memoized by header band fingerprint, so
+        repeated headers on later pages (and in other reports sharing the
+        template) are resolved with a hash lookup.
+
         Args:
-            conn: Database connection.
+            source: Element source to read header spans from.
             page_num: Page number containing the table headers (default: 39).
 
         Returns:
             List of flattened header strings in column order.
         """
-        cursor = conn.cursor()
-
-        # Query text spans in the header region
-        cursor.execute("""
-            SELECT ts.x0, ts.x1, ts.y0, ts.text
-            FROM text_spans ts
-            JOIN pages p ON ts.page_id = p.id
-            WHERE p.page_number = ? AND ts.y0 >= ? AND ts.y0 <= ?
-            ORDER BY ts.y0, ts.x0
-        """, (page_num, self.HEADER_Y_MIN, self.HEADER_Y_MAX))
-
-        spans = [(row["x0"], row["x1"], row["y0"], row["text"].strip())
-                 for row in cursor.fetchall()]
+        # Text spans in the header region
+        spans = [
+            (span.x0, span.x1, span.y0, span.text.strip())
+            for span in source.spans_in_band(page_num, self.HEADER_Y_MIN, self.HEADER_Y_MAX)
+        ]
 
         if not spans:
             logger.warning(f"No header spans found on page {page_num}, using fallback headers")
             return self.ORIGINAL_HEADERS[:-1]  # Exclude "Page Number"
 
+        layout = self._header_layout()
+        fingerprint = self._header_fingerprint(spans, layout)
+        with _header_cache_lock:
+            cached = _header_cache.get(fingerprint)
+            if cached is not None:
+                _header_cache.move_to_end(fingerprint)
+        if cached is not None:
+            logger.debug(f"Header fingerprint cache hit on page {page_num}")
+            return list(cached)
+
         # Initialize columns with empty text lists
         columns = [[] for _ in self.COLUMN_BOUNDARIES]
 
-        # Helper to find spanning header match
-        def find_spanning_match(y: float, center: float) -> list[int] | None:
-            for (y_approx, x_approx), col_indices in self.SPANNING_HEADERS.items():
-                if abs(y - y_approx) < 5 and abs(center - x_approx) < 20:
-                    return col_indices
-            return None
-
-        # Helper to check if header should be excluded
-        def is_excluded(y: float, center: float) -> bool:
-            for (y_approx, x_approx) in self.EXCLUDED_HEADERS:
-                if abs(y - y_approx) < 5 and abs(center - x_approx) < 20:
-                    return True
-            return False
-
         # Assign each span to column(s)
         for x0, x1, y, text in spans:
             center = (x0 + x1) / 2
 
             # Check if excluded
-            if is_excluded(y, center):
+            if layout.is_excluded(y, center):
                 continue
 
             # Check if this is a spanning header
-            span_cols = find_spanning_match(y, center)
+            span_cols = layout.spanning_columns(y, center)
             if span_cols:
                 # Add to all spanned columns
                 for col_idx in span_cols:
                     columns[col_idx].append((y, text))
             else:
                 # Assign to single column based on center
-                for i, (col_min, col_max) in enumerate(self.COLUMN_BOUNDARIES):
-                    if col_min <= center <= col_max:
-                        columns[i].append((y, text))
-                        break
+                col_idx = layout.column_for(center)
+                if col_idx is not None:
+                    columns[col_idx].append((y, text))
 
         # Build header strings by joining text from top to bottom
         headers = []
@@ -277,6 +535,11 @@ class CoreAnalysisExtractor:
             else:
                 headers.append("")
 
+        with _header_cache_lock:
+            _header_cache[fingerprint] = tuple(headers)
+            if len(_header_cache) > MAX_HEADER_CACHE_ENTRIES:
+                _header_cache.popitem(last=False)
+
         logger.debug(f"Extracted {len(headers)} headers from page {page_num}")
         return headers
 
@@ -287,9 +550,10 @@ class CoreAnalysisExtractor:
         Returns cached headers or extracts them from the database.
         """
         if self._extracted_headers is None:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                pdf_headers = self._extract_headers_from_db(conn)
+            with self._open_source() as source:
+                with self.profiler.stage("header_extraction") as stage:
+                    pdf_headers = self._extract_headers(source)
+                    stage.add_rows(len(pdf_headers))
                 # Append "Page Number" which is not in the PDF
                 self._extracted_headers = pdf_headers + ["Page Number"]
         return self._extracted_headers
@@ -331,15 +595,15 @@ class CoreAnalysisExtractor:
                 'mismatches': [],
             }
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-
+        with self._open_source() as source:
             # Extract headers from each table page
             headers_by_page: dict[int, list[str]] = {}
             for page_num in table_pages:
-                headers_by_page[page_num] = self._extract_headers_from_db(
-                    conn, page_num
-                )
+                with self.profiler.stage("header_extraction") as stage:
+                    headers_by_page[page_num] = self._extract_headers(
+                        source, page_num
+                    )
+                    stage.add_rows(len(headers_by_page[page_num]))
 
         # Use first table page as reference
         reference_page = table_pages[0]
@@ -400,11 +664,11 @@ class CoreAnalysisExtractor:
         """Run the full extraction pipeline."""
         result = ExtractionResult()
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-
+        with self._open_source() as source:
             # Step 1: Classify all pages
-            result.classifications = self._classify_pages(conn)
+            with self.profiler.stage("classify") as stage:
+                result.classifications = self._classify_pages(source)
+                stage.add_rows(len(result.classifications))
             result.table_pages = [
                 c.page_number for c in result.classifications
                 if c.page_type == "table"
@@ -412,43 +676,57 @@ class CoreAnalysisExtractor:
 
             # Step 2: Extract data from table pages
             for page_num in result.table_pages:
-                try:
-                    samples = self._extract_page_data(conn, page_num)
-                    result.samples.extend(samples)
-                except Exception as e:
-                    result.warnings.append(f"Page {page_num}: {str(e)}")
+                with self.profiler.stage(f"parse:page_{page_num}") as stage:
+                    try:
+                        samples = self._extract_page_data(source, page_num)
+                        result.samples.extend(samples)
+                        stage.add_rows(len(samples))
+                    except Exception as e:
+                        result.warnings.append(f"Page {page_num}: {str(e)}")
 
         return result
 
-    def _classify_pages(self, conn: sqlite3.Connection) -> list[PageClassification]:
-        """Classify all pages in the document."""
-        cursor = conn.cursor()
-
-        # Get all pages
-        cursor.execute("SELECT page_number FROM pages ORDER BY page_number")
-        pages = [row["page_number"] for row in cursor.fetchall()]
+    def _classify_pages(self, source: ElementSource) -> list[PageClassification]:
+        """Classify all pages in the document.
 
+        With a layout index, a page matching a labeled template takes the
+        template's label; the rest are classified by the rules and teach
+        the index.
+        """
+        layouts = source.page_layouts() if self.layout_index is not None else {}
         classifications = []
-        for page_num in pages:
-            classification = self._classify_page(conn, page_num)
+        for page_num in source.page_numbers():
+            fingerprint = layouts.get(page_num)
+            template = self.layout_index.lookup(fingerprint) if fingerprint is not None else None
+            if template is not None:
+                # Example: (source name, classification) of the template's first page
+                name, example = template.example
+                classification = PageClassification(
+                    page_number=page_num,
+                    page_type=example.page_type,
+                    confidence=example.confidence,
+                    reason=f"Layout matches {name} page {example.page_number}: {example.reason}",
+                )
+            else:
+                classification = self._classify_page(source, page_num)
+                if fingerprint is not None:
+                    self.layout_index.add(
+                        fingerprint,
+                        (classification.page_type, classification.confidence),
+                        (source.name, classification),
+                    )
             classifications.append(classification)
 
         return classifications
 
-    def _classify_page(self, conn: sqlite3.Connection, page_num: int) -> PageClassification:
+    def _classify_page(self, source: ElementSource, page_num: int) -> PageClassification:
         """Classify a single page based on its content."""
-        cursor = conn.cursor()
-
         # Get all text from the page
-        cursor.execute("""
-            SELECT GROUP_CONCAT(text, ' ') as all_text
-            FROM text_spans ts
-            JOIN pages p ON ts.page_id = p.id
-            WHERE p.page_number = ?
-        """, (page_num,))
-
-        row = cursor.fetchone()
-        text = row["all_text"] or "" if row else ""
+        return self.classify_page_text(page_num, source.page_text(page_num))
+
+    @classmethod
+    def classify_page_text(cls, page_num: int, text: str) -> PageClassification:
+        """Classify a page from its plain text using the keyword rules."""
         text_upper = text.upper()
 
         # Check for summary table (highest priority)
@@ -461,7 +739,7 @@ class CoreAnalysisExtractor:
             )
 
         # Check for plots
-        for keyword in self.PLOT_KEYWORDS:
+        for keyword in cls.PLOT_KEYWORDS:
             if keyword in text_upper:
                 return PageClassification(
                     page_number=page_num,
@@ -471,7 +749,7 @@ class CoreAnalysisExtractor:
                 )
 
         # Check for cover/TOC pages
-        for keyword in self.COVER_KEYWORDS:
+        for keyword in cls.COVER_KEYWORDS:
             if keyword in text_upper:
                 return PageClassification(
                     page_number=page_num,
@@ -481,7 +759,7 @@ class CoreAnalysisExtractor:
                 )
 
         # Check for other table indicators
-        table_score = sum(1 for kw in self.TABLE_KEYWORDS if kw.upper() in text_upper)
+        table_score = sum(1 for kw in cls.TABLE_KEYWORDS if kw.upper() in text_upper)
         if table_score >= 3:
             return PageClassification(
                 page_number=page_num,
@@ -515,34 +793,24 @@ class CoreAnalysisExtractor:
             reason="Unable to classify"
         )
 
-    def _extract_page_data(self, conn: sqlite3.Connection, page_num: int) -> list[CoreSample]:
+    def _extract_page_data(self, source: ElementSource, page_num: int) -> list[CoreSample]:
         """Extract core sample data from a table page."""
-        cursor = conn.cursor()
-
         # Get text blocks ordered by position
-        cursor.execute("""
-            SELECT full_text, x0, y0, x1, y1
-            FROM text_blocks tb
-            JOIN pages p ON tb.page_id = p.id
-            WHERE p.page_number = ?
-            ORDER BY y0, x0
-        """, (page_num,))
-
-        blocks = cursor.fetchall()
+        blocks = source.text_blocks(page_num)
 
         # Find the data block (largest block with numeric data)
         data_block = None
         for block in blocks:
-            text = block["full_text"]
+            text = block.full_text
             # Look for block with depth values (e.g., "9,580.50" or "9580.50")
             if re.search(r'\d{1,2},?\d{3}\.\d{2}', text):
-                if data_block is None or len(text) > len(data_block["full_text"]):
+                if data_block is None or len(text) > len(data_block.full_text):
                     data_block = block
 
         if not data_block:
             return []
 
-        return self._parse_data_block(data_block["full_text"], page_num)
+        return self._parse_data_block(data_block.full_text, page_num)
 
     def _parse_data_block(self, text: str, page_num: int) -> list[CoreSample]:
         """Parse the data block into CoreSample objects."""
@@ -760,12 +1028,7 @@ class CoreAnalysisExtractor:
         Raises:
             ValueError: If path is outside allowed directories
         """
-        abs_path = os.path.abspath(output_path)
-        for allowed_root in ALLOWED_OUTPUT_ROOTS:
-            allowed_abs = os.path.abspath(allowed_root)
-            if abs_path.startswith(allowed_abs):
-                return True
-        raise ValueError(f"Output path '{output_path}' outside allowed directories")
+        return validate_output_path(output_path)
 
     def get_classification_dict(self, result: ExtractionResult) -> dict[str, str]:
         """Get classification as a simple dictionary for the assignment."""
@@ -809,41 +1072,46 @@ class CoreAnalysisExtractor:
         else:
             display_headers = self.CANONICAL_HEADERS
 
-        # Helper to format and sanitize cell values
-        def format_value(val):
-            if val is None:
-                return ""
-            # ISSUE #4: Sanitize string values that may contain CSV injection chars
-            # This handles replicated merged indicators like +, **, <0.0001
-            if isinstance(val, str):
-                return sanitize_csv_value(val)
-            return val
-
         # Write with UTF-8 BOM for Excel compatibility
-        with open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
+        with self.profiler.stage("write_csv") as stage, \
+                open(output_path, 'w', newline='', encoding='utf-8-sig') as f:
             writer = csv.writer(f)
             writer.writerow(display_headers)
 
-            for sample in result.samples:
-                # Get values in the same order as headers
-                row = [
-                    sample.core_number,
-                    sample.sample_number,
-                    sample.depth_feet if sample.depth_feet is not None else "",
-                    format_value(sample.permeability_air_md),
-                    format_value(sample.permeability_klink_md),
-                    sample.porosity_ambient_pct if sample.porosity_ambient_pct is not None else "",
-                    sample.porosity_ncs_pct if sample.porosity_ncs_pct is not None else "",
-                    sample.grain_density_gcc if sample.grain_density_gcc is not None else "",
-                    format_value(sample.saturation_water_pct),
-                    format_value(sample.saturation_oil_pct),
-                    format_value(sample.saturation_total_pct),
-                    sample.page_number,
-                ]
-                writer.writerow(row)
+            writer.writerows(iter_csv_rows(result.samples))
+            stage.add_rows(len(result.samples))
 
         return str(output_path)
 
+    def save_columnar(
+        self,
+        result: ExtractionResult,
+        output_path: str,
+        fmt: str = "auto",
+    ) -> str:
+        """Save extracted samples to typed columnar Parquet or NPZ.
+
+        Measurements are written as float64 columns with a uint8 indicator
+        column each, so merged indicators (+, <0.0001, **) need no string
+        parsing downstream. See src.output.columnar for the indicator codes.
+
+        Args:
+            result: Extraction result containing samples.
+            output_path: Path to save to; the suffix is set from the format.
+            fmt: 'parquet', 'npz', or 'auto' (parquet when pyarrow is installed).
+
+        Returns:
+            Path to saved file.
+
+        Raises:
+            ValueError: If output_path is outside allowed directories.
+        """
+        self._validate_output_path(str(output_path))
+        with self.profiler.stage("write_columnar") as stage:
+            path = write_columnar(result.samples, output_path, fmt=fmt)
+            stage.add_rows(len(result.samples))
+        return path
+
     def save_classification(self, result: ExtractionResult, output_path: str) -> str:
         """Save page classification to JSON (Part 1 of assignment).
 
@@ -861,8 +1129,10 @@ class CoreAnalysisExtractor:
         # Output flat classification dict only (not nested)
         data = self.get_classification_dict(result)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with self.profiler.stage("write_classification") as stage, \
+                open(output_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2)
+            stage.add_rows(len(data))
 
         return str(output_path)
 
@@ -892,7 +1162,9 @@ class CoreAnalysisExtractor:
         self._validate_output_path(str(output_path))
 
         # Run header verification
-        verification = self.verify_headers_across_pages(table_pages)
+        with self.profiler.stage("verification") as stage:
+            verification = self.verify_headers_across_pages(table_pages)
+            stage.add_rows(len(verification['pages_checked']))
 
         # Format as human-readable report
         lines = [
@@ -937,8 +1209,10 @@ class CoreAnalysisExtractor:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with self.profiler.stage("write_header_verification") as stage, \
+                open(output_path, 'w', encoding='utf-8') as f:
             f.write("\n".join(lines))
+            stage.add_rows(len(lines))
 
         return str(output_path)
 
@@ -960,15 +1234,69 @@ class CoreAnalysisExtractor:
             "classification": self.get_classification_dict(result),
             "table_pages": result.table_pages,
             "sample_count": len(result.samples),
-            "samples": [s.to_dict() for s in result.samples],
+            "samples": as_sample_table(result.samples).to_dicts(),
             "warnings": result.warnings,
         }
 
-        with open(output_path, 'w', encoding='utf-8') as f:
+        with self.profiler.stage("write_json") as stage, \
+                open(output_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2)
+            stage.add_rows(len(result.samples))
+
+        return str(output_path)
+
+    def validate(self, result: ExtractionResult) -> ValidationReport:
+        """Run range, consistency and outlier rules over extracted samples.
+
+        See src.validation for the rules. Requires NumPy.
+        """
+        with self.profiler.stage("validation") as stage:
+            report = validate_samples(result.samples)
+            stage.add_rows(report.sample_count)
+        return report
+
+    def save_validation(self, report: ValidationReport, output_path: str) -> str:
+        """Save a validation report to JSON.
+
+        Raises:
+            ValueError: If output_path is outside allowed directories.
+        """
+        self._validate_output_path(str(output_path))
+
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2)
 
         return str(output_path)
 
+    def print_validation(self, report: ValidationReport):
+        """Print a validation summary."""
+        status = "PASSED" if report.passed else "FAILED"
+        print(f"\nValidation: {status} ({report.sample_count} samples, "
+              f"{report.violation_count} violations)")
+        for violation in report.violations:
+            examples = ", ".join(violation.samples[:5])
+            print(f"  - {violation.rule} [{violation.column}]: {violation.count} ({examples})")
+
+    def save_profile(self, output_path: str) -> str:
+        """Save the per-stage timing and memory report to JSON.
+
+        Stops the profiler, so the reported total covers the run up to
+        this call.
+
+        Raises:
+            ValueError: If output_path is outside allowed directories, or
+                        the extractor was created without a StageProfiler.
+        """
+        self._validate_output_path(str(output_path))
+        if not self.profiler.enabled:
+            raise ValueError("Profiling is not enabled for this extractor")
+
+        self.profiler.stop()
+        return self.profiler.save(output_path)
+
     def print_summary(self, result: ExtractionResult):
         """Print extraction summary."""
         print("\n" + "=" * 60)
@@ -987,8 +1315,9 @@ class CoreAnalysisExtractor:
         print(f"\nTable pages: {result.table_pages}")
         print(f"Samples extracted: {len(result.samples)}")
 
-        if result.samples:
-            print(f"\nSample depth range: {min(s.depth_feet for s in result.samples if s.depth_feet):.2f} - {max(s.depth_feet for s in result.samples if s.depth_feet):.2f} feet")
+        depth_range = as_sample_table(result.samples).depth_range()
+        if depth_range:
+            print(f"\nSample depth range: {depth_range[0]:.2f} - {depth_range[1]:.2f} feet")
 
         if result.warnings:
             print(f"\nWarnings ({len(result.warnings)}):")
@@ -1005,7 +1334,17 @@ def main():
     parser = argparse.ArgumentParser(
         description="Extract Core Analysis data from parsed PDF database"
     )
-    parser.add_argument("database", help="Path to the SQLite database from elementizer")
+    parser.add_argument(
+        "database",
+        nargs="?",
+        help="Path to the SQLite database (or .jsonl page dump) from elementizer, "
+             "or a directory/glob of databases to extract in batch mode"
+    )
+    parser.add_argument(
+        "--pdf",
+        default=None,
+        help="Extract straight from a PDF in memory, without an elements database"
+    )
     parser.add_argument(
         "--output", "-o",
         default="data/output",
@@ -1026,18 +1365,96 @@ def main():
         action="store_true",
         help="Use original PDF headers instead of canonical names"
     )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="With --pdf: classify pages from plain text first, then fully "
+             "extract only pages of --page-types"
+    )
+    parser.add_argument(
+        "--page-types",
+        default=",".join(DEFAULT_LAZY_PAGE_TYPES),
+        help="Comma-separated page types to fully extract in --lazy mode (default: table)"
+    )
+    parser.add_argument(
+        "--columnar",
+        choices=["auto", "parquet", "npz"],
+        default=None,
+        help="Also write typed columnar output (auto: Parquet if pyarrow is installed, else NPZ)"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=None,
+        help="Worker processes for batch mode (default: CPU count)"
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Check samples with range, consistency and outlier rules and "
+             "write validation_report.json (requires NumPy)"
+    )
+    parser.add_argument(
+        "--template-match",
+        action="store_true",
+        help="Label pages whose layout matches an already classified page "
+             "(in this or an earlier document of the run) without the keyword rules"
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="OUT_JSON",
+        default=None,
+        help="Write per-stage wall time, row counts and peak memory to this JSON file"
+    )
 
     args = parser.parse_args()
+    if (args.database is None) == (args.pdf is None):
+        parser.error("provide either a database or --pdf")
+    if args.lazy and not args.pdf:
+        parser.error("--lazy requires --pdf")
+
+    from .batch import is_batch_target
+    if args.database and is_batch_target(args.database):
+        if args.profile:
+            parser.error("--profile is only supported for a single database")
+        _run_batch_cli(args)
+        return
 
-    extractor = CoreAnalysisExtractor(args.database)
+    profiler = None
+    if args.profile:
+        # Fail before extraction rather than after it
+        validate_output_path(args.profile)
+        profiler = StageProfiler()
+    layout_index = TEMPLATE_INDEX if args.template_match else None
+    if args.pdf:
+        page_types = tuple(t.strip() for t in args.page_types.split(",") if t.strip())
+        extractor = CoreAnalysisExtractor.from_pdf(
+            args.pdf, lazy=args.lazy, page_types=page_types, profiler=profiler,
+            layout_index=layout_index,
+        )
+    elif Path(args.database).suffix.lower() in JSONL_SUFFIXES:
+        source = open_element_source(args.database)
+        extractor = CoreAnalysisExtractor(source=source, profiler=profiler, layout_index=layout_index)
+    else:
+        extractor = CoreAnalysisExtractor(args.database, profiler=profiler, layout_index=layout_index)
     result = extractor.extract()
 
     if args.json_output:
+        if args.profile:
+            extractor.save_profile(args.profile)
         print(json.dumps(extractor.get_classification_dict(result), indent=2))
         return
 
     extractor.print_summary(result)
 
+    validation_path = None
+    if args.validate:
+        report = extractor.validate(result)
+        extractor.print_validation(report)
+        validation_path = extractor.save_validation(
+            report, f"{args.output}/validation_report.json"
+        )
+
     if not args.classify_only:
         # LLD-015: New output filenames matching assignment terminology
         csv_path = extractor.save_csv(
@@ -1054,11 +1471,70 @@ def main():
             f"{args.output}/header_verification.txt",
             table_pages=result.table_pages,
         )
+        columnar_path = None
+        if args.columnar:
+            columnar_path = extractor.save_columnar(
+                result,
+                f"{args.output}/full_table_extraction",
+                fmt=args.columnar,
+            )
 
         print(f"\nOutput files:")
         print(f"  Page Classification (Part 1): {classification_path}")
         print(f"  Full Table Extraction (Part 2): {csv_path}")
         print(f"  Header Verification: {verification_path}")
+        if columnar_path:
+            print(f"  Columnar Extraction: {columnar_path}")
+        if validation_path:
+            print(f"  Validation Report: {validation_path}")
+
+    if args.profile:
+        profile_path = extractor.save_profile(args.profile)
+        print(f"\nStage profile: {profile_path}")
+
+
+def _run_batch_cli(args):
+    """Run batch mode over a directory or glob of databases."""
+    from .batch import (
+        BATCH_SUMMARY_NAME,
+        discover_databases,
+        get_batch_summary,
+        print_batch_summary,
+        run_batch,
+        save_batch_summary,
+    )
+
+    databases = discover_databases(args.database)
+    if not databases:
+        print(f"No databases found: {args.database}")
+        return
+
+    batch = run_batch(
+        databases,
+        args.output,
+        workers=args.workers,
+        use_original_headers=args.original_headers,
+        classify_only=args.classify_only,
+        columnar=args.columnar,
+        validate=args.validate,
+        template_match=args.template_match,
+    )
+    summary_path = save_batch_summary(batch, f"{args.output}/{BATCH_SUMMARY_NAME}")
+
+    if args.json_output:
+        print(json.dumps(get_batch_summary(batch), indent=2))
+        return
+
+    print_batch_summary(batch)
+
+    print(f"\nOutput files:")
+    if batch.consolidated_csv:
+        print(f"  Consolidated Extraction: {batch.consolidated_csv}")
+    if batch.consolidated_columnar:
+        print(f"  Consolidated Columnar: {batch.consolidated_columnar}")
+    if batch.validation_report:
+        print(f"  Validation Report: {batch.validation_report}")
+    print(f"  Batch Summary: {summary_path}")
 
 
 if __name__ == "__main__":
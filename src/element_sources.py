@@ -0,0 +1,346 @@
+"""Element sources feeding CoreAnalysisExtractor.
+
+CoreAnalysisExtractor only needs page numbers, page text, text blocks and
+the spans inside the header band. An ElementSource provides those from:
+
+- SQLiteElementSource: an elementizer database (``*_elements.db``)
+- JSONLElementSource: a page dump with one PageElements dict per line
+  (``elementizer extract --jsonl``)
+- InMemoryElementSource: a DocumentElements tree, e.g. produced directly
+  from a PDF by PDFElementExtractor without writing a database
+- LazyPDFElementSource: plain text for every page plus full elements for
+  only the pages a selector picks from that text (two-phase extraction)
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple, Optional
+
+# Suffixes recognized by open_element_source
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+JSONL_SUFFIXES = (".jsonl",)
+PDF_SUFFIXES = (".pdf",)
+
+
+class BlockRow(NamedTuple):
+    """A text block's full text and bounding box."""
+    full_text: str
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+
+
+class SpanRow(NamedTuple):
+    """A text span's horizontal extent, top edge and raw text."""
+    x0: float
+    x1: float
+    y0: float
+    text: str
+
+
+class ElementSource:
+    """Read-only access to the page text elements of one document.
+
+    Subclasses implement the four query methods. Sources are context
+    managers; closing releases any connection or file handle.
+    """
+
+    name: str = ""
+
+    def page_numbers(self) -> list[int]:
+        """All page numbers in ascending order."""
+        raise NotImplementedError
+
+    def page_text(self, page_num: int) -> str:
+        """All span text on a page joined with spaces ('' if none)."""
+        raise NotImplementedError
+
+    def text_blocks(self, page_num: int) -> list[BlockRow]:
+        """Text blocks on a page ordered by (y0, x0)."""
+        raise NotImplementedError
+
+    def spans_in_band(self, page_num: int, y_min: float, y_max: float) -> list[SpanRow]:
+        """Spans with y_min <= y0 <= y_max on a page, ordered by (y0, x0)."""
+        raise NotImplementedError
+
+    def page_layouts(self) -> dict[int, int]:
+        """Layout fingerprints (see elementizer.layout_index) by page number.
+
+        Pages without a fingerprint are left out; sources that keep no
+        layout return an empty dict.
+        """
+        return {}
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class SQLiteElementSource(ElementSource):
+    """Element source backed by an elementizer SQLite database."""
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Database not found: {db_path}")
+        self.name = self.db_path.stem
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.row_factory = sqlite3.Row
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def page_numbers(self) -> list[int]:
+        cursor = self.conn.execute("SELECT page_number FROM pages ORDER BY page_number")
+        return [row["page_number"] for row in cursor.fetchall()]
+
+    def page_text(self, page_num: int) -> str:
+        cursor = self.conn.execute("""
+            SELECT GROUP_CONCAT(text, ' ') as all_text
+            FROM text_spans ts
+            JOIN pages p ON ts.page_id = p.id
+            WHERE p.page_number = ?
+        """, (page_num,))
+        row = cursor.fetchone()
+        return row["all_text"] or "" if row else ""
+
+    def text_blocks(self, page_num: int) -> list[BlockRow]:
+        cursor = self.conn.execute("""
+            SELECT full_text, x0, y0, x1, y1
+            FROM text_blocks tb
+            JOIN pages p ON tb.page_id = p.id
+            WHERE p.page_number = ?
+            ORDER BY y0, x0
+        """, (page_num,))
+        return [BlockRow(*row) for row in cursor.fetchall()]
+
+    def spans_in_band(self, page_num: int, y_min: float, y_max: float) -> list[SpanRow]:
+        cursor = self.conn.execute("""
+            SELECT ts.x0, ts.x1, ts.y0, ts.text
+            FROM text_spans ts
+            JOIN pages p ON ts.page_id = p.id
+            WHERE p.page_number = ? AND ts.y0 >= ? AND ts.y0 <= ?
+            ORDER BY ts.y0, ts.x0
+        """, (page_num, y_min, y_max))
+        return [SpanRow(*row) for row in cursor.fetchall()]
+
+    def page_layouts(self) -> dict[int, int]:
+        from .elementizer.database import read_page_layouts
+
+        page_numbers = dict(self.conn.execute("SELECT id, page_number FROM pages").fetchall())
+        return {
+            page_numbers[page_id]: fingerprint
+            for page_id, fingerprint in read_page_layouts(self.conn).items()
+        }
+
+
+class _PageText:
+    """Text elements of one page, kept in extraction order."""
+
+    __slots__ = ("blocks", "spans")
+
+    def __init__(self):
+        self.blocks: list[BlockRow] = []
+        self.spans: list[tuple[float, float, float, float, str]] = []  # x0, y0, x1, y1, text
+
+
+class _IndexedElementSource(ElementSource):
+    """Element source answering queries from per-page text held in memory."""
+
+    def __init__(self, pages: dict[int, _PageText], name: str = ""):
+        self._pages = pages
+        self._layouts: dict[int, int] = {}
+        self.name = name
+
+    def page_numbers(self) -> list[int]:
+        return sorted(self._pages)
+
+    def page_text(self, page_num: int) -> str:
+        page = self._pages.get(page_num)
+        return " ".join(span[4] for span in page.spans) if page else ""
+
+    def text_blocks(self, page_num: int) -> list[BlockRow]:
+        page = self._pages.get(page_num)
+        return sorted(page.blocks, key=lambda b: (b.y0, b.x0)) if page else []
+
+    def spans_in_band(self, page_num: int, y_min: float, y_max: float) -> list[SpanRow]:
+        page = self._pages.get(page_num)
+        if not page:
+            return []
+        band = [
+            SpanRow(x0, x1, y0, text)
+            for x0, y0, x1, _y1, text in page.spans
+            if y_min <= y0 <= y_max
+        ]
+        band.sort(key=lambda s: (s.y0, s.x0))
+        return band
+
+    def page_layouts(self) -> dict[int, int]:
+        return dict(self._layouts)
+
+
+class InMemoryElementSource(_IndexedElementSource):
+    """Element source over a DocumentElements tree.
+
+    Args:
+        doc_elements: Extracted document.
+        layouts: Also fingerprint each page's layout for page_layouts().
+    """
+
+    def __init__(self, doc_elements, layouts: bool = False):
+        pages = {}
+        for page in doc_elements.pages:
+            page_text = pages[page.page_number] = _PageText()
+            for block in page.text_blocks:
+                bbox = block.bbox
+                page_text.blocks.append(BlockRow(block.text, bbox.x0, bbox.y0, bbox.x1, bbox.y1))
+                for line in block.lines:
+                    for span in line.spans:
+                        b = span.bbox
+                        page_text.spans.append((b.x0, b.y0, b.x1, b.y1, span.text))
+        super().__init__(pages, name=Path(doc_elements.file_path).stem)
+        if layouts:
+            from .elementizer.layout_index import page_elements_fingerprint
+
+            self._layouts = {page.page_number: page_elements_fingerprint(page) for page in doc_elements.pages}
+
+    @classmethod
+    def from_pdf(cls, pdf_path: str, layouts: bool = False) -> "InMemoryElementSource":
+        """Extract text elements from a PDF without writing a database.
+
+        Images and vector drawings are skipped; only text is needed. So
+        layout fingerprints (layouts=True) cover text alone and differ
+        from those of the same pages in an elements database.
+        """
+        from .elementizer.extractor import PDFElementExtractor
+
+        with PDFElementExtractor(pdf_path) as extractor:
+            doc_elements = extractor.extract_all(extract_images=False, extract_drawings=False)
+        return cls(doc_elements, layouts=layouts)
+
+
+class LazyPDFElementSource(InMemoryElementSource):
+    """Two-phase PDF source: cheap text for all pages, elements for a few.
+
+    Phase one reads only the plain text of each page. A selector picks
+    pages from that text (e.g. pages classified as tables) and phase two
+    extracts full text structure for those pages alone. page_text() serves
+    phase-one text for every page, so classification sees all pages;
+    text_blocks() and spans_in_band() are empty for unselected pages.
+    """
+
+    def __init__(self, page_texts: dict[int, str], doc_elements):
+        super().__init__(doc_elements)
+        self._page_texts = page_texts
+        self.extracted_pages = sorted(self._pages)
+
+    def page_numbers(self) -> list[int]:
+        return sorted(self._page_texts)
+
+    def page_text(self, page_num: int) -> str:
+        return self._page_texts.get(page_num, "")
+
+    @classmethod
+    def from_pdf(
+        cls,
+        pdf_path: str,
+        select_pages: Callable[[dict[int, str]], Iterable[int]],
+        extract_images: bool = False,
+        extract_drawings: bool = False,
+        profiler=None,
+    ) -> "LazyPDFElementSource":
+        """Run both phases against a PDF.
+
+        Args:
+            pdf_path: PDF to read.
+            select_pages: Called with {page_number: text}; returns the page
+                          numbers to extract fully.
+            extract_images: Extract images on selected pages.
+            extract_drawings: Extract vector drawings on selected pages.
+            profiler: Optional StageProfiler recording both phases.
+        """
+        from .elementizer.extractor import PDFElementExtractor
+        from .profiling import NULL_PROFILER
+
+        profiler = profiler or NULL_PROFILER
+        with PDFElementExtractor(pdf_path) as extractor:
+            with profiler.stage("pdf_text") as stage:
+                # Whitespace-normalized, like spans joined with single spaces
+                page_texts = {
+                    page_num: " ".join(text.split())
+                    for page_num, text in extractor.extract_page_texts().items()
+                }
+                stage.add_rows(len(page_texts))
+            selected = list(select_pages(page_texts))
+            with profiler.stage("pdf_elements") as stage:
+                doc_elements = extractor.extract_pages(
+                    selected,
+                    extract_images=extract_images,
+                    extract_drawings=extract_drawings,
+                )
+                stage.add_rows(len(doc_elements.pages))
+        return cls(page_texts, doc_elements)
+
+
+class JSONLElementSource(_IndexedElementSource):
+    """Element source over a JSONL page dump.
+
+    Each line is a ``PageElements.to_dict()`` object. Only text blocks and
+    their spans are read; other element types are ignored.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        if not self.path.exists():
+            raise FileNotFoundError(f"Page dump not found: {path}")
+        with open(self.path, encoding="utf-8") as f:
+            pages = self._index_pages(json.loads(line) for line in f if line.strip())
+        super().__init__(pages, name=self.path.stem)
+
+    @staticmethod
+    def _index_pages(page_dicts: Iterable[dict]) -> dict[int, _PageText]:
+        pages = {}
+        for page in page_dicts:
+            page_text = pages[page["page_number"]] = _PageText()
+            for block in page.get("text_blocks", []):
+                bbox = block["bbox"]
+                page_text.blocks.append(
+                    BlockRow(block["text"], bbox["x0"], bbox["y0"], bbox["x1"], bbox["y1"])
+                )
+                for line in block.get("lines", []):
+                    for span in line.get("spans", []):
+                        b = span["bbox"]
+                        page_text.spans.append((b["x0"], b["y0"], b["x1"], b["y1"], span["text"]))
+        return pages
+
+
+def open_element_source(path: str) -> ElementSource:
+    """Open an element source chosen by file suffix (.db, .jsonl or .pdf).
+
+    Raises:
+        ValueError: If the suffix is not recognized.
+        FileNotFoundError: If the file does not exist.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in SQLITE_SUFFIXES:
+        return SQLiteElementSource(path)
+    if suffix in JSONL_SUFFIXES:
+        return JSONLElementSource(path)
+    if suffix in PDF_SUFFIXES:
+        return InMemoryElementSource.from_pdf(path)
+    raise ValueError(f"Unrecognized element source '{path}', expected .db, .jsonl or .pdf")
@@ -5,8 +5,131 @@ import sqlite3
 from pathlib import Path
 from typing import Optional
 
+from .layout_index import (
+    LSH_BANDS,
+    MAX_TEMPLATE_DISTANCE,
+    box_token,
+    from_sqlite_int,
+    hamming_distance,
+    lsh_bands,
+    page_elements_fingerprint,
+    simhash,
+    span_token,
+    to_sqlite_int,
+)
 from .models import DocumentElements, PageElements
 
+# Element tables counted in document_stats
+STAT_TABLES = ("text_blocks", "text_spans", "images", "lines", "rects", "paths")
+
+# Per-document element counts, computed from the element tables. Used to
+# backfill document_stats for databases written before it existed.
+DOCUMENT_STATS_SQL = """
+    SELECT p.document_id AS document_id,
+           COUNT(*) AS pages,
+""" + ",\n".join(
+    f"           TOTAL((SELECT COUNT(*) FROM {table} WHERE page_id = p.id)) AS {table}"
+    for table in STAT_TABLES
+) + """
+    FROM pages p
+    {where}
+    GROUP BY p.document_id
+"""
+
+
+def compute_document_stats(
+    conn: sqlite3.Connection, document_id: Optional[int] = None
+) -> dict[int, dict]:
+    """Count pages and elements per document from the element tables.
+
+    Returns:
+        document_id -> {"pages": n, "text_blocks": n, ...}
+    """
+    where, params = ("WHERE p.document_id = ?", (document_id,)) if document_id else ("", ())
+    stats = {}
+    for row in conn.execute(DOCUMENT_STATS_SQL.format(where=where), params):
+        doc_id, *counts = row
+        stats[doc_id] = dict(zip(("pages",) + STAT_TABLES, (int(c) for c in counts)))
+    return stats
+
+
+def read_document_stats(
+    conn: sqlite3.Connection, document_id: Optional[int] = None
+) -> dict[int, dict]:
+    """Precomputed document_stats rows, computing any that are missing.
+
+    Works read-only on databases without the document_stats table.
+    """
+    columns = ", ".join(("document_id", "pages") + STAT_TABLES)
+    sql = f"SELECT {columns} FROM document_stats"
+    params: tuple = ()
+    if document_id:
+        sql += " WHERE document_id = ?"
+        params = (document_id,)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    except sqlite3.OperationalError:
+        rows = []
+    stats = {row[0]: dict(zip(("pages",) + STAT_TABLES, row[1:])) for row in rows}
+
+    if document_id:
+        expected = {document_id}
+    else:
+        expected = {row[0] for row in conn.execute("SELECT id FROM documents")}
+    if expected - set(stats):
+        computed = compute_document_stats(conn, document_id)
+        empty = dict.fromkeys(("pages",) + STAT_TABLES, 0)
+        for doc_id in expected - set(stats):
+            stats[doc_id] = computed.get(doc_id, dict(empty))
+    return stats
+
+
+# Layout tokens of a page rebuilt from its stored elements, matching
+# page_elements_fingerprint at ingest
+PAGE_LAYOUT_QUERIES = (
+    ("SELECT x0, font_name, font_size FROM text_spans WHERE page_id = ?", span_token),
+    ("SELECT start_x, start_y, end_x, end_y FROM lines WHERE page_id = ?", lambda *r: box_token("l", *r)),
+    ("SELECT x0, y0, x1, y1 FROM rects WHERE page_id = ?", lambda *r: box_token("r", *r)),
+    ("SELECT x0, y0, x1, y1 FROM paths WHERE page_id = ?", lambda *r: box_token("p", *r)),
+    ("SELECT x0, y0, x1, y1 FROM images WHERE page_id = ?", lambda *r: box_token("i", *r)),
+)
+
+
+def compute_page_layout(conn: sqlite3.Connection, page_id: int) -> int:
+    """Layout fingerprint of a stored page, from its element rows."""
+    return simhash(
+        make_token(*row)
+        for sql, make_token in PAGE_LAYOUT_QUERIES
+        for row in conn.execute(sql, (page_id,))
+    )
+
+
+def read_page_layouts(
+    conn: sqlite3.Connection, document_id: Optional[int] = None
+) -> dict[int, int]:
+    """Stored layout fingerprints by page id, computing any that are missing.
+
+    Works read-only on databases without the page_layouts table.
+    """
+    where, params = ("WHERE p.document_id = ?", (document_id,)) if document_id else ("", ())
+    try:
+        rows = conn.execute(
+            f"SELECT p.id, l.fingerprint FROM pages p "
+            f"LEFT JOIN page_layouts l ON l.page_id = p.id {where}",
+            params,
+        ).fetchall()
+    except sqlite3.OperationalError:
+        rows = conn.execute(f"SELECT p.id, NULL FROM pages p {where}", params).fetchall()
+    return {
+        page_id: compute_page_layout(conn, page_id) if value is None else from_sqlite_int(value)
+        for page_id, value in rows
+    }
+
+
+def page_layout_row(page_id: int, fingerprint: int) -> tuple:
+    """A page_layouts row: page id, fingerprint and its LSH bands."""
+    return (page_id, to_sqlite_int(fingerprint), *lsh_bands(fingerprint))
+
 
 class ElementDatabase:
     """SQLite storage for extracted PDF elements."""
@@ -120,14 +243,45 @@ class ElementDatabase:
         FOREIGN KEY (page_id) REFERENCES pages(id)
     );
 
+    -- Per-document counts, written with the document so listing many
+    -- documents does not count element rows
+    CREATE TABLE IF NOT EXISTS document_stats (
+        document_id INTEGER PRIMARY KEY,
+        pages INTEGER,
+        text_blocks INTEGER,
+        text_spans INTEGER,
+        images INTEGER,
+        lines INTEGER,
+        rects INTEGER,
+        paths INTEGER,
+        FOREIGN KEY (document_id) REFERENCES documents(id)
+    );
+
+    -- Layout fingerprints (SimHash, see layout_index) for template
+    -- matching; band0-3 are its LSH bands, indexed for similarity lookups
+    CREATE TABLE IF NOT EXISTS page_layouts (
+        page_id INTEGER PRIMARY KEY,
+        fingerprint INTEGER NOT NULL,
+        band0 INTEGER, band1 INTEGER, band2 INTEGER, band3 INTEGER,
+        FOREIGN KEY (page_id) REFERENCES pages(id)
+    );
+
     -- Indexes for common queries
     CREATE INDEX IF NOT EXISTS idx_pages_document ON pages(document_id);
+    -- Per-document page lookups and (page_number, id) keyset pagination
+    -- use the UNIQUE(document_id, page_number) index, whose entries end
+    -- in the row id; a page_number-only index served neither
+    DROP INDEX IF EXISTS idx_pages_number;
     CREATE INDEX IF NOT EXISTS idx_text_blocks_page ON text_blocks(page_id);
     CREATE INDEX IF NOT EXISTS idx_text_spans_page ON text_spans(page_id);
     CREATE INDEX IF NOT EXISTS idx_images_page ON images(page_id);
     CREATE INDEX IF NOT EXISTS idx_lines_page ON lines(page_id);
     CREATE INDEX IF NOT EXISTS idx_rects_page ON rects(page_id);
     CREATE INDEX IF NOT EXISTS idx_paths_page ON paths(page_id);
+    CREATE INDEX IF NOT EXISTS idx_page_layouts_band0 ON page_layouts(band0);
+    CREATE INDEX IF NOT EXISTS idx_page_layouts_band1 ON page_layouts(band1);
+    CREATE INDEX IF NOT EXISTS idx_page_layouts_band2 ON page_layouts(band2);
+    CREATE INDEX IF NOT EXISTS idx_page_layouts_band3 ON page_layouts(band3);
     """
 
     def __init__(self, db_path: str):
@@ -178,6 +332,22 @@ class ElementDatabase:
         for page_elements in doc_elements.pages:
             page_id = self._store_page(cursor, document_id, page_elements, store_image_data)
 
+        pages = doc_elements.pages
+        cursor.execute("""
+            INSERT INTO document_stats (
+                document_id, pages, text_blocks, text_spans, images, lines, rects, paths
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            document_id,
+            len(pages),
+            sum(len(p.text_blocks) for p in pages),
+            sum(len(line.spans) for p in pages for b in p.text_blocks for line in b.lines),
+            sum(len(p.images) for p in pages),
+            sum(len(p.lines) for p in pages),
+            sum(len(p.rects) for p in pages),
+            sum(len(p.paths) for p in pages),
+        ))
+
         self._conn.commit()
         return document_id
 
@@ -196,6 +366,12 @@ class ElementDatabase:
         """, (document_id, page.page_number, page.width, page.height, page.rotation))
         page_id = cursor.lastrowid
 
+        cursor.execute(
+            "INSERT INTO page_layouts (page_id, fingerprint, band0, band1, band2, band3) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            page_layout_row(page_id, page_elements_fingerprint(page)),
+        )
+
         # Insert text blocks
         for block_idx, block in enumerate(page.text_blocks):
             cursor.execute("""
@@ -283,6 +459,79 @@ class ElementDatabase:
 
         return page_id
 
+    def list_documents(self) -> list[dict]:
+        """All documents with their stats, backfilling missing stats rows."""
+        stats = read_document_stats(self._conn)
+        missing = [
+            doc_id for (doc_id,) in self._conn.execute(
+                "SELECT d.id FROM documents d LEFT JOIN document_stats s "
+                "ON s.document_id = d.id WHERE s.document_id IS NULL"
+            )
+        ]
+        if missing:
+            columns = ("pages",) + STAT_TABLES
+            self._conn.executemany(
+                f"INSERT INTO document_stats (document_id, {', '.join(columns)}) "
+                f"VALUES (?, {', '.join('?' for _ in columns)})",
+                [(doc_id, *(stats[doc_id][c] for c in columns)) for doc_id in missing],
+            )
+            self._conn.commit()
+
+        rows = self._conn.execute(
+            "SELECT id, file_path, title, page_count FROM documents ORDER BY id"
+        ).fetchall()
+        return [{**dict(row), **stats[row["id"]]} for row in rows]
+
+    def find_similar_pages(
+        self,
+        fingerprint: int,
+        max_distance: int = MAX_TEMPLATE_DISTANCE,
+        document_id: Optional[int] = None,
+    ) -> list[dict]:
+        """Pages of every document laid out like a fingerprint, nearest first.
+
+        Candidates come from the LSH band indexes, so only pages sharing a
+        band are compared. Layouts of pages stored before page_layouts
+        existed are backfilled first.
+
+        Returns:
+            [{"document_id", "page_number", "distance"}, ...]
+        """
+        self._backfill_page_layouts()
+        bands = lsh_bands(fingerprint)
+        sql = f"""
+            SELECT p.document_id, p.page_number, l.fingerprint
+            FROM page_layouts l JOIN pages p ON l.page_id = p.id
+            WHERE ({" OR ".join(f"l.band{i} = ?" for i in range(LSH_BANDS))})
+        """
+        params = list(bands)
+        if document_id:
+            sql += " AND p.document_id = ?"
+            params.append(document_id)
+
+        matches = []
+        for doc_id, page_number, value in self._conn.execute(sql, params):
+            distance = hamming_distance(fingerprint, from_sqlite_int(value))
+            if distance <= max_distance:
+                matches.append({"document_id": doc_id, "page_number": page_number, "distance": distance})
+        matches.sort(key=lambda m: (m["distance"], m["document_id"], m["page_number"]))
+        return matches
+
+    def _backfill_page_layouts(self):
+        missing = [
+            page_id for (page_id,) in self._conn.execute(
+                "SELECT p.id FROM pages p LEFT JOIN page_layouts l "
+                "ON l.page_id = p.id WHERE l.page_id IS NULL"
+            )
+        ]
+        if missing:
+            self._conn.executemany(
+                "INSERT INTO page_layouts (page_id, fingerprint, band0, band1, band2, band3) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [page_layout_row(page_id, compute_page_layout(self._conn, page_id)) for page_id in missing],
+            )
+            self._conn.commit()
+
     def get_stats(self) -> dict:
         """Get database statistics."""
         cursor = self._conn.cursor()
@@ -326,10 +575,10 @@ class ElementDatabase:
         cursor.execute("""
             SELECT * FROM pages WHERE document_id = ? AND page_number = ?
         """, (document_id, page_number))
-        page = dict(cursor.fetchone()) if cursor.fetchone() else None
-
-        if not page:
+        row = cursor.fetchone()
+        if not row:
             return {}
+        page = dict(row)
 
         page_id = page["id"]
 
@@ -1,6 +1,7 @@
 """PDF element extraction using PyMuPDF."""
 
 import os
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 
@@ -18,6 +19,11 @@ from .models import (
     TextLine,
     TextSpan,
 )
+from .page_interpretation import PageInterpretation
+
+# Bytes of extracted images kept for reuse by later placements of the
+# same xref, such as a logo on every page
+MAX_IMAGE_CACHE_BYTES = 64 * 1024 * 1024
 
 
 class PDFElementExtractor:
@@ -33,6 +39,11 @@ class PDFElementExtractor:
             self.image_output_dir.mkdir(parents=True, exist_ok=True)
 
         self._doc: Optional[fitz.Document] = None
+        # xref -> image digest, shared by every page's interpretation
+        self._image_digests: dict[int, bytes] = {}
+        # xref -> extract_image result, least recently used first
+        self._images: OrderedDict[int, dict] = OrderedDict()
+        self._image_bytes = 0
 
     def __enter__(self):
         self._doc = fitz.open(self.file_path)
@@ -42,8 +53,15 @@ class PDFElementExtractor:
         if self._doc:
             self._doc.close()
 
-    def extract_all(self, extract_images: bool = True) -> DocumentElements:
-        """Extract all elements from the PDF."""
+    def extract_all(
+        self, extract_images: bool = True, extract_drawings: bool = True
+    ) -> DocumentElements:
+        """Extract all elements from the PDF.
+
+        Args:
+            extract_images: Extract embedded images.
+            extract_drawings: Extract vector lines, rects and paths.
+        """
         if not self._doc:
             raise RuntimeError("Must use as context manager")
 
@@ -54,11 +72,57 @@ class PDFElementExtractor:
         )
 
         for page_num in range(len(self._doc)):
-            page_elements = self._extract_page(page_num, extract_images)
+            page_elements = self._extract_page(page_num, extract_images, extract_drawings)
             doc_elements.pages.append(page_elements)
 
         return doc_elements
 
+    def extract_page_texts(self) -> dict[int, str]:
+        """Extract plain text of every page, keyed by 1-based page number.
+
+        Much cheaper than extract_all: no span structure, images or
+        drawings. Useful for classifying pages before a full extraction.
+        """
+        if not self._doc:
+            raise RuntimeError("Must use as context manager")
+
+        return {
+            page_num + 1: self._doc[page_num].get_text("text")
+            for page_num in range(len(self._doc))
+        }
+
+    def extract_pages(
+        self,
+        page_numbers,
+        extract_images: bool = True,
+        extract_drawings: bool = True,
+    ) -> DocumentElements:
+        """Extract all elements from selected pages only.
+
+        Args:
+            page_numbers: 1-based page numbers to extract; out-of-range
+                          numbers are ignored.
+
+        Returns:
+            DocumentElements whose pages hold only the selected pages.
+        """
+        if not self._doc:
+            raise RuntimeError("Must use as context manager")
+
+        doc_elements = DocumentElements(
+            file_path=str(self.file_path),
+            page_count=len(self._doc),
+            metadata=self._extract_metadata(),
+        )
+
+        for page_number in sorted(set(page_numbers)):
+            if 1 <= page_number <= len(self._doc):
+                doc_elements.pages.append(
+                    self._extract_page(page_number - 1, extract_images, extract_drawings)
+                )
+
+        return doc_elements
+
     def _extract_metadata(self) -> dict:
         """Extract document metadata."""
         meta = self._doc.metadata or {}
@@ -75,7 +139,9 @@ class PDFElementExtractor:
             "encryption": meta.get("encryption"),
         }
 
-    def _extract_page(self, page_num: int, extract_images: bool) -> PageElements:
+    def _extract_page(
+        self, page_num: int, extract_images: bool, extract_drawings: bool = True
+    ) -> PageElements:
         """Extract all elements from a single page."""
         page = self._doc[page_num]
         rect = page.rect
@@ -87,22 +153,26 @@ class PDFElementExtractor:
             rotation=page.rotation,
         )
 
+        # Each kind of content is interpreted once and shared
+        interp = PageInterpretation(page, image_digests=self._image_digests)
+
         # Extract text with full structure
-        self._extract_text_blocks(page, page_elements)
+        self._extract_text_blocks(interp, page_elements)
 
         # Extract images
         if extract_images:
-            self._extract_images(page, page_elements)
+            self._extract_images(interp, page_elements)
 
         # Extract vector graphics (lines, rects, paths)
-        self._extract_drawings(page, page_elements)
+        if extract_drawings:
+            self._extract_drawings(interp, page_elements)
 
         return page_elements
 
-    def _extract_text_blocks(self, page: fitz.Page, page_elements: PageElements):
+    def _extract_text_blocks(self, interp: PageInterpretation, page_elements: PageElements):
         """Extract text blocks with full span/line structure."""
         try:
-            text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+            text_dict = interp.text_dict()
 
             for block in text_dict.get("blocks", []):
                 if block.get("type") != 0:  # Skip non-text blocks
@@ -141,10 +211,10 @@ class PDFElementExtractor:
             # Log but continue
             pass
 
-    def _extract_images(self, page: fitz.Page, page_elements: PageElements):
+    def _extract_images(self, interp: PageInterpretation, page_elements: PageElements):
         """Extract images from the page."""
         try:
-            image_list = page.get_images(full=True)
+            image_list = interp.images()
 
             for img_index, img in enumerate(image_list):
                 try:
@@ -152,13 +222,16 @@ class PDFElementExtractor:
 
                     # Get image bounding box on page
                     try:
-                        img_rect = page.get_image_bbox(xref)
-                        bbox = BoundingBox(img_rect.x0, img_rect.y0, img_rect.x1, img_rect.y1)
+                        img_rect = interp.image_bbox(xref)
                     except Exception:
+                        img_rect = None
+                    if img_rect is not None:
+                        bbox = BoundingBox(img_rect.x0, img_rect.y0, img_rect.x1, img_rect.y1)
+                    else:
                         bbox = BoundingBox(0, 0, 0, 0)
 
                     # Extract image data
-                    base_image = self._doc.extract_image(xref)
+                    base_image = self._extract_image(xref)
                     if not base_image:
                         continue
 
@@ -191,10 +264,27 @@ class PDFElementExtractor:
         except Exception:
             pass
 
-    def _extract_drawings(self, page: fitz.Page, page_elements: PageElements):
+    def _extract_image(self, xref: int) -> Optional[dict]:
+        """doc.extract_image, cached by xref within MAX_IMAGE_CACHE_BYTES."""
+        base_image = self._images.get(xref)
+        if base_image is not None:
+            self._images.move_to_end(xref)
+            return base_image
+
+        base_image = self._doc.extract_image(xref)
+        size = len(base_image.get("image") or b"") if base_image else 0
+        if base_image and size <= MAX_IMAGE_CACHE_BYTES:
+            self._images[xref] = base_image
+            self._image_bytes += size
+            while self._image_bytes > MAX_IMAGE_CACHE_BYTES:
+                _, evicted = self._images.popitem(last=False)
+                self._image_bytes -= len(evicted.get("image") or b"")
+        return base_image
+
+    def _extract_drawings(self, interp: PageInterpretation, page_elements: PageElements):
         """Extract vector drawings (lines, rectangles, paths)."""
         try:
-            drawings = page.get_drawings()
+            drawings = interp.drawings()
 
             for drawing in drawings:
                 fill_color = drawing.get("fill")
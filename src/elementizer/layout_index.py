@@ -0,0 +1,219 @@
+"""Layout fingerprints and a template index for page classification.
+
+Reports from the same lab reuse page templates (data tables, profile
+plots, covers), so a page laid out like an already-classified page can
+take that page's label instead of re-running the classification rules.
+
+A layout fingerprint is a 64-bit SimHash over the set of a page's layout
+tokens: span left edges snapped to a LAYOUT_GRID point grid with their
+font name and size (the page's columns and type styles), and the snapped
+boxes of lines, rects, paths and images. Text, row positions and token
+counts are left out, so pages of one template fingerprint alike however
+many rows or which values they hold. Similar layouts give fingerprints a
+few bits apart.
+
+LayoutIndex finds near templates with locality-sensitive hashing: the
+fingerprint is cut into LSH_BANDS bands, and any two fingerprints within
+MAX_TEMPLATE_DISTANCE bits of each other share at least one whole band.
+A lookup is a few dict probes however many templates are indexed.
+
+    index = LayoutIndex()
+    index.add(fingerprint, "table", example)       # after running the rules
+    template = index.lookup(other_fingerprint)     # None, or a template
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+# Snap positions to this many points before hashing
+LAYOUT_GRID = 6.0
+
+FINGERPRINT_BITS = 64
+
+# LSH bands; with 4 bands of 16 bits, fingerprints up to 3 bits apart
+# always share a band
+LSH_BANDS = 4
+BAND_BITS = FINGERPRINT_BITS // LSH_BANDS
+
+# Largest Hamming distance treated as the same template
+MAX_TEMPLATE_DISTANCE = LSH_BANDS - 1
+
+# Pages that must agree on a template's label before it is served
+MIN_TEMPLATE_SUPPORT = 2
+
+MAX_TEMPLATES = 4096
+
+
+def _snap(value: float) -> int:
+    return int(value // LAYOUT_GRID)
+
+
+def span_token(x0: float, font_name: Optional[str], font_size: Optional[float]) -> str:
+    """Layout token of a text span: snapped left edge and font signature."""
+    return f"s{_snap(x0)},{font_name or ''},{round(font_size or 0)}"
+
+
+def box_token(kind: str, x0: float, y0: float, x1: float, y1: float) -> str:
+    """Layout token of a line, rect, path or image: its snapped box."""
+    return f"{kind}{_snap(x0)},{_snap(y0)},{_snap(x1)},{_snap(y1)}"
+
+
+def simhash(tokens: Iterable[str]) -> int:
+    """64-bit SimHash of the distinct tokens."""
+    distinct = set(tokens)
+    if not distinct:
+        return 0
+    # Token hashes as one string of bits, FINGERPRINT_BITS per token
+    bits = "".join(
+        f"{int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), 'big'):064b}"
+        for token in distinct
+    )
+    # A bit is set when most token hashes set it; each bit position is a
+    # strided slice, counted in C
+    majority = len(distinct) / 2
+    return int("".join(
+        "1" if bits[bit::FINGERPRINT_BITS].count("1") > majority else "0"
+        for bit in range(FINGERPRINT_BITS)
+    ), 2)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def lsh_bands(fingerprint: int) -> list[int]:
+    """The fingerprint's LSH_BANDS bands, lowest bits first."""
+    mask = (1 << BAND_BITS) - 1
+    return [(fingerprint >> (band * BAND_BITS)) & mask for band in range(LSH_BANDS)]
+
+
+def to_sqlite_int(fingerprint: int) -> int:
+    """Store an unsigned 64-bit fingerprint in a signed SQLite INTEGER."""
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def from_sqlite_int(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def page_elements_fingerprint(page) -> int:
+    """Layout fingerprint of an elementizer PageElements."""
+    tokens = [
+        span_token(span.bbox.x0, span.font_name, span.font_size)
+        for block in page.text_blocks
+        for line in block.lines
+        for span in line.spans
+    ]
+    tokens.extend(box_token("l", ln.start_x, ln.start_y, ln.end_x, ln.end_y) for ln in page.lines)
+    for kind, elements in (("r", page.rects), ("p", page.paths), ("i", page.images)):
+        tokens.extend(box_token(kind, e.bbox.x0, e.bbox.y0, e.bbox.x1, e.bbox.y1) for e in elements)
+    return simhash(tokens)
+
+
+class Template:
+    """A labeled page layout.
+
+    Attributes:
+        fingerprint: Layout fingerprint of the first page seen.
+        label: Label the classification rules gave it.
+        example: Caller's record of that first page (e.g. its classification).
+        support: Pages classified by the rules with this label.
+        conflicted: Set when a page of this layout got another label;
+                    conflicted templates are never served.
+    """
+
+    __slots__ = ("fingerprint", "label", "example", "support", "conflicted")
+
+    def __init__(self, fingerprint: int, label: Any, example: Any = None):
+        self.fingerprint = fingerprint
+        self.label = label
+        self.example = example
+        self.support = 1
+        self.conflicted = False
+
+
+class LayoutIndex:
+    """Nearest-template index over layout fingerprints.
+
+    Thread-safe. Holds at most max_templates templates, evicting the
+    least recently used.
+
+    Args:
+        max_distance: Largest Hamming distance matched; at most
+                      MAX_TEMPLATE_DISTANCE, which LSH guarantees to find.
+        min_support: Agreeing pages needed before a template is served.
+        max_templates: Template count bound.
+    """
+
+    def __init__(
+        self,
+        max_distance: int = MAX_TEMPLATE_DISTANCE,
+        min_support: int = MIN_TEMPLATE_SUPPORT,
+        max_templates: int = MAX_TEMPLATES,
+    ):
+        self.max_distance = min(max_distance, MAX_TEMPLATE_DISTANCE)
+        self.min_support = min_support
+        self.max_templates = max_templates
+        self._templates: "OrderedDict[int, Template]" = OrderedDict()
+        self._buckets: dict[tuple[int, int], list[Template]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def _nearest(self, fingerprint: int) -> Optional[Template]:
+        best, best_distance = None, self.max_distance + 1
+        for key in enumerate(lsh_bands(fingerprint)):
+            for template in self._buckets.get(key, ()):
+                distance = hamming_distance(fingerprint, template.fingerprint)
+                if distance < best_distance:
+                    best, best_distance = template, distance
+        return best
+
+    def lookup(self, fingerprint: int) -> Optional[Template]:
+        """The nearest servable template within max_distance, or None."""
+        with self._lock:
+            template = self._nearest(fingerprint)
+            if template is None or template.conflicted or template.support < self.min_support:
+                self.misses += 1
+                return None
+            self._templates.move_to_end(template.fingerprint)
+            self.hits += 1
+            return template
+
+    def add(self, fingerprint: int, label: Any, example: Any = None) -> Template:
+        """Record a page the rules labeled, joining its nearest template."""
+        with self._lock:
+            template = self._nearest(fingerprint)
+            if template is not None:
+                if template.label == label:
+                    template.support += 1
+                else:
+                    template.conflicted = True
+                self._templates.move_to_end(template.fingerprint)
+                return template
+
+            template = Template(fingerprint, label, example)
+            self._templates[fingerprint] = template
+            for key in enumerate(lsh_bands(fingerprint)):
+                self._buckets.setdefault(key, []).append(template)
+            if len(self._templates) > self.max_templates:
+                self._evict(self._templates.popitem(last=False)[1])
+            return template
+
+    def _evict(self, template: Template) -> None:
+        for key in enumerate(lsh_bands(template.fingerprint)):
+            bucket = self._buckets[key]
+            bucket.remove(template)
+            if not bucket:
+                del self._buckets[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self._buckets.clear()
+            self.hits = self.misses = 0
@@ -3,11 +3,13 @@
 import json
 import sys
 from pathlib import Path
+from typing import Optional
 
 import click
 
 from .database import ElementDatabase
 from .extractor import PDFElementExtractor
+from .thumbnails import THUMBNAIL_SIZES, default_thumbnail_dir, generate_thumbnails
 
 
 @click.group()
@@ -29,6 +31,10 @@ def cli():
               help="Output JSON only, skip database")
 @click.option("--db-only", is_flag=True,
               help="Output database only, skip JSON")
+@click.option("--jsonl", "jsonl_pages", is_flag=True,
+              help="Also write a JSONL page dump (one page per line)")
+@click.option("--thumbnails/--no-thumbnails", default=True,
+              help="Generate image thumbnails for the viewer (default: yes)")
 def extract(
     pdf_path: str,
     output: str,
@@ -36,6 +42,8 @@ def extract(
     store_image_blobs: bool,
     json_only: bool,
     db_only: bool,
+    jsonl_pages: bool,
+    thumbnails: bool,
 ):
     """Extract all elements from a PDF to database and JSON.
 
@@ -68,6 +76,14 @@ def extract(
                 json.dump(doc_elements.to_dict(), f, indent=2, ensure_ascii=False)
             click.echo(f"  JSON: {json_path}")
 
+        # Save page dump, readable by core_analysis without a database
+        if jsonl_pages:
+            jsonl_path = output_dir / f"{pdf_name}_pages.jsonl"
+            with open(jsonl_path, "w", encoding="utf-8") as f:
+                for page in doc_elements.pages:
+                    f.write(json.dumps(page.to_dict(), ensure_ascii=False) + "\n")
+            click.echo(f"  JSONL pages: {jsonl_path}")
+
         # Save to database
         if not json_only:
             db_path = output_dir / f"{pdf_name}_elements.db"
@@ -81,6 +97,9 @@ def extract(
         if image_dir and extract_images:
             image_count = len(list(image_dir.glob("*"))) if image_dir.exists() else 0
             click.echo(f"  Images saved: {image_count} files in {image_dir}")
+            if thumbnails and image_count:
+                report = generate_thumbnails(str(image_dir))
+                click.echo(f"  Thumbnails: {report.generated} generated in {default_thumbnail_dir(image_dir)}")
 
         click.echo("\nDone.")
 
@@ -163,6 +182,31 @@ def stats(db_path: str):
         sys.exit(1)
 
 
+@cli.command()
+@click.argument("db_path", type=click.Path(exists=True))
+def documents(db_path: str):
+    """List documents with page and element counts."""
+    try:
+        with ElementDatabase(db_path) as db:
+            documents = db.list_documents()
+
+        if not documents:
+            click.echo("No documents in database")
+            return
+
+        click.echo(f"\n{'ID':<6}{'Pages':<8}{'Spans':<10}{'Images':<8}{'Lines':<8}{'Rects':<8}File")
+        click.echo("-" * 80)
+        for doc in documents:
+            click.echo(
+                f"{doc['id']:<6}{doc['pages']:<8}{doc['text_spans']:<10}{doc['images']:<8}"
+                f"{doc['lines']:<8}{doc['rects']:<8}{Path(doc['file_path']).name}"
+            )
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
 @cli.command()
 @click.argument("db_path", type=click.Path(exists=True))
 @click.argument("query")
@@ -197,21 +241,27 @@ def search(db_path: str, query: str, limit: int):
 @cli.command()
 @click.argument("db_path", type=click.Path(exists=True))
 @click.argument("page_number", type=int)
+@click.option("--document", "-d", "document_id", type=int,
+              help="Document ID (see 'documents'); required if the database holds several")
 @click.option("--json-output", "-j", is_flag=True, help="Output as JSON")
-def page(db_path: str, page_number: int, json_output: bool):
+def page(db_path: str, page_number: int, document_id: Optional[int], json_output: bool):
     """Show all elements on a specific page."""
     try:
         with ElementDatabase(db_path) as db:
-            # Get document ID (assuming single document per DB for now)
-            cursor = db._conn.cursor()
-            cursor.execute("SELECT id FROM documents LIMIT 1")
-            row = cursor.fetchone()
-            if not row:
+            doc_ids = [row[0] for row in db._conn.execute("SELECT id FROM documents ORDER BY id")]
+            if not doc_ids:
                 click.echo("No documents in database")
                 return
+            if document_id is None:
+                if len(doc_ids) > 1:
+                    click.echo(
+                        f"Database holds {len(doc_ids)} documents; choose one with --document",
+                        err=True,
+                    )
+                    sys.exit(1)
+                document_id = doc_ids[0]
 
-            doc_id = row[0]
-            elements = db.get_page_elements(doc_id, page_number)
+            elements = db.get_page_elements(document_id, page_number)
 
         if not elements:
             click.echo(f"Page {page_number} not found")
@@ -254,19 +304,57 @@ def _print_page_elements(elements: dict, page_number: int):
         click.echo(f"Paths: {len(elements['paths'])}")
 
 
+@cli.command()
+@click.argument("images_dir", type=click.Path(exists=True, file_okay=False))
+@click.option("--output", "-o", type=click.Path(), default=None,
+              help="Thumbnail directory (default: <images_dir>_thumbs)")
+@click.option("--workers", "-w", default=4, type=int, help="Thumbnail threads")
+def thumbnails(images_dir: str, output: str, workers: int):
+    """Generate thumbnail pyramids for an images directory.
+
+    Only new or changed images are processed, so this can run repeatedly.
+    """
+    report = generate_thumbnails(images_dir, thumb_dir=output, workers=workers)
+    sizes = ", ".join(f"{size}px" for size in THUMBNAIL_SIZES)
+    click.echo(f"Thumbnails ({sizes}): {report.generated} generated, {report.skipped} up to date")
+    if report.failed:
+        click.echo(f"  Not decodable ({len(report.failed)}): {', '.join(report.failed[:10])}")
+
+
 @cli.command()
 @click.argument("db_path", type=click.Path(exists=True))
 @click.option("--images", "-i", type=click.Path(exists=True), help="Images directory")
 @click.option("--host", "-h", default="127.0.0.1", help="Host to bind to")
 @click.option("--port", "-p", default=5000, type=int, help="Port to bind to")
-def view(db_path: str, images: str, host: str, port: int):
+@click.option("--render-cache", type=click.Path(), default=None,
+              help="Page render cache directory (default: <db>_render_cache)")
+@click.option("--cache-mb", default=256, type=int, help="Page render cache size in MB")
+@click.option("--render-workers", default=2, type=int, help="Page render threads")
+@click.option("--no-prewarm", is_flag=True, help="Do not pre-render table pages at startup")
+@click.option("--serve", type=click.Choice(["development", "production"]), default="development",
+              help="Flask development server, or precompiled templates on a threaded WSGI server")
+@click.option("--threads", default=8, type=int, help="Request threads in production mode")
+def view(db_path: str, images: str, host: str, port: int, render_cache: str,
+         cache_mb: int, render_workers: int, no_prewarm: bool, serve: str, threads: int):
     """Launch web viewer to explore extracted elements.
 
     Opens a browser-based UI to navigate pages, view images, and search text.
+    Pages are rendered from the source PDF on demand and cached on disk.
     """
     try:
         from .viewer import run_viewer
-        run_viewer(db_path, images_dir=images, host=host, port=port)
+        run_viewer(
+            db_path,
+            images_dir=images,
+            host=host,
+            port=port,
+            render_cache_dir=render_cache,
+            cache_max_bytes=cache_mb * 1024 * 1024,
+            render_workers=render_workers,
+            prewarm=not no_prewarm,
+            serve=serve,
+            threads=threads,
+        )
     except ImportError as e:
         click.echo(f"Error: Flask is required for the viewer. Install with: pip install flask", err=True)
         sys.exit(1)
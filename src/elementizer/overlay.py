@@ -0,0 +1,190 @@
+"""SVG overlays of extracted elements for QA of extractions.
+
+An overlay draws every span, line, rect, image and path bounding box of
+a page in PDF coordinates, color-coded by element type, together with
+the core analysis column boundaries and header band. It shares the
+page's coordinate system, so it lines up with a page render at any zoom.
+
+SVGs are cached on disk under a key of the page, the guides and the
+database version, so a page is drawn once per database version. The key
+is computed without reading the page's elements; they are only loaded
+to draw a missing overlay.
+"""
+
+import hashlib
+import sqlite3
+from dataclasses import dataclass
+from typing import Optional
+from xml.sax.saxutils import escape
+
+from .render_cache import TileCache
+
+# Bump when the drawing changes so cached overlays are regenerated
+OVERLAY_VERSION = 1
+
+DEFAULT_OVERLAY_CACHE_BYTES = 64 * 1024 * 1024
+
+ELEMENT_COLORS = {
+    "span": "#2ecc71",
+    "line": "#3498db",
+    "rect": "#9b59b6",
+    "image": "#e74c3c",
+    "path": "#f39c12",
+}
+HEADER_BAND_COLOR = "#f1c40f"
+COLUMN_COLOR = "#00d4ff"
+
+# Elements per type, as plain coordinate tuples plus span text
+OVERLAY_QUERIES = {
+    "span": "SELECT x0, y0, x1, y1, text FROM text_spans WHERE page_id = ? ORDER BY id",
+    "line": "SELECT start_x, start_y, end_x, end_y FROM lines WHERE page_id = ? ORDER BY id",
+    "rect": "SELECT x0, y0, x1, y1 FROM rects WHERE page_id = ? ORDER BY id",
+    "image": "SELECT x0, y0, x1, y1 FROM images WHERE page_id = ? ORDER BY id",
+    "path": "SELECT x0, y0, x1, y1 FROM paths WHERE page_id = ? ORDER BY id",
+}
+
+
+@dataclass(frozen=True)
+class OverlayGuides:
+    """Extraction geometry drawn over the elements."""
+    column_boundaries: tuple[tuple[float, float], ...] = ()
+    header_band: Optional[tuple[float, float]] = None
+
+
+NO_GUIDES = OverlayGuides()
+
+
+def core_analysis_guides() -> OverlayGuides:
+    """Column boundaries and header band used by CoreAnalysisExtractor."""
+    from ..core_analysis import CoreAnalysisExtractor
+
+    return OverlayGuides(
+        column_boundaries=tuple(tuple(b) for b in CoreAnalysisExtractor.COLUMN_BOUNDARIES),
+        header_band=(CoreAnalysisExtractor.HEADER_Y_MIN, CoreAnalysisExtractor.HEADER_Y_MAX),
+    )
+
+
+def load_page_elements(conn: sqlite3.Connection, page_id: int) -> dict[str, list[tuple]]:
+    """Element coordinates of one page, keyed by element type."""
+    return {
+        kind: [tuple(row) for row in conn.execute(sql, (page_id,))]
+        for kind, sql in OVERLAY_QUERIES.items()
+    }
+
+
+def overlay_key(page_id: int, width: float, height: float, version: str, guides: OverlayGuides) -> str:
+    """Cache key of a page's overlay.
+
+    version must change whenever the database does (the viewer passes
+    its database_version), since the page's elements are not hashed.
+    """
+    return hashlib.blake2b(
+        repr((OVERLAY_VERSION, version, page_id, width, height, guides)).encode(), digest_size=16,
+    ).hexdigest()
+
+
+def _box(x0, y0, x1, y1) -> str:
+    return f'x="{x0:.1f}" y="{y0:.1f}" width="{max(x1 - x0, 0):.1f}" height="{max(y1 - y0, 0):.1f}"'
+
+
+def build_overlay_svg(
+    width: float,
+    height: float,
+    elements: dict[str, list[tuple]],
+    guides: OverlayGuides = NO_GUIDES,
+) -> str:
+    """Draw a page's elements and guides as a standalone SVG document."""
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width:.1f} {height:.1f}" '
+        f'width="{width:.1f}" height="{height:.1f}">',
+        "<style>rect,line{vector-effect:non-scaling-stroke}</style>",
+    ]
+
+    if guides.header_band:
+        y_min, y_max = guides.header_band
+        parts.append(
+            f'<g class="header-band"><rect x="0" y="{y_min}" width="{width:.1f}" '
+            f'height="{y_max - y_min}" fill="{HEADER_BAND_COLOR}" fill-opacity="0.15" '
+            f'stroke="{HEADER_BAND_COLOR}" stroke-width="0.5"><title>Header band</title></rect></g>'
+        )
+    if guides.column_boundaries:
+        parts.append(f'<g class="columns" stroke="{COLUMN_COLOR}" stroke-width="0.5" stroke-dasharray="3 2">')
+        edges = sorted({x for boundary in guides.column_boundaries for x in boundary})
+        for x in edges:
+            parts.append(f'<line x1="{x}" y1="0" x2="{x}" y2="{height:.1f}"/>')
+        for index, (x_min, x_max) in enumerate(guides.column_boundaries):
+            parts.append(
+                f'<text x="{(x_min + x_max) / 2:.1f}" y="10" font-size="7" text-anchor="middle" '
+                f'fill="{COLUMN_COLOR}" stroke="none">{index}</text>'
+            )
+        parts.append("</g>")
+
+    for kind in ("rect", "path", "image"):
+        color = ELEMENT_COLORS[kind]
+        parts.append(f'<g class="{kind}" fill="none" stroke="{color}" stroke-width="0.6">')
+        parts.extend(f"<rect {_box(*row)}/>" for row in elements.get(kind, []))
+        parts.append("</g>")
+
+    color = ELEMENT_COLORS["line"]
+    parts.append(f'<g class="line" stroke="{color}" stroke-width="0.8">')
+    parts.extend(
+        f'<line x1="{x0:.1f}" y1="{y0:.1f}" x2="{x1:.1f}" y2="{y1:.1f}"/>'
+        for x0, y0, x1, y1 in elements.get("line", [])
+    )
+    parts.append("</g>")
+
+    color = ELEMENT_COLORS["span"]
+    parts.append(f'<g class="span" fill="{color}" fill-opacity="0.12" stroke="{color}" stroke-width="0.4">')
+    parts.extend(
+        f"<rect {_box(x0, y0, x1, y1)}><title>{escape(text or '')}</title></rect>"
+        for x0, y0, x1, y1, text in elements.get("span", [])
+    )
+    parts.append("</g>")
+
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+class OverlayCache:
+    """Builds page overlays once per key and keeps them on disk.
+
+    Args:
+        cache_dir: Directory for cached SVGs (an LRU TileCache).
+        max_bytes: Cache size budget.
+        guides: Guides drawn when requested.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_bytes: int = DEFAULT_OVERLAY_CACHE_BYTES,
+        guides: OverlayGuides = NO_GUIDES,
+    ):
+        self.cache = TileCache(cache_dir, max_bytes=max_bytes)
+        self.guides = guides
+
+    def overlay(
+        self, conn: sqlite3.Connection, page: sqlite3.Row, version: str, with_guides: bool = True,
+    ) -> tuple[str, bytes]:
+        """SVG for a pages row, from cache unless the database version changed.
+
+        Args:
+            conn: Database holding the page.
+            page: pages row with id, width and height.
+            version: Database version; see overlay_key.
+            with_guides: Draw the column boundaries and header band.
+
+        Returns:
+            (cache key, svg bytes)
+        """
+        guides = self.guides if with_guides else NO_GUIDES
+        key = overlay_key(page["id"], page["width"], page["height"], version, guides)
+        name = f"{key}.svg"
+
+        data = self.cache.get(name)
+        if data is None:
+            elements = load_page_elements(conn, page["id"])
+            data = build_overlay_svg(page["width"], page["height"], elements, guides).encode()
+            self.cache.put(name, data)
+        return key, data
+
@@ -0,0 +1,121 @@
+"""Page interpretation shared by extraction and rendering.
+
+Each PyMuPDF call such as get_text, get_drawings or get_image_bbox
+re-interprets a page's content stream, and get_image_bbox (like
+get_image_info with xrefs=True) also decodes every image to match
+placements to xrefs by digest. A PageInterpretation runs each kind of
+interpretation at most once per page and derives everything else from
+the cached result:
+
+- text page: the text dict and plain text
+- image list and image info: every image placement, matched to its xref
+  by pixel size without decoding. Only images the same size as another
+  image of the page are decoded and matched by digest, with digests
+  shared across the document's pages.
+- drawings
+
+Text comes from a text page of the page itself rather than of the
+display list, because display lists drop the structure and ActualText
+that text extraction relies on in tagged PDFs.
+
+    interp = PageInterpretation(doc[38])
+    blocks = interp.text_dict()["blocks"]
+    bbox = interp.image_bbox(xref)
+"""
+
+from typing import Optional
+
+import fitz  # PyMuPDF
+
+# Text page flags used by the element extractor and the dissector
+TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE
+
+
+class PageInterpretation:
+    """Cached interpretation of one page.
+
+    Args:
+        page: Page to interpret.
+        text_flags: Flags of the text page behind text_dict and text.
+        image_digests: xref -> pixmap digest cache. Share one dict across a
+                       document's pages so images matched by digest are
+                       decoded once.
+    """
+
+    def __init__(
+        self,
+        page: fitz.Page,
+        text_flags: int = TEXT_FLAGS,
+        image_digests: Optional[dict[int, bytes]] = None,
+    ):
+        self.page = page
+        self.text_flags = text_flags
+        self.image_digests = image_digests if image_digests is not None else {}
+        self._text_page: Optional[fitz.TextPage] = None
+        self._text_dict: Optional[dict] = None
+        self._drawings: Optional[list[dict]] = None
+        self._images: Optional[list[tuple]] = None
+        # hashes flag -> image placements
+        self._image_infos: dict[bool, list[dict]] = {}
+
+    @property
+    def text_page(self) -> fitz.TextPage:
+        if self._text_page is None:
+            self._text_page = self.page.get_textpage(flags=self.text_flags)
+        return self._text_page
+
+    def text_dict(self) -> dict:
+        """page.get_text("dict") from the cached text page."""
+        if self._text_dict is None:
+            self._text_dict = self.page.get_text("dict", textpage=self.text_page)
+        return self._text_dict
+
+    def text(self) -> str:
+        """Plain text, one line per text line, from the cached text page."""
+        return self.page.get_text("text", textpage=self.text_page)
+
+    def drawings(self) -> list[dict]:
+        """page.get_drawings(), computed once."""
+        if self._drawings is None:
+            self._drawings = self.page.get_drawings()
+        return self._drawings
+
+    def images(self) -> list[tuple]:
+        """page.get_images(full=True), computed once."""
+        if self._images is None:
+            self._images = self.page.get_images(full=True)
+        return self._images
+
+    def image_infos(self, hashes: bool = False) -> list[dict]:
+        """Placements of every image on the page (bbox, width, height, ...).
+
+        Args:
+            hashes: Add each image's pixmap digest, which decodes the image.
+        """
+        if hashes not in self._image_infos:
+            self._image_infos[hashes] = self.page.get_image_info(hashes=hashes)
+        return self._image_infos[hashes]
+
+    def image_bbox(self, xref: int) -> Optional[fitz.Rect]:
+        """Where an image is first placed, in unrotated page coordinates
+        like text and drawings, or None if it is not shown on the page.
+        """
+        sizes = {item[0]: (item[2], item[3]) for item in self.images()}
+        size = sizes.get(xref)
+        if size is None:
+            return None
+        if list(sizes.values()).count(size) == 1:
+            for info in self.image_infos():
+                if (info["width"], info["height"]) == size:
+                    return fitz.Rect(info["bbox"])
+
+        # Another image has the same size, or the placement reports a
+        # different one: match by digest
+        digest = self.image_digests.get(xref)
+        if digest is None:
+            digest = fitz.Pixmap(self.page.parent, xref).digest
+            self.image_digests[xref] = digest
+        for info in self.image_infos(hashes=True):
+            if info["digest"] == digest:
+                return fitz.Rect(info["bbox"])
+        return None
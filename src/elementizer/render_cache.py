@@ -0,0 +1,242 @@
+"""Page rasterization with a size-bounded LRU disk cache.
+
+Pages of the source PDF are rendered with PyMuPDF on a thread pool and
+the encoded tiles (PNG, or WebP when Pillow is installed) are kept on
+disk, keyed by page, zoom and format. When the cache grows past its byte
+budget the least recently used tiles are deleted. File modification
+times record recency, so the LRU order survives a restart.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+import fitz  # PyMuPDF
+
+RENDER_FORMATS = ("png", "webp")
+RENDER_MIMETYPES = {"png": "image/png", "webp": "image/webp"}
+
+# Zoom levels are fixed so the number of distinct tiles per page is bounded
+DEFAULT_ZOOM_LEVELS = (0.5, 1.0, 1.5, 2.0)
+DEFAULT_ZOOM = 1.0
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+WEBP_QUALITY = 80
+
+
+def tile_name(page_number: int, zoom: float, fmt: str) -> str:
+    """Cache file name for a rendered tile."""
+    return f"page_{page_number:04d}_z{zoom:g}.{fmt}"
+
+
+class TileCache:
+    """Disk cache of encoded tiles, evicted least recently used first.
+
+    Args:
+        cache_dir: Directory holding the tiles (created if missing).
+        max_bytes: Total size budget for all tiles.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_BYTES):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # name -> size in bytes, least recently used first
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._size = 0
+        self._load()
+
+    def _load(self) -> None:
+        files = [
+            (entry.stat().st_mtime_ns, entry.name, entry.stat().st_size)
+            for entry in os.scandir(self.cache_dir)
+            if entry.is_file() and not entry.name.startswith(".")
+        ]
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._size += size
+        with self._lock:
+            self._evict()
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def get(self, name: str) -> Optional[bytes]:
+        """Return a cached tile and mark it most recently used."""
+        with self._lock:
+            if name not in self._entries:
+                return None
+            self._entries.move_to_end(name)
+        path = self.cache_dir / name
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._size -= self._entries.pop(name, 0)
+            return None
+        return data
+
+    def put(self, name: str, data: bytes) -> None:
+        """Store a tile atomically, then evict down to the size budget."""
+        path = self.cache_dir / name
+        tmp_path = path.with_name(f".{name}.tmp-{threading.get_ident()}")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._size -= self._entries.pop(name, 0)
+            self._entries[name] = len(data)
+            self._size += len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        # The newest tile is kept even if it alone exceeds the budget
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._size -= size
+            (self.cache_dir / name).unlink(missing_ok=True)
+
+
+class PageRenderer:
+    """Renders PDF pages to cached tiles on a thread pool.
+
+    Concurrent requests for the same tile share one render.
+
+    Args:
+        pdf_path: Source PDF.
+        cache: Tile cache.
+        workers: Render threads.
+        zoom_levels: Accepted zoom factors (1.0 = 72 dpi).
+        namespace: Tile name prefix, so several documents can share a cache.
+    """
+
+    def __init__(
+        self,
+        pdf_path: str,
+        cache: TileCache,
+        workers: int = 2,
+        zoom_levels: Iterable[float] = DEFAULT_ZOOM_LEVELS,
+        namespace: str = "",
+    ):
+        self.pdf_path = str(pdf_path)
+        self.cache = cache
+        self.zoom_levels = tuple(zoom_levels)
+        self.namespace = namespace
+        with fitz.open(self.pdf_path) as doc:
+            self.page_count = len(doc)
+
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+        self._local = threading.local()
+        self._documents: list[fitz.Document] = []
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, Future] = {}
+
+    def _check(self, page_number: int, zoom: float, fmt: str) -> None:
+        if fmt not in RENDER_FORMATS:
+            raise ValueError(f"Unsupported format {fmt!r}; choose from {', '.join(RENDER_FORMATS)}")
+        if fmt == "webp" and not _has_pillow():
+            raise ValueError("WebP rendering requires Pillow. Install with: pip install pillow")
+        if zoom not in self.zoom_levels:
+            levels = ", ".join(f"{z:g}" for z in self.zoom_levels)
+            raise ValueError(f"Unsupported zoom {zoom:g}; choose from {levels}")
+        if not 1 <= page_number <= self.page_count:
+            raise IndexError(f"Page {page_number} out of range (1-{self.page_count})")
+
+    def tile_name(self, page_number: int, zoom: float, fmt: str) -> str:
+        return self.namespace + tile_name(page_number, zoom, fmt)
+
+    def _document(self) -> fitz.Document:
+        # PyMuPDF documents must not be shared between threads
+        doc = getattr(self._local, "doc", None)
+        if doc is None:
+            doc = fitz.open(self.pdf_path)
+            self._local.doc = doc
+            with self._lock:
+                self._documents.append(doc)
+        return doc
+
+    def _render(self, page_number: int, zoom: float, fmt: str) -> bytes:
+        page = self._document()[page_number - 1]
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        if fmt == "png":
+            data = pix.tobytes("png")
+        else:
+            import io
+            from PIL import Image
+
+            buffer = io.BytesIO()
+            image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+            image.save(buffer, format="WEBP", quality=WEBP_QUALITY)
+            data = buffer.getvalue()
+        self.cache.put(self.tile_name(page_number, zoom, fmt), data)
+        return data
+
+    def submit(self, page_number: int, zoom: float = DEFAULT_ZOOM, fmt: str = "png") -> Future:
+        """Schedule a render unless the tile is cached or already rendering."""
+        self._check(page_number, zoom, fmt)
+        name = self.tile_name(page_number, zoom, fmt)
+        with self._lock:
+            future = self._in_flight.get(name)
+            if future is not None:
+                return future
+            future = self.executor.submit(self._render, page_number, zoom, fmt)
+            self._in_flight[name] = future
+        future.add_done_callback(lambda _: self._forget(name))
+        return future
+
+    def _forget(self, name: str) -> None:
+        with self._lock:
+            self._in_flight.pop(name, None)
+
+    def render(self, page_number: int, zoom: float = DEFAULT_ZOOM, fmt: str = "png") -> bytes:
+        """Encoded tile for a page, from cache or rendered on the pool.
+
+        Raises:
+            ValueError: Unsupported zoom or format.
+            IndexError: Page outside the document.
+        """
+        self._check(page_number, zoom, fmt)
+        data = self.cache.get(self.tile_name(page_number, zoom, fmt))
+        if data is not None:
+            return data
+        return self.submit(page_number, zoom, fmt).result()
+
+    def prewarm(
+        self,
+        page_numbers: Iterable[int],
+        zoom: float = DEFAULT_ZOOM,
+        fmt: str = "png",
+    ) -> list[Future]:
+        """Render uncached tiles in the background."""
+        futures = []
+        for page_number in page_numbers:
+            if self.tile_name(page_number, zoom, fmt) not in self.cache:
+                futures.append(self.submit(page_number, zoom, fmt))
+        return futures
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        for doc in self._documents:
+            doc.close()
+        self._documents.clear()
+
+
+def _has_pillow() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
@@ -0,0 +1,154 @@
+"""Thumbnail pyramids for extracted images.
+
+Each image in a ``*_images`` directory gets one downscaled JPEG per
+pyramid level in a sibling ``*_images_thumbs`` directory:
+
+    W20552_images/page0039_img0000.png
+    W20552_images_thumbs/150/page0039_img0000.jpg
+    W20552_images_thumbs/300/page0039_img0000.jpg
+    W20552_images_thumbs/600/page0039_img0000.jpg
+
+Levels are bounded by their longest edge and never upscale. Each level is
+scaled from the next larger one, so a multi-megabyte scan is decoded
+once. Thumbnails newer than their source are kept, so regeneration only
+touches new or changed images.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
+
+import fitz  # PyMuPDF
+
+# Longest edge in pixels of each pyramid level
+THUMBNAIL_SIZES = (150, 300, 600)
+THUMBNAIL_DIR_SUFFIX = "_thumbs"
+JPEG_QUALITY = 80
+
+
+@dataclass
+class ThumbnailReport:
+    """Outcome of a thumbnail generation run."""
+    generated: int = 0
+    skipped: int = 0
+    failed: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "generated": self.generated,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
+
+
+def default_thumbnail_dir(images_dir: str) -> Path:
+    """Thumbnail cache directory next to an images directory."""
+    images_dir = Path(images_dir)
+    return images_dir.with_name(images_dir.name + THUMBNAIL_DIR_SUFFIX)
+
+
+def thumbnail_path(thumb_dir: str, image_filename: str, size: int) -> Path:
+    """Path of one pyramid level of an image."""
+    return Path(thumb_dir) / str(size) / f"{Path(image_filename).stem}.jpg"
+
+
+def is_current(image_path: Path, thumb_dir: str, sizes: Iterable[int] = THUMBNAIL_SIZES) -> bool:
+    """True if every level exists and is at least as new as the source."""
+    source_mtime = image_path.stat().st_mtime_ns
+    for size in sizes:
+        path = thumbnail_path(thumb_dir, image_path.name, size)
+        if not path.exists() or path.stat().st_mtime_ns < source_mtime:
+            return False
+    return True
+
+
+def _to_rgb(pix: fitz.Pixmap) -> fitz.Pixmap:
+    """Drop alpha and convert to a colorspace JPEG can hold."""
+    if pix.alpha:
+        pix = fitz.Pixmap(pix, 0)
+    if pix.colorspace is None or pix.colorspace.n not in (1, 3):
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    return pix
+
+
+def _scaled(pix: fitz.Pixmap, size: int) -> fitz.Pixmap:
+    scale = size / max(pix.width, pix.height)
+    if scale >= 1:
+        return pix
+    width = max(1, round(pix.width * scale))
+    height = max(1, round(pix.height * scale))
+    return fitz.Pixmap(pix, width, height, None)
+
+
+def make_thumbnails(
+    image_path: str,
+    thumb_dir: str,
+    sizes: Iterable[int] = THUMBNAIL_SIZES,
+) -> list[Path]:
+    """Write every pyramid level of one image.
+
+    Returns:
+        Thumbnail paths, largest level first.
+    """
+    image_path = Path(image_path)
+    pix = _to_rgb(fitz.Pixmap(str(image_path)))
+
+    paths = []
+    for size in sorted(sizes, reverse=True):
+        pix = _scaled(pix, size)
+        path = thumbnail_path(thumb_dir, image_path.name, size)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp-{threading.get_ident()}")
+        tmp_path.write_bytes(pix.tobytes("jpg", jpg_quality=JPEG_QUALITY))
+        os.replace(tmp_path, path)
+        paths.append(path)
+    return paths
+
+
+def generate_thumbnails(
+    images_dir: str,
+    thumb_dir: Optional[str] = None,
+    sizes: Iterable[int] = THUMBNAIL_SIZES,
+    workers: int = 4,
+) -> ThumbnailReport:
+    """Build thumbnail pyramids for every image in a directory.
+
+    Args:
+        images_dir: Directory of extracted images.
+        thumb_dir: Thumbnail cache. Defaults to default_thumbnail_dir.
+        sizes: Pyramid levels (longest edge in pixels).
+        workers: Thread pool size.
+
+    Returns:
+        ThumbnailReport with generated, up-to-date and failed counts.
+    """
+    sizes = tuple(sizes)
+    thumb_dir = Path(thumb_dir) if thumb_dir else default_thumbnail_dir(images_dir)
+    report = ThumbnailReport()
+
+    pending = []
+    for image_path in sorted(Path(images_dir).iterdir()):
+        if not image_path.is_file() or image_path.name.startswith("."):
+            continue
+        if is_current(image_path, str(thumb_dir), sizes):
+            report.skipped += 1
+        else:
+            pending.append(image_path)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(make_thumbnails, str(path), str(thumb_dir), sizes): path
+            for path in pending
+        }
+        for future, path in futures.items():
+            try:
+                future.result()
+                report.generated += 1
+            except Exception:
+                # Undecodable formats (e.g. JBIG2 masks) fall back to the original
+                report.failed.append(path.name)
+
+    return report
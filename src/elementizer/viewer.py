@@ -1,16 +1,93 @@
 """Web viewer for exploring extracted PDF elements."""
 
+import base64
+import gzip
+import hashlib
 import json
+import os
 import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-
-from flask import Flask, render_template_string, request, send_from_directory, g
+from typing import Optional
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from flask import Flask, Response, jsonify, redirect, request, send_from_directory, g
+
+from .database import read_document_stats
+from .overlay import OverlayCache, core_analysis_guides
+from .render_cache import (
+    DEFAULT_CACHE_BYTES,
+    DEFAULT_ZOOM,
+    RENDER_MIMETYPES,
+    PageRenderer,
+    TileCache,
+)
+from .thumbnails import (
+    THUMBNAIL_SIZES,
+    default_thumbnail_dir,
+    generate_thumbnails,
+    is_current,
+    make_thumbnails,
+    thumbnail_path,
+)
 
 app = Flask(__name__)
 
 # Configuration - set via environment or command line
 DATABASE_PATH = None
 IMAGES_DIR = None
+THUMBNAILS_DIR = None
+RENDERER: Optional[PageRenderer] = None
+OVERLAYS: Optional[OverlayCache] = None
+
+# Routes without a /doc/<id> prefix address the first document
+DEFAULT_DOCUMENT_ID: Optional[int] = None
+DOCUMENT_SCOPE = "COALESCE(?, (SELECT MIN(id) FROM documents))"
+
+# Renderers of other documents share one tile cache and are opened on
+# first use; at most MAX_OPEN_RENDERERS are kept open
+TILE_CACHE: Optional[TileCache] = None
+RENDER_WORKERS = 2
+RENDER_PREWARM = True
+MAX_OPEN_RENDERERS = 8
+_renderers: OrderedDict[int, Optional[PageRenderer]] = OrderedDict()
+_renderers_lock = threading.Lock()
+
+# (database, version, document) -> stats, for databases without document_stats
+_document_stats_cache: dict[tuple, dict[int, dict]] = {}
+
+# Pages whose text contains this title are pre-rendered (same rule as the
+# core analysis page classifier)
+TABLE_PAGE_MARKER = "SUMMARY OF ROUTINE CORE ANALYSES"
+
+# Browsers may reuse a rendered tile without revalidating for this long
+RENDER_MAX_AGE = 3600
+
+SERVE_MODES = ("development", "production")
+DEFAULT_SERVER_THREADS = 8
+
+# Extracted images never change under a given name and content hash
+IMAGE_MAX_AGE = 365 * 24 * 3600
+
+# Responses that are a pure function of the database; they revalidate
+# against its modification time and get 304 when it is unchanged
+DB_BACKED_ENDPOINTS = {
+    'index', 'home', 'pages', 'page', 'images', 'search', 'api_images', 'api_spans', 'api_search',
+}
+
+# Keyset pagination page sizes for list views and the JSON API
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+COMPRESSIBLE_MIMETYPES = {'text/html', 'application/json', 'image/svg+xml'}
+GZIP_MIN_BYTES = 500
+GZIP_LEVEL = 6
+
+# Image path -> (mtime_ns, size, sha256), so files are hashed once
+_file_digests: dict[str, tuple[int, int, str]] = {}
 
 HTML_TEMPLATE = """
 <!DOCTYPE html>
@@ -76,6 +153,14 @@ HTML_TEMPLATE = """
         .pagination a.active { background: #00d4ff; color: #000; }
 
         .back-link { display: inline-block; margin-bottom: 20px; padding: 8px 15px; background: #16213e; border-radius: 4px; }
+
+        .page-render { margin-bottom: 30px; text-align: center; }
+        .page-render img { max-width: 100%; background: #fff; border-radius: 4px; }
+        .page-render .zoom-links { margin-top: 10px; font-size: 0.9em; }
+        .page-render .zoom-links a { margin: 0 8px; }
+        .page-stack { position: relative; display: inline-block; width: 100%; max-width: 900px; background: #fff; border-radius: 4px; }
+        .page-stack img { display: block; width: 100%; max-width: none; }
+        .page-stack img.overlay { position: absolute; top: 0; left: 0; background: none; }
     </style>
 </head>
 <body>
@@ -90,10 +175,11 @@ HOME_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
 <h1>PDF Element Viewer</h1>
 
 <div class="nav">
-    <a href="/">Home</a>
-    <a href="/pages">All Pages</a>
-    <a href="/images">All Images</a>
-    <a href="/search">Search</a>
+    {% if base %}<a href="/">Documents</a>{% endif %}
+    <a href="{{ base }}/">Home</a>
+    <a href="{{ base }}/pages">All Pages</a>
+    <a href="{{ base }}/images">All Images</a>
+    <a href="{{ base }}/search">Search</a>
 </div>
 
 <h2>Document: {{ doc.file_path | basename }}</h2>
@@ -126,7 +212,7 @@ HOME_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
 </div>
 
 <div class="search-box">
-    <form action="/search" method="get">
+    <form action="{{ base }}/search" method="get">
         <input type="text" name="q" placeholder="Search text content..." autofocus>
     </form>
 </div>
@@ -134,7 +220,7 @@ HOME_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
 <h2>Pages with Content</h2>
 <div class="page-grid">
     {% for page in pages %}
-    <a href="/page/{{ page.page_number }}" class="page-card">
+    <a href="{{ base }}/page/{{ page.page_number }}" class="page-card">
         <div class="page-num">{{ page.page_number }}</div>
         <div class="count">{{ page.element_count }} elements</div>
     </a>
@@ -142,20 +228,42 @@ HOME_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
 </div>
 """)
 
+DOCUMENTS_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
+<h1>PDF Element Viewer</h1>
+
+<h2>{{ documents|length }} Documents</h2>
+
+<div class="element-list">
+    {% for doc in documents %}
+    {% set doc_stats = stats[doc.id] %}
+    <div class="element-item">
+        <a href="/doc/{{ doc.id }}/" class="page-link">{{ doc.file_path | basename }}</a>
+        {% if doc.title %}<span class="font-info">{{ doc.title }}</span>{% endif %}
+        <div class="position">
+            {{ doc_stats.pages }} pages &middot; {{ doc_stats.text_spans }} spans &middot;
+            {{ doc_stats.images }} images &middot; {{ doc_stats.lines }} lines &middot;
+            {{ doc_stats.rects }} rects
+        </div>
+    </div>
+    {% endfor %}
+</div>
+""")
+
 PAGES_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
-<a href="/" class="back-link">&larr; Back to Home</a>
+<a href="{{ base }}/" class="back-link">&larr; Back to Home</a>
 <h1>All Pages</h1>
 
 <div class="nav">
-    <a href="/">Home</a>
-    <a href="/pages">All Pages</a>
-    <a href="/images">All Images</a>
-    <a href="/search">Search</a>
+    {% if base %}<a href="/">Documents</a>{% endif %}
+    <a href="{{ base }}/">Home</a>
+    <a href="{{ base }}/pages">All Pages</a>
+    <a href="{{ base }}/images">All Images</a>
+    <a href="{{ base }}/search">Search</a>
 </div>
 
 <div class="page-grid">
     {% for page in pages %}
-    <a href="/page/{{ page.page_number }}" class="page-card">
+    <a href="{{ base }}/page/{{ page.page_number }}" class="page-card">
         <div class="page-num">{{ page.page_number }}</div>
         <div class="count">{{ page.width|int }}x{{ page.height|int }}</div>
     </a>
@@ -164,14 +272,15 @@ PAGES_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
 """)
 
 PAGE_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
-<a href="/" class="back-link">&larr; Back to Home</a>
+<a href="{{ base }}/" class="back-link">&larr; Back to Home</a>
 <h1>Page {{ page_number }}</h1>
 
 <div class="nav">
-    {% if page_number > 1 %}<a href="/page/{{ page_number - 1 }}">&larr; Prev</a>{% endif %}
-    <a href="/">Home</a>
-    <a href="/pages">All Pages</a>
-    {% if page_number < total_pages %}<a href="/page/{{ page_number + 1 }}">Next &rarr;</a>{% endif %}
+    {% if page_number > 1 %}<a href="{{ base }}/page/{{ page_number - 1 }}">&larr; Prev</a>{% endif %}
+    {% if base %}<a href="/">Documents</a>{% endif %}
+    <a href="{{ base }}/">Home</a>
+    <a href="{{ base }}/pages">All Pages</a>
+    {% if page_number < total_pages %}<a href="{{ base }}/page/{{ page_number + 1 }}">Next &rarr;</a>{% endif %}
 </div>
 
 <div class="stats-grid">
@@ -197,6 +306,27 @@ PAGE_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
     </div>
 </div>
 
+<h2>Page</h2>
+<div class="page-render">
+    <div class="page-stack">
+        {% if zoom_levels %}
+        <img src="{{ base }}/page/{{ page_number }}/render" alt="Page {{ page_number }}" loading="lazy">
+        <img id="overlay" class="overlay" src="{{ base }}/page/{{ page_number }}/overlay.svg" alt="Element overlay">
+        {% else %}
+        <img id="overlay" src="{{ base }}/page/{{ page_number }}/overlay.svg" alt="Element overlay">
+        {% endif %}
+    </div>
+    <div class="zoom-links">
+        <label><input type="checkbox" checked
+            onchange="document.getElementById('overlay').style.visibility = this.checked ? 'visible' : 'hidden'">
+            Element overlay</label>
+        <a href="{{ base }}/page/{{ page_number }}/overlay.svg" target="_blank">SVG</a>
+        {% for zoom in zoom_levels %}
+        <a href="{{ base }}/page/{{ page_number }}/render?zoom={{ zoom }}" target="_blank">{{ zoom }}x</a>
+        {% endfor %}
+    </div>
+</div>
+
 {% if images %}
 <h2>Images</h2>
 <div class="image-grid">
@@ -204,7 +334,7 @@ PAGE_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
     <div class="image-card">
         {% if img.file_path %}
         <a href="/image/{{ img.file_path | basename }}" target="_blank">
-            <img src="/image/{{ img.file_path | basename }}" alt="Image">
+            <img src="{{ img.file_path | thumbnail(300) }}" alt="Image" loading="lazy">
         </a>
         {% endif %}
         <div class="meta">{{ img.width }}x{{ img.height }} {{ img.format }}</div>
@@ -245,14 +375,15 @@ PAGE_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
 """)
 
 IMAGES_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
-<a href="/" class="back-link">&larr; Back to Home</a>
-<h1>All Images ({{ images|length }})</h1>
+<a href="{{ base }}/" class="back-link">&larr; Back to Home</a>
+<h1>All Images</h1>
 
 <div class="nav">
-    <a href="/">Home</a>
-    <a href="/pages">All Pages</a>
-    <a href="/images">All Images</a>
-    <a href="/search">Search</a>
+    {% if base %}<a href="/">Documents</a>{% endif %}
+    <a href="{{ base }}/">Home</a>
+    <a href="{{ base }}/pages">All Pages</a>
+    <a href="{{ base }}/images">All Images</a>
+    <a href="{{ base }}/search">Search</a>
 </div>
 
 <div class="image-grid">
@@ -260,7 +391,7 @@ IMAGES_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
     <div class="image-card">
         {% if img.file_path %}
         <a href="/image/{{ img.file_path | basename }}" target="_blank">
-            <img src="/image/{{ img.file_path | basename }}" alt="Image">
+            <img src="{{ img.file_path | thumbnail(150) }}" alt="Image" loading="lazy">
         </a>
         {% endif %}
         <div class="meta">Page {{ img.page_number }} - {{ img.width }}x{{ img.height }}</div>
@@ -269,49 +400,268 @@ IMAGES_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
 </div>
 
 <div class="pagination">
-    {% if offset > 0 %}
-    <a href="/images?offset={{ offset - limit }}">&larr; Prev</a>
+    {% if cursor %}
+    <a href="{{ base }}/images">&larr; First</a>
     {% endif %}
-    <span>Showing {{ offset + 1 }}-{{ offset + images|length }} of {{ total }}</span>
-    {% if offset + limit < total %}
-    <a href="/images?offset={{ offset + limit }}">Next &rarr;</a>
+    <span>{{ images|length }} images{% if images %} from page {{ images[0].page_number }}{% endif %}</span>
+    {% if next_cursor %}
+    <a href="{{ base }}/images?cursor={{ next_cursor }}">Next &rarr;</a>
     {% endif %}
 </div>
 """)
 
 SEARCH_TEMPLATE = HTML_TEMPLATE.replace("{% block content %}{% endblock %}", """
-<a href="/" class="back-link">&larr; Back to Home</a>
+<a href="{{ base }}/" class="back-link">&larr; Back to Home</a>
 <h1>Search</h1>
 
 <div class="nav">
-    <a href="/">Home</a>
-    <a href="/pages">All Pages</a>
-    <a href="/images">All Images</a>
-    <a href="/search">Search</a>
+    {% if base %}<a href="/">Documents</a>{% endif %}
+    <a href="{{ base }}/">Home</a>
+    <a href="{{ base }}/pages">All Pages</a>
+    <a href="{{ base }}/images">All Images</a>
+    <a href="{{ base }}/search">Search</a>
 </div>
 
 <div class="search-box">
-    <form action="/search" method="get">
+    <form action="{{ base }}/search" method="get">
         <input type="text" name="q" placeholder="Search text content..." value="{{ query }}" autofocus>
     </form>
 </div>
 
 {% if query %}
-<h2>Results for "{{ query }}" ({{ results|length }}{% if results|length >= 100 %}+{% endif %})</h2>
+<h2>Results for "{{ query }}"</h2>
 
 <div class="search-results">
     {% for result in results %}
     <div class="search-result">
-        <a href="/page/{{ result.page_number }}" class="page-link">Page {{ result.page_number }}</a>
+        <a href="{{ base }}/page/{{ result.page_number }}" class="page-link">Page {{ result.page_number }}</a>
         <span class="font-info">{{ result.font_name }} {{ result.font_size|round(1) }}pt</span>
         <div class="context">{{ result.text }}</div>
     </div>
     {% endfor %}
 </div>
+
+<div class="pagination">
+    {% if cursor %}
+    <a href="{{ base }}/search?q={{ query | urlencode }}">&larr; First</a>
+    {% endif %}
+    {% if not results %}<span>No results</span>{% endif %}
+    {% if next_cursor %}
+    <a href="{{ base }}/search?q={{ query | urlencode }}&cursor={{ next_cursor }}">More results &rarr;</a>
+    {% endif %}
+</div>
 {% endif %}
 """)
 
 
+ALL_TEMPLATES = (
+    DOCUMENTS_TEMPLATE, HOME_TEMPLATE, PAGES_TEMPLATE, PAGE_TEMPLATE, IMAGES_TEMPLATE, SEARCH_TEMPLATE,
+)
+
+# Template source -> compiled template. render_template_string would
+# recompile the large template strings on every request.
+_compiled_templates = {}
+
+# All elements of one page in a single round trip. Each element table is
+# aggregated into a JSON array holding only the columns PAGE_TEMPLATE uses.
+PAGE_ELEMENTS_SQL = """
+    SELECT p.*,
+           (SELECT COUNT(*) FROM pages WHERE document_id = p.document_id) AS total_pages,
+           (SELECT json_group_array(json_object(
+                        'x0', x0, 'y0', y0, 'x1', x1, 'y1', y1, 'full_text', full_text))
+            FROM (SELECT * FROM text_blocks WHERE page_id = p.id ORDER BY y0, x0)
+           ) AS text_blocks,
+           (SELECT json_group_array(json_object(
+                        'file_path', file_path, 'width', width, 'height', height,
+                        'format', format))
+            FROM (SELECT * FROM images WHERE page_id = p.id ORDER BY id)
+           ) AS images,
+           (SELECT json_group_array(json_object(
+                        'start_x', start_x, 'start_y', start_y,
+                        'end_x', end_x, 'end_y', end_y,
+                        'is_horizontal', is_horizontal, 'is_vertical', is_vertical))
+            FROM (SELECT * FROM lines WHERE page_id = p.id ORDER BY id)
+           ) AS lines,
+           (SELECT json_group_array(json_object('x0', x0, 'y0', y0, 'x1', x1, 'y1', y1))
+            FROM (SELECT * FROM rects WHERE page_id = p.id ORDER BY id)
+           ) AS rects
+    FROM pages p
+    WHERE p.document_id = {scope} AND p.page_number = ?
+""".format(scope=DOCUMENT_SCOPE)
+PAGE_ELEMENT_TABLES = ("text_blocks", "images", "lines", "rects")
+
+
+# Keyset-paginated lists. Element tables are aliased ``t`` and joined to
+# pages ``p``; rows are ordered by (page_number, id) so a cursor seeks
+# straight to the next row instead of skipping an OFFSET.
+IMAGE_LIST_SQL = """
+    SELECT t.id, t.xref, t.x0, t.y0, t.x1, t.y1, t.width, t.height,
+           t.colorspace, t.bpc, t.format, t.file_path, p.page_number
+    FROM images t
+    JOIN pages p ON t.page_id = p.id
+"""
+SPAN_LIST_SQL = """
+    SELECT t.id, t.block_index, t.line_index, t.span_index,
+           t.x0, t.y0, t.x1, t.y1, t.text, t.font_name, t.font_size,
+           t.color, t.flags, p.page_number
+    FROM text_spans t
+    JOIN pages p ON t.page_id = p.id
+"""
+
+
+def encode_cursor(page_number: int, row_id: int) -> str:
+    """Opaque cursor for the row after (page_number, row_id)."""
+    raw = json.dumps([page_number, row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[int, int]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        page_number, row_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not (isinstance(page_number, int) and isinstance(row_id, int)):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return page_number, row_id
+
+
+def keyset_page(
+    db: sqlite3.Connection,
+    select_sql: str,
+    filters: list[str],
+    params: list,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> tuple[list[sqlite3.Row], Optional[str]]:
+    """Fetch one page of rows ordered by (page_number, id).
+
+    Returns:
+        (rows, next_cursor), where next_cursor is None on the last page.
+    """
+    where = list(filters)
+    args = list(params)
+    if cursor:
+        page_number, row_id = decode_cursor(cursor)
+        # The plain >= lets SQLite range-scan pages by page_number
+        where.append("p.page_number >= ? AND (p.page_number > ? OR t.id > ?)")
+        args += [page_number, page_number, row_id]
+
+    sql = select_sql
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY p.page_number, t.id LIMIT ?"
+    # One extra row tells whether another page exists
+    rows = db.execute(sql, args + [limit + 1]).fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['page_number'], rows[-1]['id'])
+    return rows, next_cursor
+
+
+def _page_size() -> int:
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _search_filters(doc_id: Optional[int], query: str) -> tuple[list[str], list]:
+    return [f"p.document_id = {DOCUMENT_SCOPE}", "t.text LIKE ?"], [doc_id, f"%{query}%"]
+
+
+def _base(doc_id: Optional[int]) -> str:
+    """URL prefix of the links on a page: /doc/<id> when the URL named one."""
+    return f"/doc/{doc_id}" if doc_id is not None else ""
+
+
+def document_stats(db: sqlite3.Connection, document_id: Optional[int] = None) -> dict[int, dict]:
+    """Per-document counts from document_stats, cached until the database changes."""
+    key = (DATABASE_PATH, database_version(), document_id)
+    stats = _document_stats_cache.get(key)
+    if stats is None:
+        if len(_document_stats_cache) >= 256:
+            _document_stats_cache.clear()
+        stats = read_document_stats(db, document_id)
+        _document_stats_cache[key] = stats
+    return stats
+
+
+def document_namespace(document_id: int) -> str:
+    """Tile name prefix of a document in the shared tile cache."""
+    return f"doc{document_id}_"
+
+
+def _open_renderer(document_id: int) -> Optional[PageRenderer]:
+    pdf_path = _source_pdf(DATABASE_PATH, document_id)
+    if pdf_path is None:
+        return None
+    renderer = PageRenderer(
+        str(pdf_path), TILE_CACHE, workers=RENDER_WORKERS,
+        namespace=document_namespace(document_id),
+    )
+    if RENDER_PREWARM:
+        renderer.prewarm(table_page_numbers(DATABASE_PATH, document_id))
+    return renderer
+
+
+def get_renderer(document_id: Optional[int]) -> Optional[PageRenderer]:
+    """Page renderer of a document, opened on first use.
+
+    Returns None if the document's source PDF cannot be found.
+    """
+    if document_id is None or document_id == DEFAULT_DOCUMENT_ID:
+        return RENDERER
+    if TILE_CACHE is None:
+        return None
+    with _renderers_lock:
+        if document_id in _renderers:
+            _renderers.move_to_end(document_id)
+            return _renderers[document_id]
+
+    renderer = _open_renderer(document_id)
+    evicted = []
+    with _renderers_lock:
+        if document_id in _renderers:
+            # Another request opened it first
+            evicted.append(renderer)
+            renderer = _renderers[document_id]
+        else:
+            _renderers[document_id] = renderer
+            while len(_renderers) > MAX_OPEN_RENDERERS:
+                evicted.append(_renderers.popitem(last=False)[1])
+    for stale in evicted:
+        if stale is not None:
+            stale.close()
+    return renderer
+
+
+def _close_renderers() -> None:
+    with _renderers_lock:
+        renderers = list(_renderers.values())
+        _renderers.clear()
+    for renderer in renderers:
+        if renderer is not None:
+            renderer.close()
+
+
+def render_template(source: str, **context) -> str:
+    """Render a template string, compiling it on first use only."""
+    template = _compiled_templates.get(source)
+    if template is None:
+        template = app.jinja_env.from_string(source)
+        _compiled_templates[source] = template
+    return template.render(**context)
+
+
+def precompile_templates() -> None:
+    """Compile every page template up front."""
+    for source in ALL_TEMPLATES:
+        if source not in _compiled_templates:
+            _compiled_templates[source] = app.jinja_env.from_string(source)
+
+
 def get_db():
     """Get database connection."""
     if 'db' not in g:
@@ -327,22 +677,99 @@ def close_db(exception):
         db.close()
 
 
+def _file_digest(path: str) -> str:
+    stat = os.stat(path)
+    cached = _file_digests.get(path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    _file_digests[path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def database_version() -> str:
+    """Validator for database-backed pages: changes whenever the database does."""
+    stat = os.stat(DATABASE_PATH)
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}-{int(RENDERER is not None)}"
+
+
+@app.before_request
+def not_modified():
+    """Answer conditional GETs of database-backed pages before querying."""
+    if request.method != 'GET' or request.endpoint not in DB_BACKED_ENDPOINTS:
+        return None
+    g.db_version = database_version()
+    if not (request.if_none_match or request.if_modified_since):
+        return None
+    response = Response()
+    response.set_etag(g.db_version, weak=True)
+    response.last_modified = os.stat(DATABASE_PATH).st_mtime
+    response.make_conditional(request)
+    return response if response.status_code == 304 else None
+
+
+@app.after_request
+def cache_and_compress(response):
+    """Add validators to database-backed pages and gzip text responses."""
+    if 'db_version' in g and response.status_code == 200:
+        response.set_etag(g.db_version, weak=True)
+        response.last_modified = os.stat(DATABASE_PATH).st_mtime
+        response.cache_control.no_cache = True
+
+    if (
+        response.status_code == 200
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+        and not response.direct_passthrough
+        and 'Content-Encoding' not in response.headers
+        and request.accept_encodings['gzip']
+    ):
+        data = response.get_data()
+        if len(data) >= GZIP_MIN_BYTES:
+            response.set_data(gzip.compress(data, compresslevel=GZIP_LEVEL))
+            response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+    return response
+
+
 @app.template_filter('basename')
 def basename_filter(path):
     return Path(path).name if path else ''
 
 
+@app.template_filter('thumbnail')
+def thumbnail_filter(path, size):
+    """URL of an image's thumbnail, or of the image when thumbnails are off."""
+    name = Path(path).name if path else ''
+    if THUMBNAILS_DIR and size in THUMBNAIL_SIZES:
+        return f"/thumb/{size}/{name}"
+    return f"/image/{name}"
+
+
 @app.route('/')
-def home():
+def index():
+    """Document index, or the document's home page if there is only one."""
     db = get_db()
+    documents = db.execute(
+        "SELECT id, file_path, title FROM documents ORDER BY id"
+    ).fetchall()
+    if len(documents) == 1:
+        return home()
+    return render_template(
+        DOCUMENTS_TEMPLATE, documents=documents, stats=document_stats(db),
+    )
+
 
-    # Get document info
-    doc = db.execute("SELECT * FROM documents LIMIT 1").fetchone()
+@app.route('/doc/<int:doc_id>/')
+def home(doc_id=None):
+    db = get_db()
 
-    # Get stats
-    stats = {}
-    for table in ['pages', 'text_blocks', 'text_spans', 'images', 'lines', 'rects']:
-        stats[table] = db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    doc = db.execute(f"SELECT * FROM documents WHERE id = {DOCUMENT_SCOPE}", (doc_id,)).fetchone()
+    if not doc:
+        return "Document not found", 404
+    stats = document_stats(db, doc['id'])[doc['id']]
 
     # Get pages with element counts
     pages = db.execute("""
@@ -353,121 +780,440 @@ def home():
                    (SELECT COUNT(*) FROM lines WHERE page_id = p.id) +
                    (SELECT COUNT(*) FROM rects WHERE page_id = p.id) as element_count
             FROM pages p
+            WHERE p.document_id = ?
         ) WHERE element_count > 0
         ORDER BY page_number
-    """).fetchall()
+    """, (doc['id'],)).fetchall()
 
-    return render_template_string(HOME_TEMPLATE, doc=doc, stats=stats, pages=pages)
+    return render_template(HOME_TEMPLATE, doc=doc, stats=stats, pages=pages, base=_base(doc_id))
 
 
-@app.route('/pages')
-def pages():
+@app.route('/pages', defaults={'doc_id': None})
+@app.route('/doc/<int:doc_id>/pages')
+def pages(doc_id):
     db = get_db()
-    pages = db.execute("SELECT * FROM pages ORDER BY page_number").fetchall()
-    return render_template_string(PAGES_TEMPLATE, pages=pages)
+    pages = db.execute(
+        f"SELECT * FROM pages WHERE document_id = {DOCUMENT_SCOPE} ORDER BY page_number",
+        (doc_id,),
+    ).fetchall()
+    return render_template(PAGES_TEMPLATE, pages=pages, base=_base(doc_id))
 
 
-@app.route('/page/<int:page_number>')
-def page(page_number):
+@app.route('/page/<int:page_number>', defaults={'doc_id': None})
+@app.route('/doc/<int:doc_id>/page/<int:page_number>')
+def page(doc_id, page_number):
     db = get_db()
 
-    # Get page
-    page = db.execute(
-        "SELECT * FROM pages WHERE page_number = ?", (page_number,)
-    ).fetchone()
+    # Page, page count and all elements in one query
+    page = db.execute(PAGE_ELEMENTS_SQL, (doc_id, page_number)).fetchone()
 
     if not page:
         return "Page not found", 404
 
-    page_id = page['id']
-    total_pages = db.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
-
-    # Get elements
-    text_blocks = db.execute(
-        "SELECT * FROM text_blocks WHERE page_id = ? ORDER BY y0, x0", (page_id,)
-    ).fetchall()
+    elements = {table: json.loads(page[table]) for table in PAGE_ELEMENT_TABLES}
+    renderer = get_renderer(page['document_id'])
 
-    images = db.execute(
-        "SELECT * FROM images WHERE page_id = ?", (page_id,)
-    ).fetchall()
-
-    lines = db.execute(
-        "SELECT * FROM lines WHERE page_id = ?", (page_id,)
-    ).fetchall()
-
-    rects = db.execute(
-        "SELECT * FROM rects WHERE page_id = ?", (page_id,)
-    ).fetchall()
-
-    return render_template_string(
+    return render_template(
         PAGE_TEMPLATE,
         page=page,
         page_number=page_number,
-        total_pages=total_pages,
-        text_blocks=text_blocks,
-        images=images,
-        lines=lines,
-        rects=rects,
+        total_pages=page['total_pages'],
+        zoom_levels=renderer.zoom_levels if renderer else (),
+        base=_base(doc_id),
+        **elements,
     )
 
 
-@app.route('/images')
-def images():
+@app.route('/page/<int:page_number>/render', defaults={'doc_id': None})
+@app.route('/doc/<int:doc_id>/page/<int:page_number>/render')
+def render_page(doc_id, page_number):
+    """Rasterized page from the source PDF, served from the tile cache."""
+    renderer = get_renderer(doc_id)
+    if renderer is None:
+        return "Source PDF not available", 404
+
+    zoom = request.args.get('zoom', DEFAULT_ZOOM, type=float)
+    fmt = request.args.get('format', 'png').lower()
+    try:
+        try:
+            data = renderer.render(page_number, zoom, fmt)
+        except RuntimeError:
+            # Closed by eviction while in use; reopen it
+            renderer = get_renderer(doc_id)
+            if renderer is None:
+                return "Source PDF not available", 404
+            data = renderer.render(page_number, zoom, fmt)
+    except ValueError as e:
+        return str(e), 400
+    except IndexError:
+        return "Page not found", 404
+
+    response = Response(data, mimetype=RENDER_MIMETYPES[fmt])
+    response.cache_control.public = True
+    response.cache_control.max_age = RENDER_MAX_AGE
+    response.set_etag(hashlib.sha256(data).hexdigest())
+    return response.make_conditional(request, accept_ranges=True)
+
+
+@app.route('/page/<int:page_number>/overlay.svg', defaults={'doc_id': None})
+@app.route('/doc/<int:doc_id>/page/<int:page_number>/overlay.svg')
+def page_overlay(doc_id, page_number):
+    """SVG of the page's elements, column boundaries and header band.
+
+    Cached on disk per database version; ?guides=0 omits the guides.
+    """
     db = get_db()
+    page = db.execute(
+        f"SELECT id, width, height FROM pages WHERE document_id = {DOCUMENT_SCOPE} AND page_number = ?",
+        (doc_id, page_number),
+    ).fetchone()
+    if not page:
+        return "Page not found", 404
 
-    limit = 50
-    offset = int(request.args.get('offset', 0))
+    with_guides = request.args.get('guides', '1') != '0'
+    key, data = OVERLAYS.overlay(
+        db, page, f"{DATABASE_PATH}:{database_version()}", with_guides=with_guides,
+    )
+
+    response = Response(data, mimetype='image/svg+xml')
+    # Weak, since the gzip and identity encodings share it
+    response.set_etag(key, weak=True)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
-    total = db.execute("SELECT COUNT(*) FROM images").fetchone()[0]
 
-    images = db.execute("""
-        SELECT i.*, p.page_number
-        FROM images i
-        JOIN pages p ON i.page_id = p.id
-        ORDER BY p.page_number, i.id
-        LIMIT ? OFFSET ?
-    """, (limit, offset)).fetchall()
+@app.route('/images', defaults={'doc_id': None})
+@app.route('/doc/<int:doc_id>/images')
+def images(doc_id):
+    db = get_db()
+    cursor = request.args.get('cursor')
 
-    return render_template_string(
+    try:
+        images, next_cursor = keyset_page(
+            db, IMAGE_LIST_SQL, [f"p.document_id = {DOCUMENT_SCOPE}"], [doc_id],
+            cursor, _page_size(),
+        )
+    except ValueError as e:
+        return str(e), 400
+
+    return render_template(
         IMAGES_TEMPLATE,
         images=images,
-        total=total,
-        limit=limit,
-        offset=offset,
+        cursor=cursor,
+        next_cursor=next_cursor,
+        base=_base(doc_id),
     )
 
 
 @app.route('/image/<filename>')
 def serve_image(filename):
-    if IMAGES_DIR:
-        return send_from_directory(IMAGES_DIR, filename)
-    return "Images directory not configured", 404
+    """Extracted image with a content-hash ETag and long-lived caching.
+
+    send_from_directory answers If-None-Match with 304 and Range with 206.
+    """
+    if not IMAGES_DIR:
+        return "Images directory not configured", 404
+    path = os.path.join(IMAGES_DIR, filename)
+    if not os.path.isfile(path):
+        return "Image not found", 404
+    response = send_from_directory(
+        IMAGES_DIR, filename, etag=_file_digest(path), max_age=IMAGE_MAX_AGE,
+    )
+    response.cache_control.immutable = True
+    return response
+
+
+@app.route('/thumb/<int:size>/<filename>')
+def serve_thumbnail(size, filename):
+    """Downscaled image, generated on first request if the ingest did not."""
+    if not (IMAGES_DIR and THUMBNAILS_DIR) or size not in THUMBNAIL_SIZES:
+        return "Thumbnail not found", 404
+    source = Path(IMAGES_DIR) / filename
+    if source.parent != Path(IMAGES_DIR) or not source.is_file():
+        return "Image not found", 404
+
+    if not is_current(source, THUMBNAILS_DIR):
+        try:
+            make_thumbnails(str(source), THUMBNAILS_DIR)
+        except Exception:
+            return redirect(f"/image/{filename}")
+
+    path = thumbnail_path(THUMBNAILS_DIR, filename, size)
+    response = send_from_directory(
+        path.parent, path.name, etag=_file_digest(str(path)), max_age=IMAGE_MAX_AGE,
+    )
+    response.cache_control.immutable = True
+    return response
 
 
-@app.route('/search')
-def search():
+@app.route('/search', defaults={'doc_id': None})
+@app.route('/doc/<int:doc_id>/search')
+def search(doc_id):
     db = get_db()
     query = request.args.get('q', '')
+    cursor = request.args.get('cursor')
 
-    results = []
+    results, next_cursor = [], None
     if query:
-        results = db.execute("""
-            SELECT ts.*, p.page_number
-            FROM text_spans ts
-            JOIN pages p ON ts.page_id = p.id
-            WHERE ts.text LIKE ?
-            ORDER BY p.page_number, ts.y0, ts.x0
-            LIMIT 100
-        """, (f"%{query}%",)).fetchall()
-
-    return render_template_string(SEARCH_TEMPLATE, query=query, results=results)
+        try:
+            results, next_cursor = keyset_page(
+                db, SPAN_LIST_SQL, *_search_filters(doc_id, query), cursor, _page_size(),
+            )
+        except ValueError as e:
+            return str(e), 400
+
+    return render_template(
+        SEARCH_TEMPLATE,
+        query=query,
+        results=results,
+        cursor=cursor,
+        next_cursor=next_cursor,
+        base=_base(doc_id),
+    )
 
 
-def run_viewer(db_path: str, images_dir: str = None, host: str = '127.0.0.1', port: int = 5000):
-    """Run the viewer server."""
-    global DATABASE_PATH, IMAGES_DIR
+def _api_page(select_sql: str, filters: list[str], params: list):
+    """JSON body for one keyset page: items, next_cursor and limit."""
+    limit = _page_size()
+    try:
+        rows, next_cursor = keyset_page(
+            get_db(), select_sql, filters, params, request.args.get('cursor'), limit,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({
+        "items": [dict(row) for row in rows],
+        "next_cursor": next_cursor,
+        "limit": limit,
+    })
+
+
+@app.route('/api/images', defaults={'doc_id': None})
+@app.route('/doc/<int:doc_id>/api/images')
+def api_images(doc_id):
+    """Images ordered by (page_number, id). Params: cursor, limit."""
+    return _api_page(IMAGE_LIST_SQL, [f"p.document_id = {DOCUMENT_SCOPE}"], [doc_id])
+
+
+@app.route('/api/spans', defaults={'doc_id': None})
+@app.route('/doc/<int:doc_id>/api/spans')
+def api_spans(doc_id):
+    """Text spans ordered by (page_number, id). Params: page, cursor, limit."""
+    filters, params = [f"p.document_id = {DOCUMENT_SCOPE}"], [doc_id]
+    page_number = request.args.get('page', type=int)
+    if page_number is not None:
+        filters.append("p.page_number = ?")
+        params.append(page_number)
+    return _api_page(SPAN_LIST_SQL, filters, params)
+
+
+@app.route('/api/search', defaults={'doc_id': None})
+@app.route('/doc/<int:doc_id>/api/search')
+def api_search(doc_id):
+    """Spans containing q, ordered by (page_number, id). Params: q, cursor, limit."""
+    query = request.args.get('q', '')
+    if not query:
+        return jsonify({"error": "Missing query parameter q"}), 400
+    return _api_page(SPAN_LIST_SQL, *_search_filters(doc_id, query))
+
+
+def _source_pdf(db_path: str, document_id: Optional[int] = None) -> Optional[Path]:
+    """Locate the source PDF recorded in documents.file_path (first document by default)."""
+    with sqlite3.connect(db_path) as conn:
+        row = conn.execute(
+            f"SELECT file_path FROM documents WHERE id = {DOCUMENT_SCOPE}", (document_id,)
+        ).fetchone()
+    if not row or not row[0]:
+        return None
+    path = Path(row[0])
+    # Relative paths are tried from the working directory, then the database
+    for candidate in (path, Path(db_path).parent / path):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def table_page_numbers(db_path: str, document_id: Optional[int] = None) -> list[int]:
+    """Pages of a document (the first by default) containing the summary table title."""
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(f"""
+            SELECT DISTINCT p.page_number
+            FROM text_blocks tb
+            JOIN pages p ON tb.page_id = p.id
+            WHERE p.document_id = {DOCUMENT_SCOPE} AND UPPER(tb.full_text) LIKE ?
+            ORDER BY p.page_number
+        """, (document_id, f"%{TABLE_PAGE_MARKER}%")).fetchall()
+    return [row[0] for row in rows]
+
+
+def configure_viewer(
+    db_path: str,
+    images_dir: str = None,
+    render_cache_dir: str = None,
+    cache_max_bytes: int = DEFAULT_CACHE_BYTES,
+    render_workers: int = 2,
+    prewarm: bool = True,
+    thumbnails_dir: str = None,
+    overlay_cache_dir: str = None,
+) -> Optional[PageRenderer]:
+    """Point the viewer at a database and set up page rendering.
+
+    Args:
+        db_path: Element database.
+        images_dir: Directory of extracted images.
+        render_cache_dir: Tile cache directory. Defaults to
+                          ``<db stem>_render_cache`` next to the database.
+        cache_max_bytes: Tile cache size budget.
+        render_workers: Render threads.
+        prewarm: Render table pages and missing thumbnails in the
+                 background at startup.
+        thumbnails_dir: Thumbnail cache. Defaults to ``<images_dir>_thumbs``.
+        overlay_cache_dir: SVG overlay cache. Defaults to
+                           ``<db stem>_overlay_cache`` next to the database.
+
+    Returns:
+        The first document's page renderer, or None if its source PDF
+        cannot be found. Other documents' renderers are opened on demand.
+    """
+    global DATABASE_PATH, IMAGES_DIR, THUMBNAILS_DIR, RENDERER, OVERLAYS
+    global DEFAULT_DOCUMENT_ID, TILE_CACHE, RENDER_WORKERS, RENDER_PREWARM
     DATABASE_PATH = db_path
     IMAGES_DIR = images_dir
+    RENDER_WORKERS = render_workers
+    RENDER_PREWARM = prewarm
+
+    if overlay_cache_dir is None:
+        overlay_cache_dir = Path(db_path).with_name(f"{Path(db_path).stem}_overlay_cache")
+    OVERLAYS = OverlayCache(str(overlay_cache_dir), guides=core_analysis_guides())
+    THUMBNAILS_DIR = None
+    if images_dir:
+        THUMBNAILS_DIR = str(thumbnails_dir or default_thumbnail_dir(images_dir))
+        if prewarm:
+            threading.Thread(
+                target=generate_thumbnails,
+                args=(images_dir, THUMBNAILS_DIR),
+                name="thumbnails",
+                daemon=True,
+            ).start()
+
+    if RENDERER is not None:
+        RENDERER.close()
+        RENDERER = None
+    _close_renderers()
+
+    with sqlite3.connect(db_path) as conn:
+        DEFAULT_DOCUMENT_ID = conn.execute("SELECT MIN(id) FROM documents").fetchone()[0]
+
+    if render_cache_dir is None:
+        render_cache_dir = Path(db_path).with_name(f"{Path(db_path).stem}_render_cache")
+    TILE_CACHE = TileCache(str(render_cache_dir), max_bytes=cache_max_bytes)
+    if DEFAULT_DOCUMENT_ID is not None:
+        RENDERER = _open_renderer(DEFAULT_DOCUMENT_ID)
+    return RENDERER
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    """Request handler without per-request access logging."""
+
+    def log_request(self, code='-', size='-'):
+        pass
+
+
+class PooledWSGIServer(WSGIServer):
+    """wsgiref server that handles requests on a bounded thread pool.
+
+    While every thread is busy, the accept loop blocks, so further
+    connections wait in the listen backlog (request_queue_size) rather
+    than piling up as accepted sockets.
+    """
+
+    request_queue_size = 128
+
+    def __init__(self, *args, threads: int = DEFAULT_SERVER_THREADS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="viewer")
+        self._idle_threads = threading.BoundedSemaphore(threads)
+
+    def process_request(self, request, client_address):
+        self._idle_threads.acquire()
+        try:
+            self.pool.submit(self._handle, request, client_address)
+        except BaseException:
+            self._idle_threads.release()
+            self.shutdown_request(request)
+            raise
+
+    def _handle(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._idle_threads.release()
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=False)
+
+
+def make_production_server(host: str, port: int, threads: int = DEFAULT_SERVER_THREADS):
+    """Build the pooled WSGI server used when waitress is not installed."""
+    return make_server(
+        host, port, app,
+        server_class=partial(PooledWSGIServer, threads=threads),
+        handler_class=_QuietRequestHandler,
+    )
+
+
+def serve_production(host: str, port: int, threads: int = DEFAULT_SERVER_THREADS) -> None:
+    """Serve with templates precompiled on a multi-threaded WSGI server.
+
+    Uses waitress if installed, otherwise a thread-pooled wsgiref server.
+    """
+    precompile_templates()
+    try:
+        from waitress import serve
+    except ImportError:
+        server = make_production_server(host, port, threads=threads)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+        return
+    serve(app, host=host, port=port, threads=threads)
+
+
+def run_viewer(
+    db_path: str,
+    images_dir: str = None,
+    host: str = '127.0.0.1',
+    port: int = 5000,
+    render_cache_dir: str = None,
+    cache_max_bytes: int = DEFAULT_CACHE_BYTES,
+    render_workers: int = 2,
+    prewarm: bool = True,
+    serve: str = "development",
+    threads: int = DEFAULT_SERVER_THREADS,
+):
+    """Run the viewer server.
+
+    Args:
+        serve: "development" for Flask's built-in server, or "production"
+               for a multi-threaded WSGI server (see serve_production).
+        threads: Request threads in production mode.
+    """
+    if serve not in SERVE_MODES:
+        raise ValueError(f"Unknown serve mode {serve!r}; choose from {', '.join(SERVE_MODES)}")
+
+    renderer = configure_viewer(
+        db_path,
+        images_dir=images_dir,
+        render_cache_dir=render_cache_dir,
+        cache_max_bytes=cache_max_bytes,
+        render_workers=render_workers,
+        prewarm=prewarm,
+    )
 
     print(f"\n{'='*50}")
     print("PDF Element Viewer")
@@ -475,10 +1221,18 @@ def run_viewer(db_path: str, images_dir: str = None, host: str = '127.0.0.1', po
     print(f"Database: {db_path}")
     if images_dir:
         print(f"Images: {images_dir}")
+    if renderer:
+        print(f"Page renders: {renderer.pdf_path} (cache: {renderer.cache.cache_dir})")
+    else:
+        print("Page renders: disabled (source PDF not found)")
+    print(f"Server: {serve}" + (f" ({threads} threads)" if serve == "production" else ""))
     print(f"\nOpen in browser: http://{host}:{port}")
     print(f"{'='*50}\n")
 
-    app.run(host=host, port=port, debug=False)
+    if serve == "production":
+        serve_production(host, port, threads=threads)
+    else:
+        app.run(host=host, port=port, debug=False)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,183 @@
+"""Indexed header matching for table consolidation.
+
+pdfplumber finds one table per page of a long data listing, and
+consolidating them compares every table's headers against every header
+group, column by column, with SequenceMatcher. HeaderIndex keeps that
+cheap:
+
+- header rows are hashed by their normalized signature, so a row seen
+  before resolves to its group with one dict lookup
+- groups are bucketed by column count, the only ones a row can match
+- a character-count bound (unigram overlap) skips SequenceMatcher for
+  header pairs that cannot reach the threshold
+- bounds and similarities are cached per header pair
+
+Results are the same as the all-pairs comparison: the bound never
+underestimates SequenceMatcher.ratio(), and groups are still tried in
+creation order.
+
+    index = HeaderIndex(threshold=0.8)
+    group = index.find_or_add(table.headers, table)
+    mapping = column_mapping(table.headers, group.headers, 0.8)
+"""
+
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Any, Optional
+
+MAX_SIMILARITY_CACHE_ENTRIES = 65536
+
+# Share of columns that must be similar for two header rows to match
+MIN_MATCHING_COLUMNS = 0.8
+
+
+def normalize_header(header: str) -> str:
+    return header.lower()
+
+
+def header_signature(headers: list[str]) -> tuple[str, ...]:
+    """Hashable normalized form of a header row."""
+    return tuple(normalize_header(h) for h in headers)
+
+
+@lru_cache(maxsize=MAX_SIMILARITY_CACHE_ENTRIES)
+def _char_counts(header: str) -> Counter:
+    return Counter(header)
+
+
+@lru_cache(maxsize=MAX_SIMILARITY_CACHE_ENTRIES)
+def header_similarity(a: str, b: str) -> float:
+    """SequenceMatcher ratio of two normalized headers."""
+    return SequenceMatcher(None, a, b).ratio()
+
+
+@lru_cache(maxsize=MAX_SIMILARITY_CACHE_ENTRIES)
+def _similarity_bound(a: str, b: str) -> float:
+    """Upper bound of header_similarity from shared character counts.
+
+    Matching blocks can only pair characters both headers contain, so
+    this is never below the real ratio (it is SequenceMatcher.quick_ratio).
+    """
+    total = len(a) + len(b)
+    if not total:
+        return 1.0
+    return 2 * sum((_char_counts(a) & _char_counts(b)).values()) / total
+
+
+def similarity_at_least(a: str, b: str, threshold: float) -> Optional[float]:
+    """header_similarity(a, b) if it reaches threshold, else None."""
+    if a == b:
+        return 1.0
+    total = len(a) + len(b)
+    # Length bound first, then the character-count bound
+    if 2 * min(len(a), len(b)) < threshold * total or _similarity_bound(a, b) < threshold:
+        return None
+    similarity = header_similarity(a, b)
+    return similarity if similarity >= threshold else None
+
+
+def signatures_match(sig1: tuple[str, ...], sig2: tuple[str, ...], threshold: float) -> bool:
+    """Whether enough columns of two header signatures are similar."""
+    if len(sig1) != len(sig2):
+        return False
+    required = len(sig1) * MIN_MATCHING_COLUMNS
+    misses = 0
+    for h1, h2 in zip(sig1, sig2):
+        if similarity_at_least(h1, h2, threshold) is None:
+            misses += 1
+            # Stop once the remaining columns cannot make up the shortfall
+            if len(sig1) - misses < required:
+                return False
+    return True
+
+
+def column_mapping(
+    source_headers: list[str],
+    target_headers: list[str],
+    threshold: float,
+) -> dict[int, int]:
+    """Map each source column to its most similar target column.
+
+    Ties go to the first target column; columns with no target at
+    threshold similarity are left out.
+    """
+    source = header_signature(source_headers)
+    target = header_signature(target_headers)
+    exact: dict[str, int] = {}
+    for tgt_idx, tgt_header in enumerate(target):
+        exact.setdefault(tgt_header, tgt_idx)
+
+    mapping = {}
+    for src_idx, src_header in enumerate(source):
+        # An identical header is the only way to reach 1.0
+        if src_header in exact:
+            mapping[src_idx] = exact[src_header]
+            continue
+        best_idx, best_similarity = None, 0.0
+        for tgt_idx, tgt_header in enumerate(target):
+            similarity = similarity_at_least(src_header, tgt_header, max(threshold, best_similarity))
+            if similarity is not None and similarity > best_similarity:
+                best_idx, best_similarity = tgt_idx, similarity
+        if best_idx is not None:
+            mapping[src_idx] = best_idx
+    return mapping
+
+
+class HeaderGroup:
+    """Tables consolidated under one header row.
+
+    Attributes:
+        headers: Headers of the group's first table.
+        signature: header_signature of headers.
+        members: Caller's records of the group's tables.
+    """
+
+    __slots__ = ("headers", "signature", "members")
+
+    def __init__(self, headers: list[str], signature: tuple[str, ...]):
+        self.headers = headers
+        self.signature = signature
+        self.members: list[Any] = []
+
+
+class HeaderIndex:
+    """Groups header rows by similarity, first matching group first.
+
+    Args:
+        threshold: Similarity at which two headers count as the same column.
+    """
+
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.groups: list[HeaderGroup] = []
+        self._by_signature: dict[tuple[str, ...], HeaderGroup] = {}
+        self._by_width: dict[int, list[HeaderGroup]] = {}
+
+    def find(self, headers: list[str]) -> Optional[HeaderGroup]:
+        """First group whose headers match, or None."""
+        signature = header_signature(headers)
+        group = self._by_signature.get(signature)
+        if group is None:
+            for candidate in self._by_width.get(len(signature), ()):
+                if signatures_match(candidate.signature, signature, self.threshold):
+                    group = candidate
+                    break
+            if group is None:
+                return None
+            # Groups are never removed or changed, so the first match of a
+            # signature stays its first match
+            self._by_signature[signature] = group
+        return group
+
+    def find_or_add(self, headers: list[str], member: Any = None) -> HeaderGroup:
+        """Add a member to its header group, starting a group if none match."""
+        group = self.find(headers)
+        if group is None:
+            signature = header_signature(headers)
+            group = HeaderGroup(headers, signature)
+            self.groups.append(group)
+            self._by_signature[signature] = group
+            self._by_width.setdefault(len(signature), []).append(group)
+        group.members.append(member)
+        return group
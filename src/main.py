@@ -3,11 +3,14 @@
 import json
 import sys
 from pathlib import Path
+from typing import Optional
 
 import click
 
 from .page_classifier import PageClassifier
+from .page_sampling import DEFAULT_SAMPLE_PAGES, MIN_SAMPLE_PAGES
 from .pdf_dissector import PDFDissector
+from .table_engines import DEFAULT_ENGINE, ENGINES
 from .table_extractor import TableExtractor
 
 
@@ -21,17 +24,31 @@ def cli():
 @cli.command()
 @click.argument("pdf_path", type=click.Path(exists=True))
 @click.option("--json-output", "-j", is_flag=True, help="Output as JSON")
-def analyze(pdf_path: str, json_output: bool):
+@click.option("--workers", "-w", type=int, default=None,
+              help="Worker processes for page analysis (default: CPU count; 1 = serial)")
+@click.option("--sample", "-s", is_flag=True,
+              help="Quick pre-scan: analyze a page sample and extrapolate with confidence bounds")
+@click.option("--sample-pages", type=click.IntRange(min=MIN_SAMPLE_PAGES), default=DEFAULT_SAMPLE_PAGES, show_default=True,
+              help="Pages analyzed by --sample")
+def analyze(pdf_path: str, json_output: bool, workers: Optional[int], sample: bool, sample_pages: int):
     """Analyze PDF structure and metadata.
 
     Extracts page count, metadata, fonts, and per-page structure information.
+    With --sample, estimates document-wide statistics from a page sample
+    instead, for triage of very long files.
     """
     try:
         with PDFDissector(pdf_path) as dissector:
-            summary = dissector.get_summary()
+            if sample:
+                summary = dissector.sample(max_pages=sample_pages).to_dict()
+            else:
+                dissector.analyze(workers=workers)
+                summary = dissector.get_summary()
 
         if json_output:
             click.echo(json.dumps(summary, indent=2))
+        elif sample:
+            _print_sample(summary)
         else:
             _print_analysis(summary)
 
@@ -82,6 +99,40 @@ def _print_analysis(summary: dict):
         )
 
 
+def _print_sample(summary: dict):
+    """Print sampled estimates in human-readable format."""
+    click.echo("\n" + "=" * 60)
+    click.echo("PDF STRUCTURE PRE-SCAN")
+    click.echo("=" * 60)
+
+    sampled = len(summary["sampled_pages"])
+    click.echo(f"\nFile: {summary['file_path']}")
+    click.echo(f"Pages: {summary['page_count']} ({sampled} sampled, {summary['sample_fraction']:.1%})")
+    if not summary["exact"]:
+        click.echo(f"Bounds: {summary['confidence']:.0%} confidence")
+
+    def row(name: str, estimate: dict):
+        click.echo(
+            f"{name:<14}{estimate['total']:>12,.0f}{estimate['low']:>12,.0f}"
+            f"{estimate['high']:>12,.0f}{estimate['per_page']:>12.2f}"
+        )
+
+    click.echo(f"\n{'Estimate':<14}{'Total':>12}{'Low':>12}{'High':>12}{'Per page':>12}")
+    click.echo("-" * 62)
+    for name, estimate in summary["metrics"].items():
+        row(name, estimate)
+    row("text pages", summary["text_pages"])
+
+    click.echo("\n--- Page Types ---")
+    for name, estimate in summary["page_types"].items():
+        row(name, estimate)
+
+    if summary["anomalies"]:
+        click.echo("\n--- Anomalies ---")
+        for anomaly in summary["anomalies"]:
+            click.echo(f"  ! {anomaly}")
+
+
 @cli.command()
 @click.argument("pdf_path", type=click.Path(exists=True))
 @click.option("--json-output", "-j", is_flag=True, help="Output as JSON")
@@ -144,7 +195,22 @@ def _print_classification(summary: dict):
 @click.option("--pages", "-p", help="Comma-separated page numbers to extract (e.g., '2,3,4')")
 @click.option("--all-pages", "-a", is_flag=True, help="Extract from all pages, not just classified tables")
 @click.option("--json-output", "-j", is_flag=True, help="Output summary as JSON")
-def extract(pdf_path: str, output: str, pages: str, all_pages: bool, json_output: bool):
+@click.option("--engine", "-e", type=click.Choice(list(ENGINES)), default=DEFAULT_ENGINE, show_default=True,
+              help="Table detection engine")
+@click.option("--workers", "-w", type=int, default=None,
+              help="Worker processes for page extraction (default: CPU count; 1 = serial)")
+@click.option("--chunk-pages", type=click.IntRange(min=1), default=None,
+              help="Stream pages in groups of this many with bounded memory (for very long appendices)")
+def extract(
+    pdf_path: str,
+    output: str,
+    pages: str,
+    all_pages: bool,
+    json_output: bool,
+    engine: str,
+    workers: Optional[int],
+    chunk_pages: Optional[int],
+):
     """Extract table data to CSV and JSON.
 
     By default, extracts from pages classified as tables.
@@ -168,22 +234,32 @@ def extract(pdf_path: str, output: str, pages: str, all_pages: bool, json_output
                 click.echo("No table pages detected. Use --all-pages to extract from all pages.")
                 return
 
-        # Extract tables
-        extractor = TableExtractor(pdf_path)
-        result = extractor.extract_tables(page_numbers)
-
-        if not result.tables:
-            click.echo("No tables found in specified pages.")
-            return
-
-        # Save output
+        # Extract tables and save output
+        extractor = TableExtractor(pdf_path, engine=engine)
         output_dir = Path(output)
         pdf_name = Path(pdf_path).stem
 
-        csv_path = extractor.save_csv(result, output_dir / f"{pdf_name}_tables.csv")
-        json_path = extractor.save_json(result, output_dir / f"{pdf_name}_tables.json")
+        if chunk_pages:
+            with extractor.extract_tables_streaming(
+                page_numbers, workers=workers, pages_per_chunk=chunk_pages
+            ) as stream:
+                if not stream.result.tables:
+                    click.echo("No tables found in specified pages.")
+                    return
+
+                csv_path = stream.save_csv(output_dir / f"{pdf_name}_tables.csv")
+                json_path = stream.save_json(output_dir / f"{pdf_name}_tables.json")
+                summary = stream.get_summary()
+        else:
+            result = extractor.extract_tables(page_numbers, workers=workers)
 
-        summary = extractor.get_summary(result)
+            if not result.tables:
+                click.echo("No tables found in specified pages.")
+                return
+
+            csv_path = extractor.save_csv(result, output_dir / f"{pdf_name}_tables.csv")
+            json_path = extractor.save_json(result, output_dir / f"{pdf_name}_tables.json")
+            summary = extractor.get_summary(result)
 
         if json_output:
             summary["csv_output"] = csv_path
@@ -234,7 +310,11 @@ def _print_extraction(summary: dict, csv_path: str, json_path: str):
     help="Output directory for extracted data",
 )
 @click.option("--json-output", "-j", is_flag=True, help="Output all results as JSON")
-def full(pdf_path: str, output: str, json_output: bool):
+@click.option("--engine", "-e", type=click.Choice(list(ENGINES)), default=DEFAULT_ENGINE, show_default=True,
+              help="Table detection engine")
+@click.option("--workers", "-w", type=int, default=None,
+              help="Worker processes for analysis and extraction (default: CPU count; 1 = serial)")
+def full(pdf_path: str, output: str, json_output: bool, engine: str, workers: Optional[int]):
     """Run full pipeline: analyze, classify, and extract.
 
     Performs complete PDF dissection and saves extracted table data.
@@ -245,7 +325,7 @@ def full(pdf_path: str, output: str, json_output: bool):
         # Step 1: Analyze
         click.echo("Step 1/3: Analyzing PDF structure...")
         with PDFDissector(pdf_path) as dissector:
-            structure = dissector.analyze()
+            structure = dissector.analyze(workers=workers)
             results["analysis"] = dissector.get_summary()
 
         # Step 2: Classify
@@ -258,8 +338,8 @@ def full(pdf_path: str, output: str, json_output: bool):
         # Step 3: Extract
         click.echo("Step 3/3: Extracting tables...")
         if table_pages:
-            extractor = TableExtractor(pdf_path)
-            extraction_result = extractor.extract_tables(table_pages)
+            extractor = TableExtractor(pdf_path, engine=engine)
+            extraction_result = extractor.extract_tables(table_pages, workers=workers)
             results["extraction"] = extractor.get_summary(extraction_result)
 
             if extraction_result.tables:
@@ -82,6 +82,7 @@ class PageInfo:
     text_content: str = ""
     char_count: int = 0
     word_count: int = 0
+    layout_fingerprint: Optional[int] = None  # see elementizer.layout_index
 
     @property
     def horizontal_lines(self) -> list[LineInfo]:
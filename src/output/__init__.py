@@ -1,5 +1,6 @@
 """Output formatting and sanitization utilities."""
 
+from .columnar import read_columnar, write_columnar
 from .csv_sanitizer import sanitize_csv_value, write_csv_with_bom
 
-__all__ = ["sanitize_csv_value", "write_csv_with_bom"]
+__all__ = ["read_columnar", "sanitize_csv_value", "write_columnar", "write_csv_with_bom"]
@@ -0,0 +1,213 @@
+"""Typed columnar output (Parquet/NPZ) for extracted core samples.
+
+Numeric measurement columns are written as float64 alongside a compact
+uint8 indicator column per measurement, so merged indicators like ``+``,
+``<0.0001`` and ``**`` survive without forcing downstream readers through
+string CSV parsing.
+
+Parquet output requires pyarrow; NPZ output requires only NumPy.
+"""
+
+import math
+from pathlib import Path
+from typing import Iterable, Optional
+
+# Indicator codes stored in each ``<column>_indicator`` column
+INDICATOR_VALUE = 0         # Numeric value present
+INDICATOR_MISSING = 1       # Blank cell
+INDICATOR_PLUS = 2          # "+" merged below-detection marker
+INDICATOR_LESS_THAN = 3     # "<X" detection limit; value column holds X
+INDICATOR_NOT_MEASURED = 4  # "**" merged saturation marker
+INDICATOR_OTHER = 5         # Unrecognized text
+
+INDICATOR_NAMES = {
+    INDICATOR_VALUE: "value",
+    INDICATOR_MISSING: "missing",
+    INDICATOR_PLUS: "+",
+    INDICATOR_LESS_THAN: "<",
+    INDICATOR_NOT_MEASURED: "**",
+    INDICATOR_OTHER: "other",
+}
+
+INDICATOR_SUFFIX = "_indicator"
+
+# Text identifier columns and numeric measurement columns, in CSV order
+ID_COLUMNS = ["core_number", "sample_number"]
+MEASUREMENT_COLUMNS = [
+    "depth_feet",
+    "permeability_air_md", "permeability_klink_md",
+    "porosity_ambient_pct", "porosity_ncs_pct",
+    "grain_density_gcc",
+    "saturation_water_pct", "saturation_oil_pct", "saturation_total_pct",
+]
+
+FORMATS = ("parquet", "npz")
+FORMAT_SUFFIXES = {"parquet": ".parquet", "npz": ".npz"}
+
+
+def encode_value(value) -> tuple[float, int]:
+    """Encode a sample cell as (float64 value, indicator code)."""
+    if value is None:
+        return math.nan, INDICATOR_MISSING
+    if not isinstance(value, str):
+        return float(value), INDICATOR_VALUE
+    if value == "+":
+        return math.nan, INDICATOR_PLUS
+    if value == "**":
+        return math.nan, INDICATOR_NOT_MEASURED
+    if value.startswith("<"):
+        try:
+            return float(value[1:].replace(",", "")), INDICATOR_LESS_THAN
+        except ValueError:
+            return math.nan, INDICATOR_LESS_THAN
+    try:
+        return float(value.replace(",", "")), INDICATOR_VALUE
+    except ValueError:
+        return math.nan, INDICATOR_OTHER
+
+
+def decode_value(value: float, code: int):
+    """Decode a (value, indicator code) pair back to the sample cell form."""
+    if code == INDICATOR_VALUE:
+        return value
+    if code == INDICATOR_PLUS:
+        return "+"
+    if code == INDICATOR_NOT_MEASURED:
+        return "**"
+    if code == INDICATOR_LESS_THAN:
+        return "<" if math.isnan(value) else f"<{value!r}"
+    return None
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "NumPy is required for columnar output. Install with: pip install numpy"
+        ) from e
+    return np
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_format(fmt: str = "auto") -> str:
+    """Resolve 'auto' to parquet when pyarrow is installed, else npz."""
+    if fmt == "auto":
+        return "parquet" if _has_pyarrow() else "npz"
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown columnar format '{fmt}', expected one of {FORMATS}")
+    return fmt
+
+
+def samples_to_columns(samples: Iterable, source: Optional[str] = None) -> dict:
+    """Convert samples to typed NumPy columns.
+
+    Args:
+        samples: CoreSample-like objects.
+        source: Optional document name added as a constant ``source`` column.
+
+    Returns:
+        Dict of column name to NumPy array: string identifier columns,
+        float64 measurement columns with uint8 ``*_indicator`` columns,
+        and an int32 ``page_number`` column.
+    """
+    np = _require_numpy()
+
+    # SampleTable already holds typed buffers
+    if hasattr(samples, "numpy_columns"):
+        table_columns = samples.numpy_columns()
+        columns = {}
+        if source is not None:
+            columns["source"] = np.array([source] * len(samples), dtype=str)
+        columns.update(table_columns)
+        return columns
+
+    samples = list(samples)
+    count = len(samples)
+
+    columns = {}
+    if source is not None:
+        columns["source"] = np.array([source] * count, dtype=str)
+    for name in ID_COLUMNS:
+        columns[name] = np.array([str(getattr(s, name)) for s in samples], dtype=str)
+
+    for name in MEASUREMENT_COLUMNS:
+        values = np.empty(count, dtype=np.float64)
+        codes = np.empty(count, dtype=np.uint8)
+        for i, sample in enumerate(samples):
+            values[i], codes[i] = encode_value(getattr(sample, name))
+        columns[name] = values
+        columns[name + INDICATOR_SUFFIX] = codes
+
+    columns["page_number"] = np.array([s.page_number for s in samples], dtype=np.int32)
+    return columns
+
+
+def write_columns(columns: dict, output_path: str, fmt: str = "auto") -> str:
+    """Write prepared columns to Parquet or NPZ.
+
+    The output suffix is set from the resolved format.
+
+    Returns:
+        Path to saved file.
+    """
+    fmt = resolve_format(fmt)
+    output_path = Path(output_path).with_suffix(FORMAT_SUFFIXES[fmt])
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    legend = ",".join(f"{code}={name}" for code, name in INDICATOR_NAMES.items())
+
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.table(columns)
+        table = table.replace_schema_metadata({"indicator_codes": legend})
+        pq.write_table(table, output_path)
+    else:
+        np = _require_numpy()
+        np.savez_compressed(output_path, indicator_codes=np.array(legend), **columns)
+
+    return str(output_path)
+
+
+def write_columnar(
+    samples: Iterable,
+    output_path: str,
+    fmt: str = "auto",
+    source: Optional[str] = None,
+) -> str:
+    """Write samples to a typed columnar file.
+
+    Args:
+        samples: CoreSample-like objects.
+        output_path: Destination path; the suffix is set from the format.
+        fmt: 'parquet', 'npz', or 'auto' (parquet when pyarrow is installed).
+        source: Optional document name added as a ``source`` column.
+
+    Returns:
+        Path to saved file.
+    """
+    return write_columns(samples_to_columns(samples, source=source), output_path, fmt)
+
+
+def read_columnar(path: str) -> dict:
+    """Load a Parquet or NPZ file written by write_columnar as NumPy arrays."""
+    np = _require_numpy()
+    path = Path(path)
+
+    if path.suffix == FORMAT_SUFFIXES["parquet"]:
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+        return {name: table.column(name).to_numpy() for name in table.column_names}
+
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files if name != "indicator_codes"}
@@ -1,7 +1,7 @@
 """CSV injection prevention and output utilities."""
 
 import csv
-from typing import List
+from typing import Iterable, List
 
 
 # Characters that trigger formula execution in spreadsheet applications
@@ -52,7 +52,7 @@ def sanitize_csv_value(value: str) -> str:
 
 
 def write_csv_with_bom(
-    rows: List[List[str]],
+    rows: Iterable[List[str]],
     output_path: str,
     headers: List[str],
     sanitize_headers: bool = True,
@@ -64,7 +64,7 @@ def write_csv_with_bom(
     the file as UTF-8 encoded, preventing character encoding issues.
 
     Args:
-        rows: Data rows to write.
+        rows: Data rows to write; any iterable, written as it is consumed.
         output_path: Destination file path.
         headers: Header row.
         sanitize_headers: If True, apply CSV injection protection to headers.
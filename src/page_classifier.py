@@ -1,10 +1,33 @@
-"""Page classification module for determining page content types."""
+"""Page classification module for determining page content types.
 
+classify_structure classifies all pages at once: per-page features
+(line counts, image coverage, line regularity) are built as NumPy arrays
+and the decision rules are applied as array masks, so thousands of pages
+take a handful of vector operations. Without NumPy it falls back to
+classify_page for each page, with identical results.
+
+With a LayoutIndex, a page whose layout fingerprint matches a template
+the rules already labeled takes that label without computing features.
+"""
+
+from itertools import chain
+from typing import Optional
+
+from .elementizer.layout_index import LayoutIndex, Template
 from .models import PageClassification, PageInfo, PageType, PDFStructure
 
 
 class PageClassifier:
-    """Classifies pages based on structural heuristics."""
+    """Classifies pages based on structural heuristics.
+
+    Args:
+        layout_index: Template index shared across pages and documents.
+                      Pages matching a labeled template copy its
+                      classification (including its line counts and image
+                      coverage); other pages are classified by the rules
+                      and added. Page 1 always goes through the rules,
+                      since the cover rules depend on it.
+    """
 
     # Thresholds for classification
     MIN_LINES_FOR_TABLE = 5
@@ -13,24 +36,209 @@ class PageClassifier:
     IMAGE_COVERAGE_THRESHOLD = 0.5  # 50% of page
     BLANK_THRESHOLD = 10  # chars
 
+    # Decision rules in priority order, as used by _determine_type:
+    # (page type, confidence, notes template)
+    RULES = [
+        (PageType.BLANK, 0.95, "Minimal content detected"),
+        (PageType.COVER, 0.7, "First page with image, likely cover"),
+        (PageType.COVER, 0.6, "First page with sparse text, likely cover"),
+        (PageType.FIGURE, 0.85, "Image coverage {image_coverage:.1%}"),
+        (PageType.TABLE, 0.9, "Grid structure: {h_lines}H x {v_lines}V lines"),
+        (PageType.TABLE, 0.75, "Regular line pattern with {text_blocks} text blocks"),
+        (PageType.MIXED, 0.6, "Lines present but irregular pattern"),
+        (PageType.NARRATIVE, 0.8, "Dense text, few structural lines"),
+        (PageType.MIXED, 0.5, "Structured text without clear table markers"),
+        (PageType.UNKNOWN, 0.3, "Unable to determine page type"),
+    ]
+
+    def __init__(self, layout_index: Optional[LayoutIndex] = None):
+        self.layout_index = layout_index
+
     def classify_structure(self, structure: PDFStructure) -> dict[int, PageClassification]:
         """Classify all pages in a PDF structure."""
+        return self.classify_pages(structure.pages)
+
+    def classify_pages(self, pages: list[PageInfo]) -> dict[int, PageClassification]:
+        """Classify many pages in one vectorized pass (per page without NumPy).
+
+        Templates learned from this batch serve later calls.
+        """
+        matched = {}
+        for page_info in pages:
+            template = self._template_for(page_info)
+            if template is not None:
+                matched[page_info.page_number] = self._from_template(page_info, template)
+        by_rules = self._classify_pages_by_rules([p for p in pages if p.page_number not in matched])
+        for page_info in pages:
+            if page_info.page_number in by_rules:
+                self._learn(page_info, by_rules[page_info.page_number])
+        return {p.page_number: matched.get(p.page_number) or by_rules[p.page_number] for p in pages}
+
+    def _classify_pages_by_rules(self, pages: list[PageInfo]) -> dict[int, PageClassification]:
+        try:
+            import numpy as np
+        except ImportError:
+            return {page_info.page_number: self._classify_page_by_rules(page_info) for page_info in pages}
+
+        features = self._page_features(pages, np)
+        rules = self._apply_rules(features, np)
+
         classifications = {}
-        for page_info in structure.pages:
-            classifications[page_info.page_number] = self.classify_page(page_info)
+        for page_info, rule, h_lines, v_lines, text_blocks, image_coverage in zip(
+            pages,
+            rules.tolist(),
+            features["h_lines"].tolist(),
+            features["v_lines"].tolist(),
+            features["text_blocks"].tolist(),
+            features["image_coverage"].tolist(),
+        ):
+            page_type, confidence, notes = self.RULES[rule]
+            classifications[page_info.page_number] = PageClassification(
+                page_number=page_info.page_number,
+                page_type=page_type,
+                confidence=confidence,
+                horizontal_line_count=h_lines,
+                vertical_line_count=v_lines,
+                text_block_count=text_blocks,
+                image_coverage=round(image_coverage, 3),
+                notes=notes.format(
+                    h_lines=h_lines, v_lines=v_lines, text_blocks=text_blocks, image_coverage=image_coverage,
+                ),
+            )
         return classifications
 
+    def _page_features(self, pages: list[PageInfo], np) -> dict:
+        """Feature matrix columns, one row per page."""
+        n = len(pages)
+        features = {
+            "page_number": np.array([p.page_number for p in pages], dtype=np.int64),
+            "text_blocks": np.array([len(p.text_blocks) for p in pages], dtype=np.int64),
+            "char_count": np.array([p.char_count for p in pages], dtype=np.int64),
+        }
+
+        # Image coverage: image areas summed per page, in page order
+        image_counts = np.array([len(p.images) for p in pages], dtype=np.int64)
+        images = np.fromiter(
+            chain.from_iterable((img.x0, img.y0, img.x1, img.y1) for p in pages for img in p.images),
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        areas = (images[:, 2] - images[:, 0]) * (images[:, 3] - images[:, 1])
+        image_area = np.bincount(np.repeat(np.arange(n), image_counts), weights=areas, minlength=n)
+        page_area = np.array([p.width * p.height for p in pages], dtype=np.float64)
+        features["image_coverage"] = np.divide(
+            image_area, page_area, out=np.zeros(n), where=page_area > 0,
+        )
+
+        # Line orientation, with the thresholds of LineInfo.is_horizontal / is_vertical
+        line_counts = np.array([len(p.lines) for p in pages], dtype=np.int64)
+        lines = np.fromiter(
+            chain.from_iterable((line.x0, line.y0, line.x1, line.y1) for p in pages for line in p.lines),
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        line_page = np.repeat(np.arange(n), line_counts)
+        horizontal = np.abs(lines[:, 3] - lines[:, 1]) < 2
+        vertical = np.abs(lines[:, 2] - lines[:, 0]) < 2
+        features["h_lines"] = np.bincount(line_page[horizontal], minlength=n)
+        features["v_lines"] = np.bincount(line_page[vertical], minlength=n)
+        features["regular"] = self._line_regularity(line_page[horizontal], lines[horizontal, 1], n, np)
+        return features
+
+    def _line_regularity(self, page, y, n: int, np):
+        """_check_line_regularity for all pages, from horizontal line y0s."""
+        # Sort by page, then y; gaps between consecutive lines of the same page
+        order = np.lexsort((y, page))
+        page, y = page[order], y[order]
+        same_page = page[1:] == page[:-1]
+        gap_page = page[1:][same_page]
+        gaps = np.diff(y)[same_page]
+
+        gap_count = np.bincount(gap_page, minlength=n)
+        gap_sum = np.bincount(gap_page, weights=gaps, minlength=n)
+        avg_gap = np.divide(gap_sum, gap_count, out=np.zeros(n), where=gap_count > 0)
+
+        avg = avg_gap[gap_page]
+        regular_gaps = np.bincount(gap_page[(0.5 * avg <= gaps) & (gaps <= 1.5 * avg)], minlength=n)
+        ratio = np.divide(regular_gaps, gap_count, out=np.zeros(n), where=gap_count > 0)
+        # At least 3 lines, i.e. 2 gaps, not too close together
+        return (gap_count >= 2) & (avg_gap >= 5) & (ratio > 0.6)
+
+    def _apply_rules(self, features: dict, np):
+        """Index into RULES of the first rule matching each page."""
+        h_lines, v_lines = features["h_lines"], features["v_lines"]
+        text_blocks, char_count = features["text_blocks"], features["char_count"]
+        coverage = features["image_coverage"]
+        first_page = features["page_number"] == 1
+        total_lines = h_lines + v_lines
+        has_many_lines = total_lines >= self.MIN_LINES_FOR_TABLE
+        has_structured_text = text_blocks >= 3
+
+        conditions = [
+            (char_count < self.BLANK_THRESHOLD) & (coverage < 0.1),
+            first_page & (char_count < 500) & (coverage > 0.1),
+            first_page & (text_blocks < 5) & (char_count < 300),
+            coverage > self.IMAGE_COVERAGE_THRESHOLD,
+            (h_lines >= self.MIN_GRID_LINES) & (v_lines >= self.MIN_GRID_LINES),
+            has_many_lines & has_structured_text & features["regular"],
+            has_many_lines & has_structured_text,
+            (char_count > 500) & (total_lines < 5),
+            has_structured_text,
+        ]
+        return np.select(conditions, range(len(conditions)), default=len(conditions))
+
     def classify_page(self, page_info: PageInfo) -> PageClassification:
         """Classify a single page based on its structure."""
+        template = self._template_for(page_info)
+        if template is not None:
+            return self._from_template(page_info, template)
+        classification = self._classify_page_by_rules(page_info)
+        self._learn(page_info, classification)
+        return classification
+
+    def _template_for(self, page_info: PageInfo) -> Optional[Template]:
+        if self.layout_index is None or page_info.layout_fingerprint is None or page_info.page_number == 1:
+            return None
+        return self.layout_index.lookup(page_info.layout_fingerprint)
+
+    def _learn(self, page_info: PageInfo, classification: PageClassification) -> None:
+        if self.layout_index is None or page_info.layout_fingerprint is None or page_info.page_number == 1:
+            return
+        self.layout_index.add(
+            page_info.layout_fingerprint,
+            (classification.page_type, classification.confidence),
+            classification,
+        )
+
+    @classmethod
+    def _from_template(cls, page_info: PageInfo, template: Template) -> PageClassification:
+        """Type and confidence of the template's example page, with this
+        page's own measurements.
+        """
+        example = template.example
+        return PageClassification(
+            page_number=page_info.page_number,
+            page_type=example.page_type,
+            confidence=example.confidence,
+            horizontal_line_count=len(page_info.horizontal_lines),
+            vertical_line_count=len(page_info.vertical_lines),
+            text_block_count=len(page_info.text_blocks),
+            image_coverage=round(cls._image_coverage(page_info), 3),
+            notes=f"Layout matches page {example.page_number}: {example.notes}",
+        )
+
+    @staticmethod
+    def _image_coverage(page_info: PageInfo) -> float:
+        """Share of the page area covered by images."""
+        page_area = page_info.width * page_info.height
+        image_area = sum(img.area for img in page_info.images)
+        return image_area / page_area if page_area > 0 else 0
+
+    def _classify_page_by_rules(self, page_info: PageInfo) -> PageClassification:
         h_lines = len(page_info.horizontal_lines)
         v_lines = len(page_info.vertical_lines)
         text_blocks = len(page_info.text_blocks)
         char_count = page_info.char_count
 
-        # Calculate image coverage
-        page_area = page_info.width * page_info.height
-        image_area = sum(img.area for img in page_info.images)
-        image_coverage = image_area / page_area if page_area > 0 else 0
+        image_coverage = self._image_coverage(page_info)
 
         # Classification logic
         page_type, confidence, notes = self._determine_type(
@@ -0,0 +1,271 @@
+"""Sampled pre-scan of large PDFs.
+
+Analyzing every page of a 3,000 page composite well file takes far too
+long for triage. A pre-scan analyzes a fixed budget of pages and
+extrapolates the document's structure with confidence bounds, which is
+enough to route the file to the right pipeline.
+
+Pages are sampled in two strata:
+- certainty pages, always analyzed: the first and last pages and the
+  pages the outline points to. Their counts enter the estimates exactly.
+- every k-th remaining page (systematic sampling), spread over the rest
+  of the document. Estimates for the unsampled pages come from these.
+
+So certainty pages, which are often covers and section title pages, do
+not skew the extrapolation. Bounds are normal intervals for per-page
+means and Wilson intervals for page type shares, both with a finite
+population correction, so they shrink to zero width as the sample
+approaches the whole document.
+"""
+
+import math
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import Optional
+
+from .models import PageInfo, PageType
+from .page_classifier import PageClassifier
+
+# Pages analyzed by default; a few tenths of a second on typical reports
+DEFAULT_SAMPLE_PAGES = 100
+
+# Pages at each end of the document always analyzed
+EDGE_PAGES = 2
+
+# Share of the budget outline pages may take, leaving the rest for
+# systematic sampling
+MAX_OUTLINE_SHARE = 0.5
+
+# Systematic pages needed to extrapolate: a sample variance takes two
+MIN_SYSTEMATIC_PAGES = 2
+
+# Smallest page budget: both edges plus the systematic minimum
+MIN_SAMPLE_PAGES = 2 * EDGE_PAGES + MIN_SYSTEMATIC_PAGES
+
+# Per-page counts estimated for the whole document
+PAGE_METRICS = {
+    "chars": lambda p: p.char_count,
+    "words": lambda p: p.word_count,
+    "text_blocks": lambda p: len(p.text_blocks),
+    "lines": lambda p: p.line_count,
+    "images": lambda p: p.image_count,
+}
+
+
+@dataclass
+class Estimate:
+    """Extrapolated document total with confidence bounds.
+
+    per_page divides each value by the page count.
+    """
+    total: float
+    low: float
+    high: float
+    page_count: int
+
+    @property
+    def per_page(self) -> tuple[float, float, float]:
+        n = self.page_count or 1
+        return self.total / n, self.low / n, self.high / n
+
+    def to_dict(self) -> dict:
+        mean, low, high = self.per_page
+        return {
+            "total": round(self.total, 1),
+            "low": round(self.low, 1),
+            "high": round(self.high, 1),
+            "per_page": round(mean, 3),
+            "per_page_low": round(low, 3),
+            "per_page_high": round(high, 3),
+        }
+
+
+@dataclass
+class SampleEstimate:
+    """Structure statistics of a document extrapolated from a page sample."""
+    file_path: str
+    page_count: int
+    confidence: float
+    certainty_pages: list[int] = field(default_factory=list)
+    systematic_pages: list[int] = field(default_factory=list)
+    pages: list[PageInfo] = field(default_factory=list)
+    metrics: dict[str, Estimate] = field(default_factory=dict)
+    page_types: dict[str, Estimate] = field(default_factory=dict)
+    text_pages: Optional[Estimate] = None
+    fonts: list[str] = field(default_factory=list)
+    anomalies: list[str] = field(default_factory=list)
+
+    @property
+    def sampled_pages(self) -> list[int]:
+        return sorted(self.certainty_pages + self.systematic_pages)
+
+    @property
+    def is_exact(self) -> bool:
+        return len(self.sampled_pages) == self.page_count
+
+    def to_dict(self) -> dict:
+        return {
+            "file_path": self.file_path,
+            "page_count": self.page_count,
+            "sampled_pages": self.sampled_pages,
+            "sample_fraction": round(len(self.sampled_pages) / self.page_count, 4) if self.page_count else 0,
+            "exact": self.is_exact,
+            "confidence": self.confidence,
+            "metrics": {name: estimate.to_dict() for name, estimate in self.metrics.items()},
+            "page_types": {name: estimate.to_dict() for name, estimate in self.page_types.items()},
+            "text_pages": self.text_pages.to_dict() if self.text_pages else None,
+            "fonts": self.fonts,
+            "anomalies": self.anomalies,
+        }
+
+
+def select_sample_pages(
+    page_count: int,
+    max_pages: int = DEFAULT_SAMPLE_PAGES,
+    outline_pages: Optional[list[int]] = None,
+) -> tuple[list[int], list[int]]:
+    """Choose the pages of a pre-scan.
+
+    Args:
+        page_count: Pages in the document.
+        max_pages: Page budget, at least MIN_SAMPLE_PAGES; every page is
+                   taken when it covers the document.
+        outline_pages: 1-based pages the outline points to.
+
+    Returns:
+        (certainty pages, systematic pages), 0-based and sorted. Unless
+        the document is taken whole, there are at least
+        MIN_SYSTEMATIC_PAGES systematic pages.
+
+    Raises:
+        ValueError: If max_pages is below MIN_SAMPLE_PAGES.
+    """
+    if max_pages < MIN_SAMPLE_PAGES:
+        raise ValueError(f"max_pages must be at least {MIN_SAMPLE_PAGES}, got {max_pages}")
+    if page_count <= max_pages:
+        return list(range(page_count)), []
+
+    edges = set(range(min(EDGE_PAGES, page_count))) | set(range(max(page_count - EDGE_PAGES, 0), page_count))
+
+    # Outline targets, thinned evenly when a deep outline would use up the budget
+    targets = sorted({p - 1 for p in outline_pages or [] if 1 <= p <= page_count} - edges)
+    outline_budget = max(int(max_pages * MAX_OUTLINE_SHARE) - len(edges), 0)
+    if len(targets) > outline_budget:
+        step = len(targets) / outline_budget if outline_budget else 0
+        targets = [targets[int(i * step)] for i in range(outline_budget)]
+
+    certainty = sorted(edges | set(targets))
+    remaining = [p for p in range(page_count) if p not in edges and p not in targets]
+    # The outline share leaves at least half the budget, and the budget is
+    # at least MIN_SAMPLE_PAGES, so this is never below MIN_SYSTEMATIC_PAGES
+    budget = max_pages - len(certainty)
+
+    # Every k-th remaining page, starting half a stride in
+    stride = len(remaining) / budget
+    systematic = sorted({remaining[int(stride / 2 + i * stride)] for i in range(budget)})
+    return certainty, systematic
+
+
+def _mean_bounds(values: list[float], population: int, z: float) -> tuple[float, float, float]:
+    """Sample mean with a normal confidence interval over a finite population.
+
+    Raises:
+        ValueError: If fewer than two values sample a larger population,
+                    which leaves the variance unknown.
+    """
+    n = len(values)
+    mean = sum(values) / n
+    if n >= population:
+        return mean, mean, mean
+    if n < 2:
+        raise ValueError(f"Cannot bound a mean from {n} sample of {population}")
+    variance = sum((v - mean) ** 2 for v in values) / (n - 1)
+    fpc = (population - n) / (population - 1)
+    half_width = z * math.sqrt(variance / n * fpc)
+    return mean, max(mean - half_width, 0.0), mean + half_width
+
+
+def _share_bounds(hits: int, n: int, population: int, z: float) -> tuple[float, float, float]:
+    """Sample share with a Wilson interval over a finite population."""
+    share = hits / n
+    if n >= population:
+        return share, share, share
+    # The finite population correction shrinks variance as if n were larger
+    fpc = (population - n) / (population - 1)
+    n_eff = n / fpc
+    denominator = 1 + z * z / n_eff
+    center = (share + z * z / (2 * n_eff)) / denominator
+    half_width = z * math.sqrt(share * (1 - share) / n_eff + z * z / (4 * n_eff * n_eff)) / denominator
+    return share, max(center - half_width, 0.0), min(center + half_width, 1.0)
+
+
+def estimate_structure(
+    file_path: str,
+    page_count: int,
+    certainty: list[PageInfo],
+    systematic: list[PageInfo],
+    confidence: float = 0.95,
+) -> SampleEstimate:
+    """Extrapolate document statistics from analyzed sample pages.
+
+    Certainty pages are counted exactly; the systematic sample stands for
+    every other page.
+
+    Raises:
+        ValueError: If pages are left unsampled but the systematic sample
+                    has fewer than MIN_SYSTEMATIC_PAGES pages to
+                    extrapolate from.
+    """
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    population = page_count - len(certainty)
+    if population > 0 and len(systematic) < MIN_SYSTEMATIC_PAGES:
+        raise ValueError(
+            f"{population} unsampled pages cannot be extrapolated from "
+            f"{len(systematic)} systematic pages; need {MIN_SYSTEMATIC_PAGES}"
+        )
+    classifier = PageClassifier()
+    estimate = SampleEstimate(
+        file_path=file_path,
+        page_count=page_count,
+        confidence=confidence,
+        certainty_pages=[p.page_number for p in certainty],
+        systematic_pages=[p.page_number for p in systematic],
+        pages=sorted(certainty + systematic, key=lambda p: p.page_number),
+    )
+
+    def extrapolate(exact: float, sampled: tuple[float, float, float]) -> Estimate:
+        mean, low, high = sampled
+        return Estimate(
+            total=exact + population * mean,
+            low=exact + population * low,
+            high=exact + population * high,
+            page_count=page_count,
+        )
+
+    # Only when every page is a certainty page
+    unsampled = (0.0, 0.0, 0.0)
+    for name, metric in PAGE_METRICS.items():
+        exact = sum(metric(p) for p in certainty)
+        sampled = _mean_bounds([metric(p) for p in systematic], population, z) if systematic else unsampled
+        estimate.metrics[name] = extrapolate(exact, sampled)
+
+    classifications = classifier.classify_pages(certainty + systematic)
+    certain_types = [classifications[p.page_number].page_type for p in certainty]
+    sampled_types = [classifications[p.page_number].page_type for p in systematic]
+    for page_type in PageType:
+        exact = certain_types.count(page_type)
+        hits = sampled_types.count(page_type)
+        if not exact and not hits:
+            continue
+        sampled = _share_bounds(hits, len(systematic), population, z) if systematic else unsampled
+        estimate.page_types[page_type.value] = extrapolate(exact, sampled)
+
+    # Pages with a text layer; the rest are scans needing OCR
+    def has_text(page: PageInfo) -> bool:
+        return page.char_count >= classifier.BLANK_THRESHOLD
+
+    exact = sum(has_text(p) for p in certainty)
+    hits = sum(has_text(p) for p in systematic)
+    sampled = _share_bounds(hits, len(systematic), population, z) if systematic else unsampled
+    estimate.text_pages = extrapolate(exact, sampled)
+    return estimate
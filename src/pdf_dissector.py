@@ -1,11 +1,14 @@
 """Core PDF analysis module using PyMuPDF for safe structure extraction."""
 
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 import fitz  # PyMuPDF
 
+from .elementizer.layout_index import box_token, simhash, span_token
+from .elementizer.page_interpretation import PageInterpretation
 from .models import (
     ImageInfo,
     LineInfo,
@@ -14,16 +17,35 @@ from .models import (
     PDFStructure,
     TextBlock,
 )
+from .page_sampling import DEFAULT_SAMPLE_PAGES, SampleEstimate, estimate_structure, select_sample_pages
+
+# Below this many pages a process pool costs more than it saves
+MIN_PARALLEL_PAGES = 16
+
+# Page ranges handed to each worker process; several per worker so a
+# slow range does not hold up the rest
+CHUNKS_PER_WORKER = 4
+
+
+def _analyze_page_range(file_path: str, page_nums: list[int]) -> list[tuple[PageInfo, Optional[str]]]:
+    """Analyze a range of pages in a worker process."""
+    with PDFDissector(file_path) as dissector:
+        return [dissector._analyze_page_safe(page_num) for page_num in page_nums]
 
 
 class PDFDissector:
-    """Safe PDF analysis without rendering content."""
+    """Safe PDF analysis without rendering content.
+
+    The analyzed structure is computed once per instance and reused by
+    get_summary and later analyze calls.
+    """
 
     def __init__(self, file_path: str):
         self.file_path = Path(file_path)
         if not self.file_path.exists():
             raise FileNotFoundError(f"PDF file not found: {file_path}")
         self._doc: Optional[fitz.Document] = None
+        self._structure: Optional[PDFStructure] = None
 
     def __enter__(self):
         self._doc = fitz.open(self.file_path)
@@ -33,10 +55,21 @@ class PDFDissector:
         if self._doc:
             self._doc.close()
 
-    def analyze(self) -> PDFStructure:
-        """Perform full PDF structure analysis."""
+    def analyze(self, workers: Optional[int] = 1) -> PDFStructure:
+        """Perform full PDF structure analysis.
+
+        Args:
+            workers: Processes analyzing pages. ``1`` analyzes inline;
+                     ``None`` uses the CPU count. Documents shorter than
+                     MIN_PARALLEL_PAGES are always analyzed inline.
+
+        Returns:
+            The document structure, memoized for this dissector.
+        """
         if not self._doc:
             raise RuntimeError("PDFDissector must be used as context manager")
+        if self._structure is not None:
+            return self._structure
 
         structure = PDFStructure(
             file_path=str(self.file_path),
@@ -57,21 +90,79 @@ class PDFDissector:
             structure.has_forms = False
 
         # Analyze each page
-        for page_num in range(len(self._doc)):
-            try:
-                page_info = self._analyze_page(page_num)
-                structure.pages.append(page_info)
-            except Exception as e:
-                structure.anomalies.append(f"Page {page_num + 1}: {str(e)}")
-                # Create minimal page info for failed page
-                structure.pages.append(PageInfo(
-                    page_number=page_num + 1,
-                    width=0,
-                    height=0,
-                ))
+        for page_info, anomaly in self._analyze_pages(workers):
+            structure.pages.append(page_info)
+            if anomaly:
+                structure.anomalies.append(anomaly)
 
+        self._structure = structure
         return structure
 
+    def sample(self, max_pages: int = DEFAULT_SAMPLE_PAGES, confidence: float = 0.95) -> SampleEstimate:
+        """Pre-scan a page sample and extrapolate the document's structure.
+
+        Analyzes the first and last pages, the pages the outline points to
+        and every k-th other page, at most max_pages in all. Much faster
+        than analyze on long documents; see src.page_sampling.
+
+        Args:
+            max_pages: Page budget, at least page_sampling.MIN_SAMPLE_PAGES.
+            confidence: Confidence level of the estimate bounds.
+
+        Raises:
+            ValueError: If max_pages is below MIN_SAMPLE_PAGES.
+        """
+        if not self._doc:
+            raise RuntimeError("PDFDissector must be used as context manager")
+
+        try:
+            outline_pages = [entry[2] for entry in self._doc.get_toc(simple=True)]
+        except Exception:
+            outline_pages = []
+        certainty, systematic = select_sample_pages(len(self._doc), max_pages, outline_pages)
+
+        anomalies = []
+        analyzed = {}
+        for page_num in certainty + systematic:
+            analyzed[page_num], anomaly = self._analyze_page_safe(page_num)
+            if anomaly:
+                anomalies.append(anomaly)
+
+        estimate = estimate_structure(
+            str(self.file_path),
+            len(self._doc),
+            [analyzed[p] for p in certainty],
+            [analyzed[p] for p in systematic],
+            confidence=confidence,
+        )
+        estimate.fonts = self._extract_fonts(sorted(analyzed))
+        estimate.anomalies = anomalies
+        return estimate
+
+    def _analyze_pages(self, workers: Optional[int]) -> list[tuple[PageInfo, Optional[str]]]:
+        """Analyze every page, in page order, inline or across processes."""
+        page_count = len(self._doc)
+        workers = min(workers or os.cpu_count() or 1, page_count)
+        if workers <= 1 or page_count < MIN_PARALLEL_PAGES:
+            return [self._analyze_page_safe(page_num) for page_num in range(page_count)]
+
+        chunk_size = -(-page_count // (workers * CHUNKS_PER_WORKER))
+        chunks = [
+            list(range(start, min(start + chunk_size, page_count)))
+            for start in range(0, page_count, chunk_size)
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_analyze_page_range, str(self.file_path), chunk) for chunk in chunks]
+            return [result for future in futures for result in future.result()]
+
+    def _analyze_page_safe(self, page_num: int) -> tuple[PageInfo, Optional[str]]:
+        """Analyze a page, or return minimal page info and an anomaly if it fails."""
+        try:
+            return self._analyze_page(page_num), None
+        except Exception as e:
+            # Create minimal page info for failed page
+            return PageInfo(page_number=page_num + 1, width=0, height=0), f"Page {page_num + 1}: {str(e)}"
+
     def _extract_metadata(self) -> PDFMetadata:
         """Extract PDF metadata."""
         meta = self._doc.metadata or {}
@@ -98,10 +189,10 @@ class PDFDissector:
             pass
         return None
 
-    def _extract_fonts(self) -> list[str]:
-        """Extract list of fonts used in the document."""
+    def _extract_fonts(self, page_nums: Optional[list[int]] = None) -> list[str]:
+        """Extract list of fonts used in the document, or on the given pages."""
         fonts = set()
-        for page_num in range(len(self._doc)):
+        for page_num in range(len(self._doc)) if page_nums is None else page_nums:
             try:
                 page = self._doc[page_num]
                 font_list = page.get_fonts()
@@ -117,6 +208,7 @@ class PDFDissector:
         """Analyze a single page."""
         page = self._doc[page_num]
         rect = page.rect
+        interp = PageInterpretation(page)
 
         page_info = PageInfo(
             page_number=page_num + 1,
@@ -124,17 +216,19 @@ class PDFDissector:
             height=rect.height,
         )
 
-        # Extract text blocks
+        # Extract text blocks, and the full text from the same extraction
+        # (one line of text per line, as page.get_text() lays it out)
         try:
-            text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+            text_dict = interp.text_dict()
+            block_texts = []
             for block in text_dict.get("blocks", []):
                 if block.get("type") == 0:  # Text block
                     bbox = block.get("bbox", (0, 0, 0, 0))
-                    text = ""
-                    for line in block.get("lines", []):
-                        for span in line.get("spans", []):
-                            text += span.get("text", "")
-                        text += "\n"
+                    text = "".join(
+                        "".join(span.get("text", "") for span in line.get("spans", [])) + "\n"
+                        for line in block.get("lines", [])
+                    )
+                    block_texts.append(text)
                     page_info.text_blocks.append(TextBlock(
                         x0=bbox[0],
                         y0=bbox[1],
@@ -142,12 +236,7 @@ class PDFDissector:
                         y1=bbox[3],
                         text=text.strip(),
                     ))
-        except Exception:
-            pass
-
-        # Extract full text content
-        try:
-            page_info.text_content = page.get_text()
+            page_info.text_content = "".join(block_texts)
             page_info.char_count = len(page_info.text_content)
             page_info.word_count = len(page_info.text_content.split())
         except Exception:
@@ -155,7 +244,7 @@ class PDFDissector:
 
         # Extract drawings/lines
         try:
-            drawings = page.get_drawings()
+            drawings = interp.drawings()
             for drawing in drawings:
                 for item in drawing.get("items", []):
                     if item[0] == "l":  # Line
@@ -177,23 +266,32 @@ class PDFDissector:
         except Exception:
             pass
 
-        # Extract images
+        # Extract image placements (no decoding needed, unlike matching xrefs)
         try:
-            image_list = page.get_images()
-            for img in image_list:
-                try:
-                    xref = img[0]
-                    img_rect = page.get_image_bbox(xref)
-                    page_info.images.append(ImageInfo(
-                        x0=img_rect.x0,
-                        y0=img_rect.y0,
-                        x1=img_rect.x1,
-                        y1=img_rect.y1,
-                        width=img[2],
-                        height=img[3],
-                    ))
-                except Exception:
-                    continue
+            for img in interp.image_infos():
+                x0, y0, x1, y1 = img["bbox"]
+                page_info.images.append(ImageInfo(
+                    x0=x0,
+                    y0=y0,
+                    x1=x1,
+                    y1=y1,
+                    width=img["width"],
+                    height=img["height"],
+                ))
+        except Exception:
+            pass
+
+        # Layout fingerprint for template matching in PageClassifier
+        try:
+            tokens = [
+                span_token(span["bbox"][0], span.get("font"), span.get("size"))
+                for block in text_dict.get("blocks", []) if block.get("type") == 0
+                for line in block.get("lines", [])
+                for span in line.get("spans", [])
+            ]
+            tokens.extend(box_token("l", ln.x0, ln.y0, ln.x1, ln.y1) for ln in page_info.lines)
+            tokens.extend(box_token("i", im.x0, im.y0, im.x1, im.y1) for im in page_info.images)
+            page_info.layout_fingerprint = simhash(tokens)
         except Exception:
             pass
 
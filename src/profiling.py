@@ -0,0 +1,176 @@
+"""Per-stage timing and memory instrumentation for extraction runs.
+
+StageProfiler records wall time, row counts and peak traced memory for
+named pipeline stages (classify, header extraction, per-page parsing,
+verification, writers). NullProfiler is the default and does nothing, so
+instrumented code costs only a method call when profiling is off.
+"""
+
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass
+class StageRecord:
+    """Accumulated measurements for one named stage."""
+    name: str
+    calls: int = 0
+    wall_ms: float = 0.0
+    rows: int = 0
+    peak_bytes: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.name,
+            "calls": self.calls,
+            "wall_ms": round(self.wall_ms, 3),
+            "rows": self.rows,
+            "peak_kb": round(self.peak_bytes / 1024, 1),
+        }
+
+
+class _Stage:
+    """Context manager timing one entry into a stage."""
+
+    __slots__ = ("_profiler", "_record", "_start", "_peak")
+
+    def __init__(self, profiler: "StageProfiler", record: StageRecord):
+        self._profiler = profiler
+        self._record = record
+        self._start = 0.0
+        self._peak = 0
+
+    def add_rows(self, count: int) -> None:
+        """Count rows produced by this stage (samples, pages, headers)."""
+        self._record.rows += count
+
+    def __enter__(self) -> "_Stage":
+        self._profiler._push(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self._record.wall_ms += (time.perf_counter() - self._start) * 1000
+        self._record.calls += 1
+        self._profiler._pop(self)
+        self._record.peak_bytes = max(self._record.peak_bytes, self._peak)
+        return False
+
+
+class StageProfiler:
+    """Records wall time, rows and peak traced memory per stage.
+
+    Stages are flat and keyed by name; entering the same name again
+    accumulates into one record. Stages may nest (verification runs
+    header extraction), in which case the outer stage's time and peak
+    include the inner one.
+
+    Args:
+        trace_memory: Track peak allocations with tracemalloc. Tracing is
+                      started on construction and stopped by stop() if
+                      this profiler started it.
+    """
+
+    enabled = True
+
+    def __init__(self, trace_memory: bool = True):
+        self.records: dict[str, StageRecord] = {}
+        self._open: list[_Stage] = []
+        self._started_tracing = False
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start = time.perf_counter()
+        self._elapsed_ms: Optional[float] = None
+
+    def stage(self, name: str) -> _Stage:
+        """Return a context manager measuring one entry into ``name``."""
+        record = self.records.get(name)
+        if record is None:
+            record = self.records[name] = StageRecord(name)
+        return _Stage(self, record)
+
+    def _fold_peak(self) -> None:
+        """Credit the traced peak since the last reset to all open stages."""
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for open_stage in self._open:
+            open_stage._peak = max(open_stage._peak, peak)
+        tracemalloc.reset_peak()
+
+    def _push(self, stage: _Stage) -> None:
+        self._fold_peak()
+        self._open.append(stage)
+
+    def _pop(self, stage: _Stage) -> None:
+        self._fold_peak()
+        self._open.remove(stage)
+
+    def stop(self) -> None:
+        """Freeze the total elapsed time and stop tracing if started here."""
+        if self._elapsed_ms is None:
+            self._elapsed_ms = (time.perf_counter() - self._start) * 1000
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @property
+    def elapsed_ms(self) -> float:
+        if self._elapsed_ms is not None:
+            return self._elapsed_ms
+        return (time.perf_counter() - self._start) * 1000
+
+    def report(self) -> dict:
+        """Get a JSON-serializable report of all stages in first-seen order."""
+        return {
+            "total_ms": round(self.elapsed_ms, 3),
+            "memory_traced": self.trace_memory,
+            "stages": [record.to_dict() for record in self.records.values()],
+        }
+
+    def save(self, output_path: str) -> str:
+        """Write the report to JSON. Callers validate the path."""
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+        return str(output_path)
+
+
+class _NullStage:
+    """Shared no-op stage."""
+
+    __slots__ = ()
+
+    def add_rows(self, count: int) -> None:
+        pass
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class NullProfiler:
+    """Profiler that records nothing; the default for extractors."""
+
+    enabled = False
+
+    def stage(self, name: str) -> _NullStage:
+        return _NULL_STAGE
+
+    def stop(self) -> None:
+        pass
+
+
+NULL_PROFILER = NullProfiler()
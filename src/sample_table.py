@@ -0,0 +1,239 @@
+"""Compact columnar container for extracted core samples.
+
+SampleTable stores samples as typed parallel arrays instead of one
+dataclass instance per row. Measurements are float64 values paired with
+indicator codes (see src.output.columnar), so merged indicators like ``+``
+and ``**`` do not force every column to hold Python objects. Rows are
+exposed as slot-based SampleRow views that keep the CoreSample API.
+"""
+
+import math
+from array import array
+from typing import Iterable, Iterator, Optional
+
+from .output.columnar import (
+    ID_COLUMNS,
+    INDICATOR_LESS_THAN,
+    INDICATOR_OTHER,
+    INDICATOR_SUFFIX,
+    INDICATOR_VALUE,
+    MEASUREMENT_COLUMNS,
+    decode_value,
+    encode_value,
+)
+
+# Field order matches CoreSample and CoreAnalysisExtractor.CANONICAL_HEADERS
+FIELDS = ID_COLUMNS + MEASUREMENT_COLUMNS + ["page_number"]
+
+# Indicator codes whose original text is kept verbatim for exact round trips
+_LITERAL_CODES = (INDICATOR_LESS_THAN, INDICATOR_OTHER)
+
+
+class SampleRow:
+    """Read-only view of one SampleTable row with the CoreSample API."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "SampleTable", index: int):
+        self._table = table
+        self._index = index
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def __eq__(self, other) -> bool:
+        if not hasattr(other, "to_dict"):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in FIELDS)
+        return f"SampleRow({fields})"
+
+
+def _id_property(name: str) -> property:
+    def getter(row: SampleRow) -> str:
+        return row._table._ids[name][row._index]
+    return property(getter)
+
+
+def _measurement_property(name: str) -> property:
+    def getter(row: SampleRow):
+        return row._table._cell(name, row._index)
+    return property(getter)
+
+
+for _name in ID_COLUMNS:
+    setattr(SampleRow, _name, _id_property(_name))
+for _name in MEASUREMENT_COLUMNS:
+    setattr(SampleRow, _name, _measurement_property(_name))
+SampleRow.page_number = property(lambda row: row._table._pages[row._index])
+
+
+class SampleTable:
+    """Samples stored as typed parallel arrays.
+
+    Behaves like a list of CoreSample for iteration, indexing, ``len`` and
+    ``append``/``extend``, and adds column accessors that avoid per-row
+    Python objects.
+    """
+
+    def __init__(self, samples: Iterable = ()):
+        self._ids: dict[str, list[str]] = {name: [] for name in ID_COLUMNS}
+        self._values: dict[str, array] = {name: array("d") for name in MEASUREMENT_COLUMNS}
+        self._codes: dict[str, array] = {name: array("B") for name in MEASUREMENT_COLUMNS}
+        self._pages = array("i")
+        # Verbatim text for '<X' and unrecognized cells, keyed by (column, row)
+        self._literals: dict[tuple[str, int], str] = {}
+        self.extend(samples)
+
+    # -- list-compatible API -------------------------------------------------
+
+    def append(self, sample) -> None:
+        """Append a CoreSample (or any object with the CoreSample fields)."""
+        index = len(self._pages)
+        for name in ID_COLUMNS:
+            self._ids[name].append(getattr(sample, name))
+        for name in MEASUREMENT_COLUMNS:
+            raw = getattr(sample, name)
+            value, code = encode_value(raw)
+            self._values[name].append(value)
+            self._codes[name].append(code)
+            if code in _LITERAL_CODES:
+                self._literals[(name, index)] = raw
+        self._pages.append(sample.page_number)
+
+    def extend(self, samples: Iterable) -> None:
+        for sample in samples:
+            self.append(sample)
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def __iter__(self) -> Iterator[SampleRow]:
+        return (SampleRow(self, i) for i in range(len(self)))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.take(range(len(self))[key])
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError("SampleTable index out of range")
+        return SampleRow(self, key)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, SampleTable):
+            return self.to_dicts() == other.to_dicts()
+        if isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"SampleTable({len(self)} samples)"
+
+    # -- cell and row access ---------------------------------------------------
+
+    def _cell(self, name: str, index: int):
+        code = self._codes[name][index]
+        if code in _LITERAL_CODES:
+            return self._literals[(name, index)]
+        return decode_value(self._values[name][index], code)
+
+    def iter_tuples(self) -> Iterator[tuple]:
+        """Yield decoded row values in FIELDS order without view objects."""
+        decoded = [
+            [self._cell(name, i) for i in range(len(self))]
+            if any(c != INDICATOR_VALUE for c in self._codes[name])
+            else list(self._values[name])
+            for name in MEASUREMENT_COLUMNS
+        ]
+        columns = [self._ids[name] for name in ID_COLUMNS] + decoded + [self._pages]
+        return zip(*columns)
+
+    def to_dicts(self) -> list[dict]:
+        return [dict(zip(FIELDS, values)) for values in self.iter_tuples()]
+
+    def take(self, indices: Iterable[int]) -> "SampleTable":
+        """Return a new table holding the given rows, in order."""
+        table = SampleTable()
+        for new_index, i in enumerate(indices):
+            for name in ID_COLUMNS:
+                table._ids[name].append(self._ids[name][i])
+            for name in MEASUREMENT_COLUMNS:
+                table._values[name].append(self._values[name][i])
+                table._codes[name].append(self._codes[name][i])
+                literal = self._literals.get((name, i))
+                if literal is not None:
+                    table._literals[(name, new_index)] = literal
+            table._pages.append(self._pages[i])
+        return table
+
+    # -- column accessors ------------------------------------------------------
+
+    def values(self, name: str) -> array:
+        """Raw float64 values for a measurement column (NaN where no number)."""
+        return self._values[name]
+
+    def indicators(self, name: str) -> array:
+        """Indicator codes for a measurement column."""
+        return self._codes[name]
+
+    def ids(self, name: str) -> list[str]:
+        """Values of an identifier column (core_number or sample_number)."""
+        return self._ids[name]
+
+    @property
+    def page_numbers(self) -> array:
+        return self._pages
+
+    def numeric(self, name: str) -> list[float]:
+        """Plain numeric values of a column, skipping indicators and blanks."""
+        return [
+            value for value, code in zip(self._values[name], self._codes[name])
+            if code == INDICATOR_VALUE
+        ]
+
+    def column_mean(self, name: str) -> Optional[float]:
+        """Mean of a column's plain numeric values, or None if there are none."""
+        values = self.numeric(name)
+        return math.fsum(values) / len(values) if values else None
+
+    def column_means(self) -> dict[str, Optional[float]]:
+        return {name: self.column_mean(name) for name in MEASUREMENT_COLUMNS}
+
+    def depth_range(self) -> Optional[tuple[float, float]]:
+        """(min, max) sample depth, or None if no sample has a depth."""
+        depths = [d for d in self.numeric("depth_feet") if d]
+        return (min(depths), max(depths)) if depths else None
+
+    def core_numbers(self) -> list[str]:
+        """Distinct core numbers in first-seen order."""
+        return list(dict.fromkeys(self._ids["core_number"]))
+
+    def core_slice(self, core_number: str) -> "SampleTable":
+        """Rows belonging to one core."""
+        return self.take(
+            i for i, core in enumerate(self._ids["core_number"]) if core == core_number
+        )
+
+    def by_core(self) -> dict[str, "SampleTable"]:
+        return {core: self.core_slice(core) for core in self.core_numbers()}
+
+    def numpy_columns(self) -> dict:
+        """Typed NumPy columns matching src.output.columnar.samples_to_columns.
+
+        Measurement and page arrays are bulk-copied from the table's
+        buffers, with no per-row conversion. Requires NumPy.
+        """
+        import numpy as np
+
+        def copy(buffer, dtype):
+            return np.frombuffer(buffer, dtype=dtype).copy() if len(buffer) else np.empty(0, dtype)
+
+        columns = {name: np.array(self._ids[name], dtype=str) for name in ID_COLUMNS}
+        for name in MEASUREMENT_COLUMNS:
+            columns[name] = copy(self._values[name], np.float64)
+            columns[name + INDICATOR_SUFFIX] = copy(self._codes[name], np.uint8)
+        columns["page_number"] = copy(self._pages, np.int32)
+        return columns
@@ -0,0 +1,390 @@
+"""Local HTTP extraction service.
+
+Accepts RCA PDF uploads, queues them on a bounded worker pool and serves
+the Core Analysis outputs (CSV, page classification, header verification)
+per job. Workers import PyMuPDF and the extraction pipeline once at pool
+startup, so each job pays only for its own extraction.
+
+When the number of queued plus running jobs reaches the configured queue
+depth, uploads are rejected with 429 instead of buffering without bound.
+Finished jobs and their directories are deleted after a TTL, or sooner
+when more than a set number of finished jobs are kept. If a worker
+process dies, the broken pool is replaced on the next upload.
+
+Usage:
+    python -m src.service --work-dir /tmp/rca_service --workers 2 --queue-depth 8
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from flask import Flask, jsonify, request, send_file
+
+from .core_analysis import CoreAnalysisExtractor, validate_output_path
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the service CLI
+DEFAULT_WORK_DIR = "/tmp/rca_service"
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_DEPTH = 8
+MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+
+# Finished jobs kept for result downloads, and for how long
+DEFAULT_MAX_FINISHED_JOBS = 100
+DEFAULT_JOB_TTL_SECONDS = 3600.0
+
+# Seconds suggested to clients in the Retry-After header on 429
+RETRY_AFTER_SECONDS = 5
+
+# Result files written per job (also the result endpoint names)
+RESULT_FILES = {
+    "csv": ("full_table_extraction.csv", "text/csv"),
+    "classification": ("page_classification.json", "application/json"),
+    "headers": ("header_verification.txt", "text/plain"),
+}
+
+PDF_MAGIC = b"%PDF"
+
+
+def _warm_worker():
+    """Import the extraction stack in a worker before the first job."""
+    import fitz  # noqa: F401
+
+    from .element_sources import LazyPDFElementSource  # noqa: F401
+    from .elementizer.extractor import PDFElementExtractor  # noqa: F401
+
+
+def run_job(pdf_path: str, output_dir: str, lazy: bool = True) -> dict:
+    """Extract one PDF and write its result files. Runs in a worker.
+
+    Returns:
+        Summary dict with table pages, sample count, warnings and timing.
+    """
+    start = time.perf_counter()
+    extractor = CoreAnalysisExtractor.from_pdf(pdf_path, lazy=lazy)
+    result = extractor.extract()
+
+    output_dir = Path(output_dir)
+    extractor.save_csv(result, str(output_dir / RESULT_FILES["csv"][0]))
+    extractor.save_classification(result, str(output_dir / RESULT_FILES["classification"][0]))
+    extractor.save_header_verification(
+        str(output_dir / RESULT_FILES["headers"][0]),
+        table_pages=result.table_pages,
+    )
+
+    return {
+        "table_pages": result.table_pages,
+        "sample_count": len(result.samples),
+        "warnings": result.warnings,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+@dataclass
+class Job:
+    """A submitted extraction job."""
+    id: str
+    filename: str
+    output_dir: str
+    submitted_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    future: Optional[Future] = None
+
+    @property
+    def status(self) -> str:
+        if self.future is None or not (self.future.running() or self.future.done()):
+            return "queued"
+        if not self.future.done():
+            return "running"
+        return "failed" if self.future.exception() is not None else "done"
+
+    def to_dict(self) -> dict:
+        data = {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+        }
+        if self.status == "done":
+            data["result"] = self.future.result()
+            data["links"] = {name: f"/jobs/{self.id}/{name}" for name in RESULT_FILES}
+        elif self.status == "failed":
+            data["error"] = str(self.future.exception())
+        return data
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue is at its configured depth."""
+
+
+class JobQueue:
+    """Bounded queue of extraction jobs on a worker pool.
+
+    Args:
+        work_dir: Directory receiving one subdirectory per job.
+        workers: Worker count.
+        queue_depth: Maximum jobs queued or running at once.
+        lazy: Use two-phase lazy PDF extraction.
+        use_processes: Run jobs in worker processes (default) or threads.
+        max_finished_jobs: Finished jobs kept; the oldest are evicted first.
+        job_ttl: Seconds a finished job is kept.
+
+    Evicted jobs are forgotten and their directories deleted.
+    """
+
+    def __init__(
+        self,
+        work_dir: str,
+        workers: int = DEFAULT_WORKERS,
+        queue_depth: int = DEFAULT_QUEUE_DEPTH,
+        lazy: bool = True,
+        use_processes: bool = True,
+        max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS,
+        job_ttl: float = DEFAULT_JOB_TTL_SECONDS,
+    ):
+        validate_output_path(str(work_dir))
+        if queue_depth < 1:
+            raise ValueError("queue_depth must be at least 1")
+
+        self.work_dir = Path(work_dir)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers
+        self.queue_depth = queue_depth
+        self.lazy = lazy
+        self.use_processes = use_processes
+        self.max_finished_jobs = max_finished_jobs
+        self.job_ttl = job_ttl
+        self.jobs: dict[str, Job] = {}
+        # Finished job ID -> monotonic finish time, oldest first
+        self._finished: OrderedDict[str, float] = OrderedDict()
+        self._in_flight = 0
+        self._slots = threading.BoundedSemaphore(queue_depth)
+        self._lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self.executor = self._start_pool()
+
+    def _start_pool(self) -> Executor:
+        if not self.use_processes:
+            return ThreadPoolExecutor(max_workers=self.workers)
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        # Start every worker now rather than on the first uploads
+        for warm in [executor.submit(_warm_worker) for _ in range(self.workers)]:
+            warm.result()
+        return executor
+
+    def _replace_pool(self, broken: Executor) -> None:
+        """Replace a pool broken by a dead worker, once per broken pool."""
+        with self._pool_lock:
+            if self.executor is not broken:
+                return
+            logger.warning("Worker pool broken; starting a new one")
+            broken.shutdown(wait=False)
+            self.executor = self._start_pool()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    def reserve(self) -> None:
+        """Reserve a queue slot before accepting an upload.
+
+        Raises:
+            QueueFullError: If queue_depth jobs are already queued or running.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError(f"Queue full ({self.queue_depth} jobs in flight)")
+
+    def release(self) -> None:
+        """Release a reserved slot that was not used for a job."""
+        self._slots.release()
+
+    def submit(self, pdf_bytes: bytes, filename: str) -> Job:
+        """Store an upload and queue it. The caller must hold a reserved slot."""
+        job_id = uuid.uuid4().hex
+        job_dir = self.work_dir / job_id
+        job_dir.mkdir(parents=True)
+        pdf_path = job_dir / "input.pdf"
+        pdf_path.write_bytes(pdf_bytes)
+
+        job = Job(id=job_id, filename=filename, output_dir=str(job_dir))
+        try:
+            job.future = self._submit(run_job, str(pdf_path), str(job_dir), self.lazy)
+        except BaseException:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+        # Registered only once queued; the callback runs after this even
+        # if the job has already finished
+        with self._lock:
+            self.jobs[job_id] = job
+            self._in_flight += 1
+        job.future.add_done_callback(lambda future: self._finish(job_id, future))
+        logger.info(f"Queued job {job_id} ({filename})")
+        self._evict()
+        return job
+
+    def _submit(self, *args) -> Future:
+        executor = self.executor
+        try:
+            return executor.submit(*args)
+        except BrokenProcessPool:
+            self._replace_pool(executor)
+            return self.executor.submit(*args)
+
+    def _finish(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._finished[job_id] = time.monotonic()
+        self._slots.release()
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            # The pool is replaced when the next job is submitted
+            logger.warning(f"Job {job_id} lost its worker process")
+        self._evict()
+
+    def _evict(self) -> None:
+        """Forget finished jobs past the TTL or count limit and delete their directories."""
+        expired = []
+        with self._lock:
+            cutoff = time.monotonic() - self.job_ttl
+            while self._finished:
+                job_id, finished_at = next(iter(self._finished.items()))
+                if finished_at > cutoff and len(self._finished) <= self.max_finished_jobs:
+                    break
+                del self._finished[job_id]
+                job = self.jobs.pop(job_id, None)
+                if job is not None:
+                    expired.append(job)
+        for job in expired:
+            shutil.rmtree(job.output_dir, ignore_errors=True)
+            logger.info(f"Evicted job {job.id}")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._evict()
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait)
+
+
+def _error(message: str, http_status: int, **extra):
+    response = jsonify({"error": message, **extra})
+    response.status_code = http_status
+    return response
+
+
+def create_app(queue: JobQueue) -> Flask:
+    """Create the service app around a job queue."""
+    app = Flask(__name__)
+    app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES
+    app.config["JOB_QUEUE"] = queue
+
+    @app.route("/health")
+    def health():
+        return jsonify({
+            "status": "ok",
+            "workers": queue.workers,
+            "queue_depth": queue.queue_depth,
+            "in_flight": queue.in_flight,
+        })
+
+    @app.route("/jobs", methods=["POST"])
+    def submit_job():
+        upload = request.files.get("file")
+        if upload is None or not upload.filename:
+            return _error("Missing PDF upload in form field 'file'", 400)
+
+        try:
+            queue.reserve()
+        except QueueFullError as e:
+            response = _error(str(e), 429)
+            response.headers["Retry-After"] = str(RETRY_AFTER_SECONDS)
+            return response
+
+        try:
+            data = upload.read()
+            if not data.startswith(PDF_MAGIC):
+                queue.release()
+                return _error("Upload is not a PDF", 400)
+            job = queue.submit(data, Path(upload.filename).name)
+        except Exception:
+            queue.release()
+            raise
+
+        response = jsonify(job.to_dict())
+        response.status_code = 202
+        response.headers["Location"] = f"/jobs/{job.id}"
+        return response
+
+    @app.route("/jobs/<job_id>")
+    def job_status(job_id):
+        job = queue.get(job_id)
+        if job is None:
+            return _error("Unknown job", 404)
+        return jsonify(job.to_dict())
+
+    @app.route("/jobs/<job_id>/<result_name>")
+    def job_result(job_id, result_name):
+        job = queue.get(job_id)
+        if job is None or result_name not in RESULT_FILES:
+            return _error("Not found", 404)
+        if job.status != "done":
+            return _error("Job has no results", 409, status=job.status)
+
+        filename, mimetype = RESULT_FILES[result_name]
+        return send_file(os.path.join(job.output_dir, filename), mimetype=mimetype)
+
+    return app
+
+
+def main():
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the local RCA extraction service")
+    parser.add_argument("--work-dir", default=DEFAULT_WORK_DIR,
+                        help="Directory for uploads and job results")
+    parser.add_argument("--workers", "-w", type=int, default=DEFAULT_WORKERS,
+                        help="Worker processes")
+    parser.add_argument("--queue-depth", type=int, default=DEFAULT_QUEUE_DEPTH,
+                        help="Maximum queued plus running jobs before returning 429")
+    parser.add_argument("--max-finished-jobs", type=int, default=DEFAULT_MAX_FINISHED_JOBS,
+                        help="Finished jobs kept for result downloads")
+    parser.add_argument("--job-ttl", type=float, default=DEFAULT_JOB_TTL_SECONDS,
+                        help="Seconds a finished job's results are kept")
+    parser.add_argument("--eager", action="store_true",
+                        help="Fully extract every page instead of two-phase lazy extraction")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    args = parser.parse_args()
+
+    queue = JobQueue(
+        args.work_dir,
+        workers=args.workers,
+        queue_depth=args.queue_depth,
+        lazy=not args.eager,
+        max_finished_jobs=args.max_finished_jobs,
+        job_ttl=args.job_ttl,
+    )
+    print(f"RCA extraction service on http://{args.host}:{args.port} "
+          f"({args.workers} workers, queue depth {args.queue_depth})")
+    try:
+        create_app(queue).run(host=args.host, port=args.port, debug=False, threaded=True)
+    finally:
+        queue.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,78 @@
-"""Table extraction module using pdfplumber for structured data extraction."""
+"""Table extraction module for structured data extraction.
+
+Tables are detected by a pluggable engine (see table_engines), pdfplumber
+by default, and pages can be extracted in parallel worker processes.
+extract_tables_streaming extracts long documents with bounded memory.
+"""
 
 import json
+import os
 import re
-from difflib import SequenceMatcher
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import pandas as pd
-import pdfplumber
 
+from .header_matching import HeaderGroup, HeaderIndex, column_mapping, header_signature, signatures_match
 from .models import ExtractedTable, ExtractionResult
 from .output.csv_sanitizer import write_csv_with_bom
+from .table_engines import DEFAULT_ENGINE, RawTable, TableEngine, get_engine
+from .table_stream import PAGES_PER_CHUNK, TableStream
+
+# Below this many pages a process pool costs more than it saves; table
+# detection is far slower per page than structure analysis
+MIN_PARALLEL_PAGES = 4
+
+# Page ranges handed to each worker process
+CHUNKS_PER_WORKER = 2
+
+PageTables = tuple[list[ExtractedTable], Optional[str]]
+
+
+def _extract_page_range(file_path: str, engine: str, page_nums: list[int]) -> list[PageTables]:
+    """Extract the tables of a range of pages in a worker process."""
+    extractor = TableExtractor(file_path, engine=engine)
+    with extractor.engine_class(file_path) as table_engine:
+        return [extractor._extract_page_safe(table_engine, page_num) for page_num in page_nums]
 
 
 class TableExtractor:
-    """Extract structured table data from PDFs."""
+    """Extract structured table data from PDFs.
+
+    Args:
+        file_path: PDF to extract from.
+        engine: Table detection engine name, a key of table_engines.ENGINES.
+    """
 
     HEADER_SIMILARITY_THRESHOLD = 0.8
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, engine: str = DEFAULT_ENGINE):
         self.file_path = Path(file_path)
         if not self.file_path.exists():
             raise FileNotFoundError(f"PDF file not found: {file_path}")
+        self.engine = engine
+        self.engine_class = get_engine(engine)
 
     def extract_tables(
         self,
         page_numbers: Optional[list[int]] = None,
+        workers: Optional[int] = 1,
     ) -> ExtractionResult:
-        """Extract tables from specified pages or all pages."""
-        result = ExtractionResult(source_file=str(self.file_path))
-
-        with pdfplumber.open(self.file_path) as pdf:
-            pages_to_process = page_numbers or list(range(1, len(pdf.pages) + 1))
-            result.pages_processed = len(pages_to_process)
+        """Extract tables from specified pages or all pages.
 
-            for page_num in pages_to_process:
-                if page_num < 1 or page_num > len(pdf.pages):
-                    result.warnings.append(f"Page {page_num} out of range, skipping")
-                    continue
-
-                try:
-                    page = pdf.pages[page_num - 1]  # pdfplumber uses 0-based indexing
-                    tables = self._extract_page_tables(page, page_num)
-
-                    if tables:
-                        result.tables.extend(tables)
-                        result.pages_with_tables += 1
+        Args:
+            page_numbers: 1-based pages to extract; all pages if omitted.
+            workers: Processes extracting pages. ``1`` extracts inline;
+                     ``None`` uses one per CPU. Fewer than
+                     MIN_PARALLEL_PAGES pages are always extracted inline.
+        """
+        result = ExtractionResult(source_file=str(self.file_path))
 
-                except Exception as e:
-                    result.warnings.append(f"Page {page_num}: {str(e)}")
+        for page_num, tables, error in self._iter_page_results(page_numbers, workers):
+            if self._record_page(result, page_num, tables, error):
+                result.tables.extend(tables)
 
         # Consolidate tables with similar headers
         if result.tables:
@@ -56,69 +80,166 @@ class TableExtractor:
 
         return result
 
+    def extract_tables_streaming(
+        self,
+        page_numbers: Optional[list[int]] = None,
+        workers: Optional[int] = 1,
+        pages_per_chunk: int = PAGES_PER_CHUNK,
+    ) -> TableStream:
+        """Extract tables with bounded memory, for very long tabular appendices.
+
+        Pages are extracted pages_per_chunk at a time and their rows spooled
+        to a temporary file, so only one page group is held in memory. The
+        returned TableStream consolidates like extract_tables and yields
+        rows, typed DataFrames or CSV output page group by page group.
+        Close it (or use it as a context manager) to delete the spool.
+
+        Raises:
+            ValueError: If pages_per_chunk is less than 1.
+        """
+        if pages_per_chunk < 1:
+            raise ValueError(f"pages_per_chunk must be at least 1, got {pages_per_chunk}")
+        stream = TableStream(self)
+        try:
+            for page_num, tables, error in self._iter_page_results(page_numbers, workers, pages_per_chunk):
+                if self._record_page(stream.result, page_num, tables, error):
+                    stream.add_tables(tables, (stream.result.pages_processed - 1) // pages_per_chunk)
+            stream.finish()
+        except BaseException:
+            stream.close()
+            raise
+        return stream
+
+    def _record_page(
+        self,
+        result: ExtractionResult,
+        page_num: int,
+        tables: Optional[list[ExtractedTable]],
+        error: Optional[str],
+    ) -> bool:
+        """Count a page and record its warnings; True if it has tables."""
+        result.pages_processed += 1
+        if tables is None:
+            result.warnings.append(f"Page {page_num} out of range, skipping")
+            return False
+        if error:
+            result.warnings.append(f"Page {page_num}: {error}")
+            return False
+        if tables:
+            result.pages_with_tables += 1
+            return True
+        return False
+
+    def _iter_page_results(
+        self,
+        page_numbers: Optional[list[int]],
+        workers: Optional[int],
+        pages_per_chunk: Optional[int] = None,
+    ) -> Iterator[tuple[int, Optional[list[ExtractedTable]], Optional[str]]]:
+        """Yield (page number, tables, error) for each requested page, in order.
+
+        Pages are extracted pages_per_chunk at a time (all at once if None);
+        tables is None for pages out of range.
+        """
+        with ExitStack() as stack:
+            engine = stack.enter_context(self.engine_class(str(self.file_path)))
+            page_count = engine.page_count
+            pages_to_process = page_numbers or list(range(1, page_count + 1))
+            in_range = {p for p in pages_to_process if 1 <= p <= page_count}
+
+            # One pool for every chunk
+            workers = min(workers or os.cpu_count() or 1, len(in_range))
+            pool = None
+            if workers > 1 and len(in_range) >= MIN_PARALLEL_PAGES:
+                pool = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+
+            chunk_pages = pages_per_chunk or len(pages_to_process) or 1
+            for start in range(0, len(pages_to_process), chunk_pages):
+                chunk = pages_to_process[start:start + chunk_pages]
+                wanted = sorted({p for p in chunk if p in in_range})
+                page_results = dict(zip(wanted, self._extract_pages(engine, wanted, pool, workers)))
+                for page_num in chunk:
+                    tables, error = page_results.get(page_num, (None, None))
+                    yield page_num, tables, error
+
+    def _extract_pages(
+        self,
+        engine: TableEngine,
+        page_numbers: list[int],
+        pool: Optional[ProcessPoolExecutor],
+        workers: int,
+    ) -> list[PageTables]:
+        """Extract pages in order, inline or across the pool's processes."""
+        if pool is None or len(page_numbers) < 2:
+            return [self._extract_page_safe(engine, page_num) for page_num in page_numbers]
+
+        chunk_size = -(-len(page_numbers) // (workers * CHUNKS_PER_WORKER))
+        chunks = [page_numbers[start:start + chunk_size] for start in range(0, len(page_numbers), chunk_size)]
+        futures = [
+            pool.submit(_extract_page_range, str(self.file_path), self.engine, chunk)
+            for chunk in chunks
+        ]
+        return [result for future in futures for result in future.result()]
+
+    def _extract_page_safe(self, engine: TableEngine, page_num: int) -> PageTables:
+        """Extract a page's tables, or return no tables and the error."""
+        try:
+            return self._extract_page_tables(engine, page_num), None
+        except Exception as e:
+            return [], str(e)
+
     def _extract_page_tables(
         self,
-        page: pdfplumber.page.Page,
+        engine: TableEngine,
         page_num: int,
     ) -> list[ExtractedTable]:
         """Extract all tables from a single page."""
-        tables = []
-
-        # Try to find tables using pdfplumber's table detection
-        found_tables = page.find_tables()
+        tables = self._tables_from_grids(engine.page_tables(page_num - 1), page_num)
 
-        for idx, table in enumerate(found_tables):
-            try:
-                raw_data = table.extract()
-                if not raw_data or len(raw_data) < 2:
-                    continue
-
-                # First row as headers, rest as data
-                headers = self._clean_row(raw_data[0])
-                rows = [self._clean_row(row) for row in raw_data[1:]]
-
-                # Filter out empty rows
-                rows = [row for row in rows if any(cell.strip() for cell in row)]
-
-                if headers and rows:
-                    tables.append(ExtractedTable(
-                        page_number=page_num,
-                        table_index=idx,
-                        headers=headers,
-                        original_headers=headers.copy(),  # Preserve original for CSV output
-                        rows=rows,
-                    ))
-
-            except Exception:
-                continue
-
-        # If no tables found with find_tables, try extract_tables as fallback
+        # If the engine's detection found no tables, try its fallback
         if not tables:
             try:
-                raw_tables = page.extract_tables()
-                for idx, raw_data in enumerate(raw_tables):
-                    if not raw_data or len(raw_data) < 2:
-                        continue
-
-                    headers = self._clean_row(raw_data[0])
-                    rows = [self._clean_row(row) for row in raw_data[1:]]
-                    rows = [row for row in rows if any(cell.strip() for cell in row)]
-
-                    if headers and rows:
-                        tables.append(ExtractedTable(
-                            page_number=page_num,
-                            table_index=idx,
-                            headers=headers,
-                            original_headers=headers.copy(),  # Preserve original for CSV output
-                            rows=rows,
-                            confidence=0.7,  # Lower confidence for fallback method
-                        ))
-
+                tables = self._tables_from_grids(
+                    engine.fallback_tables(page_num - 1),
+                    page_num,
+                    confidence=0.7,  # Lower confidence for fallback method
+                )
             except Exception:
                 pass
 
         return tables
 
+    def _tables_from_grids(
+        self,
+        grids: list[RawTable],
+        page_num: int,
+        confidence: float = 1.0,
+    ) -> list[ExtractedTable]:
+        """Split cell grids into header and data rows."""
+        tables = []
+        for idx, raw_data in enumerate(grids):
+            if not raw_data or len(raw_data) < 2:
+                continue
+
+            # First row as headers, rest as data
+            headers = self._clean_row(raw_data[0])
+            rows = [self._clean_row(row) for row in raw_data[1:]]
+
+            # Filter out empty rows
+            rows = [row for row in rows if any(cell.strip() for cell in row)]
+
+            if headers and rows:
+                tables.append(ExtractedTable(
+                    page_number=page_num,
+                    table_index=idx,
+                    headers=headers,
+                    original_headers=headers.copy(),  # Preserve original for CSV output
+                    rows=rows,
+                    confidence=confidence,
+                ))
+
+        return tables
+
     def _clean_row(self, row: list) -> list[str]:
         """Clean a row of table data."""
         cleaned = []
@@ -142,40 +263,20 @@ class TableExtractor:
         if not result.tables:
             return
 
-        # Group tables by similar headers
-        header_groups: list[tuple[list[str], list[str], list[ExtractedTable]]] = []
-        # Each group is (canonical_headers, original_headers, [tables])
-
-        for table in result.tables:
-            matched = False
-            for i, (canonical_headers, orig_headers, group) in enumerate(header_groups):
-                if self._headers_match(canonical_headers, table.headers):
-                    group.append(table)
-                    matched = True
-                    break
-
-            if not matched:
-                # Start new group with this table's headers
-                header_groups.append((
-                    table.headers,
-                    table.original_headers if table.original_headers else table.headers.copy(),
-                    [table]
-                ))
-
         # Use the largest group as the consolidated output
-        if header_groups:
-            largest_group = max(header_groups, key=lambda g: sum(t.row_count for t in g[2]))
-            result.consolidated_headers = largest_group[0]
-            result.original_headers = largest_group[1]
-
-            for table in largest_group[2]:
-                # Align rows to canonical headers
-                aligned_rows = self._align_rows(
-                    table.headers,
-                    table.rows,
-                    result.consolidated_headers,
+        largest_group = self._largest_header_group(result.tables, [t.row_count for t in result.tables])
+        if largest_group:
+            self._use_header_group(result, largest_group)
+
+            # Tables with the same headers share one column mapping
+            mappings: dict[tuple[str, ...], Optional[dict[int, int]]] = {}
+            for table in (result.tables[i] for i in largest_group.members):
+                headers = tuple(table.headers)
+                if headers not in mappings:
+                    mappings[headers] = self._column_mapping(table.headers, result.consolidated_headers)
+                result.consolidated_rows.extend(
+                    self._apply_mapping(mappings[headers], table.rows, len(result.consolidated_headers))
                 )
-                result.consolidated_rows.extend(aligned_rows)
 
             # ALIGNMENT INVARIANT CHECK
             assert len(result.consolidated_headers) == len(result.original_headers), (
@@ -188,49 +289,59 @@ class TableExtractor:
                     f"{len(result.consolidated_headers)}"
                 )
 
-    def _headers_match(self, headers1: list[str], headers2: list[str]) -> bool:
-        """Check if two header lists are similar enough to consolidate."""
-        if len(headers1) != len(headers2):
-            return False
+    def _largest_header_group(
+        self,
+        tables: list[ExtractedTable],
+        row_counts: list[int],
+    ) -> Optional[HeaderGroup]:
+        """Group tables by similar headers and return the group with the most rows.
 
-        matches = 0
-        for h1, h2 in zip(headers1, headers2):
-            similarity = SequenceMatcher(None, h1.lower(), h2.lower()).ratio()
-            if similarity >= self.HEADER_SIMILARITY_THRESHOLD:
-                matches += 1
+        Each table joins the first group whose canonical (first table's)
+        headers match. Group members are indexes into tables.
+        """
+        index = HeaderIndex(self.HEADER_SIMILARITY_THRESHOLD)
+        for i, table in enumerate(tables):
+            index.find_or_add(table.headers, i)
+        if not index.groups:
+            return None
+        return max(index.groups, key=lambda g: sum(row_counts[i] for i in g.members))
+
+    def _use_header_group(self, result: ExtractionResult, group: HeaderGroup) -> None:
+        """Take a header group's canonical and original headers as the output headers."""
+        first_table = result.tables[group.members[0]]
+        result.consolidated_headers = group.headers
+        result.original_headers = first_table.original_headers or first_table.headers.copy()
 
-        return matches >= len(headers1) * 0.8
+    def _headers_match(self, headers1: list[str], headers2: list[str]) -> bool:
+        """Check if two header lists are similar enough to consolidate."""
+        return signatures_match(
+            header_signature(headers1),
+            header_signature(headers2),
+            self.HEADER_SIMILARITY_THRESHOLD,
+        )
 
-    def _align_rows(
+    def _column_mapping(
         self,
         source_headers: list[str],
-        rows: list[list[str]],
         target_headers: list[str],
-    ) -> list[list[str]]:
-        """Align rows from source headers to target headers."""
+    ) -> Optional[dict[int, int]]:
+        """Source index -> target index, or None when the headers are identical."""
         if source_headers == target_headers:
+            return None
+        return column_mapping(source_headers, target_headers, self.HEADER_SIMILARITY_THRESHOLD)
+
+    def _apply_mapping(
+        self,
+        mapping: Optional[dict[int, int]],
+        rows: list[list[str]],
+        width: int,
+    ) -> list[list[str]]:
+        if mapping is None:
             return rows
 
-        # Create mapping from source index to target index
-        mapping = {}
-        for src_idx, src_header in enumerate(source_headers):
-            best_match_idx = None
-            best_similarity = 0
-            for tgt_idx, tgt_header in enumerate(target_headers):
-                similarity = SequenceMatcher(
-                    None, src_header.lower(), tgt_header.lower()
-                ).ratio()
-                if similarity > best_similarity:
-                    best_similarity = similarity
-                    best_match_idx = tgt_idx
-
-            if best_match_idx is not None and best_similarity >= self.HEADER_SIMILARITY_THRESHOLD:
-                mapping[src_idx] = best_match_idx
-
-        # Apply mapping to rows
         aligned = []
         for row in rows:
-            new_row = [""] * len(target_headers)
+            new_row = [""] * width
             for src_idx, value in enumerate(row):
                 if src_idx in mapping:
                     new_row[mapping[src_idx]] = value
@@ -238,6 +349,16 @@ class TableExtractor:
 
         return aligned
 
+    def _align_rows(
+        self,
+        source_headers: list[str],
+        rows: list[list[str]],
+        target_headers: list[str],
+    ) -> list[list[str]]:
+        """Align rows from source headers to target headers."""
+        mapping = self._column_mapping(source_headers, target_headers)
+        return self._apply_mapping(mapping, rows, len(target_headers))
+
     def to_dataframe(self, result: ExtractionResult) -> pd.DataFrame:
         """Convert extraction result to pandas DataFrame."""
         if not result.consolidated_headers or not result.consolidated_rows:
@@ -268,73 +389,85 @@ class TableExtractor:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Choose headers based on preference
-        if use_original_headers and result.original_headers:
-            headers = result.original_headers
-        else:
-            headers = result.consolidated_headers
-
         # Use the new CSV writer with BOM and sanitization
         write_csv_with_bom(
             rows=result.consolidated_rows,
             output_path=str(output_path),
-            headers=headers,
+            headers=self._output_headers(result, use_original_headers),
             sanitize_headers=True,
         )
 
         return str(output_path)
 
+    def _output_headers(self, result: ExtractionResult, use_original_headers: bool) -> list[str]:
+        """Choose headers based on preference."""
+        if use_original_headers and result.original_headers:
+            return result.original_headers
+        return result.consolidated_headers
+
     def save_json(self, result: ExtractionResult, output_path: str) -> str:
         """Save extraction result to JSON file."""
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        data = {
+        data = self._json_data(
+            result,
+            [t.row_count for t in result.tables],
+            len(result.consolidated_rows),
+            result.consolidated_rows,
+        )
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+        return str(output_path)
+
+    def _json_data(self, result: ExtractionResult, row_counts: list[int], total_rows: int, rows) -> dict:
+        """The save_json document, with rows as "data"."""
+        return {
             "source_file": result.source_file,
             "pages_processed": result.pages_processed,
             "pages_with_tables": result.pages_with_tables,
             "total_tables": len(result.tables),
-            "total_rows": len(result.consolidated_rows),
+            "total_rows": total_rows,
             "headers": result.consolidated_headers,
             "original_headers": result.original_headers,
-            "data": result.consolidated_rows,
+            "data": rows,
             "tables_by_page": [
                 {
                     "page": t.page_number,
                     "table_index": t.table_index,
                     "headers": t.headers,
                     "original_headers": t.original_headers,
-                    "row_count": t.row_count,
+                    "row_count": row_count,
                     "confidence": t.confidence,
                 }
-                for t in result.tables
+                for t, row_count in zip(result.tables, row_counts)
             ],
             "warnings": result.warnings,
         }
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-
-        return str(output_path)
-
     def get_summary(self, result: ExtractionResult) -> dict:
         """Get extraction summary."""
+        return self._summary(result, [t.row_count for t in result.tables], len(result.consolidated_rows))
+
+    def _summary(self, result: ExtractionResult, row_counts: list[int], total_rows: int) -> dict:
         return {
             "source_file": result.source_file,
             "pages_processed": result.pages_processed,
             "pages_with_tables": result.pages_with_tables,
             "total_tables_found": len(result.tables),
             "consolidated_columns": len(result.consolidated_headers),
-            "consolidated_rows": len(result.consolidated_rows),
+            "consolidated_rows": total_rows,
             "headers": result.consolidated_headers,
             "tables_by_page": {
                 t.page_number: {
                     "table_index": t.table_index,
                     "columns": t.column_count,
-                    "rows": t.row_count,
+                    "rows": row_count,
                     "confidence": t.confidence,
                 }
-                for t in result.tables
+                for t, row_count in zip(result.tables, row_counts)
             },
             "warnings": result.warnings,
         }
@@ -0,0 +1,212 @@
+"""Bounded-memory output of TableExtractor results.
+
+extract_tables keeps every row of every table until it has consolidated
+them, which does not scale to tabular appendices thousands of pages
+long. TableExtractor.extract_tables_streaming instead extracts pages a
+group at a time and spools each table's rows to a temporary file as one
+JSON line, keeping only headers and row counts in memory. Consolidation
+needs just those, so it picks the same header group and column
+mappings as extract_tables. Rows are then read back and aligned one
+page group at a time:
+
+    with extractor.extract_tables_streaming(pages_per_chunk=25) as stream:
+        for frame in stream.iter_dataframes():
+            ...
+        stream.save_csv("appendix.csv")
+
+DataFrame chunks are typed consistently across the whole stream: a
+column is float64 when every non-blank cell of it in any table parses
+as a number (blank cells become NaN), and object otherwise.
+"""
+
+import dataclasses
+import json
+import math
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from .models import ExtractedTable, ExtractionResult
+from .output.columnar import INDICATOR_VALUE, encode_value
+from .output.csv_sanitizer import write_csv_with_bom
+
+# Pages extracted, spooled and output together
+PAGES_PER_CHUNK = 25
+
+
+def _column_kinds(rows: list[list[str]]) -> list[Optional[bool]]:
+    """Per column: True if every non-blank cell is numeric, False if not,
+    None if the column is blank.
+    """
+    kinds: list[Optional[bool]] = [None] * max((len(row) for row in rows), default=0)
+    for row in rows:
+        for i, value in enumerate(row):
+            if kinds[i] is not False and value.strip():
+                kinds[i] = encode_value(value)[1] == INDICATOR_VALUE
+    return kinds
+
+
+class TableStream:
+    """Spooled tables of a streaming extraction.
+
+    Attributes:
+        result: Extraction result with warnings, page counts and
+                consolidated headers. Its tables carry no rows and its
+                consolidated_rows stay empty; rows come from the iterators.
+        row_counts: Rows of each table in result.tables.
+        total_rows: Consolidated rows.
+        column_types: dtype of each consolidated column in DataFrame chunks.
+
+    Read with one iterator at a time; they share the spool file.
+    """
+
+    def __init__(self, extractor):
+        self.extractor = extractor
+        self.result = ExtractionResult(source_file=str(extractor.file_path))
+        self.row_counts: list[int] = []
+        self.total_rows = 0
+        self.column_types: list[str] = []
+        self._spool = tempfile.TemporaryFile("w+", encoding="utf-8")
+        # Per table: page group and per-column kinds
+        self._chunks: list[int] = []
+        self._kinds: list[list[Optional[bool]]] = []
+        # Table index -> column mapping, for tables in the consolidated group
+        self._mappings: dict[int, Optional[dict[int, int]]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        """Delete the spool file."""
+        self._spool.close()
+
+    def add_tables(self, tables: list[ExtractedTable], chunk: int) -> None:
+        """Spool the rows of one page's tables."""
+        for table in tables:
+            self._spool.write(json.dumps(table.rows, ensure_ascii=False) + "\n")
+            self.result.tables.append(dataclasses.replace(table, rows=[]))
+            self.row_counts.append(table.row_count)
+            self._chunks.append(chunk)
+            self._kinds.append(_column_kinds(table.rows))
+
+    def finish(self) -> None:
+        """Consolidate the spooled tables as extract_tables would."""
+        self._spool.flush()
+        group = self.extractor._largest_header_group(self.result.tables, self.row_counts)
+        if group is None:
+            return
+        self.extractor._use_header_group(self.result, group)
+        headers = self.result.consolidated_headers
+
+        # Tables with the same headers share one column mapping
+        mappings: dict[tuple[str, ...], Optional[dict[int, int]]] = {}
+        kinds: list[Optional[bool]] = [None] * len(headers)
+        for i in group.members:
+            table = self.result.tables[i]
+            key = tuple(table.headers)
+            if key not in mappings:
+                mappings[key] = self.extractor._column_mapping(table.headers, headers)
+            mapping = self._mappings[i] = mappings[key]
+            self.total_rows += self.row_counts[i]
+
+            for src_idx, kind in enumerate(self._kinds[i]):
+                tgt_idx = src_idx if mapping is None else mapping.get(src_idx)
+                if kind is None or tgt_idx is None or tgt_idx >= len(headers):
+                    continue
+                kinds[tgt_idx] = kind if kinds[tgt_idx] is None else kinds[tgt_idx] and kind
+        self.column_types = ["float64" if kind else "object" for kind in kinds]
+
+    def iter_row_chunks(self) -> Iterator[list[list[str]]]:
+        """Consolidated rows, one list per page group."""
+        width = len(self.result.consolidated_headers)
+        self._spool.seek(0)
+        rows: list[list[str]] = []
+        chunk = None
+        for i, line in enumerate(self._spool):
+            if i not in self._mappings:
+                continue
+            if self._chunks[i] != chunk and rows:
+                yield rows
+                rows = []
+            chunk = self._chunks[i]
+            aligned = self.extractor._apply_mapping(self._mappings[i], json.loads(line), width)
+            # ALIGNMENT INVARIANT CHECK
+            for row in aligned:
+                assert len(row) == width, f"Row has {len(row)} columns but headers have {width}"
+            rows.extend(aligned)
+        if rows:
+            yield rows
+
+    def iter_dataframes(self) -> Iterator[pd.DataFrame]:
+        """Typed DataFrame chunks, one per page group, indexed as one frame."""
+        start = 0
+        for rows in self.iter_row_chunks():
+            yield self._typed_frame(rows, start)
+            start += len(rows)
+
+    def _typed_frame(self, rows: list[list[str]], start: int) -> pd.DataFrame:
+        columns = {}
+        for j, values in enumerate(zip(*rows)):
+            if self.column_types[j] == "float64":
+                # Non-blank cells all parse; blank cells become NaN
+                columns[j] = pd.Series(
+                    [encode_value(v)[0] if v.strip() else math.nan for v in values],
+                    dtype="float64",
+                )
+            else:
+                columns[j] = pd.Series(values, dtype="object")
+        frame = pd.DataFrame(columns)
+        frame.columns = self.result.consolidated_headers
+        frame.index = pd.RangeIndex(start, start + len(rows))
+        return frame
+
+    def save_csv(self, output_path: str, use_original_headers: bool = True) -> str:
+        """Write the consolidated rows to CSV, a page group at a time.
+
+        Same output as TableExtractor.save_csv.
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        write_csv_with_bom(
+            rows=(row for rows in self.iter_row_chunks() for row in rows),
+            output_path=str(output_path),
+            headers=self.extractor._output_headers(self.result, use_original_headers),
+            sanitize_headers=True,
+        )
+
+        return str(output_path)
+
+    def save_json(self, output_path: str) -> str:
+        """Write the TableExtractor.save_json document, streaming "data"
+        one row per line.
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Lay out everything but the rows, then write the rows in place
+        # of a placeholder
+        placeholder = f"__rows_{uuid.uuid4().hex}__"
+        data = self.extractor._json_data(self.result, self.row_counts, self.total_rows, placeholder)
+        head, tail = json.dumps(data, indent=2, ensure_ascii=False).split(json.dumps(placeholder), 1)
+
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(head + "[")
+            separator = "\n"
+            for rows in self.iter_row_chunks():
+                for row in rows:
+                    f.write(separator + "    " + json.dumps(row, ensure_ascii=False))
+                    separator = ",\n"
+            f.write(("\n  ]" if separator != "\n" else "]") + tail)
+
+        return str(output_path)
+
+    def get_summary(self) -> dict:
+        """TableExtractor.get_summary of the streamed extraction."""
+        return self.extractor._summary(self.result, self.row_counts, self.total_rows)
@@ -0,0 +1,211 @@
+"""Vectorized validation of extracted core samples.
+
+Rules run column-wise over typed NumPy columns (see
+src.output.columnar.samples_to_columns), so a consolidated batch of many
+wells is checked with a handful of array operations instead of per-row
+Python. Only plain numeric cells are checked; indicator cells (+, <X, **)
+and blanks are skipped.
+
+Rules:
+- range: value outside its column's plausible range
+- ncs_exceeds_ambient: NCS porosity greater than ambient porosity
+- klinkenberg_exceeds_air: Klinkenberg permeability greater than air
+- saturation_sum: |water + oil - total| above tolerance
+- depth_order: depth not increasing within a core (per source)
+- outlier: |z-score| above threshold (permeability on a log10 scale)
+
+Requires NumPy.
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .output.columnar import INDICATOR_SUFFIX, INDICATOR_VALUE, samples_to_columns
+
+# Plausible ranges for routine core analysis measurements (inclusive)
+DEFAULT_RANGES = {
+    "depth_feet": (0.0, 35000.0),
+    "permeability_air_md": (0.0, 100000.0),
+    "permeability_klink_md": (0.0, 100000.0),
+    "porosity_ambient_pct": (0.0, 50.0),
+    "porosity_ncs_pct": (0.0, 50.0),
+    "grain_density_gcc": (2.0, 3.0),
+    "saturation_water_pct": (0.0, 100.0),
+    "saturation_oil_pct": (0.0, 100.0),
+    "saturation_total_pct": (0.0, 100.0),
+}
+
+# Water + oil may differ from the reported total by rounding
+SATURATION_TOLERANCE = 0.5
+
+# Allowed NCS excess over ambient porosity (percentage points)
+POROSITY_ORDER_TOLERANCE = 0.05
+
+# Allowed Klinkenberg excess over air permeability (fraction of air value,
+# since permeabilities span many orders of magnitude)
+PERMEABILITY_ORDER_TOLERANCE = 0.01
+
+OUTLIER_Z = 3.0
+OUTLIER_COLUMNS = [
+    "porosity_ambient_pct", "porosity_ncs_pct", "grain_density_gcc",
+    "saturation_water_pct", "saturation_oil_pct", "saturation_total_pct",
+]
+# Permeability is roughly log-normal, so z-scores use log10 values
+LOG_OUTLIER_COLUMNS = ["permeability_air_md", "permeability_klink_md"]
+
+# Minimum plain values in a column before outliers are meaningful
+MIN_OUTLIER_SAMPLES = 8
+
+# Offending samples listed per rule in the report
+MAX_REPORTED_SAMPLES = 20
+
+
+@dataclass
+class RuleViolations:
+    """Violations of one rule on one column (or column pair)."""
+    rule: str
+    column: str
+    count: int
+    samples: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "rule": self.rule,
+            "column": self.column,
+            "count": self.count,
+            "samples": self.samples,
+        }
+
+
+@dataclass
+class ValidationReport:
+    """Compact result of validating a sample set."""
+    sample_count: int
+    violations: list[RuleViolations] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+    @property
+    def violation_count(self) -> int:
+        return sum(v.count for v in self.violations)
+
+    def to_dict(self) -> dict:
+        return {
+            "passed": self.passed,
+            "sample_count": self.sample_count,
+            "violation_count": self.violation_count,
+            "violations": [v.to_dict() for v in self.violations],
+        }
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "NumPy is required for validation. Install with: pip install numpy"
+        ) from e
+    return np
+
+
+def _plain(np, columns: dict, name: str):
+    """Column values with every non-plain cell set to NaN."""
+    values = columns[name].astype(np.float64, copy=True)
+    values[columns[name + INDICATOR_SUFFIX] != INDICATOR_VALUE] = np.nan
+    return values
+
+
+def _zscores(np, values):
+    valid = ~np.isnan(values)
+    if valid.sum() < MIN_OUTLIER_SAMPLES:
+        return np.zeros_like(values)
+    std = values[valid].std(ddof=1)
+    if std == 0:
+        return np.zeros_like(values)
+    return (values - values[valid].mean()) / std
+
+
+def validate_columns(
+    columns: dict,
+    ranges: Optional[dict] = None,
+    saturation_tolerance: float = SATURATION_TOLERANCE,
+    outlier_z: float = OUTLIER_Z,
+) -> ValidationReport:
+    """Validate typed sample columns.
+
+    Args:
+        columns: Columns from samples_to_columns / read_columnar. An
+                 optional ``source`` column scopes depth ordering per document.
+        ranges: Per-column (min, max) overrides merged over DEFAULT_RANGES.
+        saturation_tolerance: Allowed |water + oil - total| difference.
+        outlier_z: |z-score| above which a value is an outlier.
+
+    Returns:
+        ValidationReport listing rules with at least one violation.
+    """
+    np = _require_numpy()
+    ranges = {**DEFAULT_RANGES, **(ranges or {})}
+    count = len(columns["sample_number"])
+    report = ValidationReport(sample_count=count)
+    if count == 0:
+        return report
+
+    labels = columns["sample_number"].astype(str)
+    if "source" in columns:
+        labels = np.char.add(np.char.add(columns["source"].astype(str), ":"), labels)
+
+    plain = {name: _plain(np, columns, name) for name in ranges}
+
+    def record(rule: str, column: str, mask) -> None:
+        hits = np.flatnonzero(mask)
+        if hits.size:
+            report.violations.append(RuleViolations(
+                rule=rule,
+                column=column,
+                count=int(hits.size),
+                samples=labels[hits[:MAX_REPORTED_SAMPLES]].tolist(),
+            ))
+
+    # NaN compares False, so skipped cells never match
+    for name, (low, high) in ranges.items():
+        record("range", name, (plain[name] < low) | (plain[name] > high))
+
+    record(
+        "ncs_exceeds_ambient", "porosity_ncs_pct",
+        plain["porosity_ncs_pct"] > plain["porosity_ambient_pct"] + POROSITY_ORDER_TOLERANCE,
+    )
+    record(
+        "klinkenberg_exceeds_air", "permeability_klink_md",
+        plain["permeability_klink_md"]
+        > plain["permeability_air_md"] * (1 + PERMEABILITY_ORDER_TOLERANCE),
+    )
+    saturation_sum = plain["saturation_water_pct"] + plain["saturation_oil_pct"]
+    record(
+        "saturation_sum", "saturation_total_pct",
+        np.abs(saturation_sum - plain["saturation_total_pct"]) > saturation_tolerance,
+    )
+
+    # Depth must increase between consecutive samples of the same core
+    depth = plain["depth_feet"]
+    same_group = columns["core_number"][1:] == columns["core_number"][:-1]
+    if "source" in columns:
+        same_group &= columns["source"][1:] == columns["source"][:-1]
+    out_of_order = np.zeros(count, dtype=bool)
+    out_of_order[1:] = same_group & (depth[1:] <= depth[:-1])
+    record("depth_order", "depth_feet", out_of_order)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for name in OUTLIER_COLUMNS + LOG_OUTLIER_COLUMNS:
+            values = plain[name]
+            if name in LOG_OUTLIER_COLUMNS:
+                values = np.where(values > 0, np.log10(values), np.nan)
+            record("outlier", name, np.abs(_zscores(np, values)) > outlier_z)
+
+    return report
+
+
+def validate_samples(samples, source: Optional[str] = None, **kwargs) -> ValidationReport:
+    """Validate a SampleTable (or list of CoreSample). See validate_columns."""
+    return validate_columns(samples_to_columns(samples, source=source), **kwargs)
@@ -0,0 +1,357 @@
+"""Watch-folder daemon that ingests and extracts new RCA PDFs.
+
+Polls an input directory for PDFs. Each new or changed file runs the
+elementizer ingest and CoreAnalysisExtractor on a worker pool, and its
+outputs land atomically in ``<stem>_extraction/`` next to the PDF: they
+are built in a hidden temporary directory and renamed into place.
+
+A JSON ledger keyed by SHA-256 of the file content records every
+processed PDF, so identical content (renamed, copied or re-dropped) is
+never successfully processed twice, even across restarts. A failed PDF
+(still being copied, out of memory, output directory locked) is retried
+with exponential backoff, up to a bounded number of attempts. A worker
+process that dies (a crash in PyMuPDF, the OOM killer) fails its jobs
+like any other error, and the broken pool is replaced.
+
+Usage:
+    python -m src.watcher /tmp/rca_inbox --interval 5 --workers 2
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .core_analysis import CoreAnalysisExtractor, validate_output_path
+
+logger = logging.getLogger(__name__)
+
+LEDGER_NAME = ".rca_watch_ledger.json"
+OUTPUT_SUFFIX = "_extraction"
+DEFAULT_INTERVAL = 5.0
+
+# A file must be unchanged for this long before it is picked up, so
+# half-copied uploads are not ingested
+DEFAULT_SETTLE_SECONDS = 2.0
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+# Attempts per content before a failed PDF is left alone, and the delay
+# before the first retry (doubled for each later one)
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF_SECONDS = 60.0
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json_atomic(path: Path, data) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _replace_dir(tmp_dir: Path, final_dir: Path) -> None:
+    """Move a finished output directory into place.
+
+    os.replace cannot overwrite a non-empty directory, so an existing
+    output is renamed aside first and removed after the swap.
+    """
+    old_dir = None
+    if final_dir.exists():
+        old_dir = final_dir.with_name(f".{final_dir.name}.old-{uuid.uuid4().hex}")
+        os.replace(final_dir, old_dir)
+    os.replace(tmp_dir, final_dir)
+    if old_dir is not None:
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def process_pdf(pdf_path: str, extract_images: bool = True) -> dict:
+    """Ingest one PDF and extract its Core Analysis outputs. Runs in a worker.
+
+    Returns:
+        Summary dict with the output directory, table pages and sample count.
+    """
+    from .elementizer.database import ElementDatabase
+    from .elementizer.extractor import PDFElementExtractor
+
+    start = time.perf_counter()
+    pdf_path = Path(pdf_path)
+    final_dir = pdf_path.with_name(pdf_path.stem + OUTPUT_SUFFIX)
+    # Unique per job: jobs for one PDF can overlap when it changes while
+    # queued, and thread workers share a pid
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{final_dir.name}.tmp-", dir=pdf_path.parent))
+
+    try:
+        image_dir = tmp_dir / f"{pdf_path.stem}_images" if extract_images else None
+        with PDFElementExtractor(str(pdf_path), image_output_dir=image_dir) as extractor:
+            doc_elements = extractor.extract_all(extract_images=extract_images)
+
+        # Images were saved under tmp_dir; record where they will be after
+        # the swap so the published database does not point into tmp_dir
+        if image_dir is not None:
+            final_image_dir = final_dir / image_dir.name
+            for page in doc_elements.pages:
+                for image in page.images:
+                    if image.file_path:
+                        image.file_path = str(final_image_dir / Path(image.file_path).name)
+
+        db_path = tmp_dir / f"{pdf_path.stem}_elements.db"
+        with ElementDatabase(db_path) as db:
+            db.store_document(doc_elements)
+
+        core = CoreAnalysisExtractor(str(db_path))
+        result = core.extract()
+        core.save_csv(result, str(tmp_dir / "full_table_extraction.csv"))
+        core.save_classification(result, str(tmp_dir / "page_classification.json"))
+        core.save_header_verification(
+            str(tmp_dir / "header_verification.txt"),
+            table_pages=result.table_pages,
+        )
+
+        _replace_dir(tmp_dir, final_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    return {
+        "output_dir": str(final_dir),
+        "table_pages": result.table_pages,
+        "sample_count": len(result.samples),
+        "warnings": result.warnings,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+class FolderWatcher:
+    """Polls a directory and processes each distinct PDF content once.
+
+    Args:
+        input_dir: Directory to watch (non-recursive).
+        state_file: Ledger path. Defaults to a hidden file in input_dir.
+        workers: Worker count.
+        settle_seconds: Minimum age of a file's last modification.
+        extract_images: Save page images during ingest.
+        use_processes: Run jobs in worker processes (default) or threads.
+        max_attempts: Attempts per content before a failing PDF is given up on.
+        retry_backoff: Seconds before the first retry; doubled for each later one.
+    """
+
+    def __init__(
+        self,
+        input_dir: str,
+        state_file: Optional[str] = None,
+        workers: int = 2,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        extract_images: bool = True,
+        use_processes: bool = True,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF_SECONDS,
+    ):
+        self.input_dir = Path(input_dir)
+        if not self.input_dir.is_dir():
+            raise FileNotFoundError(f"Input directory not found: {input_dir}")
+        # Outputs are written next to the PDFs
+        validate_output_path(str(self.input_dir))
+
+        self.state_file = Path(state_file) if state_file else self.input_dir / LEDGER_NAME
+        self.settle_seconds = settle_seconds
+        self.extract_images = extract_images
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.ledger: dict[str, dict] = self._load_ledger()
+
+        # path -> (size, mtime_ns, sha256), so unchanged files are not re-hashed
+        self._stat_cache: dict[Path, tuple[int, int, str]] = {}
+        self._pending: dict[str, tuple[Path, Future]] = {}
+
+        self.workers = workers
+        self.use_processes = use_processes
+        self.executor = self._start_pool()
+
+    def _start_pool(self) -> Executor:
+        if self.use_processes:
+            return ProcessPoolExecutor(max_workers=self.workers)
+        return ThreadPoolExecutor(max_workers=self.workers)
+
+    def _load_ledger(self) -> dict[str, dict]:
+        if not self.state_file.exists():
+            return {}
+        with open(self.state_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_ledger(self) -> None:
+        _write_json_atomic(self.state_file, self.ledger)
+
+    def _content_hash(self, path: Path, stat: os.stat_result) -> str:
+        cached = self._stat_cache.get(path)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        sha = file_sha256(path)
+        self._stat_cache[path] = (stat.st_size, stat.st_mtime_ns, sha)
+        return sha
+
+    def _ledger_skips(self, sha: str, now: float) -> bool:
+        """Whether the ledger rules out processing this content now."""
+        entry = self.ledger.get(sha)
+        if entry is None:
+            return False
+        if entry["status"] != "failed":
+            return True
+        return entry.get("attempts", 1) >= self.max_attempts or now < entry.get("retry_after", 0)
+
+    def scan(self) -> list[tuple[Path, str]]:
+        """Find settled PDFs whose content is neither processed nor pending.
+
+        Failed content is found again once its retry delay has passed,
+        until it runs out of attempts.
+
+        Returns:
+            (path, sha256) pairs, one per distinct new content.
+        """
+        now = time.time()
+        found: dict[str, Path] = {}
+        for path in sorted(self.input_dir.glob("*.pdf")):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime < self.settle_seconds:
+                continue
+            sha = self._content_hash(path, stat)
+            if self._ledger_skips(sha, now) or sha in self._pending or sha in found:
+                continue
+            found[sha] = path
+        return [(path, sha) for sha, path in found.items()]
+
+    def poll(self) -> int:
+        """Submit new PDFs and record finished jobs. Returns jobs submitted."""
+        new_files = self.scan()
+        for path, sha in new_files:
+            logger.info(f"Queued {path.name} ({sha[:12]})")
+            try:
+                future = self.executor.submit(process_pdf, str(path), self.extract_images)
+            except BrokenProcessPool:
+                # A worker died; its jobs fail in _collect and are retried
+                logger.warning("Worker pool broken; starting a new one")
+                self.executor.shutdown(wait=False)
+                self.executor = self._start_pool()
+                future = self.executor.submit(process_pdf, str(path), self.extract_images)
+            self._pending[sha] = (path, future)
+        self._collect()
+        return len(new_files)
+
+    def _collect(self, wait: bool = False) -> None:
+        finished = False
+        for sha, (path, future) in list(self._pending.items()):
+            if not (wait or future.done()):
+                continue
+            entry = {"path": str(path), "status": "done"}
+            try:
+                entry.update(future.result())
+            except Exception as e:
+                previous = self.ledger.get(sha, {})
+                attempts = previous.get("attempts", 1) + 1 if previous.get("status") == "failed" else 1
+                entry.update(
+                    status="failed",
+                    error=str(e),
+                    attempts=attempts,
+                    retry_after=time.time() + self.retry_backoff * 2 ** (attempts - 1),
+                )
+                retry = "giving up" if attempts >= self.max_attempts else "will retry"
+                logger.error(f"Failed {path.name} (attempt {attempts}/{self.max_attempts}, {retry}): {e}")
+            entry["processed_at"] = datetime.now().isoformat()
+            self.ledger[sha] = entry
+            del self._pending[sha]
+            finished = True
+        if finished:
+            self.save_ledger()
+
+    def run_once(self) -> int:
+        """Process everything currently eligible and wait for completion."""
+        submitted = self.poll()
+        self._collect(wait=True)
+        return submitted
+
+    def run(self, interval: float = DEFAULT_INTERVAL) -> None:
+        """Poll forever until interrupted."""
+        logger.info(f"Watching {self.input_dir} every {interval}s")
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        finally:
+            self._collect(wait=True)
+            self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+def main():
+    """CLI entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Watch a directory and extract Core Analysis data from new PDFs"
+    )
+    parser.add_argument("input_dir", help="Directory to watch for PDFs")
+    parser.add_argument("--state-file", default=None,
+                        help=f"Processed-file ledger (default: <input_dir>/{LEDGER_NAME})")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL,
+                        help="Seconds between scans")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE_SECONDS,
+                        help="Seconds a file must be unmodified before processing")
+    parser.add_argument("--workers", "-w", type=int, default=2, help="Worker processes")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help="Attempts per PDF before a failing file is given up on")
+    parser.add_argument("--retry-backoff", type=float, default=DEFAULT_RETRY_BACKOFF_SECONDS,
+                        help="Seconds before retrying a failed PDF, doubled per attempt")
+    parser.add_argument("--no-images", action="store_true",
+                        help="Skip saving page images during ingest")
+    parser.add_argument("--once", action="store_true",
+                        help="Process current files and exit instead of watching")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    watcher = FolderWatcher(
+        args.input_dir,
+        state_file=args.state_file,
+        workers=args.workers,
+        settle_seconds=args.settle,
+        extract_images=not args.no_images,
+        max_attempts=args.max_attempts,
+        retry_backoff=args.retry_backoff,
+    )
+    if args.once:
+        count = watcher.run_once()
+        watcher.close()
+        print(f"Processed {count} new PDF(s)")
+        return
+
+    try:
+        watcher.run(interval=args.interval)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
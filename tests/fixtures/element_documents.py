@@ -0,0 +1,130 @@
+"""Synthetic elementizer documents mimicking the W20552 RCA table layout.
+
+The W20552 element database is not committed, so these builders produce a
+small DocumentElements tree (and SQLite database) with the same header band
+geometry and data block shape that core_analysis expects.
+"""
+
+from pathlib import Path
+
+from src.elementizer.database import ElementDatabase
+from src.elementizer.models import (
+    BoundingBox,
+    DocumentElements,
+    PageElements,
+    TextBlock,
+    TextLine,
+    TextSpan,
+)
+
+# Header band spans as (center_x, y0, text), positioned like page 39 of W20552
+HEADER_SPANS = [
+    (62, 193, "Core"), (62, 204, "Number"),
+    (110, 193, "Sample"), (110, 204, "Number"),
+    (167, 193, "Sample"), (167, 204, "Depth,"), (167, 215, "feet"),
+    (259, 193, "Permeability,"), (259, 204, "millidarcys"),
+    (230, 215, "to Air"), (292, 215, "Klinkenberg"),
+    (367, 193, "Porosity,"), (367, 204, "percent"),
+    (350, 215, "Ambient"), (392, 215, "NCS"),
+    (430, 193, "Grain"), (430, 204, "Density,"), (430, 215, "gm/cc"),
+    (506, 181, "Fluid"), (506, 193, "Saturations,"), (506, 204, "percent"),
+    (470, 215, "Water"), (510, 215, "Oil"), (550, 215, "Total"),
+]
+
+# Flattened headers produced from HEADER_SPANS
+EXPECTED_HEADERS = [
+    "Core Number",
+    "Sample Number",
+    "Sample Depth, feet",
+    "Permeability, millidarcys to Air",
+    "Permeability, millidarcys Klinkenberg",
+    "Porosity, percent Ambient",
+    "Porosity, percent NCS",
+    "Grain Density, gm/cc",
+    "Fluid Saturations, percent Water",
+    "Fluid Saturations, percent Oil",
+    "Fluid Saturations, percent Total",
+]
+
+# Data rows per table page, one value per line as PyMuPDF extracts them
+TABLE_PAGE_ROWS = {
+    39: [
+        ["1", "1-1", "9,580.50", "0.0011", "0.0003", "0.9", "0.9", "2.70", "96.5", "1.5", "98.1"],
+        ["1", "1-2(F)", "9,581.50", "+", "1.2", "2.70", "76.4", "0.8", "77.2"],
+        ["1", "1-3", "9,582.10", "<0.0001", "0.3", "0.3", "2.69", "**"],
+    ],
+    40: [
+        ["2", "2-1", "9,640.50", "0.0017", "0.0005", "0.5", "0.5", "2.70", "**"],
+        ["2", "2-2", "9,641.50", "0.0027", "0.0009", "0.9", "0.9", "2.71", "80.1", "2.0", "82.1"],
+    ],
+}
+
+TABLE_TITLE = "SUMMARY OF ROUTINE CORE ANALYSES RESULTS"
+PLOT_TITLE = "PROFILE PLOT"
+COVER_TITLE = "CORE ANALYSIS REPORT"
+
+
+def _span_block(x0: float, y0: float, lines: list[str], height: float = 9.0) -> TextBlock:
+    """Build a text block with one single-span line per entry."""
+    block = TextBlock(bbox=BoundingBox(x0, y0, x0 + 60, y0 + height * len(lines)))
+    for i, text in enumerate(lines):
+        top = y0 + i * height
+        bbox = BoundingBox(x0, top, x0 + 6 * max(len(text), 1), top + height)
+        block.lines.append(TextLine(bbox=bbox, spans=[
+            TextSpan(text=text, bbox=bbox, font_name="Helvetica", font_size=8.0)
+        ]))
+    return block
+
+
+def _header_block(spans: list[tuple[float, float, str]]) -> TextBlock:
+    """Build a text block holding the header band spans."""
+    block = TextBlock(bbox=BoundingBox(40, 170, 570, 230))
+    for center, y0, text in spans:
+        half = 3 * len(text)
+        bbox = BoundingBox(center - half, y0, center + half, y0 + 8)
+        block.lines.append(TextLine(bbox=bbox, spans=[
+            TextSpan(text=text, bbox=bbox, font_name="Helvetica-Bold", font_size=8.0)
+        ]))
+    return block
+
+
+def build_table_page(
+    page_number: int,
+    rows: list[list[str]],
+    header_spans: list[tuple[float, float, str]] = HEADER_SPANS,
+) -> PageElements:
+    """Build a table page with title, header band, and data block."""
+    page = PageElements(page_number=page_number, width=612, height=792)
+    page.text_blocks.append(_span_block(150, 60, [TABLE_TITLE]))
+    page.text_blocks.append(_header_block(header_spans))
+    page.text_blocks.append(
+        _span_block(45, 240, [value for row in rows for value in row], height=6.0)
+    )
+    return page
+
+
+def build_rca_document(
+    file_path: str = "W99999.pdf",
+    page_count: int = 42,
+    table_rows: dict[int, list[list[str]]] = TABLE_PAGE_ROWS,
+) -> DocumentElements:
+    """Build a document with a cover page, table pages, and a plot page."""
+    doc = DocumentElements(file_path=file_path, page_count=page_count)
+    for page_number in range(1, page_count + 1):
+        if page_number in table_rows:
+            page = build_table_page(page_number, table_rows[page_number])
+        else:
+            page = PageElements(page_number=page_number, width=612, height=792)
+            if page_number == 1:
+                page.text_blocks.append(_span_block(200, 100, [COVER_TITLE]))
+            elif page_number == page_count:
+                page.text_blocks.append(_span_block(200, 100, [PLOT_TITLE]))
+        doc.pages.append(page)
+    return doc
+
+
+def write_elements_db(db_path: Path, doc: DocumentElements | None = None) -> Path:
+    """Store a synthetic document in a new elements database."""
+    with ElementDatabase(db_path) as db:
+        db.store_document(doc or build_rca_document(file_path=f"{Path(db_path).stem}.pdf"))
+    return Path(db_path)
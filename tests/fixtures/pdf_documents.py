@@ -0,0 +1,91 @@
+"""Synthetic RCA PDFs built with PyMuPDF.
+
+Mirrors build_rca_document: a cover page, table pages 39 and 40 with the
+header band and data column, a plot page last, and blank pages between.
+"""
+
+from pathlib import Path
+
+from tests.fixtures.element_documents import (
+    COVER_TITLE,
+    HEADER_SPANS,
+    PLOT_TITLE,
+    TABLE_PAGE_ROWS,
+    TABLE_TITLE,
+)
+
+
+def write_rca_pdf(
+    pdf_path: Path,
+    page_count: int = 42,
+    table_rows: dict[int, list[list[str]]] = TABLE_PAGE_ROWS,
+) -> Path:
+    """Write a synthetic RCA report PDF. Requires PyMuPDF."""
+    import fitz
+
+    pdf = fitz.open()
+    for page_number in range(1, page_count + 1):
+        page = pdf.new_page(width=612, height=792)
+        if page_number in table_rows:
+            page.insert_text((150, 70), TABLE_TITLE, fontsize=8)
+            for center, y0, text in HEADER_SPANS:
+                # insert_text positions the baseline; spans start ~7pt above
+                page.insert_text((center - 3 * len(text), y0 + 7), text, fontsize=8)
+            values = [value for row in table_rows[page_number] for value in row]
+            page.insert_text((45, 250), "\n".join(values), fontsize=5)
+        elif page_number == 1:
+            page.insert_text((200, 100), COVER_TITLE)
+        elif page_number == page_count:
+            page.insert_text((200, 100), PLOT_TITLE)
+            # Dense vector content that lazy extraction should skip
+            for i in range(50):
+                page.draw_line((50, 150 + i * 10), (550, 160 + i * 10))
+    pdf.save(pdf_path)
+    pdf.close()
+    return Path(pdf_path)
+
+
+def write_pdf_elements_db(pdf_path: Path, db_path: Path) -> Path:
+    """Ingest a PDF into an element database (text and drawings, no images)."""
+    from src.elementizer.database import ElementDatabase
+    from src.elementizer.extractor import PDFElementExtractor
+
+    with PDFElementExtractor(str(pdf_path)) as extractor:
+        doc_elements = extractor.extract_all(extract_images=False)
+    with ElementDatabase(db_path) as db:
+        db.store_document(doc_elements)
+    return Path(db_path)
+
+
+def write_ruled_table_pdf(
+    pdf_path: Path,
+    page_count: int,
+    tables: dict[int, list[list[str]]],
+    cell_width: float = 90,
+    cell_height: float = 18,
+) -> Path:
+    """Write a PDF with one ruled grid table on each page of tables.
+
+    Each table's first row is its header row. Requires PyMuPDF.
+    """
+    import fitz
+
+    pdf = fitz.open()
+    for page_number in range(1, page_count + 1):
+        page = pdf.new_page(width=612, height=792)
+        if page_number not in tables:
+            page.insert_text((72, 72), f"Page {page_number} narrative text.")
+            continue
+        rows = tables[page_number]
+        x0, y0 = 40, 80
+        columns = len(rows[0])
+        for r in range(len(rows) + 1):
+            page.draw_line((x0, y0 + r * cell_height), (x0 + columns * cell_width, y0 + r * cell_height))
+        for c in range(columns + 1):
+            page.draw_line((x0 + c * cell_width, y0), (x0 + c * cell_width, y0 + len(rows) * cell_height))
+        for r, row in enumerate(rows):
+            for c, text in enumerate(row):
+                page.insert_text((x0 + c * cell_width + 4, y0 + r * cell_height + 12), text, fontsize=8)
+    pdf.save(pdf_path)
+    pdf.close()
+    return Path(pdf_path)
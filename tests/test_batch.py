@@ -0,0 +1,152 @@
+"""Tests for batch Core Analysis extraction over many databases."""
+
+import csv
+import json
+
+import pytest
+
+from src.batch import (
+    CONSOLIDATED_CSV_NAME,
+    SOURCE_COLUMN,
+    discover_databases,
+    get_batch_summary,
+    is_batch_target,
+    process_database,
+    run_batch,
+    source_names,
+)
+from src.core_analysis import CoreAnalysisExtractor
+from tests.fixtures.element_documents import TABLE_PAGE_ROWS, write_elements_db
+
+SAMPLES_PER_DB = sum(len(rows) for rows in TABLE_PAGE_ROWS.values())
+
+
+@pytest.fixture
+def db_dir(tmp_path):
+    """Directory holding two synthetic element databases."""
+    db_dir = tmp_path / "dbs"
+    db_dir.mkdir()
+    write_elements_db(db_dir / "W10001_elements.db")
+    write_elements_db(db_dir / "W10002_elements.db")
+    (db_dir / "notes.txt").write_text("not a database")
+    return db_dir
+
+
+class TestDiscovery:
+    """Tests for resolving batch targets."""
+
+    def test_directory_is_batch_target(self, db_dir):
+        assert is_batch_target(str(db_dir))
+
+    def test_glob_is_batch_target(self, db_dir):
+        assert is_batch_target(str(db_dir / "*.db"))
+
+    def test_single_file_is_not_batch_target(self, db_dir):
+        assert not is_batch_target(str(db_dir / "W10001_elements.db"))
+
+    def test_directory_finds_only_databases(self, db_dir):
+        names = [p.name for p in discover_databases(str(db_dir))]
+        assert names == ["W10001_elements.db", "W10002_elements.db"]
+
+    def test_glob_filters_databases(self, db_dir):
+        names = [p.name for p in discover_databases(str(db_dir / "W10002*.db"))]
+        assert names == ["W10002_elements.db"]
+
+
+class TestProcessDatabase:
+    """Tests for the per-document worker."""
+
+    def test_writes_per_document_outputs(self, db_dir, tmp_path):
+        item = process_database(str(db_dir / "W10001_elements.db"), str(tmp_path / "out"))
+
+        assert item.ok
+        assert item.source == "W10001"
+        assert item.table_pages == [39, 40]
+        assert len(item.samples) == SAMPLES_PER_DB
+        doc_dir = tmp_path / "out" / "W10001"
+        assert (doc_dir / "full_table_extraction.csv").exists()
+        assert (doc_dir / "page_classification.json").exists()
+        assert (doc_dir / "header_verification.txt").exists()
+
+    def test_missing_database_reports_error(self, tmp_path):
+        item = process_database(str(tmp_path / "missing.db"), str(tmp_path / "out"))
+
+        assert not item.ok
+        assert "Database not found" in item.error
+        assert item.samples == []
+
+
+class TestSourceNames:
+    """Tests for unique per-document names."""
+
+    def test_distinct_names_kept(self, tmp_path):
+        assert source_names([tmp_path / "W1_elements.db", tmp_path / "W2.db"]) == ["W1", "W2"]
+
+    def test_same_name_in_other_directories(self, tmp_path):
+        databases = [tmp_path / "a" / "W1_elements.db", tmp_path / "b" / "W1_elements.db"]
+        assert source_names(databases) == ["a_W1", "b_W1"]
+
+    def test_same_name_in_one_directory(self, tmp_path):
+        databases = [tmp_path / "W1.db", tmp_path / "W1_elements.db", tmp_path / "W2.db"]
+        names = source_names(databases)
+        assert names == [f"{tmp_path.name}_W1", f"{tmp_path.name}_W1-2", "W2"]
+
+
+class TestRunBatch:
+    """Tests for the batch runner and consolidated output."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_consolidated_csv_has_source_column(self, db_dir, tmp_path, workers):
+        output = tmp_path / "out"
+        batch = run_batch(discover_databases(str(db_dir)), str(output), workers=workers)
+
+        with open(output / CONSOLIDATED_CSV_NAME, encoding="utf-8-sig") as f:
+            rows = list(csv.reader(f))
+
+        assert rows[0] == [SOURCE_COLUMN] + CoreAnalysisExtractor.CANONICAL_HEADERS
+        assert len(rows) == 1 + 2 * SAMPLES_PER_DB
+        assert [row[0] for row in rows[1:]] == (
+            ["W10001"] * SAMPLES_PER_DB + ["W10002"] * SAMPLES_PER_DB
+        )
+        assert batch.sample_count == 2 * SAMPLES_PER_DB
+
+    def test_colliding_names_get_own_outputs(self, db_dir, tmp_path):
+        write_elements_db(db_dir / "W10001.db")
+        output = tmp_path / "out"
+        batch = run_batch(discover_databases(str(db_dir)), str(output), workers=1)
+
+        sources = [item.source for item in batch.items]
+        assert sources == ["dbs_W10001", "dbs_W10001-2", "W10002"]
+        assert all((output / source / "full_table_extraction.csv").exists() for source in sources)
+        with open(output / CONSOLIDATED_CSV_NAME, encoding="utf-8-sig") as f:
+            assert {row[0] for row in list(csv.reader(f))[1:]} == set(sources)
+
+    def test_failed_database_does_not_abort_batch(self, db_dir, tmp_path):
+        databases = discover_databases(str(db_dir)) + [tmp_path / "missing.db"]
+        batch = run_batch(databases, str(tmp_path / "out"), workers=1)
+
+        assert len(batch.items) == 3
+        assert [item.source for item in batch.failed] == ["missing"]
+
+    def test_summary_reports_per_file_timing(self, db_dir, tmp_path):
+        batch = run_batch(discover_databases(str(db_dir)), str(tmp_path / "out"), workers=1)
+        summary = get_batch_summary(batch)
+
+        assert summary["documents"] == 2
+        assert summary["failed"] == 0
+        assert all(f["elapsed_ms"] >= 0 for f in summary["files"])
+        json.dumps(summary)
+
+    def test_classify_only_skips_csv(self, db_dir, tmp_path):
+        output = tmp_path / "out"
+        batch = run_batch(
+            discover_databases(str(db_dir)), str(output), workers=1, classify_only=True
+        )
+
+        assert batch.consolidated_csv is None
+        assert not (output / CONSOLIDATED_CSV_NAME).exists()
+        assert (output / "W10001" / "page_classification.json").exists()
+
+    def test_rejects_output_outside_allowed_roots(self, db_dir):
+        with pytest.raises(ValueError, match="outside allowed directories"):
+            run_batch(discover_databases(str(db_dir)), "/etc/rca-batch")
@@ -0,0 +1,123 @@
+"""Tests for typed columnar (Parquet/NPZ) sample output."""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.batch import discover_databases, run_batch
+from src.core_analysis import CoreAnalysisExtractor
+from src.output.columnar import (
+    INDICATOR_LESS_THAN,
+    INDICATOR_MISSING,
+    INDICATOR_NOT_MEASURED,
+    INDICATOR_OTHER,
+    INDICATOR_PLUS,
+    INDICATOR_VALUE,
+    decode_value,
+    encode_value,
+    read_columnar,
+    resolve_format,
+)
+from tests.fixtures.element_documents import write_elements_db
+
+
+@pytest.fixture
+def extracted(tmp_path):
+    """Extractor and result for a synthetic elements database."""
+    extractor = CoreAnalysisExtractor(str(write_elements_db(tmp_path / "W1_elements.db")))
+    return extractor, extractor.extract()
+
+
+class TestIndicatorEncoding:
+    """Tests for value/indicator encoding of sample cells."""
+
+    @pytest.mark.parametrize("value,expected_code", [
+        (0.0011, INDICATOR_VALUE),
+        (None, INDICATOR_MISSING),
+        ("+", INDICATOR_PLUS),
+        ("**", INDICATOR_NOT_MEASURED),
+        ("<0.0001", INDICATOR_LESS_THAN),
+        ("n/a", INDICATOR_OTHER),
+    ])
+    def test_codes(self, value, expected_code):
+        assert encode_value(value)[1] == expected_code
+
+    def test_detection_limit_keeps_threshold(self):
+        assert encode_value("<0.0001") == (0.0001, INDICATOR_LESS_THAN)
+
+    @pytest.mark.parametrize("value", [2.7, None, "+", "**", "<0.0001", "<"])
+    def test_round_trip(self, value):
+        assert decode_value(*encode_value(value)) == value
+
+    def test_unknown_format_rejected(self):
+        with pytest.raises(ValueError, match="Unknown columnar format"):
+            resolve_format("xlsx")
+
+
+class TestSaveColumnar:
+    """Tests for CoreAnalysisExtractor.save_columnar."""
+
+    def test_npz_columns_are_typed(self, extracted, tmp_path):
+        extractor, result = extracted
+        path = extractor.save_columnar(result, str(tmp_path / "out" / "samples"), fmt="npz")
+
+        assert path.endswith(".npz")
+        columns = read_columnar(path)
+        assert columns["depth_feet"].dtype == np.float64
+        assert columns["permeability_air_md_indicator"].dtype == np.uint8
+        assert columns["page_number"].dtype == np.int32
+        assert list(columns["sample_number"]) == [s.sample_number for s in result.samples]
+
+    def test_indicators_written_per_measurement(self, extracted, tmp_path):
+        extractor, result = extracted
+        columns = read_columnar(
+            extractor.save_columnar(result, str(tmp_path / "samples"), fmt="npz")
+        )
+
+        # Sample 1-2(F) has '+' permeability and no NCS porosity
+        assert list(columns["permeability_air_md_indicator"][:3]) == [
+            INDICATOR_VALUE, INDICATOR_PLUS, INDICATOR_LESS_THAN,
+        ]
+        assert math.isnan(columns["permeability_klink_md"][1])
+        assert columns["porosity_ncs_pct_indicator"][1] == INDICATOR_MISSING
+        assert columns["saturation_total_pct_indicator"][2] == INDICATOR_NOT_MEASURED
+        assert columns["permeability_air_md"][2] == pytest.approx(0.0001)
+
+    def test_parquet_matches_npz(self, extracted, tmp_path):
+        pytest.importorskip("pyarrow")
+        extractor, result = extracted
+        npz = read_columnar(extractor.save_columnar(result, str(tmp_path / "a"), fmt="npz"))
+        parquet = read_columnar(
+            extractor.save_columnar(result, str(tmp_path / "b"), fmt="parquet")
+        )
+
+        assert set(npz) == set(parquet)
+        for name in npz:
+            np.testing.assert_array_equal(npz[name], parquet[name].astype(npz[name].dtype))
+
+    def test_rejects_output_outside_allowed_roots(self, extracted):
+        extractor, result = extracted
+        with pytest.raises(ValueError, match="outside allowed directories"):
+            extractor.save_columnar(result, "/etc/samples", fmt="npz")
+
+
+class TestBatchColumnar:
+    """Tests for consolidated columnar output in batch mode."""
+
+    def test_consolidated_columnar_has_source(self, tmp_path):
+        write_elements_db(tmp_path / "dbs" / "W1_elements.db")
+        write_elements_db(tmp_path / "dbs" / "W2_elements.db")
+
+        batch = run_batch(
+            discover_databases(str(tmp_path / "dbs")),
+            str(tmp_path / "out"),
+            workers=1,
+            columnar="npz",
+        )
+        columns = read_columnar(batch.consolidated_columnar)
+
+        assert len(columns["source"]) == batch.sample_count
+        assert set(columns["source"]) == {"W1", "W2"}
+        assert (tmp_path / "out" / "W1" / "full_table_extraction.npz").exists()
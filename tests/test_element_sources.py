@@ -0,0 +1,147 @@
+"""Tests for pluggable element sources (SQLite, JSONL, in-memory)."""
+
+import json
+import sys
+
+import pytest
+
+from src import core_analysis
+from src.core_analysis import CoreAnalysisExtractor
+from src.element_sources import (
+    InMemoryElementSource,
+    JSONLElementSource,
+    SQLiteElementSource,
+    open_element_source,
+)
+from tests.fixtures.element_documents import (
+    EXPECTED_HEADERS,
+    TABLE_TITLE,
+    build_rca_document,
+    write_elements_db,
+)
+
+
+def write_page_dump(path, doc):
+    """Write a JSONL page dump like `elementizer extract --jsonl`."""
+    with open(path, "w", encoding="utf-8") as f:
+        for page in doc.pages:
+            f.write(json.dumps(page.to_dict()) + "\n")
+    return path
+
+
+@pytest.fixture
+def doc():
+    return build_rca_document()
+
+
+@pytest.fixture
+def sources(doc, tmp_path):
+    """The same document behind each source backend."""
+    opened = [
+        SQLiteElementSource(write_elements_db(tmp_path / "W1_elements.db", doc)),
+        JSONLElementSource(write_page_dump(tmp_path / "W1_pages.jsonl", doc)),
+        InMemoryElementSource(doc),
+    ]
+    yield opened
+    for source in opened:
+        source.close()
+
+
+class TestSourceEquivalence:
+    """All backends must answer queries identically."""
+
+    def test_page_numbers(self, sources):
+        expected = list(range(1, 43))
+        for source in sources:
+            assert source.page_numbers() == expected
+
+    @pytest.mark.parametrize("page_num", [1, 2, 39, 40, 42, 99])
+    def test_page_text(self, sources, page_num):
+        texts = {source.page_text(page_num) for source in sources}
+        assert len(texts) == 1
+
+    def test_text_blocks(self, sources):
+        reference = sources[0].text_blocks(39)
+        assert reference[0].full_text == TABLE_TITLE
+        for source in sources[1:]:
+            assert source.text_blocks(39) == reference
+
+    def test_spans_in_band(self, sources):
+        reference = sources[0].spans_in_band(39, 175, 225)
+        assert reference
+        assert all(175 <= span.y0 <= 225 for span in reference)
+        for source in sources[1:]:
+            assert source.spans_in_band(39, 175, 225) == reference
+
+    def test_extraction_matches_database(self, sources):
+        results = [CoreAnalysisExtractor(source=source).extract() for source in sources]
+        for result in results[1:]:
+            assert result.table_pages == results[0].table_pages == [39, 40]
+            assert result.samples == results[0].samples
+            assert len(result.samples) == 5
+
+    def test_headers_from_source(self, sources):
+        for source in sources:
+            headers = CoreAnalysisExtractor(source=source).get_extracted_headers()
+            assert headers == EXPECTED_HEADERS + ["Page Number"]
+
+
+class TestOpeningSources:
+    """Tests for source selection and constructor arguments."""
+
+    def test_open_by_suffix(self, doc, tmp_path):
+        db = write_elements_db(tmp_path / "W1_elements.db", doc)
+        dump = write_page_dump(tmp_path / "W1_pages.jsonl", doc)
+
+        with open_element_source(str(db)) as source:
+            assert isinstance(source, SQLiteElementSource)
+        with open_element_source(str(dump)) as source:
+            assert isinstance(source, JSONLElementSource)
+
+    def test_unknown_suffix_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match="Unrecognized element source"):
+            open_element_source(str(tmp_path / "W1.csv"))
+
+    def test_requires_exactly_one_input(self, doc, tmp_path):
+        db = str(write_elements_db(tmp_path / "W1_elements.db", doc))
+        with pytest.raises(ValueError, match="exactly one"):
+            CoreAnalysisExtractor()
+        with pytest.raises(ValueError, match="exactly one"):
+            CoreAnalysisExtractor(db, source=InMemoryElementSource(doc))
+
+    def test_sqlite_source_closes_connection(self, doc, tmp_path):
+        db = str(write_elements_db(tmp_path / "W1_elements.db", doc))
+        source = SQLiteElementSource(db)
+        with source:
+            source.page_numbers()
+        assert source._conn is None
+
+    def test_cli_reads_jsonl_dump(self, doc, tmp_path, monkeypatch):
+        dump = write_page_dump(tmp_path / "W1_pages.jsonl", doc)
+        monkeypatch.setattr(sys, "argv", [
+            "core_analysis", str(dump), "--output", str(tmp_path / "out"),
+        ])
+        core_analysis.main()
+
+        classification = json.loads((tmp_path / "out" / "page_classification.json").read_text())
+        assert classification["page_39"] == "table"
+
+
+class TestPdfSource:
+    """Tests for extracting straight from a PDF."""
+
+    def test_from_pdf_classifies_without_database(self, tmp_path):
+        fitz = pytest.importorskip("fitz")
+        pdf_path = tmp_path / "W1.pdf"
+        pdf = fitz.open()
+        pdf.new_page().insert_text((72, 72), "CORE ANALYSIS REPORT")
+        pdf.new_page().insert_text((72, 72), TABLE_TITLE)
+        pdf.save(pdf_path)
+        pdf.close()
+
+        source = InMemoryElementSource.from_pdf(str(pdf_path))
+        result = CoreAnalysisExtractor(source=source).extract()
+
+        assert source.name == "W1"
+        assert result.table_pages == [2]
+        assert not list(tmp_path.glob("*.db"))
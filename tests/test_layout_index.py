@@ -0,0 +1,201 @@
+"""Tests for layout fingerprints and template-matched page classification."""
+
+import dataclasses
+import random
+import sqlite3
+
+import pytest
+
+pytest.importorskip("fitz")
+
+from src.core_analysis import CoreAnalysisExtractor
+from src.element_sources import InMemoryElementSource, SQLiteElementSource
+from src.elementizer.database import ElementDatabase, compute_page_layout, read_page_layouts
+from src.elementizer.layout_index import (
+    FINGERPRINT_BITS,
+    MAX_TEMPLATE_DISTANCE,
+    LayoutIndex,
+    Template,
+    hamming_distance,
+    simhash,
+    span_token,
+)
+from src.page_classifier import PageClassifier
+from src.pdf_dissector import PDFDissector
+from tests.fixtures.element_documents import TABLE_PAGE_ROWS
+from tests.fixtures.pdf_documents import write_pdf_elements_db, write_rca_pdf
+
+
+@pytest.fixture(scope="module")
+def pdf_dir(tmp_path_factory):
+    pdf_dir = tmp_path_factory.mktemp("pdf")
+    write_rca_pdf(pdf_dir / "W1.pdf")
+    write_rca_pdf(pdf_dir / "W2.pdf", page_count=5, table_rows={3: TABLE_PAGE_ROWS[39]})
+    return pdf_dir
+
+
+@pytest.fixture(scope="module")
+def db_paths(pdf_dir):
+    """One database per report, plus one holding both."""
+    paths = {}
+    for name in ("W1", "W2"):
+        paths[name] = write_pdf_elements_db(pdf_dir / f"{name}.pdf", pdf_dir / f"{name}_elements.db")
+        write_pdf_elements_db(pdf_dir / f"{name}.pdf", pdf_dir / "corpus_elements.db")
+    paths["corpus"] = pdf_dir / "corpus_elements.db"
+    return paths
+
+
+class TestFingerprints:
+    """Tests for SimHash layout fingerprints."""
+
+    def test_simhash_stable_and_order_free(self):
+        tokens = [span_token(x, "Helvetica", 8) for x in range(40, 560, 45)]
+        assert simhash(tokens) == simhash(reversed(tokens)) == simhash(tokens + tokens)
+        assert simhash([]) == 0
+        assert 0 < simhash(tokens) < 1 << FINGERPRINT_BITS
+
+    def test_similar_layouts_are_close(self):
+        rng = random.Random(3)
+        tokens = [f"t{rng.random()}" for _ in range(400)]
+        assert hamming_distance(simhash(tokens), simhash(tokens[:396])) <= MAX_TEMPLATE_DISTANCE
+        assert hamming_distance(simhash(tokens), simhash(tokens[:200])) > MAX_TEMPLATE_DISTANCE
+
+    def test_row_count_does_not_matter(self, db_paths):
+        with SQLiteElementSource(db_paths["W1"]) as source:
+            layouts = source.page_layouts()
+        # Table pages 39 and 40 hold different rows
+        assert layouts[39] == layouts[40] != layouts[1]
+
+
+class TestLayoutIndex:
+    """Tests for LSH template lookup."""
+
+    def test_finds_templates_within_distance(self):
+        rng = random.Random(5)
+        index = LayoutIndex(min_support=1)
+        fingerprints = [rng.getrandbits(64) for _ in range(500)]
+        for n, fingerprint in enumerate(fingerprints):
+            index.add(fingerprint, n)
+        for n, fingerprint in enumerate(fingerprints[:50]):
+            flipped = fingerprint
+            for bit in rng.sample(range(64), MAX_TEMPLATE_DISTANCE):
+                flipped ^= 1 << bit
+            assert index.lookup(flipped).label == n
+        assert index.lookup(fingerprints[0] ^ 0xFFFF) is None
+
+    def test_support_and_conflicts(self):
+        index = LayoutIndex()
+        index.add(0b1010, "table", "page 39")
+        assert index.lookup(0b1010) is None  # one page is not a template yet
+        index.add(0b1011, "table", "page 40")
+        assert index.lookup(0b1010).example == "page 39"
+
+        index.add(0b1000, "plot")
+        assert index.lookup(0b1010) is None
+        assert len(index) == 1
+
+    def test_bounded(self):
+        index = LayoutIndex(min_support=1, max_templates=2)
+        for fingerprint in (0, 0xFFFF << 48, 0xFFFF << 16):
+            index.add(fingerprint, fingerprint)
+        assert len(index) == 2
+        assert index.lookup(0) is None
+
+
+class TestStoredLayouts:
+    """Tests for the page_layouts table."""
+
+    def test_backfill_matches_ingest(self, db_paths, tmp_path):
+        with sqlite3.connect(db_paths["corpus"]) as conn:
+            stored = read_page_layouts(conn)
+            assert all(compute_page_layout(conn, page_id) == fp for page_id, fp in stored.items())
+
+        copy = tmp_path / "copy.db"
+        with sqlite3.connect(db_paths["corpus"]) as src, sqlite3.connect(copy) as dst:
+            src.backup(dst)
+            dst.execute("DROP TABLE page_layouts")
+            assert read_page_layouts(dst) == stored
+
+    def test_find_similar_pages_across_documents(self, db_paths):
+        with SQLiteElementSource(db_paths["W1"]) as source:
+            table_layout = source.page_layouts()[39]
+        with ElementDatabase(str(db_paths["corpus"])) as db:
+            matches = db.find_similar_pages(table_layout)
+            assert [(m["document_id"], m["page_number"]) for m in matches] == [(1, 39), (1, 40), (2, 3)]
+            assert [m["page_number"] for m in db.find_similar_pages(table_layout, document_id=2)] == [3]
+
+    def test_in_memory_layouts(self, pdf_dir):
+        source = InMemoryElementSource.from_pdf(str(pdf_dir / "W1.pdf"), layouts=True)
+        layouts = source.page_layouts()
+        assert layouts[39] == layouts[40]
+        assert InMemoryElementSource.from_pdf(str(pdf_dir / "W1.pdf")).page_layouts() == {}
+
+
+class TestTemplateClassification:
+    """Template-matched labels must agree with the rules."""
+
+    def test_core_analysis_reuses_templates_across_documents(self, db_paths):
+        expected = {
+            name: CoreAnalysisExtractor(str(db_paths[name])).extract().classifications
+            for name in ("W1", "W2")
+        }
+
+        index = LayoutIndex()
+        results = {
+            name: CoreAnalysisExtractor(str(db_paths[name]), layout_index=index).extract()
+            for name in ("W1", "W2")
+        }
+        for name, result in results.items():
+            assert [(c.page_number, c.page_type) for c in result.classifications] == [
+                (c.page_number, c.page_type) for c in expected[name]
+            ]
+        assert results["W2"].table_pages == [3]
+        assert results["W2"].classifications[2].reason.startswith("Layout matches W1_elements page 39")
+        assert len(results["W2"].samples) == len(TABLE_PAGE_ROWS[39])
+        assert index.hits > 0
+
+    def test_page_classifier(self, pdf_dir):
+        structures = []
+        for name in ("W1", "W2"):
+            with PDFDissector(str(pdf_dir / f"{name}.pdf")) as dissector:
+                structures.append(dissector.analyze())
+        assert structures[0].pages[38].layout_fingerprint == structures[0].pages[39].layout_fingerprint
+
+        index = LayoutIndex()
+        classifier = PageClassifier(layout_index=index)
+        for structure in structures:
+            by_template = classifier.classify_structure(structure)
+            by_rules = PageClassifier().classify_structure(structure)
+            assert {n: c.page_type for n, c in by_template.items()} == {
+                n: c.page_type for n, c in by_rules.items()
+            }
+        assert by_template[3].notes.startswith("Layout matches page 39")
+        # Matched pages report their own measurements, not the example's
+        for number, classification in by_template.items():
+            expected = by_rules[number]
+            assert (
+                classification.horizontal_line_count, classification.vertical_line_count,
+                classification.text_block_count, classification.image_coverage,
+            ) == (
+                expected.horizontal_line_count, expected.vertical_line_count,
+                expected.text_block_count, expected.image_coverage,
+            )
+        assert by_template[1].notes == by_rules[1].notes
+        assert index.hits > 0
+
+    def test_template_page_keeps_own_measurements(self, pdf_dir):
+        with PDFDissector(str(pdf_dir / "W1.pdf")) as dissector:
+            structure = dissector.analyze()
+        page = structure.pages[38]
+        own = PageClassifier()._classify_page_by_rules(page)
+        example = dataclasses.replace(
+            own, page_number=7, horizontal_line_count=99, text_block_count=99, image_coverage=0.5,
+        )
+
+        matched = PageClassifier._from_template(page, Template(0, (own.page_type, own.confidence), example))
+        assert (matched.page_type, matched.confidence) == (own.page_type, own.confidence)
+        assert matched.horizontal_line_count == own.horizontal_line_count
+        assert matched.vertical_line_count == own.vertical_line_count
+        assert matched.text_block_count == own.text_block_count
+        assert matched.image_coverage == own.image_coverage
+        assert matched.notes.startswith("Layout matches page 7")
@@ -0,0 +1,84 @@
+"""Tests for two-phase lazy PDF extraction."""
+
+import json
+import sys
+
+import pytest
+
+pytest.importorskip("fitz")
+
+from src import core_analysis
+from src.core_analysis import CoreAnalysisExtractor
+from src.elementizer.extractor import PDFElementExtractor
+from src.profiling import StageProfiler
+from tests.fixtures.element_documents import EXPECTED_HEADERS
+from tests.fixtures.pdf_documents import write_rca_pdf
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    return str(write_rca_pdf(tmp_path_factory.mktemp("pdf") / "W1.pdf"))
+
+
+class TestSelectivePageExtraction:
+    """Tests for the PDFElementExtractor phase-one and phase-two helpers."""
+
+    def test_page_texts_cover_all_pages(self, pdf_path):
+        with PDFElementExtractor(pdf_path) as extractor:
+            texts = extractor.extract_page_texts()
+        assert list(texts) == list(range(1, 43))
+        assert "SUMMARY OF ROUTINE CORE ANALYSES" in texts[39]
+
+    def test_extract_pages_only_selected(self, pdf_path):
+        with PDFElementExtractor(pdf_path) as extractor:
+            doc = extractor.extract_pages([40, 39, 99])
+        assert doc.page_count == 42
+        assert [p.page_number for p in doc.pages] == [39, 40]
+
+
+class TestLazyExtractor:
+    """Lazy mode must match eager in-memory extraction."""
+
+    def test_only_table_pages_fully_extracted(self, pdf_path):
+        extractor = CoreAnalysisExtractor.from_pdf(pdf_path, lazy=True)
+        assert extractor.source.extracted_pages == [39, 40]
+        assert extractor.source.text_blocks(42) == []
+
+    def test_matches_eager_extraction(self, pdf_path):
+        eager = CoreAnalysisExtractor.from_pdf(pdf_path)
+        lazy = CoreAnalysisExtractor.from_pdf(pdf_path, lazy=True)
+        eager_result, lazy_result = eager.extract(), lazy.extract()
+
+        assert [c.page_type for c in lazy_result.classifications] == [
+            c.page_type for c in eager_result.classifications
+        ]
+        assert lazy_result.samples == eager_result.samples
+        assert len(lazy_result.samples) == 5
+        assert lazy.get_extracted_headers() == EXPECTED_HEADERS + ["Page Number"]
+
+    def test_configured_page_types(self, pdf_path):
+        extractor = CoreAnalysisExtractor.from_pdf(
+            pdf_path, lazy=True, page_types=("table", "plot")
+        )
+        assert extractor.source.extracted_pages == [39, 40, 42]
+
+    def test_phases_profiled(self, pdf_path):
+        profiler = StageProfiler(trace_memory=False)
+        CoreAnalysisExtractor.from_pdf(pdf_path, lazy=True, profiler=profiler)
+        assert profiler.records["pdf_text"].rows == 42
+        assert profiler.records["pdf_elements"].rows == 2
+
+    def test_cli_lazy_requires_pdf(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(sys, "argv", ["core_analysis", "x.db", "--lazy"])
+        with pytest.raises(SystemExit):
+            core_analysis.main()
+
+    def test_cli_lazy(self, pdf_path, tmp_path, monkeypatch):
+        monkeypatch.setattr(sys, "argv", [
+            "core_analysis", "--pdf", pdf_path, "--lazy", "--output", str(tmp_path),
+        ])
+        core_analysis.main()
+
+        classification = json.loads((tmp_path / "page_classification.json").read_text())
+        assert classification["page_40"] == "table"
+        assert (tmp_path / "full_table_extraction.csv").read_text().count("\n") == 6
@@ -0,0 +1,152 @@
+"""Tests for cached SVG element overlays."""
+
+import sqlite3
+import xml.etree.ElementTree as ET
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("flask")
+
+from src.core_analysis import CoreAnalysisExtractor
+from src.elementizer import viewer
+from src.elementizer.overlay import (
+    NO_GUIDES,
+    OverlayCache,
+    build_overlay_svg,
+    core_analysis_guides,
+    overlay_key,
+)
+from tests.fixtures.pdf_documents import write_pdf_elements_db, write_rca_pdf
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    pdf_path = write_rca_pdf(tmp_path / "W1.pdf")
+    return write_pdf_elements_db(pdf_path, tmp_path / "W1_elements.db")
+
+
+@pytest.fixture
+def client(db_path, tmp_path):
+    viewer.configure_viewer(
+        str(db_path), prewarm=False, overlay_cache_dir=str(tmp_path / "overlays"),
+    )
+    yield viewer.app.test_client()
+    viewer.RENDERER.close()
+    viewer.RENDERER = None
+
+
+def groups(svg: bytes) -> dict[str, ET.Element]:
+    root = ET.fromstring(svg)
+    return {g.get("class"): g for g in root.iter(f"{SVG}g")}
+
+
+class TestDrawing:
+    """Tests for the SVG document."""
+
+    def test_elements_and_guides(self):
+        elements = {
+            "span": [(10, 20, 30, 28, "A & <B>")],
+            "line": [(0, 50, 100, 50)],
+            "rect": [(5, 5, 15, 15)],
+        }
+        svg = build_overlay_svg(612, 792, elements, core_analysis_guides())
+        found = groups(svg.encode())
+
+        assert ET.fromstring(svg).get("viewBox") == "0 0 612.0 792.0"
+        assert found["span"].find(f"{SVG}rect/{SVG}title").text == "A & <B>"
+        assert len(found["line"]) == 1
+        assert len(found["rect"]) == 1
+        band = found["header-band"].find(f"{SVG}rect")
+        assert float(band.get("y")) == CoreAnalysisExtractor.HEADER_Y_MIN
+        # One label per column boundary
+        labels = found["columns"].findall(f"{SVG}text")
+        assert len(labels) == len(CoreAnalysisExtractor.COLUMN_BOUNDARIES)
+
+    def test_no_guides(self):
+        found = groups(build_overlay_svg(612, 792, {}, NO_GUIDES).encode())
+        assert "header-band" not in found
+        assert "columns" not in found
+
+    def test_key_tracks_version_and_guides(self):
+        guides = core_analysis_guides()
+        base = overlay_key(1, 612, 792, "v1", guides)
+        assert base == overlay_key(1, 612, 792, "v1", guides)
+        assert base != overlay_key(2, 612, 792, "v1", guides)
+        assert base != overlay_key(1, 612, 792, "v2", guides)
+        assert base != overlay_key(1, 612, 792, "v1", NO_GUIDES)
+
+
+class TestCache:
+    """Overlays are drawn once per fingerprint."""
+
+    def test_built_once(self, db_path, tmp_path, monkeypatch):
+        from src.elementizer import overlay as overlay_module
+
+        cache = OverlayCache(str(tmp_path / "overlays"), guides=core_analysis_guides())
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        page = conn.execute("SELECT id, width, height FROM pages WHERE page_number = 39").fetchone()
+
+        key, data = cache.overlay(conn, page, "v1")
+        assert (tmp_path / "overlays" / f"{key}.svg").read_bytes() == data
+
+        # A hit neither draws nor reads the page's elements
+        monkeypatch.setattr(overlay_module, "build_overlay_svg", lambda *a: pytest.fail("redrawn"))
+        monkeypatch.setattr(overlay_module, "load_page_elements", lambda *a: pytest.fail("elements loaded"))
+        assert cache.overlay(conn, page, "v1") == (key, data)
+        conn.close()
+
+    def test_new_version_redrawn(self, db_path, tmp_path):
+        cache = OverlayCache(str(tmp_path / "overlays"))
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        page = conn.execute("SELECT id, width, height FROM pages WHERE page_number = 39").fetchone()
+
+        before_key, before = cache.overlay(conn, page, "v1")
+        conn.execute("UPDATE text_spans SET x0 = x0 + 1 WHERE page_id = ?", (page["id"],))
+        after_key, after = cache.overlay(conn, page, "v2")
+        assert before_key != after_key
+        assert before != after
+        assert len(cache.cache) == 2
+        conn.close()
+
+
+class TestEndpoint:
+    """Tests for /page/<n>/overlay.svg."""
+
+    def test_serves_svg(self, client):
+        response = client.get("/page/39/overlay.svg")
+        assert response.status_code == 200
+        assert response.mimetype == "image/svg+xml"
+        found = groups(response.data)
+        assert len(found["span"]) == 53
+        assert "header-band" in found
+
+    def test_plot_page_lines(self, client):
+        found = groups(client.get("/page/42/overlay.svg?guides=0").data)
+        assert len(found["line"]) == 50
+        assert "columns" not in found
+
+    def test_conditional_and_compressed(self, client):
+        response = client.get("/page/39/overlay.svg")
+        again = client.get("/page/39/overlay.svg", headers={"If-None-Match": response.headers["ETag"]})
+        assert again.status_code == 304
+
+        gz = client.get("/page/39/overlay.svg", headers={"Accept-Encoding": "gzip"})
+        assert gz.headers["Content-Encoding"] == "gzip"
+        # Both encodings carry the same ETag, so it must be weak
+        assert gz.headers["ETag"] == response.headers["ETag"]
+        assert response.headers["ETag"].startswith("W/")
+        again = client.get("/page/39/overlay.svg", headers={"If-None-Match": gz.headers["ETag"]})
+        assert again.status_code == 304
+
+    def test_page_view_stacks_overlay(self, client):
+        html = client.get("/page/39").data
+        assert b'src="/page/39/overlay.svg"' in html
+        assert b'src="/page/39/render"' in html
+
+    def test_missing_page(self, client):
+        assert client.get("/page/99/overlay.svg").status_code == 404
@@ -0,0 +1,79 @@
+"""Tests for vectorized PageClassifier batch classification."""
+
+import random
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.models import ImageInfo, LineInfo, PageInfo, PageType, PDFStructure, TextBlock
+from src.page_classifier import PageClassifier
+
+
+def random_page(rng: random.Random, page_number: int) -> PageInfo:
+    """A page mixing the features each classification rule looks at."""
+    width, height = rng.choice([(612.0, 792.0), (0.0, 0.0), (792.0, 612.0)])
+    page = PageInfo(page_number=page_number, width=width, height=height)
+    page.char_count = rng.choice([0, 5, 150, 299, 450, 501, 2000])
+    page.text_blocks = [TextBlock(0, 0, 10, 10, "x")] * rng.choice([0, 2, 3, 4, 8])
+
+    kind = rng.random()
+    if kind < 0.3:
+        # Evenly or unevenly spaced rules, sometimes with a vertical grid
+        start, gap = rng.uniform(50, 100), rng.choice([3.0, 12.0, 20.0])
+        for row in range(rng.randint(0, 10)):
+            y = start + row * gap * rng.choice([1, 1, 1, 2.7])
+            page.lines.append(LineInfo(50, y, 550, y + rng.choice([0, 0.5])))
+        for col in range(rng.choice([0, 2, 4])):
+            page.lines.append(LineInfo(50 + col * 100, 100, 50 + col * 100, 300))
+    elif kind < 0.5:
+        for _ in range(rng.randint(1, 8)):
+            x, y = rng.uniform(0, 500), rng.uniform(0, 700)
+            page.lines.append(LineInfo(x, y, x + rng.uniform(-3, 100), y + rng.uniform(-3, 100)))
+    if rng.random() < 0.3:
+        for _ in range(rng.randint(1, 3)):
+            x, y = rng.uniform(0, 300), rng.uniform(0, 400)
+            page.images.append(ImageInfo(x, y, x + rng.uniform(10, 400), y + rng.uniform(10, 500), 8, 8))
+    return page
+
+
+class TestClassifyPages:
+    """Tests for PageClassifier.classify_pages."""
+
+    def test_matches_classify_page(self):
+        rng = random.Random(7)
+        classifier = PageClassifier()
+        seen = set()
+        # Many short documents, so first-page rules come up often
+        for _ in range(100):
+            pages = [random_page(rng, number) for number in range(1, 41)]
+            batch = classifier.classify_pages(pages)
+            assert list(batch) == [p.page_number for p in pages]
+            for page in pages:
+                assert batch[page.page_number] == classifier.classify_page(page)
+            seen |= {(c.page_type, c.confidence) for c in batch.values()}
+        # Every rule is exercised
+        assert seen == {
+            (page_type, confidence) for page_type, confidence, _ in PageClassifier.RULES
+        }
+
+    def test_classify_structure(self):
+        pages = [random_page(random.Random(number), number) for number in range(1, 30)]
+        structure = PDFStructure(file_path="x.pdf", page_count=len(pages), pages=pages)
+        classifier = PageClassifier()
+        assert classifier.classify_structure(structure) == {
+            p.page_number: classifier.classify_page(p) for p in pages
+        }
+
+    def test_empty_and_featureless(self):
+        classifier = PageClassifier()
+        assert classifier.classify_pages([]) == {}
+        result = classifier.classify_pages([PageInfo(page_number=3, width=612, height=792)])
+        assert result[3].page_type == PageType.BLANK
+
+    def test_without_numpy(self, monkeypatch):
+        pages = [random_page(random.Random(number), number) for number in range(1, 30)]
+        expected = PageClassifier().classify_pages(pages)
+        monkeypatch.setitem(sys.modules, "numpy", None)
+        assert PageClassifier().classify_pages(pages) == expected
@@ -0,0 +1,112 @@
+"""Tests for PageInterpretation and its use by the extractor and dissector."""
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from src.elementizer.extractor import PDFElementExtractor
+from src.elementizer.page_interpretation import TEXT_FLAGS, PageInterpretation
+from src.pdf_dissector import PDFDissector
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    """Two pages: a logo on both, a photo on the first and unused xrefs nowhere."""
+    path = tmp_path_factory.mktemp("pdf") / "images.pdf"
+    logo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), False)
+    logo.set_rect(logo.irect, (200, 30, 30))
+    photo = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 16, 12), False)
+    photo.set_rect(photo.irect, (30, 30, 200))
+
+    doc = fitz.open()
+    for number in range(2):
+        page = doc.new_page(width=612, height=792)
+        page.insert_text((72, 72), f"Page {number + 1} SUMMARY", fontsize=12)
+        page.draw_rect(fitz.Rect(72, 100, 300, 200))
+        page.insert_image(fitz.Rect(500, 20, 560, 80), pixmap=logo)
+        if number == 0:
+            page.insert_image(fitz.Rect(72, 300, 232, 420), pixmap=photo)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+class TestPageInterpretation:
+    """Tests for the cached page interpretation."""
+
+    def test_text_matches_page(self, pdf_path):
+        with fitz.open(pdf_path) as doc:
+            interp = PageInterpretation(doc[0])
+            assert interp.text_dict() == doc[0].get_text("dict", flags=TEXT_FLAGS)
+            assert interp.text_dict() is interp.text_dict()
+            assert interp.text() == doc[0].get_text(flags=TEXT_FLAGS)
+
+    def test_drawings_cached(self, pdf_path):
+        with fitz.open(pdf_path) as doc:
+            interp = PageInterpretation(doc[0])
+            assert interp.drawings() is interp.drawings()
+            assert len(interp.drawings()) == len(doc[0].get_drawings())
+
+    def test_image_bbox_matches_pymupdf(self, pdf_path):
+        with fitz.open(pdf_path) as doc:
+            page = doc[0]
+            interp = PageInterpretation(page)
+            for item in page.get_images(full=True):
+                assert interp.image_bbox(item[0]) == page.get_image_bbox(item)
+            assert interp.image_bbox(page.get_images()[1][0]) == fitz.Rect(72, 300, 232, 420)
+
+    def test_image_bbox_without_decoding(self, pdf_path, monkeypatch):
+        with fitz.open(pdf_path) as doc:
+            page = doc[0]
+            interp = PageInterpretation(page)
+            monkeypatch.setattr(fitz, "Pixmap", None)
+            photo_xref = page.get_images()[1][0]
+            assert interp.image_bbox(photo_xref) == fitz.Rect(72, 300, 232, 420)
+            assert interp.image_digests == {}
+            # Not placed on page 2
+            assert PageInterpretation(doc[1]).image_bbox(photo_xref) is None
+
+    def test_same_size_images_matched_by_digest(self, tmp_path):
+        path = tmp_path / "twins.pdf"
+        with fitz.open() as doc:
+            page = doc.new_page()
+            for x, color in ((50, (200, 30, 30)), (300, (30, 30, 200))):
+                pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), False)
+                pixmap.set_rect(pixmap.irect, color)
+                page.insert_image(fitz.Rect(x, 50, x + 100, 150), pixmap=pixmap)
+            doc.save(path)
+
+        digests = {}
+        with fitz.open(path) as doc:
+            page = doc[0]
+            interp = PageInterpretation(page, image_digests=digests)
+            for item in page.get_images(full=True):
+                assert interp.image_bbox(item[0]) == page.get_image_bbox(item)
+            assert len(digests) == 2
+
+
+class TestImagePlacements:
+    """Image bounding boxes recorded by the extractor and dissector."""
+
+    def test_extractor_stores_bboxes(self, pdf_path):
+        with PDFElementExtractor(str(pdf_path)) as extractor:
+            pages = extractor.extract_all().pages
+        boxes = [(image.bbox.x0, image.bbox.y0, image.bbox.x1, image.bbox.y1) for image in pages[0].images]
+        assert sorted(boxes) == [(72, 300, 232, 420), (500, 20, 560, 80)]
+        assert [(i.bbox.x0, i.bbox.y0) for i in pages[1].images] == [(500, 20)]
+
+    def test_dissector_records_images(self, pdf_path):
+        with PDFDissector(str(pdf_path)) as dissector:
+            structure = dissector.analyze()
+        assert len(structure.pages[0].images) == 2
+        assert [(i.x0, i.y0, i.width, i.height) for i in structure.pages[1].images] == [(500, 20, 8, 8)]
+
+    def test_extract_image_cached_by_xref(self, pdf_path, monkeypatch):
+        calls = []
+        with PDFElementExtractor(str(pdf_path)) as extractor:
+            original = extractor._doc.extract_image
+            monkeypatch.setattr(extractor._doc, "extract_image", lambda xref: calls.append(xref) or original(xref))
+            pages = extractor.extract_all().pages
+        # The logo is placed on both pages but extracted once
+        assert len(calls) == len(set(calls)) == 2
+        assert pages[0].images[0].width == pages[1].images[0].width == 8
@@ -0,0 +1,130 @@
+"""Tests for the sampled PDFDissector pre-scan."""
+
+import json
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from click.testing import CliRunner
+
+from src.main import cli
+from src.page_classifier import PageClassifier
+from src.page_sampling import MIN_SAMPLE_PAGES, estimate_structure, select_sample_pages
+from src.pdf_dissector import PDFDissector
+
+PAGE_COUNT = 300
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    """A long report: every 3rd page a ruled table, the rest narrative, one section per 30 pages."""
+    path = tmp_path_factory.mktemp("pdf") / "long.pdf"
+    doc = fitz.open()
+    for number in range(PAGE_COUNT):
+        page = doc.new_page(width=612, height=792)
+        if number % 3 == 0:
+            for row in range(8):
+                page.draw_line((50, 100 + row * 20), (550, 100 + row * 20))
+            for col in range(5):
+                page.draw_line((50 + col * 100, 100), (50 + col * 100, 240))
+            page.insert_text((60, 115), "Depth Permeability Porosity")
+        else:
+            words = " ".join(f"word{i}" for i in range(100 + number % 7 * 20))
+            page.insert_textbox(fitz.Rect(50, 50, 550, 750), words)
+    doc.set_toc([[1, f"Section {n}", n + 1] for n in range(0, PAGE_COUNT, 30)])
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.fixture(scope="module")
+def full_structure(pdf_path):
+    with PDFDissector(str(pdf_path)) as dissector:
+        return dissector.analyze()
+
+
+class TestSelectSamplePages:
+    """Tests for choosing pre-scan pages."""
+
+    def test_short_document_taken_whole(self):
+        assert select_sample_pages(10, max_pages=20) == (list(range(10)), [])
+
+    def test_strata(self):
+        certainty, systematic = select_sample_pages(3000, max_pages=40, outline_pages=[1, 500, 1500, 9999])
+        assert {0, 1, 2998, 2999, 499, 1499} == set(certainty)
+        assert len(certainty) + len(systematic) == 40
+        assert not set(certainty) & set(systematic)
+        # Spread across the document
+        assert systematic[0] < 150 and systematic[-1] > 2850
+
+    def test_deep_outline_thinned(self):
+        certainty, systematic = select_sample_pages(3000, max_pages=40, outline_pages=range(1, 3001))
+        assert len(certainty) == 20
+        assert len(systematic) == 20
+
+    def test_smallest_budget_keeps_systematic_pages(self):
+        certainty, systematic = select_sample_pages(3000, max_pages=MIN_SAMPLE_PAGES, outline_pages=[500, 1500])
+        assert certainty == [0, 1, 2998, 2999]
+        assert len(systematic) == 2
+
+    def test_budget_below_minimum(self):
+        with pytest.raises(ValueError, match="at least"):
+            select_sample_pages(3000, max_pages=4)
+
+    def test_estimate_needs_systematic_pages(self, pdf_path):
+        with PDFDissector(str(pdf_path)) as dissector:
+            pages = [dissector._analyze_page(p) for p in (0, 1, 150, 298, 299)]
+        with pytest.raises(ValueError, match="cannot be extrapolated"):
+            estimate_structure(str(pdf_path), PAGE_COUNT, pages[:2] + pages[3:], [pages[2]])
+
+
+class TestSample:
+    """Tests for PDFDissector.sample."""
+
+    def test_whole_document_is_exact(self, pdf_path, full_structure):
+        with PDFDissector(str(pdf_path)) as dissector:
+            estimate = dissector.sample(max_pages=PAGE_COUNT)
+        assert estimate.is_exact
+        words = estimate.metrics["words"]
+        assert words.low == words.total == words.high == sum(p.word_count for p in full_structure.pages)
+
+    def test_bounds_cover_full_analysis(self, pdf_path, full_structure):
+        with PDFDissector(str(pdf_path)) as dissector:
+            estimate = dissector.sample(max_pages=40)
+        assert len(estimate.sampled_pages) == 40
+        assert {1, 2, 31, 299, 300} <= set(estimate.certainty_pages)
+
+        for name, truth in [
+            ("words", sum(p.word_count for p in full_structure.pages)),
+            ("lines", sum(p.line_count for p in full_structure.pages)),
+        ]:
+            metric = estimate.metrics[name]
+            assert metric.low <= truth <= metric.high, name
+
+        classifier = PageClassifier()
+        table_pages = len(classifier.get_table_pages(classifier.classify_structure(full_structure)))
+        tables = estimate.page_types["table"]
+        assert tables.low <= table_pages <= tables.high
+        assert tables.high - tables.low < PAGE_COUNT / 2
+
+    def test_does_not_memoize(self, pdf_path):
+        with PDFDissector(str(pdf_path)) as dissector:
+            dissector.sample(max_pages=10)
+            assert dissector._structure is None
+
+    def test_cli(self, pdf_path):
+        result = CliRunner().invoke(cli, ["analyze", str(pdf_path), "--sample", "--sample-pages", "20", "-j"])
+        assert result.exit_code == 0
+        summary = json.loads(result.output)
+        assert summary["page_count"] == PAGE_COUNT
+        assert len(summary["sampled_pages"]) == 20
+        assert summary["metrics"]["words"]["low"] <= summary["metrics"]["words"]["total"]
+
+        result = CliRunner().invoke(cli, ["analyze", str(pdf_path), "--sample"])
+        assert result.exit_code == 0
+        assert "PRE-SCAN" in result.output and "table" in result.output
+
+        result = CliRunner().invoke(cli, ["analyze", str(pdf_path), "--sample", "--sample-pages", "4"])
+        assert result.exit_code == 2
+        assert "--sample-pages" in result.output
@@ -0,0 +1,57 @@
+"""Tests for PDFDissector memoization, text extraction and parallel analysis."""
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from src import pdf_dissector
+from src.pdf_dissector import PDFDissector
+from tests.fixtures.pdf_documents import write_rca_pdf
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    return write_rca_pdf(tmp_path_factory.mktemp("pdf") / "W1.pdf")
+
+
+class TestPDFDissector:
+    """Tests for PDFDissector.analyze."""
+
+    def test_structure_memoized(self, pdf_path, monkeypatch):
+        with PDFDissector(str(pdf_path)) as dissector:
+            structure = dissector.analyze()
+            monkeypatch.setattr(dissector, "_analyze_page", pytest.fail)
+            assert dissector.analyze() is structure
+            assert dissector.get_summary()["page_count"] == 42
+
+    def test_text_content_matches_get_text(self, pdf_path):
+        with PDFDissector(str(pdf_path)) as dissector:
+            structure = dissector.analyze()
+        with fitz.open(pdf_path) as doc:
+            for page_info in structure.pages:
+                expected = doc[page_info.page_number - 1].get_text()
+                assert page_info.text_content == expected
+                assert page_info.word_count == len(expected.split())
+
+    def test_parallel_matches_serial(self, pdf_path, monkeypatch):
+        monkeypatch.setattr(pdf_dissector, "MIN_PARALLEL_PAGES", 1)
+        with PDFDissector(str(pdf_path)) as dissector:
+            serial = dissector.analyze(workers=1)
+        with PDFDissector(str(pdf_path)) as dissector:
+            parallel = dissector.analyze(workers=2)
+        assert parallel.pages == serial.pages
+        assert [p.page_number for p in parallel.pages] == list(range(1, 43))
+
+    def test_failed_page_recorded_as_anomaly(self, pdf_path, monkeypatch):
+        def fail_page_3(self, page_num):
+            if page_num == 2:
+                raise ValueError("broken content stream")
+            return original(self, page_num)
+
+        original = PDFDissector._analyze_page
+        monkeypatch.setattr(PDFDissector, "_analyze_page", fail_page_3)
+        with PDFDissector(str(pdf_path)) as dissector:
+            structure = dissector.analyze()
+        assert structure.anomalies == ["Page 3: broken content stream"]
+        assert structure.pages[2].width == 0
+        assert len(structure.pages) == 42
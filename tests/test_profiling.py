@@ -0,0 +1,128 @@
+"""Tests for per-stage extraction profiling."""
+
+import json
+import sys
+import tracemalloc
+
+import pytest
+
+from src import core_analysis
+from src.core_analysis import CoreAnalysisExtractor
+from src.profiling import NULL_PROFILER, StageProfiler
+from tests.fixtures.element_documents import write_elements_db
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(write_elements_db(tmp_path / "W1_elements.db"))
+
+
+@pytest.fixture
+def profiler():
+    profiler = StageProfiler()
+    yield profiler
+    profiler.stop()
+
+
+def stage_names(profiler):
+    return list(profiler.records)
+
+
+class TestStageProfiler:
+    """Tests for StageProfiler bookkeeping."""
+
+    def test_repeated_stage_accumulates(self, profiler):
+        for count in (2, 3):
+            with profiler.stage("parse") as stage:
+                stage.add_rows(count)
+
+        record = profiler.records["parse"]
+        assert record.calls == 2
+        assert record.rows == 5
+        assert record.wall_ms >= 0
+
+    def test_peak_memory_attributed_to_stage(self, profiler):
+        with profiler.stage("allocate"):
+            block = bytearray(2 * 1024 * 1024)
+            del block
+        with profiler.stage("idle"):
+            pass
+
+        assert profiler.records["allocate"].peak_bytes >= 2 * 1024 * 1024
+        assert profiler.records["idle"].peak_bytes < 1024 * 1024
+
+    def test_nested_stage_peak_included_in_outer(self, profiler):
+        with profiler.stage("outer"):
+            with profiler.stage("inner"):
+                block = bytearray(1024 * 1024)
+                del block
+
+        assert profiler.records["outer"].peak_bytes >= profiler.records["inner"].peak_bytes
+
+    def test_stop_ends_tracing_it_started(self):
+        if tracemalloc.is_tracing():
+            pytest.skip("tracemalloc already active")
+        profiler = StageProfiler()
+        assert tracemalloc.is_tracing()
+        profiler.stop()
+        assert not tracemalloc.is_tracing()
+
+    def test_null_profiler_is_default(self, db_path):
+        extractor = CoreAnalysisExtractor(db_path)
+        assert extractor.profiler is NULL_PROFILER
+        with extractor.profiler.stage("anything") as stage:
+            stage.add_rows(1)
+
+
+class TestExtractorProfiling:
+    """Tests for stages recorded by CoreAnalysisExtractor."""
+
+    def test_pipeline_stages_recorded(self, db_path, profiler, tmp_path):
+        extractor = CoreAnalysisExtractor(db_path, profiler=profiler)
+        result = extractor.extract()
+        extractor.save_csv(result, str(tmp_path / "out.csv"), use_original_headers=True)
+        extractor.save_header_verification(
+            str(tmp_path / "verify.txt"), table_pages=result.table_pages
+        )
+
+        assert stage_names(profiler) == [
+            "classify",
+            "parse:page_39",
+            "parse:page_40",
+            "header_extraction",
+            "write_csv",
+            "verification",
+            "write_header_verification",
+        ]
+        assert profiler.records["classify"].rows == 42
+        assert profiler.records["parse:page_39"].rows == 3
+        assert profiler.records["write_csv"].rows == len(result.samples)
+
+    def test_save_profile(self, db_path, profiler, tmp_path):
+        extractor = CoreAnalysisExtractor(db_path, profiler=profiler)
+        extractor.extract()
+        path = extractor.save_profile(str(tmp_path / "profile.json"))
+
+        with open(path) as f:
+            report = json.load(f)
+        assert report["memory_traced"] is True
+        assert report["stages"][0]["stage"] == "classify"
+        assert set(report["stages"][0]) == {"stage", "calls", "wall_ms", "rows", "peak_kb"}
+
+    def test_save_profile_requires_profiler(self, db_path, tmp_path):
+        extractor = CoreAnalysisExtractor(db_path)
+        with pytest.raises(ValueError, match="not enabled"):
+            extractor.save_profile(str(tmp_path / "profile.json"))
+
+    def test_cli_profile_flag(self, db_path, tmp_path, monkeypatch):
+        profile = tmp_path / "profile.json"
+        monkeypatch.setattr(sys, "argv", [
+            "core_analysis", db_path, "--output", str(tmp_path / "out"),
+            "--profile", str(profile),
+        ])
+        core_analysis.main()
+
+        stages = [s["stage"] for s in json.loads(profile.read_text())["stages"]]
+        assert "classify" in stages
+        assert "write_classification" in stages
+        assert not tracemalloc.is_tracing()
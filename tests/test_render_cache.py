@@ -0,0 +1,162 @@
+"""Tests for cached page rendering in the viewer."""
+
+import os
+import sqlite3
+import threading
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("flask")
+
+from src.elementizer import viewer
+from src.elementizer.render_cache import PageRenderer, TileCache, tile_name
+from tests.fixtures.pdf_documents import write_pdf_elements_db, write_rca_pdf
+
+PNG_MAGIC = b"\x89PNG"
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    return write_rca_pdf(tmp_path_factory.mktemp("pdf") / "W1.pdf")
+
+
+@pytest.fixture(scope="module")
+def db_path(pdf_path):
+    return write_pdf_elements_db(pdf_path, pdf_path.with_name("W1_elements.db"))
+
+
+@pytest.fixture
+def renderer(pdf_path, tmp_path):
+    renderer = PageRenderer(str(pdf_path), TileCache(str(tmp_path / "tiles")))
+    yield renderer
+    renderer.close()
+
+
+@pytest.fixture
+def client(db_path, tmp_path):
+    viewer.configure_viewer(str(db_path), render_cache_dir=str(tmp_path / "tiles"), prewarm=False)
+    yield viewer.app.test_client()
+    viewer.RENDERER.close()
+    viewer.RENDERER = None
+
+
+class TestTileCache:
+    """Tests for the size-bounded LRU disk cache."""
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = TileCache(str(tmp_path), max_bytes=250)
+        cache.put("a.png", b"a" * 100)
+        cache.put("b.png", b"b" * 100)
+        assert cache.get("a.png") == b"a" * 100
+        cache.put("c.png", b"c" * 100)
+
+        assert "b.png" not in cache
+        assert not (tmp_path / "b.png").exists()
+        assert cache.size_bytes == 200
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["a.png", "c.png"]
+
+    def test_recency_survives_restart(self, tmp_path):
+        cache = TileCache(str(tmp_path), max_bytes=1000)
+        cache.put("old.png", b"o" * 100)
+        cache.put("new.png", b"n" * 100)
+        os.utime(tmp_path / "old.png", (1, 1))
+
+        reloaded = TileCache(str(tmp_path), max_bytes=150)
+        assert len(reloaded) == 1
+        assert "new.png" in reloaded
+
+    def test_missing_file_is_a_miss(self, tmp_path):
+        cache = TileCache(str(tmp_path))
+        cache.put("a.png", b"a")
+        (tmp_path / "a.png").unlink()
+        assert cache.get("a.png") is None
+        assert cache.size_bytes == 0
+
+    def test_rejects_invalid_budget(self, tmp_path):
+        with pytest.raises(ValueError, match="max_bytes"):
+            TileCache(str(tmp_path), max_bytes=0)
+
+
+class TestPageRenderer:
+    """Tests for rendering on the thread pool."""
+
+    def test_render_is_cached(self, renderer, monkeypatch):
+        data = renderer.render(39, zoom=1.0)
+        assert data.startswith(PNG_MAGIC)
+        assert tile_name(39, 1.0, "png") in renderer.cache
+
+        monkeypatch.setattr(renderer, "_render", lambda *args: pytest.fail("re-rendered"))
+        assert renderer.render(39, zoom=1.0) == data
+
+    def test_zoom_changes_size(self, renderer):
+        assert len(renderer.render(1, zoom=2.0)) > len(renderer.render(1, zoom=0.5))
+
+    def test_concurrent_requests_share_one_render(self, renderer, monkeypatch):
+        calls = []
+        release = threading.Event()
+        original = renderer._render
+
+        def slow_render(*args):
+            calls.append(args)
+            release.wait(5)
+            return original(*args)
+
+        monkeypatch.setattr(renderer, "_render", slow_render)
+        futures = [renderer.submit(40) for _ in range(5)]
+        release.set()
+        assert len({f.result() for f in futures}) == 1
+        assert len(calls) == 1
+
+    def test_prewarm_skips_cached(self, renderer):
+        renderer.render(39)
+        futures = renderer.prewarm([39, 40])
+        assert len(futures) == 1
+        futures[0].result()
+        assert tile_name(40, 1.0, "png") in renderer.cache
+
+    def test_webp(self, renderer):
+        pytest.importorskip("PIL")
+        assert renderer.render(39, fmt="webp")[8:12] == b"WEBP"
+
+    def test_rejects_invalid_requests(self, renderer):
+        with pytest.raises(ValueError, match="zoom"):
+            renderer.render(1, zoom=7.0)
+        with pytest.raises(ValueError, match="format"):
+            renderer.render(1, fmt="gif")
+        with pytest.raises(IndexError):
+            renderer.render(43)
+
+
+class TestRenderEndpoint:
+    """Tests for /page/<n>/render."""
+
+    def test_serves_png(self, client):
+        response = client.get("/page/39/render?zoom=1.5")
+        assert response.status_code == 200
+        assert response.mimetype == "image/png"
+        assert response.data.startswith(PNG_MAGIC)
+        assert response.cache_control.max_age == viewer.RENDER_MAX_AGE
+
+    def test_errors(self, client):
+        assert client.get("/page/39/render?zoom=9").status_code == 400
+        assert client.get("/page/99/render").status_code == 404
+
+    def test_page_view_embeds_render(self, client):
+        assert b'/page/39/render' in client.get("/page/39").data
+
+    def test_prewarm_table_pages(self, db_path, tmp_path):
+        assert viewer.table_page_numbers(str(db_path)) == [39, 40]
+        renderer = viewer.configure_viewer(str(db_path), render_cache_dir=str(tmp_path / "tiles"))
+        renderer.close()
+        viewer.RENDERER = None
+        assert sorted(p.name for p in (tmp_path / "tiles").iterdir()) == [
+            renderer.tile_name(39, 1.0, "png"), renderer.tile_name(40, 1.0, "png"),
+        ]
+
+    def test_missing_pdf_disables_rendering(self, pdf_path, tmp_path):
+        db_path = write_pdf_elements_db(pdf_path, tmp_path / "copy_elements.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE documents SET file_path = 'gone.pdf'")
+        assert viewer.configure_viewer(str(db_path)) is None
+        assert viewer.app.test_client().get("/page/39/render").status_code == 404
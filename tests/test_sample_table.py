@@ -0,0 +1,135 @@
+"""Tests for the SampleTable columnar sample container."""
+
+import pickle
+
+import pytest
+
+from src.core_analysis import (
+    CoreAnalysisExtractor,
+    CoreSample,
+    ExtractionResult,
+    format_sample_row,
+    iter_csv_rows,
+)
+from src.sample_table import FIELDS, SampleRow, SampleTable
+from tests.fixtures.stub_samples import (
+    STUB_SAMPLE_LINES_DETECTION_LIMIT,
+    STUB_SAMPLE_LINES_F_UPPERCASE,
+    STUB_SAMPLE_LINES_NORMAL,
+    STUB_SAMPLE_LINES_STAR_SATURATION,
+)
+
+
+@pytest.fixture
+def samples():
+    """Parsed CoreSamples covering numeric, +, <X and ** cells."""
+    extractor = object.__new__(CoreAnalysisExtractor)
+    lines = [
+        STUB_SAMPLE_LINES_NORMAL,
+        STUB_SAMPLE_LINES_F_UPPERCASE,
+        STUB_SAMPLE_LINES_DETECTION_LIMIT,
+        STUB_SAMPLE_LINES_STAR_SATURATION,
+    ]
+    parsed = [extractor._parse_sample_lines(l, page_num=39) for l in lines]
+    parsed.append(CoreSample(
+        core_number="2", sample_number="2-1", depth_feet=9640.5,
+        permeability_air_md=0.5, permeability_klink_md=0.4,
+        porosity_ambient_pct=3.0, porosity_ncs_pct=2.9, grain_density_gcc=2.65,
+        saturation_water_pct=50.0, saturation_oil_pct=10.0, saturation_total_pct=60.0,
+        page_number=40,
+    ))
+    return parsed
+
+
+@pytest.fixture
+def table(samples):
+    return SampleTable(samples)
+
+
+class TestRowViews:
+    """Row views must be interchangeable with CoreSample."""
+
+    def test_rows_match_core_samples(self, table, samples):
+        for row, sample in zip(table, samples):
+            assert row.to_dict() == sample.to_dict()
+            assert row == sample
+
+    def test_indicators_round_trip(self, table):
+        assert table[1].permeability_air_md == "+"
+        assert table[1].porosity_ncs_pct is None
+        assert table[2].permeability_klink_md == "<0.0001"
+        assert table[3].saturation_oil_pct == "**"
+
+    def test_rows_use_slots(self, table):
+        row = table[0]
+        assert isinstance(row, SampleRow)
+        assert not hasattr(row, "__dict__")
+
+    def test_negative_and_out_of_range_index(self, table):
+        assert table[-1].sample_number == "2-1"
+        with pytest.raises(IndexError):
+            table[len(table)]
+
+    def test_slice_returns_table(self, table, samples):
+        part = table[1:3]
+        assert isinstance(part, SampleTable)
+        assert part == samples[1:3]
+        assert part[1].permeability_air_md == "<0.0001"
+
+
+class TestColumnAccessors:
+    """Tests for vectorized column accessors."""
+
+    def test_depth_range(self, table):
+        assert table.depth_range() == (9581.5, 9640.5)
+
+    def test_empty_table(self):
+        table = SampleTable()
+        assert len(table) == 0
+        assert table.depth_range() is None
+        assert table.column_mean("porosity_ambient_pct") is None
+
+    def test_column_mean_skips_indicators(self, table, samples):
+        numeric = [
+            s.permeability_air_md for s in samples
+            if isinstance(s.permeability_air_md, float)
+        ]
+        assert len(numeric) < len(samples)
+        assert table.column_mean("permeability_air_md") == pytest.approx(
+            sum(numeric) / len(numeric)
+        )
+
+    def test_per_core_slices(self, table):
+        cores = table.by_core()
+        assert list(cores) == ["1", "2"]
+        assert len(cores["1"]) == 4
+        assert cores["2"][0].page_number == 40
+
+    def test_numpy_columns(self, table):
+        np = pytest.importorskip("numpy")
+        columns = table.numpy_columns()
+        assert columns["depth_feet"].dtype == np.float64
+        assert columns["page_number"].tolist() == [39, 39, 39, 39, 40]
+        # Copies, so the table can keep growing
+        table.append(table[0])
+        assert len(columns["depth_feet"]) == 5
+
+
+class TestWriterIntegration:
+    """Writers read the table columns directly."""
+
+    def test_csv_rows_match_per_sample_formatting(self, table, samples):
+        assert list(iter_csv_rows(table)) == [format_sample_row(s) for s in samples]
+
+    def test_to_dicts_field_order(self, table):
+        assert list(table.to_dicts()[0]) == FIELDS
+        assert FIELDS == CoreAnalysisExtractor.CANONICAL_HEADERS
+
+    def test_extraction_result_defaults_to_table(self, samples):
+        result = ExtractionResult()
+        result.samples.extend(samples)
+        assert isinstance(result.samples, SampleTable)
+        assert len(result.samples) == len(samples)
+
+    def test_pickles_for_process_pools(self, table):
+        assert pickle.loads(pickle.dumps(table)) == table
@@ -0,0 +1,182 @@
+"""Tests for the local HTTP extraction service."""
+
+import io
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fitz")
+
+from src import service
+from src.service import JobQueue, create_app
+from tests.fixtures.pdf_documents import write_rca_pdf
+
+
+@pytest.fixture(scope="module")
+def pdf_bytes(tmp_path_factory):
+    return write_rca_pdf(tmp_path_factory.mktemp("pdf") / "W1.pdf").read_bytes()
+
+
+@pytest.fixture
+def make_client(tmp_path):
+    queues = []
+
+    def make(**kwargs):
+        kwargs.setdefault("use_processes", False)
+        queue = JobQueue(str(tmp_path / "service"), **kwargs)
+        queues.append(queue)
+        return create_app(queue).test_client(), queue
+
+    yield make
+    for queue in queues:
+        queue.shutdown()
+
+
+def upload(client, data, filename="W1.pdf"):
+    return client.post(
+        "/jobs",
+        data={"file": (io.BytesIO(data), filename)},
+        content_type="multipart/form-data",
+    )
+
+
+def wait_for(client, job_id, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = client.get(f"/jobs/{job_id}").get_json()
+        if status["status"] in ("done", "failed"):
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish")
+
+
+class TestJobLifecycle:
+    """Tests for submitting jobs and fetching results."""
+
+    def test_results_available_after_completion(self, make_client, pdf_bytes):
+        client, _ = make_client()
+        response = upload(client, pdf_bytes)
+        assert response.status_code == 202
+        job_id = response.get_json()["job_id"]
+
+        status = wait_for(client, job_id)
+        assert status["status"] == "done"
+        assert status["result"]["table_pages"] == [39, 40]
+        assert status["result"]["sample_count"] == 5
+
+        classification = json.loads(client.get(f"/jobs/{job_id}/classification").data)
+        assert classification["page_39"] == "table"
+        csv_lines = client.get(f"/jobs/{job_id}/csv").data.decode("utf-8-sig").splitlines()
+        assert len(csv_lines) == 6
+        assert b"VERIFIED" in client.get(f"/jobs/{job_id}/headers").data
+
+    def test_rejects_non_pdf(self, make_client):
+        client, queue = make_client(queue_depth=1)
+        assert upload(client, b"hello").status_code == 400
+        # The rejected upload must not hold the only slot
+        assert queue.in_flight == 0
+        queue.reserve()
+
+    def test_unknown_job_and_result(self, make_client):
+        client, _ = make_client()
+        assert client.get("/jobs/missing").status_code == 404
+        assert client.get("/jobs/missing/csv").status_code == 404
+
+    def test_failed_job_reports_error(self, make_client):
+        client, _ = make_client()
+        job_id = upload(client, b"%PDF-1.4 truncated").get_json()["job_id"]
+
+        status = wait_for(client, job_id)
+        assert status["status"] == "failed"
+        assert status["error"]
+        assert client.get(f"/jobs/{job_id}/csv").status_code == 409
+
+
+class TestBackpressure:
+    """Tests for queue depth limits."""
+
+    def test_full_queue_returns_429(self, make_client, pdf_bytes, monkeypatch):
+        release = threading.Event()
+        monkeypatch.setattr(service, "run_job", lambda *args: release.wait(10) and {})
+        client, queue = make_client(workers=1, queue_depth=2)
+
+        first = upload(client, pdf_bytes)
+        second = upload(client, pdf_bytes)
+        third = upload(client, pdf_bytes)
+
+        assert [first.status_code, second.status_code] == [202, 202]
+        assert third.status_code == 429
+        assert third.headers["Retry-After"]
+        assert client.get("/health").get_json()["in_flight"] == 2
+
+        release.set()
+        wait_for(client, second.get_json()["job_id"])
+        # Slots are released by a done callback just after the status flips
+        deadline = time.time() + 5
+        while (status := upload(client, pdf_bytes).status_code) == 429 and time.time() < deadline:
+            time.sleep(0.01)
+        assert status == 202
+
+    def test_rejects_invalid_depth(self, tmp_path):
+        with pytest.raises(ValueError, match="queue_depth"):
+            JobQueue(str(tmp_path / "service"), queue_depth=0, use_processes=False)
+
+
+class TestEviction:
+    """Tests for forgetting finished jobs."""
+
+    def test_oldest_finished_jobs_evicted(self, make_client, pdf_bytes, tmp_path):
+        client, queue = make_client(workers=1, max_finished_jobs=1)
+        first = upload(client, pdf_bytes).get_json()["job_id"]
+        wait_for(client, first)
+        second = upload(client, pdf_bytes).get_json()["job_id"]
+        wait_for(client, second)
+
+        assert client.get(f"/jobs/{first}").status_code == 404
+        assert not (tmp_path / "service" / first).exists()
+        assert client.get(f"/jobs/{second}/csv").status_code == 200
+        assert list(queue.jobs) == [second]
+
+    def test_expired_jobs_evicted(self, make_client, tmp_path):
+        client, queue = make_client(job_ttl=0)
+        job_id = upload(client, b"%PDF-1.4 truncated").get_json()["job_id"]
+        deadline = time.time() + 10
+        while client.get(f"/jobs/{job_id}").status_code != 404 and time.time() < deadline:
+            time.sleep(0.01)
+        assert queue.jobs == {}
+        assert not (tmp_path / "service" / job_id).exists()
+        assert queue.in_flight == 0
+
+    def test_failed_submit_not_registered(self, make_client, pdf_bytes, tmp_path):
+        client, queue = make_client()
+        queue.shutdown()
+        with pytest.raises(RuntimeError):
+            queue.submit(pdf_bytes, "W1.pdf")
+        assert queue.jobs == {}
+        assert queue.in_flight == 0
+        assert list((tmp_path / "service").iterdir()) == []
+
+
+class TestProcessPool:
+    """The default pool runs jobs in warmed worker processes."""
+
+    def test_process_workers(self, make_client, pdf_bytes):
+        client, _ = make_client(workers=1, use_processes=True)
+        job_id = upload(client, pdf_bytes).get_json()["job_id"]
+        assert wait_for(client, job_id, timeout=60)["status"] == "done"
+
+    def test_broken_pool_replaced(self, make_client, pdf_bytes):
+        client, queue = make_client(workers=1, use_processes=True)
+        broken = queue.executor
+        for process in list(broken._processes.values()):
+            process.kill()
+        # Wait for the pool to notice its dead worker
+        deadline = time.time() + 30
+        while not broken._broken and time.time() < deadline:
+            time.sleep(0.05)
+
+        job_id = upload(client, pdf_bytes).get_json()["job_id"]
+        assert wait_for(client, job_id, timeout=60)["status"] == "done"
+        assert queue.executor is not broken
@@ -0,0 +1,142 @@
+"""Tests for indexed header matching in TableExtractor consolidation."""
+
+import random
+import time
+from difflib import SequenceMatcher
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from src.header_matching import HeaderIndex, column_mapping
+from src.models import ExtractedTable, ExtractionResult
+from src.table_extractor import TableExtractor
+
+THRESHOLD = TableExtractor.HEADER_SIMILARITY_THRESHOLD
+
+HEADER_VARIANTS = [
+    ["Sample Number", "Sample No.", "SAMPLE NUMBER", "Sample Num"],
+    ["Depth (ft)", "Depth (feet)", "DEPTH (FT)", "Depth ft"],
+    ["Permeability (md)", "Permeability, md", "Perm (md)", "Permeability (mD)"],
+    ["Porosity (%)", "Porosity %", "POROSITY (%)", "Por. (%)"],
+    ["Grain Density (g/cc)", "Grain Density", "Grain Dens. (g/cc)", "Grain Density (gm/cc)"],
+    ["Saturation Oil (%)", "Oil Sat. (%)", "Saturation, Oil (%)", "So (%)"],
+    ["Lithology", "Description", "LITHOLOGY", "Lithologic Description"],
+]
+
+
+def _reference_headers_match(headers1, headers2):
+    """The original all-pairs comparison."""
+    if len(headers1) != len(headers2):
+        return False
+    matches = sum(
+        SequenceMatcher(None, h1.lower(), h2.lower()).ratio() >= THRESHOLD
+        for h1, h2 in zip(headers1, headers2)
+    )
+    return matches >= len(headers1) * 0.8
+
+
+def _reference_mapping(source_headers, target_headers):
+    mapping = {}
+    for src_idx, src_header in enumerate(source_headers):
+        best_idx, best = None, 0
+        for tgt_idx, tgt_header in enumerate(target_headers):
+            similarity = SequenceMatcher(None, src_header.lower(), tgt_header.lower()).ratio()
+            if similarity > best:
+                best_idx, best = tgt_idx, similarity
+        if best_idx is not None and best >= THRESHOLD:
+            mapping[src_idx] = best_idx
+    return mapping
+
+
+def _reference_consolidate(tables):
+    groups = []
+    for table in tables:
+        for canonical, group in groups:
+            if _reference_headers_match(canonical, table.headers):
+                group.append(table)
+                break
+        else:
+            groups.append((table.headers, [table]))
+    canonical, group = max(groups, key=lambda g: sum(t.row_count for t in g[1]))
+    rows = []
+    for table in group:
+        if table.headers == canonical:
+            rows.extend(table.rows)
+            continue
+        mapping = _reference_mapping(table.headers, canonical)
+        for row in table.rows:
+            new_row = [""] * len(canonical)
+            for src_idx, value in enumerate(row):
+                if src_idx in mapping:
+                    new_row[mapping[src_idx]] = value
+            rows.append(new_row)
+    return canonical, group[0].original_headers, rows
+
+
+def random_tables(rng: random.Random, count: int) -> list[ExtractedTable]:
+    tables = []
+    for page in range(1, count + 1):
+        width = rng.choice([4, 5, 5, 6, 7])
+        columns = rng.sample(HEADER_VARIANTS, width) if rng.random() < 0.2 else HEADER_VARIANTS[:width]
+        headers = [rng.choice(variants) for variants in columns]
+        rows = [[f"{page}.{r}.{c}" for c in range(width)] for r in range(rng.randint(1, 30))]
+        tables.append(ExtractedTable(
+            page_number=page,
+            table_index=0,
+            headers=headers,
+            original_headers=headers.copy(),
+            rows=rows,
+        ))
+    return tables
+
+
+def consolidate(tables):
+    extractor = TableExtractor.__new__(TableExtractor)
+    result = ExtractionResult(source_file="test.pdf", tables=tables)
+    extractor._consolidate_tables(result)
+    return result
+
+
+class TestHeaderMatching:
+    """Tests for the header index and column mapping."""
+
+    def test_matches_all_pairs_comparison(self):
+        rng = random.Random(7)
+        for _ in range(20):
+            tables = random_tables(rng, 60)
+            result = consolidate(tables)
+            canonical, original, rows = _reference_consolidate(tables)
+            assert result.consolidated_headers == canonical
+            assert result.original_headers == original
+            assert result.consolidated_rows == rows
+
+    def test_column_mapping_matches_reference(self):
+        rng = random.Random(11)
+        for _ in range(500):
+            source = [rng.choice(variants) for variants in rng.sample(HEADER_VARIANTS, 5)]
+            target = [rng.choice(variants) for variants in rng.sample(HEADER_VARIANTS, 5)]
+            assert column_mapping(source, target, THRESHOLD) == _reference_mapping(source, target)
+
+    def test_ties_go_to_first_column(self):
+        assert column_mapping(["depth"], ["Depth", "DEPTH"], THRESHOLD) == {0: 0}
+        assert column_mapping(["depth ft"], ["depth fx", "depth fy"], THRESHOLD) == {0: 0}
+        assert column_mapping(["lithology"], ["porosity"], THRESHOLD) == {}
+
+    def test_first_matching_group_wins(self):
+        index = HeaderIndex(THRESHOLD)
+        first = index.find_or_add(["Depth (ft)", "Porosity (%)"], "a")
+        second = index.find_or_add(["Lithology", "Porosity (%)"], "b")
+        assert index.find_or_add(["DEPTH (FT)", "POROSITY (%)"], "c") is first
+        assert index.find_or_add(["Depth (feet)", "Porosity %"], "d") is first
+        assert index.find_or_add(["LITHOLOGY", "Porosity"], "e") is second
+        assert index.find(["Depth (ft)"]) is None
+        assert first.members == ["a", "c", "d"]
+
+    def test_hundreds_of_tables_fast(self):
+        tables = random_tables(random.Random(3), 500)
+        start = time.perf_counter()
+        result = consolidate(tables)
+        elapsed = time.perf_counter() - start
+        assert result.consolidated_rows
+        assert elapsed < 0.5
@@ -0,0 +1,121 @@
+"""Tests for table detection engines and page-parallel table extraction."""
+
+import json
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("pdfplumber")
+
+from click.testing import CliRunner
+
+from src import table_extractor
+from src.main import cli
+from src.table_engines import ENGINES, TableEngine, cell_agreement, get_engine
+from src.table_extractor import TableExtractor
+from tests.fixtures.pdf_documents import write_ruled_table_pdf
+
+HEADERS = ["Sample No.", "Depth (ft)", "Porosity (%)", "Perm (md)"]
+
+
+def table_rows(page: int) -> list[list[str]]:
+    return [HEADERS] + [[str(page * 100 + r), f"{1000 + r}.5", f"{10 + r}.1", ""] for r in range(6)]
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    """Eight pages with a ruled table on every page but 1 and 5."""
+    tables = {page: table_rows(page) for page in range(2, 9) if page != 5}
+    return write_ruled_table_pdf(tmp_path_factory.mktemp("pdf") / "ruled.pdf", 8, tables)
+
+
+class TestEngines:
+    """Tests for the engine interface."""
+
+    @pytest.mark.parametrize("engine", list(ENGINES))
+    def test_page_tables(self, pdf_path, engine):
+        with get_engine(engine)(str(pdf_path)) as table_engine:
+            assert table_engine.page_count == 8
+            assert table_engine.page_tables(0) == []
+            grids = table_engine.page_tables(1)
+        assert len(grids) == 1
+        assert grids[0][0] == HEADERS
+        assert grids[0][1][:3] == ["200", "1000.5", "10.1"]
+
+    def test_engines_agree(self, pdf_path):
+        results = {
+            engine: TableExtractor(str(pdf_path), engine=engine).extract_tables()
+            for engine in ENGINES
+        }
+        plumber, mupdf = results["pdfplumber"], results["pymupdf"]
+        assert mupdf.pages_with_tables == plumber.pages_with_tables == 6
+        assert mupdf.consolidated_rows == plumber.consolidated_rows
+        grids = {
+            engine: [[t.headers] + t.rows for t in result.tables]
+            for engine, result in results.items()
+        }
+        assert cell_agreement(grids["pdfplumber"], grids["pymupdf"]) == 1.0
+
+    def test_unknown_engine(self, pdf_path):
+        with pytest.raises(ValueError, match="camelot"):
+            TableExtractor(str(pdf_path), engine="camelot")
+
+    def test_cell_agreement(self):
+        a = [[["a", "b"], ["1", "2"]]]
+        assert cell_agreement(a, a) == 1.0
+        assert cell_agreement(a, [[["a", "b"], ["1", "3"]]]) == 0.75
+        assert cell_agreement(a, []) == 0.0
+        assert cell_agreement([], []) == 1.0
+
+    def test_fallback_tables_lower_confidence(self, pdf_path):
+        class FallbackOnly(TableEngine):
+            def page_tables(self, page_num):
+                return [[["only a header"]]]
+
+            def fallback_tables(self, page_num):
+                return [[["Depth"], ["100"]]]
+
+        extractor = TableExtractor(str(pdf_path))
+        tables = extractor._extract_page_tables(FallbackOnly(str(pdf_path)), 3)
+        assert [(t.page_number, t.headers, t.confidence) for t in tables] == [(3, ["Depth"], 0.7)]
+
+
+class TestParallelExtraction:
+    """Tests for TableExtractor.extract_tables across worker processes."""
+
+    @pytest.mark.parametrize("engine", list(ENGINES))
+    def test_parallel_matches_serial(self, pdf_path, engine, monkeypatch):
+        monkeypatch.setattr(table_extractor, "MIN_PARALLEL_PAGES", 1)
+        serial = TableExtractor(str(pdf_path), engine=engine).extract_tables(workers=1)
+        parallel = TableExtractor(str(pdf_path), engine=engine).extract_tables(workers=2)
+        assert parallel.tables == serial.tables
+        assert parallel.consolidated_rows == serial.consolidated_rows
+        assert [t.page_number for t in parallel.tables] == [2, 3, 4, 6, 7, 8]
+
+    def test_warnings_in_page_order(self, pdf_path, monkeypatch):
+        def fail_page_4(self, engine, page_num):
+            if page_num == 4:
+                raise ValueError("broken content stream")
+            return original(self, engine, page_num)
+
+        original = TableExtractor._extract_page_tables
+        monkeypatch.setattr(TableExtractor, "_extract_page_tables", fail_page_4)
+        result = TableExtractor(str(pdf_path), engine="pymupdf").extract_tables([12, 4, 2, 2])
+        assert result.warnings == ["Page 12 out of range, skipping", "Page 4: broken content stream"]
+        assert result.pages_processed == 4
+        assert result.pages_with_tables == 2
+        assert [t.page_number for t in result.tables] == [2, 2]
+
+
+class TestExtractCommand:
+    """Tests for extract --engine."""
+
+    def test_json_output(self, pdf_path, tmp_path):
+        result = CliRunner().invoke(cli, [
+            "extract", str(pdf_path), "-o", str(tmp_path), "-p", "2,3", "-j",
+            "--engine", "pymupdf", "--workers", "1",
+        ])
+        assert result.exit_code == 0, result.output
+        summary = json.loads(result.output)
+        assert summary["consolidated_rows"] == 12
+        assert summary["headers"] == HEADERS
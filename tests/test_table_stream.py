@@ -0,0 +1,130 @@
+"""Tests for streaming, chunked TableExtractor output."""
+
+import json
+
+import pytest
+
+pytest.importorskip("fitz")
+
+import pandas as pd
+from click.testing import CliRunner
+
+from src.main import cli
+from src.table_extractor import TableExtractor
+from tests.fixtures.pdf_documents import write_ruled_table_pdf
+
+HEADERS = ["Sample No.", "Depth (ft)", "Porosity (%)", "Perm (md)", "Lithology"]
+
+
+def table_rows(page: int) -> list[list[str]]:
+    rows = [[str(page * 100 + r), f"{1000 + page * 10 + r}.5", f"{10 + r}.1", "", "Sandstone"] for r in range(5)]
+    if page == 7:
+        # A detection-limit cell late in the document makes Porosity text
+        rows[2][2] = "<0.01"
+    return [HEADERS] + rows
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    """Nine pages; page 9's table has other headers and fewer rows."""
+    tables = {page: table_rows(page) for page in range(2, 9) if page != 5}
+    tables[9] = [["Core", "Box"], ["1", "2"]]
+    return write_ruled_table_pdf(tmp_path_factory.mktemp("pdf") / "appendix.pdf", 9, tables)
+
+
+@pytest.fixture
+def extractor(pdf_path):
+    return TableExtractor(str(pdf_path), engine="pymupdf")
+
+
+class TestTableStream:
+    """Tests for TableExtractor.extract_tables_streaming."""
+
+    def test_matches_extract_tables(self, extractor):
+        expected = extractor.extract_tables([1, 2, 3, 4, 5, 6, 7, 8, 9, 12])
+        with extractor.extract_tables_streaming([1, 2, 3, 4, 5, 6, 7, 8, 9, 12], pages_per_chunk=2) as stream:
+            rows = [row for chunk in stream.iter_row_chunks() for row in chunk]
+            summary = stream.get_summary()
+            result = stream.result
+        assert rows == expected.consolidated_rows
+        assert result.consolidated_headers == expected.consolidated_headers == HEADERS
+        assert result.original_headers == expected.original_headers
+        assert result.warnings == expected.warnings == ["Page 12 out of range, skipping"]
+        assert summary == extractor.get_summary(expected)
+
+    def test_chunks_by_page_group(self, extractor):
+        with extractor.extract_tables_streaming(pages_per_chunk=2) as stream:
+            chunks = list(stream.iter_row_chunks())
+            # Pages 1-2, 3-4, 5-6 and 7-8; page 9's table is not consolidated
+            assert [len(chunk) for chunk in chunks] == [5, 10, 5, 10]
+            assert stream.total_rows == 30
+            assert all(table.rows == [] for table in stream.result.tables)
+            assert stream.row_counts == [5, 5, 5, 5, 5, 5, 1]
+
+    def test_typed_dataframes(self, extractor):
+        with extractor.extract_tables_streaming(pages_per_chunk=2) as stream:
+            frames = list(stream.iter_dataframes())
+            untyped = extractor.to_dataframe(extractor.extract_tables())
+
+        assert len(frames) == 4
+        # Same dtypes in every chunk, decided over the whole document
+        for frame in frames:
+            assert list(frame.dtypes.astype(str)) == ["float64", "float64", "object", "object", "object"]
+        combined = pd.concat(frames)
+        assert list(combined.index) == list(range(30))
+        assert combined["Depth (ft)"].iloc[0] == 1020.5
+        assert combined["Porosity (%)"].iloc[22] == "<0.01"
+        assert list(combined["Lithology"]) == list(untyped["Lithology"])
+        assert (combined["Sample No."].astype(int).astype(str) == untyped["Sample No."]).all()
+
+    def test_outputs_match(self, extractor, tmp_path):
+        result = extractor.extract_tables()
+        extractor.save_csv(result, tmp_path / "full.csv")
+        extractor.save_json(result, tmp_path / "full.json")
+        with extractor.extract_tables_streaming(pages_per_chunk=3) as stream:
+            stream.save_csv(tmp_path / "stream.csv")
+            stream.save_json(tmp_path / "stream.json")
+
+        assert (tmp_path / "stream.csv").read_bytes() == (tmp_path / "full.csv").read_bytes()
+        stream_json = json.loads((tmp_path / "stream.json").read_text(encoding="utf-8"))
+        assert stream_json == json.loads((tmp_path / "full.json").read_text(encoding="utf-8"))
+
+    def test_no_tables(self, extractor, tmp_path):
+        with extractor.extract_tables_streaming([1, 5]) as stream:
+            assert list(stream.iter_dataframes()) == []
+            stream.save_json(tmp_path / "empty.json")
+            assert json.loads((tmp_path / "empty.json").read_text())["data"] == []
+
+    def test_rejects_empty_chunks(self, extractor):
+        with pytest.raises(ValueError, match="pages_per_chunk"):
+            extractor.extract_tables_streaming(pages_per_chunk=0)
+
+    def test_spool_deleted_on_close(self, extractor):
+        stream = extractor.extract_tables_streaming()
+        spool = stream._spool
+        stream.close()
+        assert spool.closed
+
+
+class TestExtractChunked:
+    """Tests for extract --chunk-pages."""
+
+    def test_same_files_as_unchunked(self, pdf_path, tmp_path):
+        for name, extra in (("full", []), ("chunked", ["--chunk-pages", "2"])):
+            result = CliRunner().invoke(cli, [
+                "extract", str(pdf_path), "-o", str(tmp_path / name), "-a", "-j", "--engine", "pymupdf",
+                "--workers", "1", *extra,
+            ])
+            assert result.exit_code == 0, result.output
+            assert json.loads(result.output)["consolidated_rows"] == 30
+
+        def read(name, suffix):
+            return (tmp_path / name / f"appendix{suffix}").read_text(encoding="utf-8-sig")
+
+        assert read("chunked", "_tables.csv") == read("full", "_tables.csv")
+        assert json.loads(read("chunked", "_tables.json")) == json.loads(read("full", "_tables.json"))
+
+    def test_rejects_invalid_chunk_size(self, pdf_path, tmp_path):
+        result = CliRunner().invoke(cli, ["extract", str(pdf_path), "-o", str(tmp_path), "--chunk-pages", "0"])
+        assert result.exit_code == 2
+        assert "--chunk-pages" in result.output
@@ -0,0 +1,129 @@
+"""Tests for image thumbnail pyramids."""
+
+import os
+import sqlite3
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+pytest.importorskip("flask")
+
+from click.testing import CliRunner
+
+from src.elementizer import viewer
+from src.elementizer.main import cli
+from src.elementizer.thumbnails import (
+    THUMBNAIL_SIZES,
+    default_thumbnail_dir,
+    generate_thumbnails,
+    make_thumbnails,
+    thumbnail_path,
+)
+from tests.fixtures.pdf_documents import write_pdf_elements_db, write_rca_pdf
+
+
+def write_png(path, width, height, alpha=False):
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, width, height), alpha)
+    pix.clear_with(180)
+    pix.save(str(path))
+    return path
+
+
+@pytest.fixture
+def images_dir(tmp_path):
+    path = tmp_path / "W1_images"
+    path.mkdir()
+    write_png(path / "page0039_img0000.png", 1200, 800)
+    write_png(path / "page0040_img0000.png", 100, 60, alpha=True)
+    (path / "page0041_img0000.jb2").write_bytes(b"not decodable")
+    return path
+
+
+def dimensions(path):
+    pix = fitz.Pixmap(str(path))
+    return pix.width, pix.height
+
+
+class TestPyramid:
+    """Tests for thumbnail generation."""
+
+    def test_levels_bounded_by_longest_edge(self, images_dir, tmp_path):
+        paths = make_thumbnails(str(images_dir / "page0039_img0000.png"), str(tmp_path / "thumbs"))
+        assert [dimensions(p) for p in paths] == [(600, 400), (300, 200), (150, 100)]
+        assert paths[-1] == thumbnail_path(str(tmp_path / "thumbs"), "page0039_img0000.png", 150)
+        assert paths[-1].read_bytes()[:2] == b"\xff\xd8"
+
+    def test_no_upscaling_and_alpha_dropped(self, images_dir, tmp_path):
+        paths = make_thumbnails(str(images_dir / "page0040_img0000.png"), str(tmp_path / "thumbs"))
+        assert {dimensions(p) for p in paths} == {(100, 60)}
+
+    def test_directory_run(self, images_dir):
+        report = generate_thumbnails(str(images_dir), workers=2)
+        assert report.generated == 2
+        assert report.failed == ["page0041_img0000.jb2"]
+
+        thumb_dir = default_thumbnail_dir(str(images_dir))
+        assert thumb_dir.name == "W1_images_thumbs"
+        assert sorted(p.name for p in thumb_dir.iterdir()) == sorted(str(s) for s in THUMBNAIL_SIZES)
+
+    def test_only_changed_images_regenerated(self, images_dir):
+        generate_thumbnails(str(images_dir))
+        report = generate_thumbnails(str(images_dir))
+        assert (report.generated, report.skipped) == (0, 2)
+
+        later = os.stat(images_dir / "page0039_img0000.png").st_mtime + 10
+        os.utime(images_dir / "page0039_img0000.png", (later, later))
+        report = generate_thumbnails(str(images_dir))
+        assert (report.generated, report.skipped) == (1, 1)
+
+    def test_cli(self, images_dir):
+        result = CliRunner().invoke(cli, ["thumbnails", str(images_dir)])
+        assert result.exit_code == 0
+        assert "2 generated" in result.output
+        assert "page0041_img0000.jb2" in result.output
+
+
+class TestViewer:
+    """The viewer serves thumbnails for grids and previews."""
+
+    @pytest.fixture
+    def client(self, images_dir, tmp_path):
+        pdf_path = write_rca_pdf(tmp_path / "W1.pdf")
+        db_path = write_pdf_elements_db(pdf_path, tmp_path / "W1_elements.db")
+        with sqlite3.connect(db_path) as conn:
+            page_id = conn.execute("SELECT id FROM pages WHERE page_number = 39").fetchone()[0]
+            conn.execute(
+                "INSERT INTO images (page_id, width, height, format, file_path) VALUES (?, ?, ?, ?, ?)",
+                (page_id, 1200, 800, "png", str(images_dir / "page0039_img0000.png")),
+            )
+        viewer.configure_viewer(str(db_path), images_dir=str(images_dir), prewarm=False)
+        yield viewer.app.test_client()
+        viewer.RENDERER.close()
+        viewer.RENDERER = None
+
+    def test_generated_on_demand(self, client, images_dir):
+        response = client.get("/thumb/150/page0039_img0000.png")
+        assert response.status_code == 200
+        assert response.mimetype == "image/jpeg"
+        assert response.cache_control.immutable
+        assert thumbnail_path(viewer.THUMBNAILS_DIR, "page0039_img0000.png", 600).exists()
+
+    def test_grid_and_page_use_thumbnails(self, client):
+        assert b'src="/thumb/150/page0039_img0000.png"' in client.get("/images").data
+        page = client.get("/page/39").data
+        assert b'src="/thumb/300/page0039_img0000.png"' in page
+        assert b'href="/image/page0039_img0000.png"' in page
+
+    def test_undecodable_falls_back_to_original(self, client):
+        response = client.get("/thumb/150/page0041_img0000.jb2")
+        assert response.status_code == 302
+        assert response.location.endswith("/image/page0041_img0000.jb2")
+
+    def test_unknown_size_or_image(self, client):
+        assert client.get("/thumb/151/page0039_img0000.png").status_code == 404
+        assert client.get("/thumb/150/missing.png").status_code == 404
+
+    def test_disabled_without_images_dir(self, client):
+        assert viewer.thumbnail_filter("/x/a.png", 150) == "/thumb/150/a.png"
+        viewer.THUMBNAILS_DIR = None
+        assert viewer.thumbnail_filter("/x/a.png", 150) == "/image/a.png"
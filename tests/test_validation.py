@@ -0,0 +1,146 @@
+"""Tests for vectorized sample validation."""
+
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.batch import discover_databases, run_batch
+from src.core_analysis import CoreAnalysisExtractor, CoreSample
+from src.output.columnar import samples_to_columns
+from src.sample_table import SampleTable
+from src.validation import validate_columns, validate_samples
+from tests.fixtures.element_documents import write_elements_db
+
+
+def sample(number, depth, **overrides):
+    values = dict(
+        core_number="1", sample_number=number, depth_feet=depth,
+        permeability_air_md=0.01, permeability_klink_md=0.005,
+        porosity_ambient_pct=5.0, porosity_ncs_pct=4.8, grain_density_gcc=2.68,
+        saturation_water_pct=60.0, saturation_oil_pct=10.0, saturation_total_pct=70.0,
+        page_number=39,
+    )
+    values.update(overrides)
+    return CoreSample(**values)
+
+
+def violations_by_rule(report):
+    return {(v.rule, v.column): v for v in report.violations}
+
+
+class TestRules:
+    """Each rule flags exactly the offending samples."""
+
+    def test_clean_samples_pass(self):
+        report = validate_samples([sample("1-1", 9580.5), sample("1-2", 9581.5)])
+        assert report.passed
+        assert report.to_dict()["violation_count"] == 0
+
+    def test_range_rule(self):
+        report = validate_samples([
+            sample("1-1", 9580.5, grain_density_gcc=3.4),
+            sample("1-2", 9581.5, saturation_water_pct=-1.0, saturation_total_pct=9.0),
+        ])
+        found = violations_by_rule(report)
+        assert found[("range", "grain_density_gcc")].samples == ["1-1"]
+        assert found[("range", "saturation_water_pct")].samples == ["1-2"]
+
+    def test_cross_field_rules(self):
+        report = validate_samples([
+            sample("1-1", 9580.5, porosity_ncs_pct=5.5),
+            sample("1-2", 9581.5, permeability_klink_md=0.02),
+            sample("1-3", 9582.5, saturation_total_pct=75.0),
+        ])
+        found = violations_by_rule(report)
+        assert found[("ncs_exceeds_ambient", "porosity_ncs_pct")].samples == ["1-1"]
+        assert found[("klinkenberg_exceeds_air", "permeability_klink_md")].samples == ["1-2"]
+        assert found[("saturation_sum", "saturation_total_pct")].samples == ["1-3"]
+
+    def test_saturation_rounding_tolerated(self):
+        report = validate_samples([sample("1-1", 9580.5, saturation_total_pct=70.3)])
+        assert report.passed
+
+    def test_indicator_cells_skipped(self):
+        report = validate_samples([
+            sample("1-1", 9580.5, permeability_air_md="+", permeability_klink_md=None),
+            sample("1-2", 9581.5, saturation_water_pct="**", saturation_oil_pct="**",
+                   saturation_total_pct="**"),
+            sample("1-3", 9582.5, permeability_air_md="<0.0001", permeability_klink_md=5.0),
+        ])
+        assert report.passed
+
+    def test_depth_order_per_core(self):
+        report = validate_samples([
+            sample("1-1", 9580.5),
+            sample("1-2", 9579.0),
+            sample("2-1", 9500.0, core_number="2"),
+        ])
+        found = violations_by_rule(report)
+        assert found[("depth_order", "depth_feet")].samples == ["1-2"]
+
+    def test_outliers(self):
+        samples = [sample(f"1-{i}", 9580.0 + i) for i in range(1, 20)]
+        samples[3] = sample("1-4", 9584.0, grain_density_gcc=2.99,
+                            permeability_air_md=50.0, permeability_klink_md=40.0)
+        # Small natural spread so z-scores are defined
+        for i, s in enumerate(samples):
+            if i != 3:
+                s.grain_density_gcc = 2.66 + 0.002 * (i % 5)
+                s.permeability_air_md = 0.01 * (1 + i % 3)
+                s.permeability_klink_md = 0.004 * (1 + i % 3)
+
+        found = violations_by_rule(validate_samples(samples))
+        assert found[("outlier", "grain_density_gcc")].samples == ["1-4"]
+        assert found[("outlier", "permeability_air_md")].samples == ["1-4"]
+
+    def test_range_overrides(self):
+        report = validate_columns(
+            samples_to_columns([sample("1-1", 9580.5)]),
+            ranges={"depth_feet": (9500.0, 9550.0)},
+        )
+        assert violations_by_rule(report)[("range", "depth_feet")].count == 1
+
+
+class TestScale:
+    """Validation is column-wise over large sample sets."""
+
+    def test_many_wells_in_one_pass(self):
+        table = SampleTable(sample(f"1-{i}", 9000.0 + i) for i in range(200))
+        columns = samples_to_columns(table, source="W1")
+        # 500 wells of 200 samples each
+        big = {name: np.tile(values, 500) for name, values in columns.items()}
+        big["source"] = np.repeat([f"W{i}" for i in range(500)], 200)
+
+        report = validate_columns(big)
+        assert report.sample_count == 100_000
+        # Depth resets at each well boundary are not ordering violations
+        assert report.passed
+
+
+class TestPipelineIntegration:
+    """Validation runs after extract and in batch mode."""
+
+    def test_extractor_validate_and_save(self, tmp_path):
+        extractor = CoreAnalysisExtractor(str(write_elements_db(tmp_path / "W1_elements.db")))
+        result = extractor.extract()
+        report = extractor.validate(result)
+        path = extractor.save_validation(report, str(tmp_path / "validation_report.json"))
+
+        data = json.loads(open(path).read())
+        assert data["sample_count"] == 5
+        assert data["passed"] is report.passed
+
+    def test_batch_validation_report(self, tmp_path):
+        write_elements_db(tmp_path / "dbs" / "W1_elements.db")
+        write_elements_db(tmp_path / "dbs" / "W2_elements.db")
+
+        batch = run_batch(
+            discover_databases(str(tmp_path / "dbs")),
+            str(tmp_path / "out"),
+            workers=1,
+            validate=True,
+        )
+        assert batch.validation.sample_count == 10
+        assert json.loads(open(batch.validation_report).read())["sample_count"] == 10
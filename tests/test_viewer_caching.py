@@ -0,0 +1,120 @@
+"""Tests for HTTP caching and compression in the viewer."""
+
+import gzip
+import hashlib
+import os
+import time
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("flask")
+
+from src.elementizer import viewer
+from tests.fixtures.pdf_documents import write_pdf_elements_db, write_rca_pdf
+
+
+@pytest.fixture(scope="module")
+def pdf_path(tmp_path_factory):
+    return write_rca_pdf(tmp_path_factory.mktemp("pdf") / "W1.pdf")
+
+
+@pytest.fixture
+def db_path(pdf_path, tmp_path):
+    return write_pdf_elements_db(pdf_path, tmp_path / "W1_elements.db")
+
+
+@pytest.fixture
+def images_dir(tmp_path):
+    path = tmp_path / "images"
+    path.mkdir()
+    (path / "page39_img1.png").write_bytes(b"\x89PNG" + bytes(range(256)) * 4)
+    return path
+
+
+@pytest.fixture
+def client(db_path, images_dir, tmp_path):
+    viewer.configure_viewer(
+        str(db_path), images_dir=str(images_dir),
+        render_cache_dir=str(tmp_path / "tiles"), prewarm=False,
+    )
+    yield viewer.app.test_client()
+    viewer.RENDERER.close()
+    viewer.RENDERER = None
+
+
+class TestImages:
+    """Extracted images are immutable and validated by content hash."""
+
+    def test_strong_content_etag(self, client, images_dir):
+        response = client.get("/image/page39_img1.png")
+        digest = hashlib.sha256((images_dir / "page39_img1.png").read_bytes()).hexdigest()
+        assert response.get_etag() == (digest, False)
+        assert response.cache_control.max_age == viewer.IMAGE_MAX_AGE
+        assert response.cache_control.immutable
+
+    def test_not_modified(self, client):
+        etag = client.get("/image/page39_img1.png").headers["ETag"]
+        response = client.get("/image/page39_img1.png", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_range_request(self, client, images_dir):
+        response = client.get("/image/page39_img1.png", headers={"Range": "bytes=0-3"})
+        assert response.status_code == 206
+        assert response.data == b"\x89PNG"
+
+    def test_missing_image(self, client):
+        assert client.get("/image/nope.png").status_code == 404
+
+
+class TestDatabasePages:
+    """HTML pages revalidate against the database modification time."""
+
+    def test_etag_and_304(self, client):
+        response = client.get("/page/39")
+        assert response.cache_control.no_cache
+        assert response.get_etag()[1] is True
+
+        again = client.get("/page/39", headers={"If-None-Match": response.headers["ETag"]})
+        assert again.status_code == 304
+
+    def test_304_skips_queries(self, client, monkeypatch):
+        etag = client.get("/pages").headers["ETag"]
+        monkeypatch.setattr(viewer, "get_db", lambda: pytest.fail("queried the database"))
+        assert client.get("/pages", headers={"If-None-Match": etag}).status_code == 304
+
+    def test_database_change_invalidates(self, client, db_path):
+        etag = client.get("/pages").headers["ETag"]
+        later = time.time() + 5
+        os.utime(db_path, (later, later))
+        assert client.get("/pages", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_if_modified_since(self, client):
+        last_modified = client.get("/").headers["Last-Modified"]
+        response = client.get("/", headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+
+
+class TestCompression:
+    """HTML is gzipped for clients that accept it."""
+
+    def test_gzip_html(self, client):
+        plain = client.get("/page/39")
+        compressed = client.get("/page/39", headers={"Accept-Encoding": "gzip"})
+
+        assert "Content-Encoding" not in plain.headers
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in compressed.headers["Vary"]
+        assert gzip.decompress(compressed.data) == plain.data
+        assert len(compressed.data) < len(plain.data)
+
+    def test_images_not_compressed(self, client):
+        response = client.get("/image/page39_img1.png", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in response.headers
+
+    def test_render_tile_etag(self, client):
+        response = client.get("/page/39/render")
+        assert response.get_etag() == (hashlib.sha256(response.data).hexdigest(), False)
+        again = client.get("/page/39/render", headers={"If-None-Match": response.headers["ETag"]})
+        assert again.status_code == 304
@@ -0,0 +1,157 @@
+"""Tests for multi-document databases: document stats and per-document routes."""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("flask")
+
+from click.testing import CliRunner
+
+from src.elementizer import viewer
+from src.elementizer.database import ElementDatabase, compute_document_stats, read_document_stats
+from src.elementizer.main import cli
+from tests.fixtures.element_documents import TABLE_PAGE_ROWS
+from tests.fixtures.pdf_documents import write_pdf_elements_db, write_rca_pdf
+
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    """Two reports in one database: W1 (42 pages) and W2 (5 pages)."""
+    pdf_dir = tmp_path_factory.mktemp("pdf")
+    db_path = pdf_dir / "wells_elements.db"
+    write_pdf_elements_db(write_rca_pdf(pdf_dir / "W1.pdf"), db_path)
+    w2 = write_rca_pdf(pdf_dir / "W2.pdf", page_count=5, table_rows={3: TABLE_PAGE_ROWS[39]})
+    write_pdf_elements_db(w2, db_path)
+    return db_path
+
+
+@pytest.fixture
+def client(db_path, tmp_path):
+    viewer.configure_viewer(str(db_path), render_cache_dir=str(tmp_path / "tiles"), prewarm=False)
+    yield viewer.app.test_client()
+    viewer.RENDERER.close()
+    viewer.RENDERER = None
+    viewer._close_renderers()
+
+
+class TestDocumentStats:
+    """Tests for the document_stats table."""
+
+    def test_written_on_store(self, db_path):
+        with sqlite3.connect(db_path) as conn:
+            stored = read_document_stats(conn)
+            assert stored == compute_document_stats(conn)
+        assert stored[1]["pages"] == 42
+        assert stored[2]["pages"] == 5
+        assert stored[2]["text_spans"] > 0
+
+    def test_backfills_missing_rows(self, db_path, tmp_path):
+        copy = tmp_path / "copy.db"
+        with sqlite3.connect(db_path) as src, sqlite3.connect(copy) as dst:
+            src.backup(dst)
+            expected = compute_document_stats(dst)
+            dst.execute("DROP TABLE document_stats")
+            # Read-only callers compute stats without the table
+            assert read_document_stats(dst) == expected
+
+        with ElementDatabase(str(copy)) as db:
+            documents = db.list_documents()
+        assert [doc["pages"] for doc in documents] == [42, 5]
+        with sqlite3.connect(copy) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM document_stats").fetchone()[0] == 2
+
+    def test_get_page_elements(self, db_path):
+        with ElementDatabase(str(db_path)) as db:
+            elements = db.get_page_elements(2, 3)
+            assert elements["page"]["page_number"] == 3
+            assert elements["text_blocks"]
+            assert db.get_page_elements(2, 39) == {}
+
+
+class TestDocumentRoutes:
+    """Tests for the document index and /doc/<id> routes."""
+
+    def test_index_lists_documents(self, client):
+        html = client.get("/").data.decode()
+        assert "2 Documents" in html
+        assert 'href="/doc/1/"' in html and 'href="/doc/2/"' in html
+        assert "W2.pdf" in html
+
+    def test_document_home(self, client):
+        html = client.get("/doc/2/").data.decode()
+        assert "W2.pdf" in html
+        assert 'href="/doc/2/page/3"' in html
+        assert 'href="/doc/2/page/39"' not in html
+        assert client.get("/doc/9/").status_code == 404
+
+    def test_page_scoped_to_document(self, client):
+        html = client.get("/doc/2/page/3").data.decode()
+        assert 'src="/doc/2/page/3/overlay.svg"' in html
+        assert 'href="/doc/2/page/4"' in html
+        assert client.get("/doc/2/page/39").status_code == 404
+        assert client.get("/doc/1/page/39").status_code == 200
+
+    def test_legacy_routes_use_first_document(self, client):
+        assert client.get("/page/39").status_code == 200
+        pages = client.get("/pages").data.decode()
+        assert 'href="/page/42"' in pages
+
+    def test_search_and_api_scoped(self, client):
+        assert b'href="/doc/2/page/3"' in client.get("/doc/2/search?q=SUMMARY").data
+        spans = client.get("/doc/2/api/search?q=SUMMARY").get_json()["items"]
+        assert {span["page_number"] for span in spans} == {3}
+        spans = client.get("/api/search?q=SUMMARY").get_json()["items"]
+        assert {span["page_number"] for span in spans} == {39, 40}
+
+    def test_render_per_document(self, client, tmp_path):
+        response = client.get("/doc/2/page/3/render")
+        assert response.status_code == 200
+        assert response.data.startswith(PNG_MAGIC)
+        assert client.get("/doc/2/page/6/render").status_code == 404
+        assert (tmp_path / "tiles" / "doc2_page_0003_z1.png").exists()
+
+    def test_overlay_per_document(self, client):
+        w1 = client.get("/doc/1/page/3/overlay.svg")
+        w2 = client.get("/doc/2/page/3/overlay.svg")
+        assert w1.status_code == w2.status_code == 200
+        assert w1.headers["ETag"] != w2.headers["ETag"]
+
+    def test_renderers_bounded(self, client, monkeypatch):
+        monkeypatch.setattr(viewer, "MAX_OPEN_RENDERERS", 1)
+        first = viewer.get_renderer(2)
+        assert viewer.get_renderer(2) is first
+        viewer.get_renderer(99)
+        assert list(viewer._renderers) == [99]
+        assert client.get("/doc/2/page/3/render").status_code == 200
+
+
+    def test_source_gone_after_eviction(self, client, monkeypatch):
+        class Closed:
+            def render(self, *args):
+                raise RuntimeError("document closed")
+
+        renderers = [Closed(), None]
+        monkeypatch.setattr(viewer, "get_renderer", lambda doc_id: renderers.pop(0))
+        assert client.get("/doc/2/page/3/render").status_code == 404
+
+
+class TestDocumentCommands:
+    """Tests for the documents command and page --document."""
+
+    def test_documents(self, db_path):
+        result = CliRunner().invoke(cli, ["documents", str(db_path)])
+        assert result.exit_code == 0
+        assert "W1.pdf" in result.output and "W2.pdf" in result.output
+
+    def test_page_requires_document(self, db_path):
+        result = CliRunner().invoke(cli, ["page", str(db_path), "3"])
+        assert result.exit_code == 1
+        assert "--document" in result.output
+
+        result = CliRunner().invoke(cli, ["page", str(db_path), "3", "--document", "2", "-j"])
+        assert result.exit_code == 0
+        assert '"page_number": 3' in result.output
@@ -0,0 +1,154 @@
+"""Tests for keyset pagination and the viewer JSON API."""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("flask")
+
+from src.elementizer import viewer
+from src.elementizer.viewer import decode_cursor, encode_cursor
+from tests.fixtures.pdf_documents import write_pdf_elements_db, write_rca_pdf
+
+IMAGES_PER_PAGE = 3
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    pdf_path = write_rca_pdf(tmp_path_factory.mktemp("pdf") / "W1.pdf")
+    db_path = write_pdf_elements_db(pdf_path, pdf_path.with_name("W1_elements.db"))
+    # Insert images in reverse page order so ids and page order disagree
+    with sqlite3.connect(db_path) as conn:
+        page_ids = conn.execute("SELECT id, page_number FROM pages ORDER BY page_number DESC").fetchall()
+        for page_id, page_number in page_ids:
+            for i in range(IMAGES_PER_PAGE):
+                conn.execute(
+                    "INSERT INTO images (page_id, width, height, format, file_path) VALUES (?, ?, ?, ?, ?)",
+                    (page_id, 10, 10, "png", f"page{page_number}_img{i}.png"),
+                )
+    return db_path
+
+
+@pytest.fixture
+def client(db_path):
+    viewer.configure_viewer(str(db_path), prewarm=False)
+    yield viewer.app.test_client()
+    viewer.RENDERER.close()
+    viewer.RENDERER = None
+
+
+def collect(client, url):
+    """Follow next_cursor links until exhausted."""
+    items, cursor, pages = [], None, 0
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""))
+        assert response.status_code == 200
+        body = response.get_json()
+        items += body["items"]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+
+class TestCursor:
+    """Tests for cursor encoding."""
+
+    def test_round_trip(self):
+        assert decode_cursor(encode_cursor(39, 1234)) == (39, 1234)
+
+    @pytest.mark.parametrize("cursor", ["", "!!", "bm90IGpzb24", encode_cursor(1, 2)[:-3]])
+    def test_rejects_malformed(self, cursor):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor)
+
+
+class TestApi:
+    """JSON endpoints walk every row exactly once."""
+
+    def test_images_complete_and_ordered(self, client):
+        items, pages = collect(client, "/api/images?limit=10")
+        assert len(items) == 42 * IMAGES_PER_PAGE
+        assert pages == 13
+        keys = [(item["page_number"], item["id"]) for item in items]
+        assert keys == sorted(keys)
+        assert "image_data" not in items[0]
+
+    def test_spans_filtered_by_page(self, client):
+        items, _ = collect(client, "/api/spans?page=39&limit=7")
+        assert {item["page_number"] for item in items} == {39}
+        assert len(items) == len({item["id"] for item in items})
+
+    def test_search_not_truncated(self, client, db_path):
+        with sqlite3.connect(db_path) as conn:
+            expected = conn.execute("SELECT COUNT(*) FROM text_spans WHERE text LIKE '%.%'").fetchone()[0]
+        items, pages = collect(client, "/api/search?q=.&limit=5")
+        assert len(items) == expected
+        assert pages > 1
+
+    def test_limit_clamped(self, client):
+        body = client.get("/api/images?limit=100000").get_json()
+        assert body["limit"] == viewer.MAX_PAGE_SIZE
+        assert client.get("/api/images?limit=0").get_json()["limit"] == 1
+
+    def test_errors(self, client):
+        assert client.get("/api/images?cursor=garbage").status_code == 400
+        assert client.get("/api/search").status_code == 400
+
+
+class TestQueryPlans:
+    """Document-scoped page queries are served by the (document_id, page_number) index."""
+
+    def plan(self, db_path, sql, params):
+        with sqlite3.connect(db_path) as conn:
+            return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+
+    def test_page_lookup(self, db_path):
+        plan = self.plan(db_path, viewer.PAGE_ELEMENTS_SQL, (None, 39))
+        assert any("p USING" in step and "(document_id=? AND page_number=?)" in step for step in plan)
+
+    def test_keyset_seek_needs_no_sort(self, db_path):
+        sql = viewer.IMAGE_LIST_SQL + (
+            f" WHERE p.document_id = {viewer.DOCUMENT_SCOPE}"
+            " AND p.page_number >= ? AND (p.page_number > ? OR t.id > ?)"
+            " ORDER BY p.page_number, t.id LIMIT ?"
+        )
+        plan = self.plan(db_path, sql, (None, 39, 39, 0, 51))
+        assert any("(document_id=? AND page_number>?)" in step for step in plan)
+        assert not any("TEMP B-TREE" in step for step in plan)
+
+    def test_page_number_index_dropped(self, db_path):
+        from src.elementizer.database import ElementDatabase
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_number ON pages(page_number)")
+        with ElementDatabase(db_path):
+            pass
+        with sqlite3.connect(db_path) as conn:
+            names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_pages_number" not in names
+
+
+class TestHtmlPages:
+    """HTML lists link to the next page with a cursor."""
+
+    def test_images_next_link(self, client):
+        html = client.get("/images?limit=4").get_data(as_text=True)
+        assert "page1_img0.png" in html
+        assert "/images?cursor=" in html
+        assert "&larr; First" not in html
+
+        cursor = encode_cursor(41, 10 ** 9)
+        html = client.get(f"/images?cursor={cursor}").get_data(as_text=True)
+        assert "page42_img0.png" in html
+        assert "page41_img0.png" not in html
+        assert "Next &rarr;" not in html
+
+    def test_search_more_results(self, client):
+        html = client.get("/search?q=.&limit=3").get_data(as_text=True)
+        assert "More results &rarr;" in html
+        assert html.count('class="search-result"') == 3
+
+    def test_bad_cursor(self, client):
+        assert client.get("/images?cursor=garbage").status_code == 400
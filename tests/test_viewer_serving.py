@@ -0,0 +1,133 @@
+"""Tests for the viewer's production serving path."""
+
+import socket
+import threading
+import urllib.request
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("flask")
+
+from src.elementizer import viewer
+from tests.fixtures.pdf_documents import write_pdf_elements_db, write_rca_pdf
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory):
+    pdf_path = write_rca_pdf(tmp_path_factory.mktemp("pdf") / "W1.pdf")
+    return write_pdf_elements_db(pdf_path, pdf_path.with_name("W1_elements.db"))
+
+
+@pytest.fixture
+def client(db_path):
+    viewer.configure_viewer(str(db_path), prewarm=False)
+    yield viewer.app.test_client()
+    viewer.RENDERER.close()
+    viewer.RENDERER = None
+
+
+class TestTemplates:
+    """Templates are compiled once, not per request."""
+
+    def test_compiled_once(self, client, monkeypatch):
+        viewer._compiled_templates.clear()
+        compiled = []
+        from_string = viewer.app.jinja_env.from_string
+        monkeypatch.setattr(
+            viewer.app.jinja_env, "from_string",
+            lambda source: compiled.append(source) or from_string(source),
+        )
+        for _ in range(3):
+            assert client.get("/page/39").status_code == 200
+            assert client.get("/pages").status_code == 200
+        assert len(compiled) == 2
+
+    def test_precompile_all(self):
+        viewer._compiled_templates.clear()
+        viewer.precompile_templates()
+        assert set(viewer._compiled_templates) == set(viewer.ALL_TEMPLATES)
+
+
+class TestPageQuery:
+    """The page route loads all elements in one query."""
+
+    def test_single_round_trip(self, client, monkeypatch):
+        statements = []
+        get_db = viewer.get_db
+
+        def traced_db():
+            db = get_db()
+            db.set_trace_callback(statements.append)
+            return db
+
+        monkeypatch.setattr(viewer, "get_db", traced_db)
+        assert client.get("/page/39").status_code == 200
+        assert len(statements) == 1
+
+    def test_elements_rendered(self, client):
+        html = client.get("/page/42").get_data(as_text=True)
+        assert "PROFILE PLOT" in html
+        assert "Lines (50)" in html
+
+        html = client.get("/page/39").get_data(as_text=True)
+        assert html.index("SUMMARY OF ROUTINE CORE ANALYSES") < html.index("Permeability")
+        assert "Next &rarr;" in html
+
+    def test_missing_page(self, client):
+        assert client.get("/page/99").status_code == 404
+
+
+class TestProductionServer:
+    """The pooled WSGI server serves concurrent requests."""
+
+    def test_concurrent_requests(self, db_path):
+        viewer.configure_viewer(str(db_path), prewarm=False)
+        server = viewer.make_production_server("127.0.0.1", 0, threads=4)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_port}/page/39"
+        try:
+            bodies = []
+            clients = [
+                threading.Thread(target=lambda: bodies.append(urllib.request.urlopen(url).read()))
+                for _ in range(8)
+            ]
+            for t in clients:
+                t.start()
+            for t in clients:
+                t.join(10)
+            assert len(bodies) == 8
+            assert len(set(bodies)) == 1
+        finally:
+            server.shutdown()
+            server.server_close()
+            viewer.RENDERER.close()
+            viewer.RENDERER = None
+
+    def test_accept_blocks_while_pool_busy(self, monkeypatch):
+        server = viewer.make_production_server("127.0.0.1", 0, threads=1)
+        release = threading.Event()
+        monkeypatch.setattr(server, "finish_request", lambda *args: release.wait(10))
+        sockets = [socket.socketpair() for _ in range(2)]
+        try:
+            server.process_request(sockets[0][0], ("127.0.0.1", 1))
+            second = threading.Thread(target=server.process_request, args=(sockets[1][0], ("127.0.0.1", 2)))
+            second.start()
+            second.join(0.2)
+            # The only thread is busy, so the second request is not accepted into the pool
+            assert second.is_alive()
+
+            release.set()
+            second.join(5)
+            assert not second.is_alive()
+        finally:
+            release.set()
+            server.server_close()
+            for pair in sockets:
+                for sock in pair:
+                    sock.close()
+
+    def test_rejects_unknown_mode(self, db_path):
+        with pytest.raises(ValueError, match="serve mode"):
+            viewer.run_viewer(str(db_path), serve="gunicorn")
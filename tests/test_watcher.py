@@ -0,0 +1,223 @@
+"""Tests for the watch-folder daemon."""
+
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+pytest.importorskip("fitz")
+
+from src import watcher as watcher_module
+from src.watcher import LEDGER_NAME, FolderWatcher, file_sha256
+from tests.fixtures.pdf_documents import write_rca_pdf
+
+
+@pytest.fixture(scope="module")
+def source_pdf(tmp_path_factory):
+    return write_rca_pdf(tmp_path_factory.mktemp("pdf") / "W1.pdf")
+
+
+@pytest.fixture
+def inbox(tmp_path):
+    path = tmp_path / "inbox"
+    path.mkdir()
+    return path
+
+
+def drop(source, inbox, name):
+    """Copy a PDF into the inbox with an mtime old enough to be settled."""
+    target = inbox / name
+    shutil.copy(source, target)
+    past = time.time() - 60
+    os.utime(target, (past, past))
+    return target
+
+
+@pytest.fixture
+def make_watcher(inbox):
+    watchers = []
+
+    def make(**kwargs):
+        kwargs.setdefault("use_processes", False)
+        kwargs.setdefault("extract_images", False)
+        watcher = FolderWatcher(str(inbox), **kwargs)
+        watchers.append(watcher)
+        return watcher
+
+    yield make
+    for watcher in watchers:
+        watcher.close()
+
+
+class TestIngest:
+    """Tests for processing dropped PDFs."""
+
+    def test_outputs_written_next_to_pdf(self, make_watcher, source_pdf, inbox):
+        drop(source_pdf, inbox, "W1.pdf")
+        assert make_watcher().run_once() == 1
+
+        output = inbox / "W1_extraction"
+        assert (output / "full_table_extraction.csv").exists()
+        assert (output / "W1_elements.db").exists()
+        classification = json.loads((output / "page_classification.json").read_text())
+        assert classification["page_39"] == "table"
+        # No temporary directories left behind
+        assert sorted(p.name for p in inbox.iterdir()) == [LEDGER_NAME, "W1.pdf", "W1_extraction"]
+
+    def test_image_paths_point_into_output(self, make_watcher, inbox, tmp_path):
+        import sqlite3
+
+        import fitz
+
+        pdf = fitz.open()
+        pixmap = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 8, 8), 0)
+        pixmap.clear_with(200)
+        for _ in range(2):
+            pdf.new_page().insert_image(fitz.Rect(50, 50, 150, 150), pixmap=pixmap)
+        pdf.save(tmp_path / "scan.pdf")
+        pdf.close()
+        drop(tmp_path / "scan.pdf", inbox, "scan.pdf")
+
+        make_watcher(extract_images=True).run_once()
+        with sqlite3.connect(inbox / "scan_extraction" / "scan_elements.db") as conn:
+            paths = [row[0] for row in conn.execute("SELECT file_path FROM images")]
+        assert len(paths) == 2
+        for path in paths:
+            assert os.path.exists(path)
+            assert os.path.dirname(path) == str(inbox / "scan_extraction" / "scan_images")
+
+    def test_overlapping_job_files_kept(self, source_pdf, inbox):
+        pdf_path = drop(source_pdf, inbox, "W1.pdf")
+        # Temporary directory of another job for the same PDF in this process
+        other = inbox / f".W1_extraction.tmp-{os.getpid()}"
+        other.mkdir()
+        (other / "W1_elements.db").write_bytes(b"in progress")
+
+        watcher_module.process_pdf(str(pdf_path), extract_images=False)
+        assert (other / "W1_elements.db").read_bytes() == b"in progress"
+        assert (inbox / "W1_extraction" / "W1_elements.db").exists()
+
+    def test_ledger_keyed_by_content_hash(self, make_watcher, source_pdf, inbox):
+        pdf = drop(source_pdf, inbox, "W1.pdf")
+        make_watcher().run_once()
+
+        ledger = json.loads((inbox / LEDGER_NAME).read_text())
+        entry = ledger[file_sha256(pdf)]
+        assert entry["status"] == "done"
+        assert entry["sample_count"] == 5
+
+    def test_failed_pdf_recorded(self, make_watcher, inbox):
+        bad = inbox / "bad.pdf"
+        bad.write_bytes(b"not a pdf")
+        os.utime(bad, (0, 0))
+        make_watcher().run_once()
+
+        ledger = json.loads((inbox / LEDGER_NAME).read_text())
+        assert ledger[file_sha256(bad)]["status"] == "failed"
+        assert not (inbox / "bad_extraction").exists()
+
+
+class TestRetries:
+    """Failed content is retried with backoff, a bounded number of times."""
+
+    def test_transient_failure_retried(self, make_watcher, source_pdf, inbox, monkeypatch):
+        original = watcher_module.process_pdf
+        calls = []
+
+        def flaky(path, *args):
+            calls.append(path)
+            if len(calls) == 1:
+                raise OSError("output directory locked")
+            return original(path, *args)
+
+        monkeypatch.setattr(watcher_module, "process_pdf", flaky)
+        pdf = drop(source_pdf, inbox, "W1.pdf")
+        watcher = make_watcher(retry_backoff=0)
+        assert watcher.run_once() == 1
+        entry = watcher.ledger[file_sha256(pdf)]
+        assert (entry["status"], entry["attempts"]) == ("failed", 1)
+
+        assert watcher.run_once() == 1
+        assert watcher.ledger[file_sha256(pdf)]["status"] == "done"
+        assert watcher.run_once() == 0
+        assert len(calls) == 2
+
+    def test_backoff_delays_retry(self, make_watcher, inbox):
+        bad = inbox / "bad.pdf"
+        bad.write_bytes(b"not a pdf")
+        os.utime(bad, (0, 0))
+        watcher = make_watcher(retry_backoff=3600)
+        assert watcher.run_once() == 1
+        assert watcher.run_once() == 0
+        # A restarted watcher honors the recorded delay too
+        assert make_watcher(retry_backoff=3600).run_once() == 0
+
+    def test_gives_up_after_max_attempts(self, make_watcher, inbox):
+        bad = inbox / "bad.pdf"
+        bad.write_bytes(b"not a pdf")
+        os.utime(bad, (0, 0))
+        watcher = make_watcher(retry_backoff=0, max_attempts=2)
+        assert [watcher.run_once() for _ in range(4)] == [1, 1, 0, 0]
+        assert watcher.ledger[file_sha256(bad)]["attempts"] == 2
+
+
+class TestWorkerCrash:
+    """A dead worker process must not stop the watcher."""
+
+    def test_broken_pool_replaced(self, make_watcher, source_pdf, inbox):
+        watcher = make_watcher(use_processes=True, workers=1)
+        broken = watcher.executor
+        # Start the worker, then kill it
+        broken.submit(time.sleep, 0).result()
+        for process in list(broken._processes.values()):
+            process.kill()
+        deadline = time.time() + 30
+        while not broken._broken and time.time() < deadline:
+            time.sleep(0.05)
+
+        drop(source_pdf, inbox, "W1.pdf")
+        assert watcher.run_once() == 1
+        assert watcher.executor is not broken
+        assert (inbox / "W1_extraction" / "full_table_extraction.csv").exists()
+
+
+class TestNoDuplicateProcessing:
+    """Each distinct content is processed exactly once."""
+
+    def test_same_content_processed_once(self, make_watcher, source_pdf, inbox, monkeypatch):
+        calls = []
+        original = watcher_module.process_pdf
+        monkeypatch.setattr(
+            watcher_module, "process_pdf",
+            lambda path, *args: calls.append(path) or original(path, *args),
+        )
+        drop(source_pdf, inbox, "W1.pdf")
+        drop(source_pdf, inbox, "W1_copy.pdf")
+
+        watcher = make_watcher()
+        assert watcher.run_once() == 1
+        assert watcher.run_once() == 0
+        assert len(calls) == 1
+
+    def test_ledger_survives_restart(self, make_watcher, source_pdf, inbox):
+        drop(source_pdf, inbox, "W1.pdf")
+        make_watcher().run_once()
+        assert make_watcher().run_once() == 0
+
+    def test_changed_content_reprocessed(self, make_watcher, source_pdf, inbox):
+        pdf = drop(source_pdf, inbox, "W1.pdf")
+        watcher = make_watcher()
+        watcher.run_once()
+
+        with open(pdf, "ab") as f:
+            f.write(b"\n% appended revision\n")
+        os.utime(pdf, (time.time() - 60, time.time() - 60))
+
+        assert watcher.run_once() == 1
+        assert len(json.loads((inbox / LEDGER_NAME).read_text())) == 2
+
+    def test_unsettled_file_skipped(self, make_watcher, source_pdf, inbox):
+        shutil.copy(source_pdf, inbox / "W1.pdf")
+        assert make_watcher(settle_seconds=30).run_once() == 0